@@ -325,7 +325,9 @@ type DeltaWithElement = Omit<Delta, "fragmentId" | "newElement" | "toJSON"> & {
 }
 
 type ForwardMsgType =
+  | boolean
   | DeltaWithElement
+  | Omit<Delta, "toJSON">
   | ForwardMsg.ScriptFinishedStatus
   | IAutoRerun
   | ILogo
@@ -2228,6 +2230,67 @@ describe("App", () => {
     })
   })
 
+  describe("App.handleResendWidgetStates", () => {
+    it("sends the last rerun request again", () => {
+      renderApp(getProps())
+      vi.useFakeTimers()
+
+      const connectionManager = getMockConnectionManager()
+      act(() => {
+        sendForwardMessage("autoRerun", {
+          interval: 1.0,
+          fragmentId: "myFragmentId",
+        })
+        vi.advanceTimersByTime(1000)
+      })
+      expect(connectionManager.sendMessage).toHaveBeenCalledTimes(1)
+
+      sendForwardMessage("resendWidgetStates", true)
+
+      expect(connectionManager.sendMessage).toHaveBeenCalledTimes(2)
+      expect(
+        // @ts-expect-error
+        connectionManager.sendMessage.mock.calls[1][0].toJSON()
+      ).toStrictEqual(
+        // @ts-expect-error
+        connectionManager.sendMessage.mock.calls[0][0].toJSON()
+      )
+    })
+
+    it("does nothing if no rerun was requested", () => {
+      renderApp(getProps())
+
+      const connectionManager = getMockConnectionManager()
+      sendForwardMessage("resendWidgetStates", true)
+
+      expect(connectionManager.sendMessage).not.toHaveBeenCalled()
+    })
+  })
+
+  describe("App.handleMissingUnchangedElement", () => {
+    it("asks the server to resend all elements once per script run", () => {
+      renderApp(getProps())
+
+      const connectionManager = getMockConnectionManager()
+      const unchangedElementDelta = {
+        type: "unchangedElement" as const,
+        unchangedElement: {},
+        fragmentId: "",
+      }
+      // There are no elements to keep at these paths.
+      sendForwardMessage("delta", unchangedElementDelta, { deltaPath: [0, 5] })
+      sendForwardMessage("delta", unchangedElementDelta, { deltaPath: [0, 6] })
+
+      expect(connectionManager.sendMessage).toHaveBeenCalledTimes(1)
+      expect(
+        // @ts-expect-error
+        connectionManager.sendMessage.mock.calls[0][0].toJSON().rerunScript
+          .resendElements
+      ).toBe(true)
+      expect(screen.queryByText(/Can't keep unchanged element/)).toBeNull()
+    })
+  })
+
   describe("App.requestFileURLs", () => {
     it("properly constructs fileUrlsRequest BackMsg", () => {
       renderApp(getProps())
@@ -77,6 +77,7 @@ import {
   Logo,
   mark,
   measure,
+  MissingUnchangedElementError,
   Navigation,
   NewSession,
   notNullOrUndefined,
@@ -130,6 +131,7 @@ import { showDevelopmentOptions } from "./showDevelopmentOptions"
 import "@streamlit/app/src/assets/css/theme.scss"
 import { ThemeManager } from "./util/useThemeManager"
 import { AppNavigation, MaybeStateUpdate } from "./util/AppNavigation"
+import { WidgetStatesDeltaEncoder } from "./util/WidgetStatesDeltaEncoder"
 
 export interface Props {
   screenCast: ScreenCastHOC
@@ -220,6 +222,19 @@ export class App extends PureComponent<Props, State> {
 
   private readonly widgetMgr: WidgetStateManager
 
+  private readonly widgetStatesDeltaEncoder = new WidgetStatesDeltaEncoder()
+
+  /**
+   * The arguments of the last rerun request, so that it can be sent again
+   * with the complete widget states if the server can't apply its delta.
+   */
+  private lastRerunRequest?: {
+    widgetStates?: WidgetStates
+    fragmentId?: string
+    pageScriptHash?: string
+    isAutoRerun?: boolean
+  }
+
   private readonly hostCommunicationMgr: HostCommunicationManager
 
   private readonly uploadClient: FileUploadClient
@@ -237,6 +252,13 @@ export class App extends PureComponent<Props, State> {
 
   private pendingElementsTimerRunning: boolean
 
+  /**
+   * True if we asked the server to send every element in full, because it
+   * reported an element as unchanged that we don't display. Reset when the
+   * next script run starts.
+   */
+  private elementResendRequested = false
+
   private readonly componentRegistry: ComponentRegistry
 
   private readonly embeddingId: string = generateUID()
@@ -612,6 +634,10 @@ export class App extends PureComponent<Props, State> {
     if (newState === ConnectionState.CONNECTED) {
       logMessage("Reconnected to server.")
 
+      // The server may not have received the widget states we sent over the
+      // previous connection, so the next rerun request must contain all of them.
+      this.widgetStatesDeltaEncoder.reset()
+
       const lastRunWasInterrupted =
         this.state.scriptRunState === ScriptRunState.RERUN_REQUESTED ||
         this.state.scriptRunState === ScriptRunState.RUNNING
@@ -710,6 +736,7 @@ export class App extends PureComponent<Props, State> {
         pageProfile: (pageProfile: PageProfile) =>
           this.handlePageProfileMsg(pageProfile),
         autoRerun: (autoRerun: AutoRerun) => this.handleAutoRerun(autoRerun),
+        resendWidgetStates: () => this.handleResendWidgetStates(),
         fileUrlsResponse: (fileURLsResponse: FileURLsResponse) =>
           this.uploadClient.onFileURLsResponse(fileURLsResponse),
         parentMessage: (parentMessage: ParentMessage) =>
@@ -856,6 +883,24 @@ export class App extends PureComponent<Props, State> {
     })
   }
 
+  /**
+   * Handler for ForwardMsg.resendWidgetStates messages: the server dropped
+   * our last rerun request, as it couldn't apply its widget state delta.
+   */
+  handleResendWidgetStates = (): void => {
+    this.widgetStatesDeltaEncoder.reset()
+    if (this.lastRerunRequest) {
+      const { widgetStates, fragmentId, pageScriptHash, isAutoRerun } =
+        this.lastRerunRequest
+      this.sendRerunBackMsg(
+        widgetStates,
+        fragmentId,
+        pageScriptHash,
+        isAutoRerun
+      )
+    }
+  }
+
   /**
    * Handler for ForwardMsg.sessionStatusChanged messages
    * @param statusChangeProto a SessionStatus protobuf
@@ -980,6 +1025,9 @@ export class App extends PureComponent<Props, State> {
       return
     }
 
+    // Elements missing from this script run may be requested again.
+    this.elementResendRequested = false
+
     // First, handle initialization logic. Each NewSession message has
     // initialization data. If this is the _first_ time we're receiving
     // the NewSession message, we perform some one-time initialization.
@@ -1006,6 +1054,9 @@ export class App extends PureComponent<Props, State> {
       const themeInput = newSessionProto.customTheme as CustomThemeConfig
 
       this.processThemeInput(themeInput)
+      this.widgetStatesDeltaEncoder.setEnabled(
+        config.enableWidgetStateDeltas
+      )
       this.setState({
         allowRunOnSave: config.allowRunOnSave,
         hideTopBar: config.hideTopBar,
@@ -1302,11 +1353,19 @@ export class App extends PureComponent<Props, State> {
     deltaMsg: Delta,
     metadataMsg: ForwardMsgMetadata
   ): void => {
-    this.pendingElementsBuffer = this.pendingElementsBuffer.applyDelta(
-      this.state.scriptRunId,
-      deltaMsg,
-      metadataMsg
-    )
+    try {
+      this.pendingElementsBuffer = this.pendingElementsBuffer.applyDelta(
+        this.state.scriptRunId,
+        deltaMsg,
+        metadataMsg
+      )
+    } catch (error) {
+      if (!(error instanceof MissingUnchangedElementError)) {
+        throw error
+      }
+      this.handleMissingUnchangedElement()
+      return
+    }
 
     if (!this.pendingElementsTimerRunning) {
       this.pendingElementsTimerRunning = true
@@ -1325,6 +1384,19 @@ export class App extends PureComponent<Props, State> {
     }
   }
 
+  /**
+   * Rerun the script and ask the server to send every element in full, since
+   * its view of our elements is out of date.
+   */
+  handleMissingUnchangedElement = (): void => {
+    if (this.elementResendRequested) {
+      // Don't request a rerun for each missing element of the same run.
+      return
+    }
+    this.elementResendRequested = true
+    this.widgetMgr.sendUpdateWidgetsMessage(undefined)
+  }
+
   /**
    * Test-only method used by e2e tests to test disabling widgets.
    */
@@ -1479,6 +1551,13 @@ export class App extends PureComponent<Props, State> {
       return
     }
 
+    this.lastRerunRequest = {
+      widgetStates,
+      fragmentId,
+      pageScriptHash,
+      isAutoRerun,
+    }
+
     const { currentPageScriptHash } = this.state
     const { basePath } = baseUriParts
     let queryString = this.getQueryString()
@@ -1517,11 +1596,12 @@ export class App extends PureComponent<Props, State> {
       new BackMsg({
         rerunScript: {
           queryString,
-          widgetStates,
+          widgetStates: this.widgetStatesDeltaEncoder.encode(widgetStates),
           pageScriptHash,
           pageName,
           fragmentId,
           isAutoRerun,
+          resendElements: this.elementResendRequested,
         },
       })
     )
@@ -0,0 +1,67 @@
+/**
+ * Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import { WidgetState, WidgetStates } from "@streamlit/lib"
+
+import { WidgetStatesDeltaEncoder } from "./WidgetStatesDeltaEncoder"
+
+describe("WidgetStatesDeltaEncoder", () => {
+  const stateA = new WidgetState({ id: "a", intValue: 1 })
+  const stateB = new WidgetState({ id: "b", intValue: 2 })
+
+  it("returns widget states unchanged when disabled", () => {
+    const encoder = new WidgetStatesDeltaEncoder()
+    const widgetStates = new WidgetStates({ widgets: [stateA] })
+    expect(encoder.encode(widgetStates)).toBe(widgetStates)
+  })
+
+  it("sends full states first and deltas afterwards", () => {
+    const encoder = new WidgetStatesDeltaEncoder()
+    encoder.setEnabled(true)
+
+    const first = encoder.encode(
+      new WidgetStates({ widgets: [stateA, stateB] })
+    )
+    expect(first?.widgets).toEqual([stateA, stateB])
+    expect(first?.version).toBe(1)
+    expect(first?.baseVersion).toBeFalsy()
+
+    const stateB2 = new WidgetState({ id: "b", intValue: 3 })
+    const second = encoder.encode(
+      new WidgetStates({ widgets: [stateA, stateB2] })
+    )
+    expect(second?.widgets).toEqual([stateB2])
+    expect(second?.version).toBe(2)
+    expect(second?.baseVersion).toBe(1)
+    expect(second?.removedWidgetIds).toEqual([])
+
+    const third = encoder.encode(new WidgetStates({ widgets: [stateB2] }))
+    expect(third?.widgets).toEqual([])
+    expect(third?.baseVersion).toBe(2)
+    expect(third?.removedWidgetIds).toEqual(["a"])
+  })
+
+  it("sends full states after a reset", () => {
+    const encoder = new WidgetStatesDeltaEncoder()
+    encoder.setEnabled(true)
+    encoder.encode(new WidgetStates({ widgets: [stateA] }))
+
+    encoder.reset()
+    const widgetStates = encoder.encode(new WidgetStates({ widgets: [stateA] }))
+    expect(widgetStates?.widgets).toEqual([stateA])
+    expect(widgetStates?.baseVersion).toBeFalsy()
+  })
+})
@@ -0,0 +1,98 @@
+/**
+ * Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import { WidgetState, WidgetStates } from "@streamlit/lib"
+
+/**
+ * Turns the complete WidgetStates of rerun requests into deltas against the
+ * previously sent WidgetStates, if the server supports it (see the
+ * "server.enableWidgetStateDeltas" config option).
+ *
+ * WidgetStateManager replaces a widget's WidgetState object whenever its
+ * value changes, so changed widgets are detected by object identity.
+ */
+export class WidgetStatesDeltaEncoder {
+  private enabled = false
+
+  /** Version of the last sent WidgetStates. Zero if none was sent yet. */
+  private version = 0
+
+  private lastSentStates = new Map<string, WidgetState>()
+
+  /** Enable or disable delta encoding, e.g. when receiving a NewSession. */
+  public setEnabled(enabled: boolean): void {
+    if (enabled !== this.enabled) {
+      this.enabled = enabled
+      this.reset()
+    }
+  }
+
+  /**
+   * Forget the previously sent WidgetStates, so that the next rerun request
+   * contains all widget states. Must be called when the server may not have
+   * received them, e.g. after reconnecting.
+   */
+  public reset(): void {
+    this.version = 0
+    this.lastSentStates = new Map()
+  }
+
+  /**
+   * Return the WidgetStates to send to the server in place of the given
+   * complete WidgetStates.
+   */
+  public encode(widgetStates?: WidgetStates): WidgetStates | undefined {
+    if (!this.enabled) {
+      return widgetStates
+    }
+
+    if (!widgetStates) {
+      // The server treats a missing WidgetStates as an empty one.
+      this.reset()
+      return widgetStates
+    }
+
+    const baseVersion = this.version
+    const previousStates = this.lastSentStates
+    const currentStates = new Map<string, WidgetState>()
+    widgetStates.widgets.forEach(state => {
+      currentStates.set(state.id, state as WidgetState)
+    })
+
+    this.version += 1
+    this.lastSentStates = currentStates
+
+    if (baseVersion === 0) {
+      return new WidgetStates({
+        widgets: widgetStates.widgets,
+        version: this.version,
+      })
+    }
+
+    const changedStates = widgetStates.widgets.filter(
+      state => previousStates.get(state.id) !== state
+    )
+    const removedWidgetIds = Array.from(previousStates.keys()).filter(
+      widgetId => !currentStates.has(widgetId)
+    )
+    return new WidgetStates({
+      widgets: changedStates,
+      version: this.version,
+      baseVersion,
+      removedWidgetIds,
+    })
+  }
+}
@@ -20,7 +20,13 @@ import { MockInstance } from "vitest"
 import { arrayFromVector } from "@streamlit/lib/src/test_util"
 import { isNullOrUndefined } from "@streamlit/lib/src/util/utils"
 
-import { AppNode, AppRoot, BlockNode, ElementNode } from "./AppNode"
+import {
+  AppNode,
+  AppRoot,
+  BlockNode,
+  ElementNode,
+  MissingUnchangedElementError,
+} from "./AppNode"
 import { IndexTypeName } from "./dataframes/arrowTypeUtils"
 import { UNICODE } from "./mocks/arrow"
 import {
@@ -1167,6 +1173,37 @@ describe("AppRoot.applyDelta", () => {
     expect(newNode.fragmentId).toBe("myFragmentId")
   })
 
+  it("handles 'unchangedElement' deltas", () => {
+    const delta = makeProto(DeltaProto, { unchangedElement: {} })
+    const newRoot = ROOT.applyDelta(
+      "new_session_id",
+      delta,
+      forwardMsgMetadata([0, 1, 0])
+    )
+
+    // The existing element is kept, and belongs to the new script run.
+    const oldNode = ROOT.main.getIn([1, 0]) as ElementNode
+    const newNode = newRoot.main.getIn([1, 0]) as ElementNode
+    expect(newNode).toBeTextNode("2")
+    expect(newNode.element).toBe(oldNode.element)
+    expect(newNode.scriptRunId).toBe("new_session_id")
+    expect(newNode.activeScriptHash).toBe(FAKE_SCRIPT_HASH)
+    expect(newRoot.main.getIn([1])?.scriptRunId).toBe("new_session_id")
+    expect(newRoot.main.getIn([0])?.scriptRunId).toBe(NO_SCRIPT_RUN_ID)
+
+    // The element survives clearing the nodes of previous script runs.
+    const clearedRoot = newRoot.clearStaleNodes("new_session_id", [])
+    expect(clearedRoot.main.getIn([0, 0])).toBeTextNode("2")
+    expect(clearedRoot.getElements().size).toBe(1)
+  })
+
+  it("throws for 'unchangedElement' deltas without element", () => {
+    const delta = makeProto(DeltaProto, { unchangedElement: {} })
+    expect(() =>
+      ROOT.applyDelta("new_session_id", delta, forwardMsgMetadata([0, 1, 1]))
+    ).toThrow(MissingUnchangedElementError)
+  })
+
   it("timestamp is set on BlockNode as message id", () => {
     const timestamp = new Date(Date.UTC(2017, 1, 14)).valueOf()
     Date.now = vi.fn(() => timestamp)
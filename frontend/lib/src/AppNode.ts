@@ -334,6 +334,26 @@ export class ElementNode implements AppNode {
     return newNode
   }
 
+  /**
+   * Return a copy of this node that belongs to the given script run, e.g.
+   * because the server reported that the run produced the same element.
+   */
+  public withScriptRunId(
+    metadata: ForwardMsgMetadata,
+    scriptRunId: string
+  ): ElementNode {
+    const newNode = new ElementNode(
+      this.element,
+      metadata,
+      scriptRunId,
+      this.activeScriptHash,
+      this.fragmentId
+    )
+    newNode.lazyQuiverElement = this.lazyQuiverElement
+    newNode.lazyVegaLiteChartElement = this.lazyVegaLiteChartElement
+    return newNode
+  }
+
   private static quiverAddRowsHelper(
     element: Quiver,
     namedDataSet: ArrowNamedDataSet
@@ -561,6 +581,13 @@ export class BlockNode implements AppNode {
   }
 }
 
+/**
+ * Thrown when the server reports an element as unchanged that we don't
+ * display, because its view of our element tree is out of date. The server
+ * must then be asked to send every element in full.
+ */
+export class MissingUnchangedElementError extends Error {}
+
 /**
  * The root of our data tree. It contains the app's top-level BlockNodes.
  */
@@ -766,6 +793,11 @@ export class AppRoot {
         }
       }
 
+      case "unchangedElement": {
+        // Throws a MissingUnchangedElementError if there's no element to keep.
+        return this.keepElement(deltaPath, metadata, scriptRunId)
+      }
+
       default: {
         throw new Error(`Unrecognized deltaType: '${delta.type}'`)
       }
@@ -921,6 +953,30 @@ export class AppRoot {
       this.appLogo
     )
   }
+
+  /**
+   * Keep the element at deltaPath, which the server didn't resend because
+   * it's unchanged since the previous script run.
+   */
+  private keepElement(
+    deltaPath: number[],
+    metadata: ForwardMsgMetadata,
+    scriptRunId: string
+  ): AppRoot {
+    const existingNode = this.root.getIn(deltaPath)
+    if (!(existingNode instanceof ElementNode)) {
+      throw new MissingUnchangedElementError(
+        `Can't keep unchanged element: invalid deltaPath: ${deltaPath}`
+      )
+    }
+
+    const elementNode = existingNode.withScriptRunId(metadata, scriptRunId)
+    return new AppRoot(
+      this.mainScriptHash,
+      this.root.setIn(deltaPath, elementNode, scriptRunId),
+      this.appLogo
+    )
+  }
 }
 
 /** Iterates over datasets and converts data to Quiver. */
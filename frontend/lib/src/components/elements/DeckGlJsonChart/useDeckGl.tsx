@@ -17,7 +17,11 @@
 import { useCallback, useEffect, useMemo, useState } from "react"
 
 import JSON5 from "json5"
-import { PickingInfo, ViewStateChangeParameters } from "@deck.gl/core"
+import {
+  Layer,
+  PickingInfo,
+  ViewStateChangeParameters,
+} from "@deck.gl/core"
 import isEqual from "lodash/isEqual"
 import { TooltipContent } from "@deck.gl/core/dist/lib/tooltip"
 import { parseToRgba } from "color2k"
@@ -40,6 +44,7 @@ import type {
   ParsedDeckGlConfig,
 } from "./types"
 import { jsonConverter } from "./utils/jsonConverter"
+import { toBinaryLayerData } from "./utils/arrowLayerData"
 import {
   FillFunction,
   getContextualFillColor,
@@ -223,6 +228,18 @@ export const useDeckGl = (props: UseDeckGlProps): UseDeckGlShape => {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [isFullScreen, isLightTheme, element.json])
 
+  // Layer data that's sent as Arrow tables, by layer index.
+  const binaryLayerData = useMemo(
+    () =>
+      new Map(
+        element.arrowLayerData.map(layerData => [
+          layerData.layerIndex,
+          toBinaryLayerData(layerData),
+        ])
+      ),
+    [element.arrowLayerData]
+  )
+
   const deck = useMemo<DeckObject>(() => {
     const copy = { ...parsedPydeckJson }
 
@@ -334,8 +351,24 @@ export const useDeckGl = (props: UseDeckGlProps): UseDeckGlShape => {
 
     delete copy?.views // We are not using views. This avoids a console warning.
 
-    return jsonConverter.convert(copy)
+    const converted = jsonConverter.convert(copy)
+
+    // Binary layer data is added after the conversion, since the converter
+    // would otherwise walk through every value of its typed arrays.
+    if (binaryLayerData.size > 0 && Array.isArray(converted.layers)) {
+      converted.layers = converted.layers.map(
+        (layer: unknown, index: number) => {
+          const layerData = binaryLayerData.get(index)
+          return layerData && layer instanceof Layer
+            ? layer.clone({ data: layerData })
+            : layer
+        }
+      )
+    }
+
+    return converted
   }, [
+    binaryLayerData,
     data.selection.indices,
     isLightTheme,
     isSelectionModeActivated,
@@ -0,0 +1,67 @@
+/**
+ * Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import { tableFromArrays, tableToIPC } from "apache-arrow"
+
+import { DeckGlJsonChart as DeckGlJsonChartProto } from "@streamlit/lib/src/proto"
+
+import { toBinaryLayerData } from "./arrowLayerData"
+
+describe("toBinaryLayerData", () => {
+  const data = tableToIPC(
+    tableFromArrays({
+      lon: new Float64Array([10, 20, 30]),
+      lat: new Float64Array([1, 2, 3]),
+      size: new Float32Array([5, 6, 7]),
+    }),
+    "stream"
+  )
+
+  it("interleaves the columns of each attribute", () => {
+    const result = toBinaryLayerData(
+      DeckGlJsonChartProto.ArrowLayerData.create({
+        layerIndex: 0,
+        data,
+        binaryAttributes: [
+          { accessor: "getPosition", columns: ["lon", "lat"] },
+          { accessor: "getRadius", columns: ["size"] },
+        ],
+      })
+    )
+
+    expect(result.length).toBe(3)
+    expect(result.attributes.getPosition.size).toBe(2)
+    expect(result.attributes.getPosition.value).toBeInstanceOf(Float64Array)
+    expect(Array.from(result.attributes.getPosition.value)).toEqual([
+      10, 1, 20, 2, 30, 3,
+    ])
+    expect(result.attributes.getRadius.size).toBe(1)
+    expect(result.attributes.getRadius.value).toBeInstanceOf(Float32Array)
+    expect(Array.from(result.attributes.getRadius.value)).toEqual([5, 6, 7])
+  })
+
+  it("throws if a column is missing", () => {
+    expect(() =>
+      toBinaryLayerData(
+        DeckGlJsonChartProto.ArrowLayerData.create({
+          layerIndex: 0,
+          data,
+          binaryAttributes: [{ accessor: "getFillColor", columns: ["r"] }],
+        })
+      )
+    ).toThrow('Column "r" is missing from the layer data.')
+  })
+})
@@ -0,0 +1,94 @@
+/**
+ * Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import { tableFromIPC } from "apache-arrow"
+
+import { DeckGlJsonChart as DeckGlJsonChartProto } from "@streamlit/lib/src/proto"
+
+type TypedArray =
+  | Int8Array
+  | Uint8Array
+  | Int16Array
+  | Uint16Array
+  | Int32Array
+  | Uint32Array
+  | Float32Array
+  | Float64Array
+
+type TypedArrayConstructor = new (length: number) => TypedArray
+
+/**
+ * Layer data in deck.gl's binary format.
+ *
+ * @see https://deck.gl/docs/developer-guide/performance#supply-attributes-directly
+ */
+export type BinaryLayerData = {
+  length: number
+  attributes: Record<string, { value: TypedArray; size: number }>
+}
+
+/**
+ * Interleaves the components of an attribute, e.g. [x0, x1] and [y0, y1]
+ * into [x0, y0, x1, y1].
+ */
+function interleave(components: TypedArray[]): TypedArray {
+  if (components.length === 1) {
+    return components[0]
+  }
+
+  const size = components.length
+  const length = components[0].length
+  const ArrayType = components[0].constructor as TypedArrayConstructor
+  const values = new ArrayType(length * size)
+  components.forEach((component, offset) => {
+    for (let i = 0; i < length; i++) {
+      values[i * size + offset] = component[i]
+    }
+  })
+  return values
+}
+
+/**
+ * Converts the Arrow data of a layer to deck.gl's binary layer data format,
+ * so that deck.gl can upload it to the GPU without creating an object per row.
+ */
+export function toBinaryLayerData(
+  layerData: DeckGlJsonChartProto.IArrowLayerData
+): BinaryLayerData {
+  const table = tableFromIPC(layerData.data as Uint8Array)
+  const attributes: BinaryLayerData["attributes"] = {}
+
+  layerData.binaryAttributes?.forEach(({ accessor, columns }) => {
+    if (!accessor || !columns?.length) {
+      return
+    }
+
+    const components = columns.map(name => {
+      const column = table.getChild(name)
+      if (!column) {
+        throw new Error(`Column "${name}" is missing from the layer data.`)
+      }
+      // For a column without nulls, this is a view of its numeric values.
+      return column.toArray() as TypedArray
+    })
+    attributes[accessor] = {
+      value: interleave(components),
+      size: components.length,
+    }
+  })
+
+  return { length: table.numRows, attributes }
+}
@@ -402,6 +402,63 @@ describe("ComponentInstance", () => {
       expect(postMessage).toHaveBeenCalledTimes(2)
     })
 
+    it("sends args stored in blobs once they're fetched", async () => {
+      const componentRegistry = getComponentRegistry()
+      const fetchArgBlob = vi
+        .spyOn(componentRegistry, "fetchArgBlob")
+        .mockResolvedValue(
+          SpecialArg.create({ key: "data", json: "[1, 2, 3]" })
+        )
+      render(
+        <ComponentInstance
+          element={createElementProp({ foo: "bar" }, [
+            SpecialArg.create({ key: "data", blobUrl: "/media/abc.bin" }),
+          ])}
+          registry={componentRegistry}
+          width={100}
+          disabled={false}
+          theme={mockTheme.emotion}
+          widgetMgr={
+            new WidgetStateManager({
+              sendRerunBackMsg: vi.fn(),
+              formsDataChanged: vi.fn(),
+            })
+          }
+        />
+      )
+      const iframe = screen.getByTitle(MOCK_COMPONENT_NAME)
+      // @ts-expect-error
+      const postMessage = vi.spyOn(iframe.contentWindow, "postMessage")
+      fireEvent(
+        window,
+        new MessageEvent("message", {
+          data: {
+            isStreamlitMessage: true,
+            apiVersion: 1,
+            type: ComponentMessageType.COMPONENT_READY,
+          },
+          // @ts-expect-error
+          source: iframe.contentWindow,
+        })
+      )
+      // The blob isn't fetched yet, so there's nothing to render.
+      expect(postMessage).not.toHaveBeenCalled()
+
+      // Let the fetch's promise chain settle.
+      await act(async () => {
+        for (let i = 0; i < 10; i++) {
+          await Promise.resolve()
+        }
+      })
+
+      expect(fetchArgBlob).toHaveBeenCalledWith("/media/abc.bin")
+      expect(postMessage).toHaveBeenCalledTimes(1)
+      expect(postMessage).toHaveBeenCalledWith(
+        renderMsg({ foo: "bar", data: [1, 2, 3] }, []),
+        "*"
+      )
+    })
+
     it("send render message when viewport changes", () => {
       const jsonArgs = { foo: "string", bar: 5 }
       let width = 100
@@ -51,8 +51,10 @@ import {
   Args,
   createIframeMessageHandler,
   DataframeArg,
+  getArgBlobUrls,
   IframeMessageHandlerProps,
   parseArgs,
+  resolveBlobArgs,
   sendRenderMessage,
 } from "./componentUtils"
 import { StyledComponentIframe } from "./styled-components"
@@ -180,12 +182,42 @@ function ComponentInstance(props: Props): ReactElement {
     props
   const { componentName, jsonArgs, specialArgs, url } = element
 
-  const [parsedNewArgs, parsedDataframeArgs] = tryParseArgs(
-    jsonArgs,
-    specialArgs,
-    setComponentError,
-    componentError
+  // Large args are stored in blobs, which are fetched from the server. Blobs
+  // are fetched once and then kept by the registry, so args that didn't
+  // change between reruns resolve to the same objects as before.
+  const [argBlobs, setArgBlobs] = useState<Map<string, ISpecialArg>>(
+    () => new Map()
   )
+  const argBlobUrls = getArgBlobUrls(specialArgs)
+  const argBlobUrlsKey = argBlobUrls.join(" ")
+  const resolvedSpecialArgs = resolveBlobArgs(specialArgs, argBlobs)
+  const areArgsResolved = resolvedSpecialArgs !== undefined
+
+  useEffect(() => {
+    if (areArgsResolved) {
+      return
+    }
+
+    // Ignore the result if newer args arrive in the meantime.
+    let isCancelled = false
+    const urls = argBlobUrlsKey.split(" ")
+    Promise.all(urls.map(blobUrl => registry.fetchArgBlob(blobUrl)))
+      .then(blobArgs => {
+        if (!isCancelled) {
+          setArgBlobs(
+            new Map(urls.map((blobUrl, i) => [blobUrl, blobArgs[i]]))
+          )
+        }
+      })
+      .catch(e => {
+        if (!isCancelled) {
+          setComponentError(ensureError(e))
+        }
+      })
+    return () => {
+      isCancelled = true
+    }
+  }, [areArgsResolved, argBlobUrlsKey, registry])
 
   // Use a ref for the args so that we can use them inside the useEffect calls without the linter complaining
   // as in the useEffect dependencies array, we don't use the parsed arg objects, but their string representation
@@ -195,6 +227,19 @@ function ComponentInstance(props: Props): ReactElement {
     args: {},
     dataframeArgs: [],
   })
+
+  // Until all blobs are fetched, keep the previous args.
+  // TODO: Update to match React best practices
+  // eslint-disable-next-line react-compiler/react-compiler
+  const previousArgs = parsedArgsRef.current
+  const [parsedNewArgs, parsedDataframeArgs] = resolvedSpecialArgs
+    ? tryParseArgs(
+        jsonArgs,
+        resolvedSpecialArgs,
+        setComponentError,
+        componentError
+      )
+    : [previousArgs.args, previousArgs.dataframeArgs]
   const haveDataframeArgsChanged = compareDataframeArgs(
     // TODO: Update to match React best practices
     // eslint-disable-next-line react-compiler/react-compiler
@@ -236,7 +281,7 @@ function ComponentInstance(props: Props): ReactElement {
   // Send a render message to the custom component everytime relevant props change, such as the
   // input args or the theme / width
   useEffect(() => {
-    if (!isReadyRef.current) {
+    if (!isReadyRef.current || !areArgsResolved) {
       return
     }
     sendRenderMessage(
@@ -246,7 +291,16 @@ function ComponentInstance(props: Props): ReactElement {
       theme,
       iframeRef.current ?? undefined
     )
-  }, [disabled, frameHeight, haveDataframeArgsChanged, jsonArgs, theme, width])
+  }, [
+    areArgsResolved,
+    argBlobs,
+    disabled,
+    frameHeight,
+    haveDataframeArgsChanged,
+    jsonArgs,
+    theme,
+    width,
+  ])
 
   useEffect(() => {
     const handleSetFrameHeight = (height: number | undefined): void => {
@@ -276,14 +330,18 @@ function ComponentInstance(props: Props): ReactElement {
     }
 
     const componentReadyCallback = (): void => {
-      // Send a render message whenever the custom component sends a ready message
-      sendRenderMessage(
-        parsedArgsRef.current.args,
-        parsedArgsRef.current.dataframeArgs,
-        disabled,
-        theme,
-        iframeRef.current ?? undefined
-      )
+      // Send a render message whenever the custom component sends a ready
+      // message. If some args are still being fetched, the render message is
+      // sent once they're fetched.
+      if (areArgsResolved) {
+        sendRenderMessage(
+          parsedArgsRef.current.args,
+          parsedArgsRef.current.dataframeArgs,
+          disabled,
+          theme,
+          iframeRef.current ?? undefined
+        )
+      }
       clearTimeoutLog()
       clearTimeoutWarningElement()
       isReadyRef.current = true
@@ -303,6 +361,7 @@ function ComponentInstance(props: Props): ReactElement {
       fragmentId,
     }
   }, [
+    areArgsResolved,
     componentName,
     disabled,
     element,
@@ -15,6 +15,7 @@
  */
 
 import { mockEndpoints } from "@streamlit/lib/src/mocks/mocks"
+import { SpecialArg } from "@streamlit/lib/src/proto"
 
 import { ComponentRegistry } from "./ComponentRegistry"
 
@@ -87,4 +88,45 @@ describe("ComponentRegistry", () => {
     expect(msgListener1).not.toHaveBeenCalled()
     expect(msgListener2).toHaveBeenCalledWith(messageData.type, messageData)
   })
+
+  describe("fetchArgBlob", () => {
+    const blob = SpecialArg.encode({ key: "foo", json: "[1, 2, 3]" }).finish()
+
+    afterEach(() => {
+      vi.unstubAllGlobals()
+    })
+
+    test("Fetches each blob once", async () => {
+      const endpoints = mockEndpoints()
+      const fetchMock = vi.fn().mockResolvedValue(new Response(blob))
+      vi.stubGlobal("fetch", fetchMock)
+      const registry = new ComponentRegistry(endpoints)
+
+      const arg1 = await registry.fetchArgBlob("/media/abc.bin")
+      const arg2 = await registry.fetchArgBlob("/media/abc.bin")
+
+      expect(arg1.key).toBe("foo")
+      expect(arg1.json).toBe("[1, 2, 3]")
+      expect(arg2).toBe(arg1)
+      expect(fetchMock).toHaveBeenCalledTimes(1)
+      expect(fetchMock.mock.calls[0][0]).toBe(
+        endpoints.buildMediaURL("/media/abc.bin")
+      )
+    })
+
+    test("Retries failed fetches", async () => {
+      const fetchMock = vi
+        .fn()
+        .mockResolvedValueOnce(new Response(null, { status: 404 }))
+        .mockResolvedValueOnce(new Response(blob))
+      vi.stubGlobal("fetch", fetchMock)
+      const registry = new ComponentRegistry(mockEndpoints())
+
+      await expect(registry.fetchArgBlob("/media/abc.bin")).rejects.toThrow()
+      const arg = await registry.fetchArgBlob("/media/abc.bin")
+
+      expect(arg.key).toBe("foo")
+      expect(fetchMock).toHaveBeenCalledTimes(2)
+    })
+  })
 })
@@ -17,6 +17,8 @@
 import { isNullOrUndefined } from "@streamlit/lib/src/util/utils"
 import { logWarning } from "@streamlit/lib/src/util/log"
 import { StreamlitEndpoints } from "@streamlit/lib/src/StreamlitEndpoints"
+import { SpecialArg } from "@streamlit/lib/src/proto"
+import { FETCH_PARAMS } from "@streamlit/lib/src/baseconsts"
 
 import { ComponentMessageType } from "./enums"
 
@@ -25,6 +27,9 @@ export type ComponentMessageListener = (
   data: any
 ) => void
 
+/** The maximum number of arg blobs that are kept after being fetched. */
+const MAX_CACHED_ARG_BLOBS = 64
+
 /**
  * Dispatches iframe messages to ComponentInstances.
  */
@@ -36,6 +41,12 @@ export class ComponentRegistry {
     ComponentMessageListener
   >()
 
+  /**
+   * Fetched arg blobs, by URL, in the order they were last used. Blob URLs are
+   * derived from the blob's content, so a cached blob never goes stale.
+   */
+  private readonly argBlobs = new Map<string, Promise<SpecialArg>>()
+
   public constructor(endpoints: StreamlitEndpoints) {
     this.endpoints = endpoints
     window.addEventListener("message", this.onMessageEvent)
@@ -67,6 +78,42 @@ export class ComponentRegistry {
     return this.endpoints.buildComponentURL(componentName, path)
   }
 
+  /**
+   * Return the SpecialArg stored in the blob with the given URL. Each blob is
+   * only fetched once, as long as it's used often enough to stay cached.
+   */
+  public fetchArgBlob = (url: string): Promise<SpecialArg> => {
+    let blob = this.argBlobs.get(url)
+    if (blob !== undefined) {
+      // Move the blob to the end of the LRU order.
+      this.argBlobs.delete(url)
+    } else {
+      blob = fetch(this.endpoints.buildMediaURL(url), FETCH_PARAMS)
+        .then(response => {
+          if (!response.ok) {
+            throw new Error(
+              `Failed to fetch component arg (${response.status}): ${url}`
+            )
+          }
+          return response.arrayBuffer()
+        })
+        .then(buffer => SpecialArg.decode(new Uint8Array(buffer)))
+      // Don't keep failed fetches, so that they can be retried.
+      blob.catch(() => {
+        if (this.argBlobs.get(url) === blob) {
+          this.argBlobs.delete(url)
+        }
+      })
+    }
+
+    this.argBlobs.set(url, blob)
+    if (this.argBlobs.size > MAX_CACHED_ARG_BLOBS) {
+      const oldestUrl = this.argBlobs.keys().next().value as string
+      this.argBlobs.delete(oldestUrl)
+    }
+    return blob
+  }
+
   private onMessageEvent = (event: MessageEvent): void => {
     if (
       isNullOrUndefined(event.data) ||
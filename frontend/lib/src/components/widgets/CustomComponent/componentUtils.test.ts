@@ -31,6 +31,7 @@ import {
   IframeMessage,
   IframeMessageHandlerProps,
   parseArgs,
+  resolveBlobArgs,
   sendRenderMessage,
 } from "./componentUtils"
 import { ComponentMessageType, StreamlitMessageType } from "./enums"
@@ -233,5 +234,40 @@ describe("test componentUtils", () => {
         Error
       )
     })
+
+    it("should parse json specialArgs", () => {
+      const specialArgs = [
+        { key: "some-list", value: "json", json: "[1, 2, 3]" },
+      ]
+
+      const [newArgs] = parseArgs(JSON.stringify({ foo: "bar" }), specialArgs)
+      expect(newArgs).toEqual({ foo: "bar", "some-list": [1, 2, 3] })
+    })
+  })
+
+  describe("resolveBlobArgs", () => {
+    const bytesArg = {
+      key: "some-bytes",
+      value: "bytes",
+      bytes: new Uint8Array(8),
+    }
+    const blobRef = {
+      key: "some-list",
+      value: "blobUrl",
+      blobUrl: "/media/a.bin",
+    }
+    const blobArg = { key: "some-list", value: "json", json: "[1, 2, 3]" }
+
+    it("should replace blob references with the blobs' content", () => {
+      const argBlobs = new Map([["/media/a.bin", blobArg]])
+      expect(resolveBlobArgs([bytesArg, blobRef], argBlobs)).toEqual([
+        bytesArg,
+        blobArg,
+      ])
+    })
+
+    it("should return undefined if a blob isn't fetched yet", () => {
+      expect(resolveBlobArgs([bytesArg, blobRef], new Map())).toBeUndefined()
+    })
   })
 })
@@ -174,6 +174,9 @@ export function createIframeMessageHandler(
  * The `specialArgs` are transformed:
  * - `specialArgs[{ key, value: 'arrowdataframe', arrowDataFrame }]` to `dataFrameArgs[{ key, value: arrowDataFrame }]`
  * - `specialArgs[{ key, value: 'bytes', bytes }]` to `newArgs{key: bytes}`
+ * - `specialArgs[{ key, value: 'json', json }]` to `newArgs{key: JSON.parse(json)}`
+ *
+ * Args stored in blobs must be resolved with {@link resolveBlobArgs} first.
  *
  * This means that byte-values from `specialArgs` override entries in `jsonArgs` when having the same key
  *
@@ -222,6 +225,10 @@ export function parseArgs(
         newArgs[key] = specialArg.bytes
         break
 
+      case "json":
+        newArgs[key] = JSON.parse(specialArg.json as string)
+        break
+
       default:
         throw new Error(`Unrecognized SpecialArg type: ${specialArg.value}`)
     }
@@ -230,6 +237,42 @@ export function parseArgs(
   return [newArgs, dataframeArgs]
 }
 
+/**
+ * Return the URLs of the blobs that hold some of the given args.
+ */
+export function getArgBlobUrls(specialArgs: ISpecialArg[]): string[] {
+  return specialArgs
+    .filter(specialArg => specialArg.value === "blobUrl")
+    .map(specialArg => specialArg.blobUrl as string)
+}
+
+/**
+ * Replace the args that are stored in blobs with the blobs' content.
+ *
+ * @param specialArgs the args as received from Python
+ * @param argBlobs fetched blobs, by URL
+ * @returns the resolved args, or undefined if some blobs aren't fetched yet
+ */
+export function resolveBlobArgs(
+  specialArgs: ISpecialArg[],
+  argBlobs: Map<string, ISpecialArg>
+): ISpecialArg[] | undefined {
+  const resolvedArgs: ISpecialArg[] = []
+  for (const specialArg of specialArgs as SpecialArgProto[]) {
+    if (specialArg.value !== "blobUrl") {
+      resolvedArgs.push(specialArg)
+      continue
+    }
+
+    const blobArg = argBlobs.get(specialArg.blobUrl as string)
+    if (blobArg === undefined) {
+      return undefined
+    }
+    resolvedArgs.push(blobArg)
+  }
+  return resolvedArgs
+}
+
 /**
  * Send a RENDER message to the component with the most recent arguments
  * received from Python.
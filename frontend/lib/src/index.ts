@@ -15,7 +15,12 @@
  */
 
 // These imports are each exported specifically in order to minimize public apis.
-export { AppRoot, BlockNode, ElementNode } from "./AppNode"
+export {
+  AppRoot,
+  BlockNode,
+  ElementNode,
+  MissingUnchangedElementError,
+} from "./AppNode"
 export { IS_DEV_ENV, WEBSOCKET_PORT_DEV } from "./baseconsts"
 export { default as VerticalBlock } from "./components/core/Block"
 export type { BlockPropsWithoutWidth } from "./components/core/Block"
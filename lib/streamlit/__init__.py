@@ -44,7 +44,10 @@ For more detailed info, see https://docs.streamlit.io.
 
 # IMPORTANT: Prefix with an underscore anything that the user shouldn't see.
 
+import importlib as _importlib
 import os as _os
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+from typing import Any as _Any
 
 # Set Matplotlib backend to avoid a crash.
 # The default Matplotlib backend crashes Python on OSX when run on a thread
@@ -101,9 +104,6 @@ from streamlit.runtime.caching import (
     cache_data as _cache_data,
     cache as _cache,
 )
-from streamlit.runtime.connection_factory import (
-    connection_factory as _connection,
-)
 from streamlit.runtime.fragment import (
     experimental_fragment as _experimental_fragment,
     fragment as _fragment,
@@ -260,9 +260,6 @@ cache = _cache
 # Namespaces
 column_config = _column_config
 
-# Connection
-connection = _connection
-
 # Fragment and dialog
 dialog = _dialog_decorator
 fragment = _fragment
@@ -291,7 +288,34 @@ experimental_set_query_params = _deprecate_func_name(
 )
 
 
-# make it possible to call streamlit.components.v1.html etc. by importing it here
-# import in the very end to avoid partially-initialized module import errors, because
-# streamlit.components.v1 also uses some streamlit imports
-import streamlit.components.v1  # noqa: F401
+# Lazily loaded attributes (PEP 562). These are rarely used, so we only import
+# them on first access to keep `import streamlit` fast. Each name maps to the
+# module it's loaded from, and the name of the attribute in that module, or None
+# for the module itself.
+_LAZY_ATTRIBUTES: "dict[str, tuple[str, str | None]]" = {
+    # Connection
+    "connection": ("streamlit.runtime.connection_factory", "connection_factory"),
+    "connections": ("streamlit.connections", None),
+}
+
+if _TYPE_CHECKING:
+    from streamlit.runtime.connection_factory import (
+        connection_factory as connection,  # noqa: F401
+    )
+
+
+def __getattr__(name: str) -> _Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute_name = _LAZY_ATTRIBUTES[name]
+    value = _importlib.import_module(module_name)
+    if attribute_name is not None:
+        value = getattr(value, attribute_name)
+    # Cache the attribute, so that later accesses don't go through here.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> "list[str]":
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
@@ -11,3 +11,19 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from streamlit.components import v1  # noqa: F401
+
+
+def __getattr__(name: str) -> Any:
+    # `streamlit.components.v1` is loaded on first access, instead of when
+    # Streamlit is imported, so that `st.components.v1` keeps working.
+    if name == "v1":
+        return importlib.import_module(f"{__name__}.v1")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -15,8 +15,9 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Final
 
+from streamlit import runtime
 from streamlit.components.types.base_custom_component import BaseCustomComponent
 from streamlit.dataframe_util import is_dataframe_like
 from streamlit.delta_generator_singletons import get_dg_singleton_instance
@@ -37,12 +38,39 @@ if TYPE_CHECKING:
     from streamlit.runtime.state.common import WidgetCallback
 
 
+# Args whose serialized size is at least this many bytes are sent as blobs.
+_MIN_BLOB_ARG_SIZE: Final = 64 * 1024
+
+
 class MarshallComponentException(StreamlitAPIException):
     """Class for exceptions generated during custom component marshalling."""
 
     pass
 
 
+def _to_blob_arg_if_large(arg: SpecialArg, dg: DeltaGenerator) -> SpecialArg:
+    """Return a SpecialArg that refers to a blob holding the given arg if the
+    arg is large, or the arg itself otherwise.
+
+    Blobs are stored in the MediaFileManager, whose file IDs are derived from
+    the file's content. So, if a large arg doesn't change between reruns, the
+    component instance sent to the frontend doesn't change either, and the
+    frontend doesn't fetch the blob again.
+    """
+    serialized_arg = arg.SerializeToString()
+    if len(serialized_arg) < _MIN_BLOB_ARG_SIZE or not runtime.exists():
+        return arg
+
+    blob_arg = SpecialArg()
+    blob_arg.key = arg.key
+    blob_arg.blob_url = runtime.get_instance().media_file_mgr.add(
+        serialized_arg,
+        "application/octet-stream",
+        f"{dg._get_delta_path_str()}.{arg.key}",
+    )
+    return blob_arg
+
+
 class CustomComponent(BaseCustomComponent):
     """A Custom Component declaration."""
 
@@ -120,6 +148,10 @@ And if you're using Streamlit Cloud, add "pyarrow" to your requirements.txt."""
         # frontend.
         all_args = dict(kwargs, **{"default": default, "key": key})
 
+        # We currently only support writing to st._main, but this will change
+        # when we settle on an improved API in a post-layout world.
+        dg = get_dg_singleton_instance().main_dg
+
         json_args = {}
         special_args = []
         for arg_name, arg_val in all_args.items():
@@ -127,21 +159,34 @@ And if you're using Streamlit Cloud, add "pyarrow" to your requirements.txt."""
                 bytes_arg = SpecialArg()
                 bytes_arg.key = arg_name
                 bytes_arg.bytes = to_bytes(arg_val)
-                special_args.append(bytes_arg)
+                special_args.append(_to_blob_arg_if_large(bytes_arg, dg))
             elif is_dataframe_like(arg_val):
                 dataframe_arg = SpecialArg()
                 dataframe_arg.key = arg_name
                 component_arrow.marshall(dataframe_arg.arrow_dataframe.data, arg_val)
-                special_args.append(dataframe_arg)
+                special_args.append(_to_blob_arg_if_large(dataframe_arg, dg))
             else:
-                json_args[arg_name] = arg_val
-
-        try:
-            serialized_json_args = json.dumps(json_args)
-        except Exception as ex:
-            raise MarshallComponentException(
-                "Could not convert component args to JSON", ex
-            )
+                try:
+                    serialized_arg = json.dumps(arg_val)
+                except Exception as ex:
+                    raise MarshallComponentException(
+                        "Could not convert component args to JSON", ex
+                    )
+                if len(serialized_arg) >= _MIN_BLOB_ARG_SIZE:
+                    json_arg = SpecialArg()
+                    json_arg.key = arg_name
+                    json_arg.json = serialized_arg
+                    special_args.append(_to_blob_arg_if_large(json_arg, dg))
+                else:
+                    json_args[arg_name] = serialized_arg
+
+        # Each arg is already serialized, so join them instead of serializing
+        # the whole dict again.
+        serialized_json_args = (
+            "{"
+            + ", ".join(f"{json.dumps(name)}: {arg}" for name, arg in json_args.items())
+            + "}"
+        )
 
         def marshall_component(dg: DeltaGenerator, element: Element) -> Any:
             element.component_instance.component_name = self.name
@@ -212,10 +257,6 @@ And if you're using Streamlit Cloud, add "pyarrow" to your requirements.txt."""
                 widget_value = component_arrow.arrow_proto_to_dataframe(widget_value)
             return widget_value
 
-        # We currently only support writing to st._main, but this will change
-        # when we settle on an improved API in a post-layout world.
-        dg = get_dg_singleton_instance().main_dg
-
         element = Element()
         return_value = marshall_component(dg, element)
 
@@ -53,6 +53,10 @@ _config_options_template: dict[str, ConfigOption] = OrderedDict()
 # Stores the current state of config options.
 _config_options: dict[str, ConfigOption] | None = None
 
+# Incremented whenever the value of a config option may have changed. This lets
+# values derived from config options be cached until the config changes.
+_config_version = 0
+
 
 # Indicates that a config option was defined by the user.
 _USER_DEFINED = "<user defined>"
@@ -187,6 +191,28 @@ def get_option(key: str) -> Any:
         return config_options[key].value
 
 
+def get_config_version() -> int:
+    """Return a number that changes whenever the value of a config option may
+    have changed.
+
+    Values that are derived from config options can be cached along with the
+    config version at the time they were computed, and computed again when
+    the config version differs.
+    """
+    return _config_version
+
+
+def bump_config_version() -> None:
+    """Change the config version without changing any config option.
+
+    Call this after changing the values that `get_option` returns by other
+    means than `set_option`, e.g. by patching it, so that values derived from
+    config options are computed again.
+    """
+    global _config_version
+    _config_version += 1
+
+
 def get_options_for_section(section: str) -> dict[str, Any]:
     """Get all of the config options for the given section.
 
@@ -611,6 +637,21 @@ _create_option(
     type_=str,
 )
 
+_create_option(
+    "runner.profileCommands",
+    description="""
+        Measure how long each Streamlit command takes, including the time spent
+        in Arrow conversion and hashing, aggregated per line of the app's
+        source code that called it.
+
+        The measurements are served on the `/_stcore/command-profile` endpoint,
+        as JSON or, with `?format=folded`, in the folded stacks format read by
+        flamegraph tools.
+    """,
+    default_val=False,
+    type_=bool,
+)
+
 # Config Section: Server #
 
 _create_section("server", "Settings for the Streamlit server")
@@ -729,6 +770,65 @@ _create_option(
     type_=bool,
 )
 
+_create_option(
+    "server.scriptHealthCheckTtl",
+    visibility="hidden",
+    description="""
+        How long, in seconds, the result of a script health check is served for,
+        before a request to the script health check endpoint runs the script again.
+        Results are also discarded when a source file changes.
+
+        Note: This is an experimental Streamlit internal API. The API is subject
+        to change anytime so this should be used at your own risk
+    """,
+    default_val=10.0,
+    type_=float,
+)
+
+_create_option(
+    "server.scriptHealthCheckInterval",
+    visibility="hidden",
+    description="""
+        How often, in seconds, the script health check runs the script in the
+        background, so that requests to the script health check endpoint don't
+        have to wait for it. Set to 0 to only run the script when the endpoint is
+        requested and there's no cached result.
+
+        Note: This is an experimental Streamlit internal API. The API is subject
+        to change anytime so this should be used at your own risk
+    """,
+    default_val=0.0,
+    type_=float,
+)
+
+_create_option(
+    "server.warmup",
+    description="""
+        Whether to warm up the server before it reports itself as ready on its
+        health endpoint. Warming up compiles the scripts of all of the app's
+        pages, and runs server.warmupScript if it's set.
+
+        When this is enabled, compiled scripts are also persisted to disk
+        (keyed by their modification times), so that restarted servers don't
+        have to compile them again.
+    """,
+    default_val=False,
+    type_=bool,
+)
+
+_create_option(
+    "server.warmupScript",
+    description="""
+        Path to a script that's run in a headless session while the server
+        warms up, e.g. to import heavy modules or to call the app's
+        `@st.cache_resource` functions before the first user connects.
+
+        Only used if server.warmup is true.
+    """,
+    default_val=None,
+    type_=str,
+)
+
 _create_option(
     "server.baseUrlPath",
     description="""
@@ -797,6 +897,35 @@ _create_option(
     type_=bool,
 )
 
+_create_option(
+    "server.enableWidgetStateDeltas",
+    description="""
+        Allow browsers to only send the widgets whose state changed since
+        their previous rerun request, instead of the state of every widget.
+
+        This reduces the size of rerun requests and the work needed to detect
+        changed widgets in apps with many widgets or large widget values.
+    """,
+    visibility="hidden",
+    default_val=False,
+    type_=bool,
+)
+
+_create_option(
+    "server.enableElementDiffing",
+    description="""
+        Send a compact "unchanged" marker instead of an element that the
+        browser already displays at the same position, e.g. because the
+        previous script run produced the same element.
+
+        This reduces the bandwidth and browser work of reruns of apps with
+        many mostly unchanged elements.
+    """,
+    visibility="hidden",
+    default_val=False,
+    type_=bool,
+)
+
 _create_option(
     "server.enableWebsocketCompression",
     description="""
@@ -806,6 +935,47 @@ _create_option(
     type_=bool,
 )
 
+_create_option(
+    "server.rerunCoalescingWindow",
+    description="""
+        The minimum time, in seconds, between two rerun requests that a browser
+        connection passes on to its session.
+
+        Rerun requests received within this window after the previous one
+        (e.g. while the user drags a slider) are merged, and only the result is
+        passed on when the window ends. Button clicks are never lost. Set to 0
+        to pass on every rerun request immediately.
+    """,
+    default_val=0.05,
+    type_=float,
+)
+
+_create_option(
+    "server.websocketPingInterval",
+    description="""
+        Websocket connections that haven't received any message from the
+        browser for this many seconds are pinged, to keep them alive through
+        proxies that close idle connections and to detect dead connections.
+        Connections that receive messages regularly are never pinged.
+
+        Set to 0 to disable pings.
+    """,
+    default_val=10,
+    type_=float,
+)
+
+_create_option(
+    "server.websocketPingTimeout",
+    description="""
+        Websocket connections that don't receive any message from the browser
+        within this many seconds of being pinged are closed.
+
+        Set to 0 to never close unresponsive connections.
+    """,
+    default_val=30,
+    type_=float,
+)
+
 _create_option(
     "server.enableStaticServing",
     description="""
@@ -822,11 +992,80 @@ _create_option(
         TTL in seconds for sessions whose websockets have been disconnected. The server
         may choose to clean up session state, uploaded files, etc for a given session
         with no active websocket connection at any point after this time has passed.
+        See also "server.sessionHibernationDir".
     """,
     default_val=120,
     type_=int,
 )
 
+_create_option(
+    "server.sessionHibernationDir",
+    description="""
+        Directory in which to store the Session State of disconnected sessions
+        once they've been disconnected for longer than
+        "server.disconnectedSessionTTL", instead of discarding it. Hibernated
+        sessions are shut down to free their memory, and are restored when
+        their browser reconnects. Only values that user code stored in Session
+        State are kept; uploaded files are released.
+
+        Values in Session State are stored with pickle, so only point this at a
+        directory that can't be read by other users.
+
+        Default: Disconnected sessions are not hibernated.
+    """,
+    default_val=None,
+    type_=str,
+)
+
+_create_option(
+    "server.maxHibernatedSessions",
+    description="""
+        Max number of sessions to keep in "server.sessionHibernationDir". The
+        least recently hibernated sessions are discarded first.
+    """,
+    default_val=1000,
+    type_=int,
+)
+
+_create_option(
+    "server.maxHibernatedSessionsSize",
+    description="""
+        Max total size, in megabytes, of the sessions kept in
+        "server.sessionHibernationDir". The least recently hibernated sessions
+        are discarded first.
+    """,
+    default_val=256,
+    type_=int,
+)
+
+_create_option(
+    "server.maxPersistedCacheSize",
+    description="""
+        Max total size, in megabytes, of the values that functions decorated
+        with `@st.cache_data(persist="disk")` keep on disk. The least recently
+        cached values are discarded first. Set to 0 for no limit.
+    """,
+    default_val=0,
+    type_=int,
+)
+
+_create_option(
+    "server.workers",
+    description="""
+        Number of worker processes that serve the app. Each worker runs
+        scripts in its own process, so that several sessions can run their
+        scripts in parallel on different CPU cores. Browser sessions stay on
+        the worker that created them, and values cached with st.cache_data are
+        shared by all workers.
+
+        Values greater than 1 are only supported on platforms with
+        `os.fork` (i.e. not on Windows). Objects cached with st.cache_resource
+        and st.session_state are not shared between workers.
+    """,
+    default_val=1,
+    type_=int,
+)
+
 # Config Section: Browser #
 
 _create_section("browser", "Configuration of non-UI browser options.")
@@ -1116,6 +1355,8 @@ def _set_option(key: str, value: Any, where_defined: str) -> None:
         Tells the config system where this was set.
 
     """
+    global _config_version
+
     assert (
         _config_options is not None
     ), "_config_options should always be populated here."
@@ -1131,6 +1372,7 @@ def _set_option(key: str, value: Any, where_defined: str) -> None:
 
     else:
         _config_options[key].set_value(value, where_defined)
+        _config_version += 1
 
 
 def _update_config_with_sensitive_env_var(config_options: dict[str, ConfigOption]):
@@ -1256,7 +1498,7 @@ def get_config_options(
     dict[str, ConfigOption]
         An ordered dict that maps config option names to their values.
     """
-    global _config_options
+    global _config_options, _config_version
 
     if not options_from_flags:
         options_from_flags = {}
@@ -1274,6 +1516,7 @@ def get_config_options(
 
         old_options = _config_options
         _config_options = copy.deepcopy(_config_options_template)
+        _config_version += 1
 
         # Values set in files later in the CONFIG_FILENAMES list overwrite those
         # set earlier.
@@ -21,7 +21,7 @@ from __future__ import annotations
 
 from collections import ChainMap
 from copy import deepcopy
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Final, Literal, cast, overload
 
 from streamlit.connections import BaseConnection
 from streamlit.connections.util import extract_from_dict
@@ -31,8 +31,10 @@ from streamlit.runtime.caching import cache_data
 if TYPE_CHECKING:
     from datetime import timedelta
 
+    import pyarrow as pa
     from pandas import DataFrame
     from sqlalchemy.engine import Connection as SQLAlchemyConnection
+    from sqlalchemy.engine import CursorResult
     from sqlalchemy.engine.base import Engine
     from sqlalchemy.orm import Session
 
@@ -49,6 +51,69 @@ _ALL_CONNECTION_PARAMS = {
     "query",
 }
 _REQUIRED_CONNECTION_PARAMS = {"dialect", "username", "host"}
+# Connection pool params that can be set at the top level of the connection's
+# secrets, and are passed to `sqlalchemy.create_engine()`.
+_POOL_PARAMS = {
+    "pool_size",
+    "max_overflow",
+    "pool_timeout",
+    "pool_recycle",
+    "pool_pre_ping",
+}
+
+# The number of rows to fetch at a time when building an Arrow table from a
+# driver that can't return Arrow data itself.
+_ARROW_FETCH_BATCH_SIZE: Final = 10_000
+
+
+def _fetch_arrow_table(result: CursorResult) -> pa.Table:
+    """Fetch all rows of a query's result as an Arrow table.
+
+    If the DBAPI driver can return Arrow data itself, as ADBC drivers and
+    DuckDB can, we use that. Otherwise, we fetch the rows from the DBAPI cursor
+    in batches, and convert each batch to Arrow arrays, without creating
+    SQLAlchemy rows or a pandas DataFrame.
+    """
+    import pyarrow as pa
+
+    cursor = result.cursor
+    # `fetch_arrow_table` is the ADBC DBAPI extension. Newer versions of DuckDB
+    # deprecate it in favor of `to_arrow_table`.
+    for method_name in ("to_arrow_table", "fetch_arrow_table"):
+        if hasattr(cursor, method_name):
+            return cast("pa.Table", getattr(cursor, method_name)())
+
+    names = list(result.keys())
+    chunks: list[list[pa.Array]] = [[] for _ in names]
+    while rows := cursor.fetchmany(_ARROW_FETCH_BATCH_SIZE):
+        for column_chunks, values in zip(chunks, zip(*rows)):
+            column_chunks.append(pa.array(values))
+    return pa.Table.from_arrays([_concat_chunks(c) for c in chunks], names)
+
+
+def _concat_chunks(chunks: list[pa.Array]) -> pa.ChunkedArray:
+    """Combine the Arrow arrays of a column's batches into one column.
+
+    The arrays' types are inferred from each batch's values, so a batch with
+    only NULLs has the null type, and they may differ in other ways too.
+    """
+    import pyarrow as pa
+
+    types = {chunk.type for chunk in chunks if chunk.type != pa.null()}
+    if len(types) > 1:
+        # Let Arrow infer a type for the whole column, e.g. double for a mix
+        # of integer and floating point batches.
+        return pa.chunked_array(
+            [pa.array([value for chunk in chunks for value in chunk.to_pylist()])]
+        )
+    column_type = types.pop() if types else pa.null()
+    return pa.chunked_array(
+        [
+            chunk if chunk.type == column_type else pa.nulls(len(chunk), column_type)
+            for chunk in chunks
+        ],
+        type=column_type,
+    )
 
 
 class SQLConnection(BaseConnection["Engine"]):
@@ -66,6 +131,10 @@ class SQLConnection(BaseConnection["Engine"]):
     - ``autocommit``. If this is ``False`` (default), the connection operates
       in manual commit (transactional) mode. If this is ``True``, the
       connection operates in autocommit (non-transactional) mode.
+    - Connection pool settings for |sqlalchemy.create_engine()|_:
+      ``pool_size``, ``max_overflow``, ``pool_timeout``, ``pool_recycle``,
+      and ``pool_pre_ping``. These can be set at the top level of the
+      connection's secrets, next to the connection parameters.
 
     If ``url`` exists as a connection parameter, Streamlit will pass it to
     ``sqlalchemy.engine.make_url()``. Otherwise, Streamlit requires (at a
@@ -211,8 +280,9 @@ class SQLConnection(BaseConnection["Engine"]):
                 query=conn_params["query"] if "query" in conn_params else None,
             )
 
+        pool_kwargs = {p: self._secrets[p] for p in _POOL_PARAMS if p in self._secrets}
         create_engine_kwargs = ChainMap(
-            kwargs, self._secrets.get("create_engine_kwargs", {})
+            kwargs, self._secrets.get("create_engine_kwargs", {}), pool_kwargs
         )
         eng = sqlalchemy.create_engine(url, **create_engine_kwargs)
 
@@ -221,6 +291,33 @@ class SQLConnection(BaseConnection["Engine"]):
         else:
             return cast("Engine", eng)
 
+    @overload
+    def query(
+        self,
+        sql: str,
+        *,
+        show_spinner: bool | str = "Running `sql.query(...)`.",
+        ttl: float | int | timedelta | None = None,
+        index_col: str | list[str] | None = None,
+        chunksize: int | None = None,
+        params=None,
+        return_type: Literal["pandas"] = "pandas",
+        **kwargs,
+    ) -> DataFrame: ...
+
+    @overload
+    def query(
+        self,
+        sql: str,
+        *,
+        show_spinner: bool | str = "Running `sql.query(...)`.",
+        ttl: float | int | timedelta | None = None,
+        index_col: None = None,
+        chunksize: None = None,
+        params=None,
+        return_type: Literal["arrow"],
+    ) -> pa.Table: ...
+
     def query(
         self,
         sql: str,
@@ -230,8 +327,9 @@ class SQLConnection(BaseConnection["Engine"]):
         index_col: str | list[str] | None = None,
         chunksize: int | None = None,
         params=None,
+        return_type: Literal["pandas", "arrow"] = "pandas",
         **kwargs,
-    ) -> DataFrame:
+    ) -> DataFrame | pa.Table:
         """Run a read-only query.
 
         This method implements query result caching and simple error
@@ -269,6 +367,14 @@ class SQLConnection(BaseConnection["Engine"]):
             documentation for which of the five syntax styles, described in `PEP 249
             paramstyle <https://peps.python.org/pep-0249/#paramstyle>`_, is supported.
             Default is None.
+        return_type : "pandas" or "arrow"
+            The type of the returned result. If this is ``"pandas"`` (default),
+            the result is a pandas DataFrame. If this is ``"arrow"``, the result
+            is a PyArrow Table, which is faster to fetch, cache, and display
+            with ``st.dataframe`` for large results. Drivers that support
+            fetching results as Arrow, like ADBC drivers and DuckDB, return it
+            directly. ``index_col``, ``chunksize``, and additional keyword
+            arguments are only supported for pandas DataFrames.
         **kwargs: dict
             Additional keyword arguments are passed to |pandas.read_sql|_.
 
@@ -277,8 +383,9 @@ class SQLConnection(BaseConnection["Engine"]):
 
         Returns
         -------
-        pandas.DataFrame
-            The result of running the query, formatted as a pandas DataFrame.
+        pandas.DataFrame or pyarrow.Table
+            The result of running the query, formatted as a pandas DataFrame or
+            a PyArrow Table, depending on ``return_type``.
 
         Example
         -------
@@ -302,6 +409,19 @@ class SQLConnection(BaseConnection["Engine"]):
             wait_fixed,
         )
 
+        if return_type not in ("pandas", "arrow"):
+            raise StreamlitAPIException(
+                f'Invalid return_type "{return_type}". '
+                'Valid values are "pandas" and "arrow".'
+            )
+        if return_type == "arrow" and (
+            index_col is not None or chunksize is not None or kwargs
+        ):
+            raise StreamlitAPIException(
+                "`index_col`, `chunksize`, and additional keyword arguments "
+                'are not supported with `return_type="arrow"`.'
+            )
+
         @retry(
             after=lambda _: self.reset(),
             stop=stop_after_attempt(3),
@@ -316,19 +436,34 @@ class SQLConnection(BaseConnection["Engine"]):
             index_col=None,
             chunksize=None,
             params=None,
+            return_type="pandas",
             **kwargs,
-        ) -> DataFrame:
+        ) -> DataFrame | pa.Table:
             import pandas as pd
 
-            instance = self._instance.connect()
-            return pd.read_sql(
-                text(sql),
-                instance,
-                index_col=index_col,
-                chunksize=chunksize,
-                params=params,
-                **kwargs,
-            )
+            if chunksize is not None:
+                # The returned iterator fetches chunks from the connection as
+                # it's consumed, so the connection can't be closed here.
+                return pd.read_sql(
+                    text(sql),
+                    self._instance.connect(),
+                    index_col=index_col,
+                    chunksize=chunksize,
+                    params=params,
+                    **kwargs,
+                )
+
+            # Return the connection to the engine's pool once we're done with it.
+            with self._instance.connect() as conn:
+                if return_type == "arrow":
+                    return _fetch_arrow_table(conn.execute(text(sql), params))
+                return pd.read_sql(
+                    text(sql),
+                    conn,
+                    index_col=index_col,
+                    params=params,
+                    **kwargs,
+                )
 
         # We modify our helper function's `__qualname__` here to work around default
         # `@st.cache_data` behavior. Otherwise, `.query()` being called with different
@@ -348,6 +483,7 @@ class SQLConnection(BaseConnection["Engine"]):
             index_col=index_col,
             chunksize=chunksize,
             params=params,
+            return_type=return_type,
             **kwargs,
         )
 
@@ -357,6 +493,9 @@ class SQLConnection(BaseConnection["Engine"]):
 
         Calling this method is equivalent to calling ``self._instance.connect()``.
 
+        Use the returned connection as a context manager, so that it's returned
+        to the engine's connection pool when you're done with it.
+
         NOTE: This method should not be confused with the internal ``_connect`` method used
         to implement a Streamlit Connection.
 
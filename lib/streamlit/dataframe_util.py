@@ -43,6 +43,7 @@ from typing import (
 from typing_extensions import TypeAlias, TypeGuard
 
 from streamlit import config, errors, logger, string_util
+from streamlit.runtime.command_profiler import profile_section
 from streamlit.type_util import (
     CustomDict,
     NumpyShape,
@@ -763,6 +764,7 @@ Offending object:
         ) from ex
 
 
+@profile_section("arrow_conversion")
 def convert_arrow_table_to_arrow_bytes(table: pa.Table) -> bytes:
     """Serialize pyarrow.Table to Arrow IPC bytes.
 
@@ -799,6 +801,7 @@ def convert_arrow_table_to_arrow_bytes(table: pa.Table) -> bytes:
     return cast(bytes, sink.getvalue().to_pybytes())
 
 
+@profile_section("arrow_conversion")
 def convert_pandas_df_to_arrow_bytes(df: DataFrame) -> bytes:
     """Serialize pandas.DataFrame to Arrow IPC bytes.
 
@@ -859,6 +862,7 @@ def _show_data_information(msg: str) -> None:
     get_dg_singleton_instance().main_dg.caption(msg)
 
 
+@profile_section("arrow_conversion")
 def convert_anything_to_arrow_bytes(
     data: Any,
     max_unevaluated_rows: int = _MAX_UNEVALUATED_DF_ROWS,
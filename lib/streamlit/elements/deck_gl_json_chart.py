@@ -31,7 +31,7 @@ from typing import (
 
 from typing_extensions import TypeAlias
 
-from streamlit import config
+from streamlit import config, dataframe_util
 from streamlit.elements.lib.event_utils import AttributeDictionary
 from streamlit.elements.lib.form_utils import current_form_id
 from streamlit.elements.lib.policies import check_widget_policies
@@ -46,6 +46,7 @@ from streamlit.runtime.state import (
 )
 
 if TYPE_CHECKING:
+    from numpy import typing as npt
     from pydeck import Deck
 
     from streamlit.delta_generator import DeltaGenerator
@@ -455,6 +456,7 @@ class PydeckMixin:
             spec = json.dumps(EMPTY_MAP)
         else:
             spec = pydeck_obj.to_json()
+            _marshall_binary_transport_layers(pydeck_proto, pydeck_obj)
 
         pydeck_proto.json = spec
         pydeck_proto.use_container_width = use_container_width
@@ -503,6 +505,9 @@ class PydeckMixin:
                 selection_mode=selection_mode,
                 use_container_width=use_container_width,
                 spec=spec,
+                arrow_layer_data=[
+                    layer_data.data for layer_data in pydeck_proto.arrow_layer_data
+                ],
                 form_id=pydeck_proto.form_id,
             )
 
@@ -545,3 +550,99 @@ def _get_pydeck_tooltip(pydeck_obj: Deck | None) -> dict[str, str] | None:
         return cast(Dict[str, str], tooltip)
 
     return None
+
+
+def _marshall_binary_transport_layers(
+    pydeck_proto: PydeckProto, pydeck_obj: Deck
+) -> None:
+    """Send the data of layers created with `use_binary_transport=True` as
+    Arrow tables.
+
+    pydeck keeps the DataFrame columns of these layers as numpy arrays (one
+    per accessor) instead of adding them to the JSON spec.
+    """
+    for layer_index, layer in enumerate(getattr(pydeck_obj, "layers", None) or []):
+        if not getattr(layer, "use_binary_transport", False):
+            continue
+
+        columns: dict[str, npt.NDArray[Any]] = {}
+        binary_attributes: dict[str, list[str]] = {}
+        for binary_column in layer.get_binary_data() or []:
+            name = binary_column["column_name"]
+            values = binary_column["np_data"]
+            if values.ndim == 1:
+                column_names = [name]
+                columns[name] = values
+            else:
+                # A column of arrays, e.g. positions: one column per component.
+                column_names = [f"{name}[{i}]" for i in range(values.shape[1])]
+                for i, column_name in enumerate(column_names):
+                    columns[column_name] = values[:, i]
+            binary_attributes[binary_column["accessor"]] = column_names
+
+        marshall_arrow_layer_data(pydeck_proto, layer_index, columns, binary_attributes)
+
+
+def marshall_arrow_layer_data(
+    pydeck_proto: PydeckProto,
+    layer_index: int,
+    columns: Mapping[str, npt.NDArray[Any]],
+    binary_attributes: Mapping[str, list[str]],
+) -> None:
+    """Add the data of a layer to the proto as an Arrow table, which the
+    frontend passes to deck.gl as binary attributes.
+
+    Parameters
+    ----------
+    pydeck_proto : DeckGlJsonChartProto
+        The proto to add the data to.
+
+    layer_index : int
+        The index of the layer in the `layers` list of the JSON spec.
+
+    columns : Mapping[str, numpy.ndarray]
+        The layer's data, as one-dimensional numeric arrays of equal length.
+
+    binary_attributes : Mapping[str, list[str]]
+        The columns that make up each binary attribute, by the name of the
+        accessor prop the attribute replaces. E.g. ``{"getPosition": ["lon",
+        "lat"]}``.
+    """
+    import pyarrow as pa
+
+    table = pa.table(
+        {
+            name: _to_binary_attribute_values(name, values)
+            for name, values in columns.items()
+        }
+    )
+
+    layer_data = pydeck_proto.arrow_layer_data.add()
+    layer_data.layer_index = layer_index
+    layer_data.data = dataframe_util.convert_arrow_table_to_arrow_bytes(table)
+    for accessor, column_names in binary_attributes.items():
+        binary_attribute = layer_data.binary_attributes.add()
+        binary_attribute.accessor = accessor
+        binary_attribute.columns.extend(column_names)
+
+
+def _to_binary_attribute_values(
+    name: str, values: npt.NDArray[Any]
+) -> npt.NDArray[Any]:
+    """Convert values to a dtype that deck.gl accepts for binary attributes."""
+    import numpy as np
+
+    kind, itemsize = values.dtype.kind, values.dtype.itemsize
+    if kind == "b":
+        return values.astype(np.uint8)
+    if kind in "iu" and itemsize == 8:
+        # 64-bit integers would become BigInt64Arrays in the browser.
+        return values.astype(np.float64)
+    if kind == "f" and itemsize == 2:
+        return values.astype(np.float32)
+    if kind in "iuf":
+        return values
+    raise StreamlitAPIException(
+        f'Column "{name}" must contain numbers or arrays of numbers to be sent '
+        f"as a binary attribute, but it has dtype {values.dtype}."
+    )
@@ -0,0 +1,254 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Serialization of Plotly figures for st.plotly_chart."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import pickle
+import threading
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+from cachetools import LRUCache
+
+from streamlit import type_util
+
+if TYPE_CHECKING:
+    from plotly.basedatatypes import BaseFigure
+
+# The maximum total size of the serialized specs kept in memory. Specs that are
+# larger than this on their own aren't memoized.
+_SPEC_CACHE_MAX_BYTES: Final = 128 * 1024 * 1024
+
+# The maximum number of chart positions whose last figure is remembered.
+_MAX_TRACKED_CHARTS: Final = 10_000
+
+# The dtypes of typed arrays that Plotly.js can decode, by numpy dtype.
+_TYPED_ARRAY_DTYPES: Final = {
+    "int8": "i1",
+    "uint8": "u1",
+    "int16": "i2",
+    "uint16": "u2",
+    "int32": "i4",
+    "uint32": "u4",
+    "float32": "f4",
+    "float64": "f8",
+}
+
+
+class _RenderedChart(NamedTuple):
+    """The figure that was last serialized for a chart position."""
+
+    spec_hash: str
+    # True if the figure wasn't memoized and differed from the one serialized
+    # before it.
+    changed: bool
+
+
+class _SpecCache:
+    """A thread-safe LRU cache of serialized specs and their hashes, bounded by
+    the specs' total size.
+
+    It also remembers the figure that was last serialized for each chart
+    position, to tell which charts change on every rerun.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._cache: LRUCache[str, tuple[str, str]] = LRUCache(
+            maxsize=max_bytes, getsizeof=lambda entry: len(entry[0])
+        )
+        self._rendered_charts: LRUCache[str, _RenderedChart] = LRUCache(
+            maxsize=_MAX_TRACKED_CHARTS
+        )
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> tuple[str, str] | None:
+        """Return the spec and spec hash memoized for the fingerprint."""
+        with self._lock:
+            return self._cache.get(fingerprint)
+
+    def set(self, fingerprint: str, spec: str, spec_hash: str) -> None:
+        if len(spec) > self._max_bytes:
+            return
+        with self._lock:
+            self._cache[fingerprint] = (spec, spec_hash)
+
+    def get_rendered_chart(self, position: str) -> _RenderedChart | None:
+        with self._lock:
+            return self._rendered_charts.get(position)
+
+    def set_rendered_chart(self, position: str, chart: _RenderedChart) -> None:
+        with self._lock:
+            self._rendered_charts[position] = chart
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._rendered_charts.clear()
+
+
+_spec_cache = _SpecCache(_SPEC_CACHE_MAX_BYTES)
+
+
+def figure_to_json(
+    figure: BaseFigure | dict[str, Any], position: str | None = None
+) -> tuple[str, str]:
+    """Serialize a figure to the JSON spec sent to the frontend.
+
+    Numeric numpy arrays in the figure are encoded as base64 typed arrays,
+    which Plotly.js decodes without parsing a decimal number per value.
+
+    Specs are memoized by a fingerprint of the figure's contents, so an
+    unchanged figure is only hashed, not serialized again, on each rerun.
+    Figures of charts whose figure changed on the previous rerun are
+    serialized without computing their fingerprint or memoizing their spec,
+    since they're likely to change again.
+
+    Parameters
+    ----------
+    figure
+        The figure to serialize.
+    position
+        A string that identifies the chart across reruns, like the session
+        and delta path. If None, the figure is always fingerprinted.
+
+    Returns
+    -------
+    tuple[str, str]
+        The JSON spec, and a hash of the spec, which can be used instead of
+        the spec to compute the element's ID.
+    """
+    fig_dict = figure if isinstance(figure, dict) else figure.to_plotly_json()
+    # Like plotly.io.to_json, leave out trace UIDs.
+    for trace in fig_dict.get("data", []):
+        trace.pop("uid", None)
+
+    last_chart = None if position is None else _spec_cache.get_rendered_chart(position)
+    fingerprint = None
+    if last_chart is None or not last_chart.changed:
+        fingerprint = _compute_fingerprint(fig_dict)
+    if fingerprint is not None:
+        memoized = _spec_cache.get(fingerprint)
+        if memoized is not None:
+            spec, spec_hash = memoized
+            if position is not None:
+                _spec_cache.set_rendered_chart(
+                    position, _RenderedChart(spec_hash, changed=False)
+                )
+            return spec, spec_hash
+
+    spec = _to_json(fig_dict)
+    spec_hash = _hash_bytes(spec.encode("utf-8"))
+
+    changed = last_chart is not None and spec_hash != last_chart.spec_hash
+    if fingerprint is not None and not changed:
+        _spec_cache.set(fingerprint, spec, spec_hash)
+    if position is not None:
+        _spec_cache.set_rendered_chart(position, _RenderedChart(spec_hash, changed))
+    return spec, spec_hash
+
+
+def _to_json(fig_dict: dict[str, Any]) -> str:
+    import plotly
+    import plotly.io
+
+    if type_util.is_version_less_than(plotly.__version__, "6.0.0"):
+        # Plotly 6+ encodes numpy arrays as typed arrays on its own.
+        fig_dict = _encode_typed_arrays(fig_dict)
+    return plotly.io.to_json(fig_dict, validate=False)
+
+
+def _compute_fingerprint(fig_dict: dict[str, Any]) -> str | None:
+    """Return a hash of the figure's contents, or None if they can't be
+    hashed.
+
+    The figure is pickled with numpy arrays' buffers passed out-of-band, so
+    that they're hashed in place instead of being copied.
+    """
+    buffers: list[pickle.PickleBuffer] = []
+    try:
+        pickled = pickle.dumps(fig_dict, protocol=5, buffer_callback=buffers.append)
+    except Exception:
+        return None
+
+    # SHA-256 is hardware-accelerated on most CPUs, so it's faster than MD5
+    # for the megabytes of data in large figures.
+    h = hashlib.sha256(pickled)
+    for buffer in buffers:
+        h.update(buffer.raw())
+    return h.hexdigest()
+
+
+def _hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _encode_typed_arrays(value: Any) -> Any:
+    """Return value with numeric numpy arrays replaced by base64 typed array
+    specs, which Plotly.js 2.28+ decodes.
+
+    This is what Plotly 6+ does when serializing a figure.
+    """
+    import numpy as np
+
+    if isinstance(value, dict):
+        return {key: _encode_typed_arrays(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_typed_arrays(item) for item in value]
+    if not isinstance(value, np.ndarray) or value.size == 0:
+        return value
+
+    if value.dtype.kind in "iu" and value.dtype.itemsize == 8:
+        # Plotly.js doesn't support 64-bit integers: use the smallest integer
+        # type that holds all values, if there is one.
+        narrowed = _narrow_int64_array(value)
+        if narrowed is None:
+            return value
+        value = narrowed
+
+    dtype = _TYPED_ARRAY_DTYPES.get(value.dtype.name)
+    if dtype is None:
+        return value
+
+    # Typed arrays are little-endian and C-contiguous.
+    data = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+    typed_array: dict[str, Any] = {
+        "dtype": dtype,
+        "bdata": base64.b64encode(data).decode("ascii"),
+    }
+    if value.ndim > 1:
+        typed_array["shape"] = ", ".join(str(length) for length in value.shape)
+    return typed_array
+
+
+def _narrow_int64_array(value: Any) -> Any:
+    """Return a 64-bit integer array converted to the smallest 32, 16 or 8-bit
+    integer dtype that holds all of its values, or None if there is none.
+    """
+    import numpy as np
+
+    min_value, max_value = value.min(), value.max()
+    candidates = (
+        (np.uint8, np.uint16, np.uint32)
+        if value.dtype.kind == "u"
+        else (np.int8, np.int16, np.int32)
+    )
+    for dtype in candidates:
+        info = np.iinfo(dtype)
+        if info.min <= min_value and max_value <= info.max:
+            return value.astype(dtype)
+    return None
@@ -15,6 +15,14 @@
 from __future__ import annotations
 
 import contextlib
+import importlib.util
+import sys
+from importlib.abc import MetaPathFinder
+from typing import TYPE_CHECKING, Any, Sequence
+
+if TYPE_CHECKING:
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
 
 
 def configure_streamlit_plotly_theme() -> None:
@@ -205,3 +213,51 @@ def configure_streamlit_plotly_theme() -> None:
         )
 
         pio.templates.default = "streamlit"
+
+
+class _PlotlyThemeFinder(MetaPathFinder):
+    """Import hook that configures the Streamlit chart theme for Plotly right
+    after `plotly.io` is imported, and before any figure can be created.
+    """
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        if fullname != "plotly.io":
+            return None
+
+        # Remove ourselves first, so that we find the real spec below, and
+        # don't interfere with any later imports.
+        with contextlib.suppress(ValueError):
+            sys.meta_path.remove(self)
+
+        spec = importlib.util.find_spec(fullname)
+        if spec is None or spec.loader is None:
+            return spec
+
+        exec_module = spec.loader.exec_module
+
+        def exec_module_and_configure_theme(module: Any) -> None:
+            exec_module(module)
+            configure_streamlit_plotly_theme()
+
+        spec.loader.exec_module = exec_module_and_configure_theme  # type: ignore
+        return spec
+
+
+def configure_streamlit_plotly_theme_on_import() -> None:
+    """Configure the Streamlit chart theme for Plotly as soon as Plotly is
+    imported.
+
+    Importing Plotly takes a large share of Streamlit's import time, and most
+    apps don't use it. So rather than importing Plotly to configure the theme,
+    this configures it once `plotly.io` is imported, which happens before any
+    Plotly figure is created.
+    """
+    if "plotly.io" in sys.modules:
+        configure_streamlit_plotly_theme()
+    elif not any(isinstance(finder, _PlotlyThemeFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _PlotlyThemeFinder())
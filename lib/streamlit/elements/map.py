@@ -33,6 +33,7 @@ from streamlit.proto.DeckGlJsonChart_pb2 import DeckGlJsonChart as DeckGlJsonCha
 from streamlit.runtime.metrics_util import gather_metrics
 
 if TYPE_CHECKING:
+    from numpy import typing as npt
     from pandas import DataFrame
 
     from streamlit.dataframe_util import Data
@@ -237,12 +238,16 @@ class MapMixin:
         #
         map_style = None
         map_proto = DeckGlJsonChartProto()
-        deck_gl_json = to_deckgl_json(
+        deck_gl_json, layer_columns, binary_attributes = to_deckgl_json(
             data, latitude, longitude, size, color, map_style, zoom
         )
         marshall(
             map_proto, deck_gl_json, use_container_width, width=width, height=height
         )
+        if layer_columns:
+            deck_gl_json_chart.marshall_arrow_layer_data(
+                map_proto, 0, layer_columns, binary_attributes
+            )
         return self.dg._enqueue("deck_gl_json_chart", map_proto)
 
     @property
@@ -259,15 +264,24 @@ def to_deckgl_json(
     color: None | str | Collection[float],
     map_style: str | None,
     zoom: int | None,
-) -> str:
+) -> tuple[str, dict[str, npt.NDArray[Any]], dict[str, list[str]]]:
+    """Return the deck.gl JSON spec of the map, and the data of its scatterplot
+    layer.
+
+    The layer's data isn't part of the spec. It's returned as columns, and the
+    columns that make up each of the layer's binary attributes, so that it can
+    be sent as an Arrow table. Both are empty if there's no data to plot.
+    """
     if data is None:
-        return json.dumps(_DEFAULT_MAP)
+        return json.dumps(_DEFAULT_MAP), {}, {}
 
     # TODO(harahu): iterables don't have the empty attribute. This is either
     # a bug, or the documented data type is too broad. One or the other
     # should be addressed
     if hasattr(data, "empty") and data.empty:
-        return json.dumps(_DEFAULT_MAP)
+        return json.dumps(_DEFAULT_MAP), {}, {}
+
+    import numpy as np
 
     df = dataframe_util.convert_anything_to_pandas_df(data)
 
@@ -278,38 +292,42 @@ def to_deckgl_json(
     size_arg, size_col_name = _get_value_and_col_name(df, size, _DEFAULT_SIZE)
     color_arg, color_col_name = _get_value_and_col_name(df, color, _DEFAULT_COLOR)
 
-    # Drop columns we're not using.
-    # (Sort for tests)
-    used_columns = sorted(
-        [
-            c
-            for c in {lat_col_name, lon_col_name, size_col_name, color_col_name}
-            if c is not None
-        ]
-    )
-    df = df[used_columns]
+    columns: dict[str, npt.NDArray[Any]] = {
+        "lon": df[lon_col_name].to_numpy(dtype=np.float64),
+        "lat": df[lat_col_name].to_numpy(dtype=np.float64),
+    }
+    binary_attributes = {"getPosition": ["lon", "lat"]}
 
-    color_arg = _convert_color_arg_or_column(df, color_arg, color_col_name)
+    layer: dict[str, Any] = {
+        "@@type": "ScatterplotLayer",
+        "radiusMinPixels": 3,
+        "radiusUnits": "meters",
+    }
+
+    if size_col_name is None:
+        layer["getRadius"] = size_arg
+    else:
+        columns["size"] = df[size_col_name].to_numpy(dtype=np.float32)
+        binary_attributes["getRadius"] = ["size"]
+
+    if color_col_name is None:
+        layer["getFillColor"] = to_int_color_tuple(color_arg)
+    else:
+        colors = _convert_color_column(df, color_col_name)
+        color_components = ["r", "g", "b", "a"][: colors.shape[1]]
+        for i, component in enumerate(color_components):
+            columns[component] = colors[:, i]
+        binary_attributes["getFillColor"] = color_components
 
     zoom, center_lat, center_lon = _get_viewport_details(
-        df, lat_col_name, lon_col_name, zoom
+        columns["lat"], columns["lon"], zoom
     )
 
     default = copy.deepcopy(_DEFAULT_MAP)
     default["initialViewState"]["latitude"] = center_lat
     default["initialViewState"]["longitude"] = center_lon
     default["initialViewState"]["zoom"] = zoom
-    default["layers"] = [
-        {
-            "@@type": "ScatterplotLayer",
-            "getPosition": f"@@=[{lon_col_name}, {lat_col_name}]",
-            "getRadius": size_arg,
-            "radiusMinPixels": 3,
-            "radiusUnits": "meters",
-            "getFillColor": color_arg,
-            "data": df.to_dict("records"),
-        }
-    ]
+    default["layers"] = [layer]
 
     if map_style:
         if not config.get_option("mapbox.token"):
@@ -319,7 +337,7 @@ def to_deckgl_json(
             )
         default["mapStyle"] = map_style
 
-    return json.dumps(default)
+    return json.dumps(default), columns, binary_attributes
 
 
 def _get_lat_or_lon_col_name(
@@ -357,9 +375,9 @@ def _get_lat_or_lon_col_name(
     # IMPLEMENTATION NOTE: We can't use isnull().values.any() because .values can return
     # ExtensionArrays, which don't have a .any() method.
     # (Read about ExtensionArrays here: # https://pandas.pydata.org/community/blog/extension-arrays.html)
-    # However, after a performance test I found the solution below runs basically as
-    # fast as .values.any().
-    if any(data[col_name].isnull().array):
+    # Converting to a numpy bool array instead keeps the check vectorized, which
+    # matters for maps with millions of points.
+    if data[col_name].isnull().to_numpy(dtype=bool).any():
         raise StreamlitAPIException(
             f"Column {col_name} is not allowed to contain null values, such "
             "as NaN, NaT, or None."
@@ -400,53 +418,98 @@ def _get_value_and_col_name(
     return pydeck_arg, col_name
 
 
-def _convert_color_arg_or_column(
-    data: DataFrame,
-    color_arg: str | Color,
-    color_col_name: str | None,
-) -> None | str | IntColorTuple:
-    """Converts color to a format accepted by PyDeck.
-
-    For example:
-    - If color_arg is "#fff", then returns (255, 255, 255, 255).
-    - If color_col_name is "my_col_123", then it converts everything in column my_col_123 to
-      an accepted color format such as (0, 100, 200, 255).
+def _convert_color_column(data: DataFrame, color_col_name: str) -> npt.NDArray[Any]:
+    """Converts the colors in a column to an array of shape (rows, 3 or 4) of
+    color components from 0 to 255, which deck.gl accepts as a binary
+    attribute.
 
-    NOTE: This function mutates the data argument.
+    Instead of converting each row's color, this converts each distinct color
+    string once, and color tuples column by column, so that it stays fast for
+    millions of rows.
     """
+    import pandas as pd
 
-    color_arg_out: None | str | IntColorTuple = None
+    column = data[color_col_name]
+    if len(column) == 0 or not is_color_like(column.iat[0]):
+        raise StreamlitAPIException(
+            f'Column "{color_col_name}" does not appear to contain valid colors.'
+        )
 
-    if color_col_name is not None:
-        # Convert color column to the right format.
-        if len(data[color_col_name]) > 0 and is_color_like(data[color_col_name].iat[0]):
-            # Use .loc[] to avoid a SettingWithCopyWarning in some cases.
-            data.loc[:, color_col_name] = data.loc[:, color_col_name].map(
-                to_int_color_tuple
-            )
+    colors: npt.NDArray[Any] | None = None
+    if isinstance(column.iat[0], str):
+        try:
+            # Missing values get the code -1. (The keywords to factorize them
+            # too differ between the supported pandas versions.)
+            codes, unique_colors = pd.factorize(column)
+        except TypeError:
+            # The column also contains color tuples, which aren't hashable.
+            pass
         else:
-            raise StreamlitAPIException(
-                f'Column "{color_col_name}" does not appear to contain valid colors.'
-            )
+            if not (codes == -1).any():
+                palette = _to_rgba_array([to_int_color_tuple(c) for c in unique_colors])
+                colors = palette[codes]
+    else:
+        colors = _convert_color_tuples(column.to_list())
+
+    if colors is None:
+        # The colors have mixed formats or unusual component types: convert
+        # them one by one.
+        colors = _to_rgba_array([to_int_color_tuple(c) for c in column.to_list()])
+    return colors
 
-        # This is guaranteed to be a str because of _get_value_and_col_name
-        assert isinstance(color_arg, str)
-        color_arg_out = color_arg
 
-    elif color_arg is not None:
-        color_arg_out = to_int_color_tuple(color_arg)
+def _to_rgba_array(colors: list[IntColorTuple]) -> npt.NDArray[Any]:
+    """Convert a list of int color tuples to an array of shape (rows, 4)."""
+    import numpy as np
 
-    return color_arg_out
+    return np.array(
+        [color if len(color) == 4 else (*color, 255) for color in colors],
+        dtype=np.uint8,
+    ).reshape(-1, 4)
+
+
+def _convert_color_tuples(color_tuples: list[Any]) -> npt.NDArray[Any] | None:
+    """Vectorized version of to_int_color_tuple for a list of color tuples of
+    the same length.
+
+    Like to_int_color_tuple, float components are scaled from 0.0-1.0 to
+    0-255, and int components are kept as-is, and both are clipped to 0-255.
+
+    Returns None if the tuples can't be converted this way.
+    """
+    import numpy as np
+
+    try:
+        # Keep the components' Python types, which decide how they're scaled.
+        components = np.array(color_tuples, dtype=object)
+    except ValueError:
+        return None
+    if components.ndim != 2 or components.shape[1] not in (3, 4):
+        return None
+
+    colors = np.empty(components.shape, dtype=np.uint8)
+    for i in range(components.shape[1]):
+        component_types = set(map(type, components[:, i]))
+        if all(issubclass(t, float) for t in component_types):
+            values = components[:, i].astype(np.float64) * 255
+            # Like int(), truncate towards zero.
+            values = np.trunc(values)
+        elif all(issubclass(t, int) for t in component_types):
+            values = components[:, i].astype(np.float64)
+        else:
+            return None
+        colors[:, i] = np.clip(values, 0, 255)
+    return colors
 
 
 def _get_viewport_details(
-    data: DataFrame, lat_col_name: str, lon_col_name: str, zoom: int | None
+    lats: npt.NDArray[Any], lons: npt.NDArray[Any], zoom: int | None
 ) -> tuple[int, float, float]:
     """Auto-set viewport when not fully specified by user."""
-    min_lat = data[lat_col_name].min()
-    max_lat = data[lat_col_name].max()
-    min_lon = data[lon_col_name].min()
-    max_lon = data[lon_col_name].max()
+    min_lat = float(lats.min())
+    max_lat = float(lats.max())
+    min_lon = float(lons.min())
+    max_lon = float(lons.max())
     center_lat = (max_lat + min_lat) / 2.0
     center_lon = (max_lon + min_lon) / 2.0
     range_lon = abs(max_lon - min_lon)
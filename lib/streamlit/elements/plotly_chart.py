@@ -38,9 +38,10 @@ from streamlit import type_util
 from streamlit.deprecation_util import show_deprecation_warning
 from streamlit.elements.lib.event_utils import AttributeDictionary
 from streamlit.elements.lib.form_utils import current_form_id
+from streamlit.elements.lib.plotly_utils import figure_to_json
 from streamlit.elements.lib.policies import check_widget_policies
 from streamlit.elements.lib.streamlit_plotly_theme import (
-    configure_streamlit_plotly_theme,
+    configure_streamlit_plotly_theme_on_import,
 )
 from streamlit.elements.lib.utils import Key, compute_and_register_element_id, to_key
 from streamlit.errors import StreamlitAPIException
@@ -57,7 +58,7 @@ if TYPE_CHECKING:
     from streamlit.delta_generator import DeltaGenerator
 
 # We need to configure the Plotly theme before any Plotly figures are created:
-configure_streamlit_plotly_theme()
+configure_streamlit_plotly_theme_on_import()
 
 _AtomicFigureOrData: TypeAlias = Union[
     "go.Figure",
@@ -438,7 +439,6 @@ class PlotlyMixin:
            height: 550px
 
         """
-        import plotly.io
         import plotly.tools
 
         # NOTE: "figure_or_data" is the name used in Plotly's .plot() method
@@ -499,11 +499,14 @@ class PlotlyMixin:
         config.setdefault("showLink", kwargs.get("show_link", False))
         config.setdefault("linkText", kwargs.get("link_text", False))
 
-        plotly_chart_proto.spec = plotly.io.to_json(figure, validate=False)
-        plotly_chart_proto.config = json.dumps(config)
-
         ctx = get_script_run_ctx()
 
+        # Identifies the chart across reruns of the session.
+        session_id = ctx.session_id if ctx else ""
+        chart_position = f"{session_id}:{self.dg._get_delta_path_str()}"
+        plotly_chart_proto.spec, spec_hash = figure_to_json(figure, chart_position)
+        plotly_chart_proto.config = json.dumps(config)
+
         # We are computing the widget id for all plotly uses
         # to also allow non-widget Plotly charts to keep their state
         # when the frontend component gets unmounted and remounted.
@@ -511,7 +514,8 @@ class PlotlyMixin:
             "plotly_chart",
             user_key=key,
             form_id=plotly_chart_proto.form_id,
-            plotly_spec=plotly_chart_proto.spec,
+            # The spec's hash is cheaper to hash again than the spec.
+            plotly_spec=spec_hash,
             plotly_config=plotly_chart_proto.config,
             selection_mode=selection_mode,
             is_selection_activated=is_selection_activated,
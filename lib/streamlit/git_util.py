@@ -16,9 +16,15 @@ from __future__ import annotations
 
 import os
 import re
-from typing import Any
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Final
 
 from streamlit import util
+from streamlit.logger import get_logger
+
+_LOGGER: Final = get_logger(__name__)
 
 # Github has two URLs, one that is https and one that is ssh
 GITHUB_HTTP_URL = r"^https://(www\.)?github.com/(.+)/(.+)(?:.git)?$"
@@ -171,3 +177,145 @@ class GitRepo:
             return None
 
         return repo, branch, self.module
+
+
+@dataclass(frozen=True)
+class GitRepoInfo:
+    """The information about an app's git repo that's shown in the app."""
+
+    repository: str
+    branch: str
+    module: str
+    untracked_files: tuple[str, ...]
+    uncommitted_files: tuple[str, ...]
+    is_head_detached: bool
+    is_ahead_of_remote: bool
+
+
+# The files in a repo's git directory that change when a commit is made, the
+# checked out branch changes, or remote branches are fetched. The index isn't
+# watched, as git rewrites it when loading the repo info (`git diff` refreshes
+# it, even with GIT_OPTIONAL_LOCKS=0), which would invalidate the info right
+# away. Changes to the app's files invalidate the info instead, see
+# `GitRepoInfoCache.invalidate`.
+_WATCHED_GIT_FILES: Final = ("HEAD", "FETCH_HEAD", "logs/HEAD")
+
+
+class GitRepoInfoCache:
+    """Loads the GitRepoInfo of apps in a background thread, and keeps it until
+    files in the repo change.
+
+    Loading a repo's info runs several git commands, which can take hundreds of
+    milliseconds in a large working tree. This loads it once for all sessions
+    of an app, without blocking the caller.
+
+    A repo's info is kept until one of its watched git files (see
+    `_WATCHED_GIT_FILES`) changes, or `invalidate` is called, e.g. because one
+    of the app's source files changed. If files can't be watched (see
+    "server.fileWatcherType"), the info is loaded again for each request
+    that doesn't overlap with an ongoing load.
+
+    Thread-safe.
+    """
+
+    def __init__(
+        self,
+        load_repo_info: Callable[[GitRepo], GitRepoInfo | None] | None = None,
+    ) -> None:
+        self._load_repo_info = load_repo_info or _load_repo_info
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: dict[str, Future[GitRepoInfo | None]] = {}
+        # The git directories whose files are watched, and whether watching
+        # them succeeded.
+        self._watched_git_dirs: dict[str, bool] = {}
+
+    def get(self, path: str) -> Future[GitRepoInfo | None]:
+        """Return a Future that resolves to the GitRepoInfo of the repo that
+        contains the given path, or to None if it's not in a valid GitHub repo.
+        """
+        with self._lock:
+            future = self._futures.get(path)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="GitRepoInfo"
+                    )
+                future = Future()
+                self._futures[path] = future
+                self._executor.submit(self._load, path, future)
+            return future
+
+    def invalidate(self, _changed_path: str | None = None) -> None:
+        """Drop all cached repo info, so that it's loaded again when it's next
+        requested.
+        """
+        with self._lock:
+            self._futures.clear()
+
+    def _load(self, path: str, future: Future[GitRepoInfo | None]) -> None:
+        repo_info = None
+        is_watched = False
+        try:
+            repo = GitRepo(path)
+            if repo.is_valid():
+                is_watched = self._watch_git_dir(repo.repo.git_dir)
+            repo_info = self._load_repo_info(repo)
+        except Exception as ex:
+            # Users may never even install Git in the first place, so this
+            # error requires no action. It can be useful for debugging.
+            _LOGGER.debug("Obtaining Git information produced an error", exc_info=ex)
+
+        if not is_watched:
+            # Without watching the repo, we can't tell when the info becomes
+            # outdated, so it's not kept.
+            with self._lock:
+                if self._futures.get(path) is future:
+                    del self._futures[path]
+        future.set_result(repo_info)
+
+    def _watch_git_dir(self, git_dir: str) -> bool:
+        # Importing the watcher package is deferred, since it imports config.
+        from streamlit.watcher import path_watcher
+
+        with self._lock:
+            is_watched = self._watched_git_dirs.get(git_dir)
+            if is_watched is None:
+                is_watched = False
+                for filename in _WATCHED_GIT_FILES:
+                    file_path = os.path.join(git_dir, filename)
+                    if os.path.isfile(file_path):
+                        is_watched |= path_watcher.watch_file(
+                            file_path, self.invalidate
+                        )
+                self._watched_git_dirs[git_dir] = is_watched
+            return is_watched
+
+
+def _load_repo_info(repo: GitRepo) -> GitRepoInfo | None:
+    repo_info = repo.get_repo_info()
+    if repo_info is None:
+        return None
+
+    repository_name, branch, module = repo_info
+    if repository_name.endswith(".git"):
+        # Remove the .git extension from the repository name
+        repository_name = repository_name[:-4]
+
+    return GitRepoInfo(
+        repository=repository_name,
+        branch=branch,
+        module=module,
+        untracked_files=tuple(repo.untracked_files),
+        uncommitted_files=tuple(repo.uncommitted_files),
+        is_head_detached=repo.is_head_detached,
+        is_ahead_of_remote=len(repo.ahead_commits) > 0,
+    )
+
+
+_git_repo_info_cache: Final = GitRepoInfoCache()
+
+
+def get_git_repo_info_cache() -> GitRepoInfoCache:
+    """Return the process-wide GitRepoInfoCache."""
+    return _git_repo_info_cache
@@ -15,13 +15,17 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import sys
+import threading
+import time
 import uuid
 from enum import Enum
-from typing import TYPE_CHECKING, Callable, Final
+from typing import TYPE_CHECKING, Callable, Final, cast
 
 import streamlit.elements.exception as exception_utils
 from streamlit import config, runtime
+from streamlit.git_util import get_git_repo_info_cache
 from streamlit.logger import get_logger
 from streamlit.proto.ClientState_pb2 import ClientState
 from streamlit.proto.Common_pb2 import FileURLs, FileURLsRequest
@@ -34,10 +38,12 @@ from streamlit.proto.NewSession_pb2 import (
     UserInfo,
 )
 from streamlit.runtime import caching
+from streamlit.runtime.element_snapshot import ElementSnapshot
 from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
 from streamlit.runtime.fragment import FragmentStorage, MemoryFragmentStorage
 from streamlit.runtime.metrics_util import Installation
 from streamlit.runtime.pages_manager import PagesManager
+from streamlit.runtime.runtime_metrics import get_runtime_metrics
 from streamlit.runtime.scriptrunner import RerunData, ScriptRunner, ScriptRunnerEvent
 from streamlit.runtime.secrets import secrets_singleton
 from streamlit.string_util import to_snake_case
@@ -45,6 +51,7 @@ from streamlit.version import STREAMLIT_VERSION_STRING
 from streamlit.watcher import LocalSourcesWatcher
 
 if TYPE_CHECKING:
+    from streamlit.git_util import GitRepoInfo
     from streamlit.proto.BackMsg_pb2 import BackMsg
     from streamlit.proto.PagesChanged_pb2 import PagesChanged
     from streamlit.runtime.script_data import ScriptData
@@ -62,6 +69,17 @@ class AppSessionState(Enum):
     SHUTDOWN_REQUESTED = "SHUTDOWN_REQUESTED"
 
 
+# The maximum number of new_session templates that are kept. Apps using
+# st.navigation may show different pages to different users, so there may be
+# more than one template in use at a time.
+_MAX_NEW_SESSION_TEMPLATES: Final = 16
+
+# Serialized new_session templates, with the config version and the pages they
+# were built for, most recently used first. See _get_new_session_template.
+_new_session_templates: list[tuple[int, dict[PageHash, PageInfo], bytes]] = []
+_new_session_templates_lock = threading.Lock()
+
+
 def _generate_scriptrun_id() -> str:
     """Randomly generate a unique ID for a script execution."""
     return str(uuid.uuid4())
@@ -158,21 +176,55 @@ class AppSession:
         self._scriptrunner: ScriptRunner | None = None
 
         # This needs to be lazily imported to avoid a dependency cycle.
-        from streamlit.runtime.state import SessionState
+        from streamlit.runtime.state import ClientWidgetStates, SessionState
 
         self._session_state = SessionState()
+        self._client_widget_states = ClientWidgetStates()
         self._user_info = user_info
 
         self._debug_last_backmsg_id: str | None = None
 
         self._fragment_storage: FragmentStorage = MemoryFragmentStorage()
 
+        # The elements that the session's client displays, so that the Runtime
+        # doesn't send them again when a script run produces the same ones.
+        self._element_snapshot = ElementSnapshot()
+
+        # Timestamps (from time.monotonic) used to record the rerun timing
+        # metrics. See streamlit.runtime.runtime_metrics.
+        self._metrics = get_runtime_metrics()
+        # When the last rerun request that hasn't started a script run yet
+        # was received.
+        self._rerun_requested_at: float | None = None
+        # When the rerun request of the current script run was received, until
+        # the run's first delta is enqueued.
+        self._first_delta_requested_at: float | None = None
+        # When the current script run started.
+        self._script_started_at: float | None = None
+
         _LOGGER.debug("AppSession initialized (id=%s)", self.id)
 
     def __del__(self) -> None:
         """Ensure that we call shutdown() when an AppSession is garbage collected."""
         self.shutdown()
 
+    def make_restorer(self) -> Callable[[], AppSession]:
+        """Return a callable that creates a new AppSession with the same ID and
+        parameters as this one.
+
+        This allows restoring a session after it's been shut down, without
+        keeping the session itself in memory.
+        """
+        return functools.partial(
+            AppSession,
+            script_data=self._script_data,
+            uploaded_file_manager=self._uploaded_file_mgr,
+            script_cache=self._script_cache,
+            message_enqueued_callback=self._message_enqueued_callback,
+            user_info=self._user_info,
+            session_id_override=self.id,
+        )
+
     def register_file_watchers(self) -> None:
         """Register handlers to be called when various files are changed.
 
@@ -285,6 +337,7 @@ class AppSession:
             msg_type = msg.WhichOneof("type")
 
             if msg_type == "rerun_script":
+                self._rerun_requested_at = time.monotonic()
                 if msg.debug_last_backmsg_id:
                     self._debug_last_backmsg_id = msg.debug_last_backmsg_id
 
@@ -400,6 +453,43 @@ class AppSession:
         if self._scriptrunner is not None:
             self._scriptrunner.request_stop()
 
+    def renders_fragment(self, fragment_id: str) -> bool:
+        """True if the session's latest script run rendered the given fragment."""
+        return self._fragment_storage.contains(fragment_id)
+
+    def handle_shared_fragment_run(self, fragment_id: str, msgs: list[bytes]) -> None:
+        """Send the result of a shared fragment's run to the browser, as if the
+        session had run the fragment itself.
+
+        Parameters
+        ----------
+        fragment_id : str
+            The ID of the shared fragment.
+        msgs : list[bytes]
+            The serialized ForwardMsgs that the fragment's run enqueued.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        if self._state != AppSessionState.APP_NOT_RUNNING:
+            # Don't interleave the result with a running script's messages.
+            # The session will get the next run's result instead.
+            return
+
+        self._enqueue_forward_msg(
+            self._create_new_session_message(
+                self._client_state.page_script_hash, [fragment_id]
+            )
+        )
+        for serialized_msg in msgs:
+            self._enqueue_forward_msg(ForwardMsg.FromString(serialized_msg))
+        self._enqueue_forward_msg(
+            self._create_script_finished_message(
+                ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY
+            )
+        )
+
     def _create_scriptrunner(self, initial_rerun_data: RerunData) -> None:
         """Create and run a new ScriptRunner with the given RerunData."""
         self._scriptrunner = ScriptRunner(
@@ -420,6 +510,10 @@ class AppSession:
     def session_state(self) -> SessionState:
         return self._session_state
 
+    @property
+    def element_snapshot(self) -> ElementSnapshot:
+        return self._element_snapshot
+
     def _should_rerun_on_file_change(self, filepath: str) -> bool:
         pages = self._pages_manager.get_pages()
 
@@ -439,6 +533,8 @@ class AppSession:
         appropriate.
         """
         self._script_cache.clear()
+        # A changed source file is likely a new uncommitted file.
+        get_git_repo_info_cache().invalidate()
 
         if filepath is not None and not self._should_rerun_on_file_change(filepath):
             return
@@ -462,7 +558,7 @@ class AppSession:
 
     def _on_pages_changed(self, _) -> None:
         msg = ForwardMsg()
-        self._populate_app_pages(msg.pages_changed, self._pages_manager.get_pages())
+        _populate_app_pages(msg.pages_changed, self._pages_manager.get_pages())
         self._enqueue_forward_msg(msg)
 
         if self._local_sources_watcher is not None:
@@ -569,6 +665,8 @@ class AppSession:
 
         prev_state = self._state
 
+        self._record_run_metrics(event, forward_msg)
+
         if event == ScriptRunnerEvent.SCRIPT_STARTED:
             if self._state != AppSessionState.SHUTDOWN_REQUESTED:
                 self._state = AppSessionState.APP_IS_RUNNING
@@ -667,6 +765,44 @@ class AppSession:
         if app_is_running != app_was_running:
             self._enqueue_forward_msg(self._create_session_status_changed_message())
 
+    def _record_run_metrics(
+        self, event: ScriptRunnerEvent, forward_msg: ForwardMsg | None
+    ) -> None:
+        """Record the timing metrics of script runs.
+
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        if event == ScriptRunnerEvent.ENQUEUE_FORWARD_MSG:
+            if (
+                self._first_delta_requested_at is not None
+                and forward_msg is not None
+                and forward_msg.HasField("delta")
+            ):
+                self._metrics.first_delta.observe(
+                    time.monotonic() - self._first_delta_requested_at
+                )
+                self._first_delta_requested_at = None
+            return
+
+        now = time.monotonic()
+        if event == ScriptRunnerEvent.SCRIPT_STARTED:
+            if self._rerun_requested_at is not None:
+                self._metrics.script_queue_wait.observe(now - self._rerun_requested_at)
+            self._first_delta_requested_at = self._rerun_requested_at
+            self._rerun_requested_at = None
+            self._script_started_at = now
+
+        elif event in (
+            ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+            ScriptRunnerEvent.SCRIPT_STOPPED_WITH_COMPILE_ERROR,
+            ScriptRunnerEvent.SCRIPT_STOPPED_FOR_RERUN,
+            ScriptRunnerEvent.FRAGMENT_STOPPED_WITH_SUCCESS,
+        ):
+            if self._script_started_at is not None:
+                self._metrics.script_exec.observe(now - self._script_started_at)
+            self._script_started_at = None
+            self._first_delta_requested_at = None
+
     def _create_session_status_changed_message(self) -> ForwardMsg:
         """Create and return a session_status_changed ForwardMsg."""
         msg = ForwardMsg()
@@ -691,6 +827,12 @@ class AppSession:
         """Create and return a new_session ForwardMsg."""
         msg = ForwardMsg()
 
+        # The pages, config, theme and environment info are the same for all
+        # sessions, so they're copied from a shared template.
+        msg.new_session.ParseFromString(
+            _get_new_session_template(pages or self._pages_manager.get_pages())
+        )
+
         msg.new_session.script_run_id = _generate_scriptrun_id()
         msg.new_session.name = self._script_data.name
         msg.new_session.main_script_path = self._pages_manager.main_script_path
@@ -700,23 +842,12 @@ class AppSession:
         if fragment_ids_this_run:
             msg.new_session.fragment_ids_this_run.extend(fragment_ids_this_run)
 
-        self._populate_app_pages(
-            msg.new_session, pages or self._pages_manager.get_pages()
-        )
-        _populate_config_msg(msg.new_session.config)
-        _populate_theme_msg(msg.new_session.custom_theme)
-
         # Immutable session data. We send this every time a new session is
         # started, to avoid having to track whether the client has already
         # received it. It does not change from run to run; it's up to the
         # to perform one-time initialization only once.
         imsg = msg.new_session.initialize
 
-        _populate_user_info_msg(imsg.user_info)
-
-        imsg.environment_info.streamlit_version = STREAMLIT_VERSION_STRING
-        imsg.environment_info.python_version = ".".join(map(str, sys.version_info))
-
         imsg.session_status.run_on_save = self._run_on_save
         imsg.session_status.script_is_running = (
             self._state == AppSessionState.APP_IS_RUNNING
@@ -742,42 +873,34 @@ class AppSession:
         return msg
 
     def _handle_git_information_request(self) -> None:
-        msg = ForwardMsg()
-
-        try:
-            from streamlit.git_util import GitRepo
-
-            repo = GitRepo(self._script_data.main_script_path)
-
-            repo_info = repo.get_repo_info()
-            if repo_info is None:
-                return
-
-            repository_name, branch, module = repo_info
-
-            if repository_name.endswith(".git"):
-                # Remove the .git extension from the repository name
-                repository_name = repository_name[:-4]
-
-            msg.git_info_changed.repository = repository_name
-            msg.git_info_changed.branch = branch
-            msg.git_info_changed.module = module
+        # Git info is loaded in a background thread, and shared by all
+        # sessions of the app.
+        future = get_git_repo_info_cache().get(self._script_data.main_script_path)
+        future.add_done_callback(
+            lambda f: self._event_loop.call_soon_threadsafe(
+                self._on_git_information_loaded, f.result()
+            )
+        )
 
-            msg.git_info_changed.untracked_files[:] = repo.untracked_files
-            msg.git_info_changed.uncommitted_files[:] = repo.uncommitted_files
+    def _on_git_information_loaded(self, repo_info: GitRepoInfo | None) -> None:
+        if repo_info is None or self._state == AppSessionState.SHUTDOWN_REQUESTED:
+            return
 
-            if repo.is_head_detached:
-                msg.git_info_changed.state = GitInfo.GitStates.HEAD_DETACHED
-            elif len(repo.ahead_commits) > 0:
-                msg.git_info_changed.state = GitInfo.GitStates.AHEAD_OF_REMOTE
-            else:
-                msg.git_info_changed.state = GitInfo.GitStates.DEFAULT
+        msg = ForwardMsg()
+        msg.git_info_changed.repository = repo_info.repository
+        msg.git_info_changed.branch = repo_info.branch
+        msg.git_info_changed.module = repo_info.module
+        msg.git_info_changed.untracked_files[:] = repo_info.untracked_files
+        msg.git_info_changed.uncommitted_files[:] = repo_info.uncommitted_files
+
+        if repo_info.is_head_detached:
+            msg.git_info_changed.state = GitInfo.GitStates.HEAD_DETACHED
+        elif repo_info.is_ahead_of_remote:
+            msg.git_info_changed.state = GitInfo.GitStates.AHEAD_OF_REMOTE
+        else:
+            msg.git_info_changed.state = GitInfo.GitStates.DEFAULT
 
-            self._enqueue_forward_msg(msg)
-        except Exception as ex:
-            # Users may never even install Git in the first place, so this
-            # error requires no action. It can be useful for debugging.
-            _LOGGER.debug("Obtaining Git information produced an error", exc_info=ex)
+        self._enqueue_forward_msg(msg)
 
     def _handle_rerun_script_request(
         self, client_state: ClientState | None = None
@@ -791,6 +914,21 @@ class AppSession:
             to use previous client state.
 
         """
+        if client_state is not None:
+            if client_state.resend_elements:
+                # The client is missing an element that we reported as
+                # unchanged, so it needs every element in full.
+                self._element_snapshot.clear()
+
+            # Resolve widget state deltas into the browser's complete widget
+            # states.
+            resolved_client_state = self._client_widget_states.resolve(client_state)
+            if resolved_client_state is None:
+                msg = ForwardMsg()
+                msg.resend_widget_states = True
+                self._enqueue_forward_msg(msg)
+                return
+            client_state = resolved_client_state
         self.request_rerun(client_state)
 
     def _handle_stop_script_request(self) -> None:
@@ -852,16 +990,59 @@ class AppSession:
 
         self._enqueue_forward_msg(msg)
 
-    def _populate_app_pages(
-        self, msg: NewSession | PagesChanged, pages: dict[PageHash, PageInfo]
-    ) -> None:
-        for page_script_hash, page_info in pages.items():
-            page_proto = msg.app_pages.add()
 
-            page_proto.page_script_hash = page_script_hash
-            page_proto.page_name = page_info["page_name"].replace("_", " ")
-            page_proto.url_pathname = page_info["page_name"]
-            page_proto.icon = page_info["icon"]
+def _populate_app_pages(
+    msg: NewSession | PagesChanged, pages: dict[PageHash, PageInfo]
+) -> None:
+    for page_script_hash, page_info in pages.items():
+        page_proto = msg.app_pages.add()
+
+        page_proto.page_script_hash = page_script_hash
+        page_proto.page_name = page_info["page_name"].replace("_", " ")
+        page_proto.url_pathname = page_info["page_name"]
+        page_proto.icon = page_info["icon"]
+
+
+def _get_new_session_template(pages: dict[PageHash, PageInfo]) -> bytes:
+    """Return a serialized NewSession message with the fields of new_session
+    messages that are the same for all sessions that have the given pages.
+
+    Templates are cached by config version and pages, since building them
+    takes a while for apps with many pages. Pages are compared by value, since
+    apps using st.navigation pass a new dict on every script run. Note that
+    all other fields of the NewSession message must be unset in the template,
+    so that they can be set after parsing it.
+    """
+    config_version = config.get_config_version()
+    with _new_session_templates_lock:
+        for i, (template_config_version, template_pages, template) in enumerate(
+            _new_session_templates
+        ):
+            if template_config_version == config_version and template_pages == pages:
+                if i > 0:
+                    _new_session_templates.insert(0, _new_session_templates.pop(i))
+                return template
+
+    new_session = NewSession()
+    _populate_app_pages(new_session, pages)
+    _populate_config_msg(new_session.config)
+    _populate_theme_msg(new_session.custom_theme)
+
+    imsg = new_session.initialize
+    _populate_user_info_msg(imsg.user_info)
+    imsg.environment_info.streamlit_version = STREAMLIT_VERSION_STRING
+    imsg.environment_info.python_version = ".".join(map(str, sys.version_info))
+
+    template = new_session.SerializeToString()
+    # Copy the pages, since the caller may change them later.
+    pages_snapshot = {
+        page_script_hash: cast("PageInfo", dict(page_info))
+        for page_script_hash, page_info in pages.items()
+    }
+    with _new_session_templates_lock:
+        _new_session_templates.insert(0, (config_version, pages_snapshot, template))
+        del _new_session_templates[_MAX_NEW_SESSION_TEMPLATES:]
+    return template
 
 
 # Config.ToolbarMode.ValueType does not exist at runtime (only in the pyi stubs), so
@@ -893,6 +1074,7 @@ def _populate_config_msg(msg: Config) -> None:
     if config.get_option("client.showSidebarNavigation") is False:
         msg.hide_sidebar_nav = True
     msg.toolbar_mode = _get_toolbar_mode()
+    msg.enable_widget_state_deltas = config.get_option("server.enableWidgetStateDeltas")
 
 
 def _populate_theme_msg(msg: CustomThemeConfig) -> None:
@@ -37,6 +37,7 @@ import streamlit as st
 from streamlit import runtime
 from streamlit.errors import StreamlitAPIException
 from streamlit.logger import get_logger
+from streamlit.runtime.caching import cache_utils
 from streamlit.runtime.caching.cache_errors import CacheError, CacheKeyNotFoundError
 from streamlit.runtime.caching.cache_type import CacheType
 from streamlit.runtime.caching.cache_utils import (
@@ -79,6 +80,24 @@ CACHE_DATA_MESSAGE_REPLAY_CTX = CachedMessageReplayContext(CacheType.DATA)
 # The cache persistence options we support: "disk" or None
 CachePersistType: TypeAlias = Union[Literal["disk"], None]
 
+# What happens to an entry once it's older than its ttl: "expire" removes it,
+# "background" keeps serving it while it's recomputed in the background.
+CacheRefreshType: TypeAlias = Literal["expire", "background"]
+
+
+def _get_ttl_seconds(
+    ttl: float | timedelta | str | None,
+    refresh: CacheRefreshType,
+    max_age: float | timedelta | str | None,
+) -> tuple[float | None, float | None]:
+    """Return the number of seconds after which entries are removed from the
+    cache storage, and after which they're refreshed in the background.
+    """
+    ttl_seconds = time_to_seconds(ttl, coerce_none_to_inf=False)
+    if refresh == "background":
+        return time_to_seconds(max_age, coerce_none_to_inf=False), ttl_seconds
+    return ttl_seconds, None
+
 
 class CachedDataFuncInfo(CachedFuncInfo):
     """Implements the CachedFuncInfo interface for @st.cache_data"""
@@ -91,6 +110,8 @@ class CachedDataFuncInfo(CachedFuncInfo):
         max_entries: int | None,
         ttl: float | timedelta | str | None,
         hash_funcs: HashFuncsDict | None = None,
+        refresh: CacheRefreshType = "expire",
+        max_age: float | timedelta | str | None = None,
     ):
         super().__init__(
             func,
@@ -100,6 +121,8 @@ class CachedDataFuncInfo(CachedFuncInfo):
         self.persist = persist
         self.max_entries = max_entries
         self.ttl = ttl
+        self.refresh = refresh
+        self.max_age = max_age
 
         self.validate_params()
 
@@ -123,6 +146,8 @@ class CachedDataFuncInfo(CachedFuncInfo):
             max_entries=self.max_entries,
             ttl=self.ttl,
             display_name=self.display_name,
+            refresh=self.refresh,
+            max_age=self.max_age,
         )
 
     def validate_params(self) -> None:
@@ -137,6 +162,8 @@ class CachedDataFuncInfo(CachedFuncInfo):
             persist=self.persist,
             max_entries=self.max_entries,
             ttl=self.ttl,
+            refresh=self.refresh,
+            max_age=self.max_age,
         )
 
 
@@ -144,6 +171,9 @@ class DataCaches(CacheStatsProvider):
     """Manages all DataCache instances"""
 
     def __init__(self):
+        # _function_caches is copy-on-write: it's only ever replaced (while
+        # holding _caches_lock), never mutated, so readers can use it without
+        # taking the lock.
         self._caches_lock = threading.Lock()
         self._function_caches: dict[str, DataCache] = {}
 
@@ -154,26 +184,36 @@ class DataCaches(CacheStatsProvider):
         max_entries: int | None,
         ttl: int | float | timedelta | str | None,
         display_name: str,
+        refresh: CacheRefreshType = "expire",
+        max_age: int | float | timedelta | str | None = None,
     ) -> DataCache:
         """Return the mem cache for the given key.
 
         If it doesn't exist, create a new one with the given params.
         """
 
-        ttl_seconds = time_to_seconds(ttl, coerce_none_to_inf=False)
+        ttl_seconds, stale_after_seconds = _get_ttl_seconds(ttl, refresh, max_age)
 
         # Get the existing cache, if it exists, and validate that its params
-        # haven't changed.
+        # haven't changed. This is the hot path of every cached function call,
+        # so we first try it without taking the lock.
+        cache = self._get_matching_cache(
+            key, persist, max_entries, ttl_seconds, stale_after_seconds
+        )
+        if cache is not None:
+            return cache
+
         with self._caches_lock:
-            cache = self._function_caches.get(key)
-            if (
-                cache is not None
-                and cache.ttl_seconds == ttl_seconds
-                and cache.max_entries == max_entries
-                and cache.persist == persist
-            ):
+            # Another thread may have created the cache while we were waiting
+            # for the lock.
+            cache = self._get_matching_cache(
+                key, persist, max_entries, ttl_seconds, stale_after_seconds
+            )
+            if cache is not None:
                 return cache
 
+            cache = self._function_caches.get(key)
+
             # Close the existing cache's storage, if it exists.
             if cache is not None:
                 _LOGGER.debug(
@@ -213,9 +253,30 @@ class DataCaches(CacheStatsProvider):
                 max_entries=max_entries,
                 ttl_seconds=ttl_seconds,
                 display_name=display_name,
+                stale_after_seconds=stale_after_seconds,
             )
-            self._function_caches[key] = cache
+            self._function_caches = {**self._function_caches, key: cache}
+            return cache
+
+    def _get_matching_cache(
+        self,
+        key: str,
+        persist: CachePersistType,
+        max_entries: int | None,
+        ttl_seconds: float | None,
+        stale_after_seconds: float | None,
+    ) -> DataCache | None:
+        """Return the existing cache for the given key if its params match."""
+        cache = self._function_caches.get(key)
+        if (
+            cache is not None
+            and cache.ttl_seconds == ttl_seconds
+            and cache.stale_after_seconds == stale_after_seconds
+            and cache.max_entries == max_entries
+            and cache.persist == persist
+        ):
             return cache
+        return None
 
     def clear_all(self) -> None:
         """Clear all in-memory and on-disk caches."""
@@ -233,10 +294,9 @@ class DataCaches(CacheStatsProvider):
             self._function_caches = {}
 
     def get_stats(self) -> list[CacheStat]:
-        with self._caches_lock:
-            # Shallow-clone our caches. We don't want to hold the global
-            # lock during stats-gathering.
-            function_caches = self._function_caches.copy()
+        # _function_caches is never mutated, so we don't need to hold the
+        # lock (or clone it) during stats-gathering.
+        function_caches = self._function_caches
 
         stats: list[CacheStat] = []
         for cache in function_caches.values():
@@ -249,6 +309,8 @@ class DataCaches(CacheStatsProvider):
         persist: CachePersistType,
         max_entries: int | None,
         ttl: int | float | timedelta | str | None,
+        refresh: CacheRefreshType = "expire",
+        max_age: int | float | timedelta | str | None = None,
     ) -> None:
         """Validate that the cache params are valid for given storage.
 
@@ -259,7 +321,7 @@ class DataCaches(CacheStatsProvider):
             CacheStorageContext.
         """
 
-        ttl_seconds = time_to_seconds(ttl, coerce_none_to_inf=False)
+        ttl_seconds, _ = _get_ttl_seconds(ttl, refresh, max_age)
 
         cache_context = self.create_cache_storage_context(
             function_key="DUMMY_KEY",
@@ -353,6 +415,8 @@ class CacheDataAPI:
         persist: CachePersistType | bool = None,
         experimental_allow_widgets: bool = False,
         hash_funcs: HashFuncsDict | None = None,
+        refresh: CacheRefreshType = "expire",
+        max_age: float | timedelta | str | None = None,
     ) -> Callable[[F], F]: ...
 
     def __call__(
@@ -365,6 +429,8 @@ class CacheDataAPI:
         persist: CachePersistType | bool = None,
         experimental_allow_widgets: bool = False,
         hash_funcs: HashFuncsDict | None = None,
+        refresh: CacheRefreshType = "expire",
+        max_age: float | timedelta | str | None = None,
     ):
         return self._decorator(
             func,
@@ -374,6 +440,8 @@ class CacheDataAPI:
             show_spinner=show_spinner,
             experimental_allow_widgets=experimental_allow_widgets,
             hash_funcs=hash_funcs,
+            refresh=refresh,
+            max_age=max_age,
         )
 
     def _decorator(
@@ -386,6 +454,8 @@ class CacheDataAPI:
         persist: CachePersistType | bool,
         experimental_allow_widgets: bool,
         hash_funcs: HashFuncsDict | None = None,
+        refresh: CacheRefreshType = "expire",
+        max_age: float | timedelta | str | None = None,
     ):
         """Decorator to cache functions that return data (e.g. dataframe transforms, database queries, ML inference).
 
@@ -411,6 +481,12 @@ class CacheDataAPI:
         func : callable
             The function to cache. Streamlit hashes the function's source code.
 
+            ``async def`` functions are awaited on an event loop that's shared
+            by all sessions. Calls that miss the cache while a value is being
+            computed share that computation. In async code (e.g. another async
+            cached function), the decorated function returns an awaitable.
+            Streamlit commands called by async functions aren't displayed.
+
         ttl : float, timedelta, str, or None
             The maximum time to keep an entry in the cache. Can be one of:
 
@@ -423,7 +499,8 @@ class CacheDataAPI:
               <https://docs.python.org/3/library/datetime.html#timedelta-objects>`_,
               e.g. ``timedelta(days=1)``.
 
-            Note that ``ttl`` will be ignored if ``persist="disk"`` or ``persist=True``.
+            If ``persist="disk"`` or ``persist=True``, the ``ttl`` also
+            applies to the values persisted on disk.
 
         max_entries : int or None
             The maximum number of entries to keep in the cache, or None
@@ -440,6 +517,10 @@ class CacheDataAPI:
             will persist the cached data to the local disk. None (or False) will disable
             persistence. The default is None.
 
+            Persisted data is stored in a single database in the ``.streamlit/cache``
+            folder, which respects ``ttl`` and ``max_entries``. Its total size can
+            be limited with the ``server.maxPersistedCacheSize`` config option.
+
         experimental_allow_widgets : bool
             Allow widgets to be used in the cached function. Defaults to False.
 
@@ -451,6 +532,19 @@ class CacheDataAPI:
             the provided function to generate a hash for it. See below for an example
             of how this can be used.
 
+        refresh : "expire" or "background"
+            What happens to an entry once it's older than ``ttl``. If
+            ``"expire"`` (default), the entry is removed, and the next call
+            recomputes it. If ``"background"``, the next call still returns
+            the stale entry, and the entry is recomputed on a background
+            thread and replaced once it's ready. Requires ``ttl``.
+
+        max_age : float, timedelta, str, or None
+            With ``refresh="background"``, the maximum time to keep an entry in
+            the cache, even if it couldn't be refreshed. Accepts the same
+            formats as ``ttl``, and must be at least ``ttl``. If ``None``
+            (default), stale entries are served until they are refreshed.
+
         .. deprecated::
             The cached widget replay functionality was removed in 1.38. Please
             remove the ``experimental_allow_widgets`` parameter from your
@@ -486,6 +580,17 @@ class CacheDataAPI:
         ...     # Fetch data from URL here, and then clean it up.
         ...     return data
 
+        To never make users wait for data that's refreshed every 10 minutes,
+        but never show data that's more than an hour old, refresh the data in
+        the background:
+
+        >>> import streamlit as st
+        >>>
+        >>> @st.cache_data(ttl="10m", refresh="background", max_age="1h")
+        ... def fetch_and_clean_data(url):
+        ...     # Fetch data from URL here, and then clean it up.
+        ...     return data
+
         By default, all parameters to a cached function must be hashable.
         Any parameter whose name begins with ``_`` will not be hashed. You can use
         this as an "escape hatch" for parameters that are not hashable:
@@ -561,6 +666,29 @@ class CacheDataAPI:
                 f"Unsupported persist option '{persist}'. Valid values are 'disk' or None."
             )
 
+        if refresh not in ("expire", "background"):
+            raise StreamlitAPIException(
+                f"Unsupported refresh option '{refresh}'. Valid values are "
+                "'expire' or 'background'."
+            )
+
+        if refresh == "background":
+            ttl_seconds = time_to_seconds(ttl, coerce_none_to_inf=False)
+            if ttl_seconds is None:
+                raise StreamlitAPIException(
+                    "`refresh='background'` requires a `ttl`, after which entries "
+                    "are refreshed."
+                )
+            max_age_seconds = time_to_seconds(max_age, coerce_none_to_inf=False)
+            if max_age_seconds is not None and max_age_seconds < ttl_seconds:
+                raise StreamlitAPIException(
+                    "`max_age` must be greater than or equal to `ttl`."
+                )
+        elif max_age is not None:
+            raise StreamlitAPIException(
+                "`max_age` is only supported with `refresh='background'`."
+            )
+
         if experimental_allow_widgets:
             show_widget_replay_deprecation("cache_data")
 
@@ -573,6 +701,8 @@ class CacheDataAPI:
                     max_entries=max_entries,
                     ttl=ttl,
                     hash_funcs=hash_funcs,
+                    refresh=refresh,
+                    max_age=max_age,
                 )
             )
 
@@ -587,6 +717,8 @@ class CacheDataAPI:
                 max_entries=max_entries,
                 ttl=ttl,
                 hash_funcs=hash_funcs,
+                refresh=refresh,
+                max_age=max_age,
             )
         )
 
@@ -607,12 +739,14 @@ class DataCache(Cache):
         max_entries: int | None,
         ttl_seconds: float | None,
         display_name: str,
+        stale_after_seconds: float | None = None,
     ):
         super().__init__()
         self.key = key
         self.display_name = display_name
         self.storage = storage
         self.ttl_seconds = ttl_seconds
+        self.stale_after_seconds = stale_after_seconds
         self.max_entries = max_entries
         self.persist = persist
 
@@ -644,6 +778,13 @@ class DataCache(Cache):
         except pickle.UnpicklingError as exc:
             raise CacheError(f"Failed to unpickle {key}") from exc
 
+    def is_stale(self, result: CachedResult) -> bool:
+        return (
+            self.stale_after_seconds is not None
+            and cache_utils.RESULT_WRITTEN_AT_TIMER() - result.written_at
+            >= self.stale_after_seconds
+        )
+
     @gather_metrics("_cache_data_object")
     def write_result(self, key: str, value: Any, messages: list[MsgData]) -> None:
         """Write a value and associated messages to the cache.
@@ -652,7 +793,13 @@ class DataCache(Cache):
         try:
             main_id = st._main.id
             sidebar_id = st.sidebar.id
-            entry = CachedResult(value, messages, main_id, sidebar_id)
+            entry = CachedResult(
+                value,
+                messages,
+                main_id,
+                sidebar_id,
+                written_at=cache_utils.RESULT_WRITTEN_AT_TIMER(),
+            )
             pickled_entry = pickle.dumps(entry)
         except (pickle.PicklingError, TypeError) as exc:
             raise CacheError(f"Failed to pickle {key}") from exc
@@ -21,17 +21,16 @@ import threading
 import types
 from typing import TYPE_CHECKING, Any, Callable, Final, TypeVar, cast, overload
 
-from cachetools import TTLCache
 from typing_extensions import TypeAlias
 
 import streamlit as st
 from streamlit.logger import get_logger
-from streamlit.runtime.caching import cache_utils
 from streamlit.runtime.caching.cache_errors import CacheKeyNotFoundError
 from streamlit.runtime.caching.cache_type import CacheType
 from streamlit.runtime.caching.cache_utils import (
     Cache,
     CachedFuncInfo,
+    MemCache,
     make_cached_func_wrapper,
 )
 from streamlit.runtime.caching.cached_message_replay import (
@@ -70,6 +69,9 @@ class ResourceCaches(CacheStatsProvider):
     """Manages all ResourceCache instances"""
 
     def __init__(self):
+        # _function_caches is copy-on-write: it's only ever replaced (while
+        # holding _caches_lock), never mutated, so readers can use it without
+        # taking the lock.
         self._caches_lock = threading.Lock()
         self._function_caches: dict[str, ResourceCache] = {}
 
@@ -91,15 +93,17 @@ class ResourceCaches(CacheStatsProvider):
         ttl_seconds = time_to_seconds(ttl)
 
         # Get the existing cache, if it exists, and validate that its params
-        # haven't changed.
+        # haven't changed. This is the hot path of every cached function call,
+        # so we first try it without taking the lock.
+        cache = self._get_matching_cache(key, max_entries, ttl_seconds, validate)
+        if cache is not None:
+            return cache
+
         with self._caches_lock:
-            cache = self._function_caches.get(key)
-            if (
-                cache is not None
-                and cache.ttl_seconds == ttl_seconds
-                and cache.max_entries == max_entries
-                and _equal_validate_funcs(cache.validate, validate)
-            ):
+            # Another thread may have created the cache while we were waiting
+            # for the lock.
+            cache = self._get_matching_cache(key, max_entries, ttl_seconds, validate)
+            if cache is not None:
                 return cache
 
             # Create a new cache object and put it in our dict
@@ -111,19 +115,36 @@ class ResourceCaches(CacheStatsProvider):
                 ttl_seconds=ttl_seconds,
                 validate=validate,
             )
-            self._function_caches[key] = cache
+            self._function_caches = {**self._function_caches, key: cache}
             return cache
 
+    def _get_matching_cache(
+        self,
+        key: str,
+        max_entries: int | float,
+        ttl_seconds: float,
+        validate: ValidateFunc | None,
+    ) -> ResourceCache | None:
+        """Return the existing cache for the given key if its params match."""
+        cache = self._function_caches.get(key)
+        if (
+            cache is not None
+            and cache.ttl_seconds == ttl_seconds
+            and cache.max_entries == max_entries
+            and _equal_validate_funcs(cache.validate, validate)
+        ):
+            return cache
+        return None
+
     def clear_all(self) -> None:
         """Clear all resource caches."""
         with self._caches_lock:
             self._function_caches = {}
 
     def get_stats(self) -> list[CacheStat]:
-        with self._caches_lock:
-            # Shallow-clone our caches. We don't want to hold the global
-            # lock during stats-gathering.
-            function_caches = self._function_caches.copy()
+        # _function_caches is never mutated, so we don't need to hold the
+        # lock (or clone it) during stats-gathering.
+        function_caches = self._function_caches
 
         stats: list[CacheStat] = []
         for cache in function_caches.values():
@@ -282,6 +303,12 @@ class CacheResourceAPI:
             The function that creates the cached resource. Streamlit hashes the
             function's source code.
 
+            ``async def`` functions are awaited on an event loop that's shared
+            by all sessions. Calls that miss the cache while a value is being
+            computed share that computation. In async code (e.g. another async
+            cached function), the decorated function returns an awaitable.
+            Streamlit commands called by async functions aren't displayed.
+
         ttl : float, timedelta, str, or None
             The maximum time to keep an entry in the cache. Can be one of:
 
@@ -459,10 +486,9 @@ class ResourceCache(Cache):
         super().__init__()
         self.key = key
         self.display_name = display_name
-        self._mem_cache: TTLCache[str, CachedResult] = TTLCache(
-            maxsize=max_entries, ttl=ttl_seconds, timer=cache_utils.TTLCACHE_TIMER
+        self._mem_cache: MemCache[CachedResult] = MemCache(
+            maxsize=max_entries, ttl=ttl_seconds
         )
-        self._mem_cache_lock = threading.Lock()
         self.validate = validate
 
     @property
@@ -477,19 +503,19 @@ class ResourceCache(Cache):
         """Read a value and associated messages from the cache.
         Raise `CacheKeyNotFoundError` if the value doesn't exist.
         """
-        with self._mem_cache_lock:
-            if key not in self._mem_cache:
-                # key does not exist in cache.
-                raise CacheKeyNotFoundError()
-
-            result = self._mem_cache[key]
+        try:
+            result = self._mem_cache.get(key)
+        except KeyError:
+            # key does not exist in cache.
+            raise CacheKeyNotFoundError()
 
-            if self.validate is not None and not self.validate(result.value):
-                # Validate failed: delete the entry and raise an error.
-                del self._mem_cache[key]
-                raise CacheKeyNotFoundError()
+        if self.validate is not None and not self.validate(result.value):
+            # Validate failed: delete the entry (unless another thread has
+            # already replaced it) and raise an error.
+            self._mem_cache.pop(key, expected=result)
+            raise CacheKeyNotFoundError()
 
-            return result
+        return result
 
     @gather_metrics("_cache_resource_object")
     def write_result(self, key: str, value: Any, messages: list[MsgData]) -> None:
@@ -497,22 +523,19 @@ class ResourceCache(Cache):
         main_id = st._main.id
         sidebar_id = st.sidebar.id
 
-        with self._mem_cache_lock:
-            self._mem_cache[key] = CachedResult(value, messages, main_id, sidebar_id)
+        self._mem_cache.set(key, CachedResult(value, messages, main_id, sidebar_id))
 
     def _clear(self, key: str | None = None) -> None:
-        with self._mem_cache_lock:
-            if key is None:
-                self._mem_cache.clear()
-            elif key in self._mem_cache:
-                del self._mem_cache[key]
+        if key is None:
+            self._mem_cache.clear()
+        else:
+            self._mem_cache.pop(key)
 
     def get_stats(self) -> list[CacheStat]:
         # Shallow clone our cache. Computing item sizes is potentially
         # expensive, and we want to minimize the time we spend holding
         # the lock.
-        with self._mem_cache_lock:
-            cache_entries = list(self._mem_cache.values())
+        cache_entries = self._mem_cache.values()
 
         # Lazy-load vendored package to prevent import of numpy
         from streamlit.vendor.pympler.asizeof import asizeof
@@ -16,15 +16,32 @@
 
 from __future__ import annotations
 
+import asyncio
+import collections
 import contextlib
+import dataclasses
 import functools
 import hashlib
 import inspect
 import threading
 import time
+import weakref
 from abc import abstractmethod
-from collections import defaultdict
-from typing import TYPE_CHECKING, Any, Callable, Final
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Final,
+    Generic,
+    Iterator,
+    TypeVar,
+)
+
+from cachetools import Cache as _CachetoolsCache
+from cachetools import TTLCache
 
 from streamlit import type_util
 from streamlit.dataframe_util import is_unevaluated_data_object
@@ -45,16 +62,27 @@ from streamlit.runtime.caching.cached_message_replay import (
     MsgData,
     replay_cached_messages,
 )
-from streamlit.runtime.caching.hashing import HashFuncsDict, update_hash
+from streamlit.runtime.caching.hashing import (
+    HashFuncsDict,
+    hash_to_bytes,
+    normalize_hash_funcs,
+    update_hash,
+)
 from streamlit.runtime.scriptrunner_utils.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME,
+    add_script_run_ctx,
+    get_script_run_ctx,
     in_cached_function,
 )
 from streamlit.util import HASHLIB_KWARGS
 
 if TYPE_CHECKING:
-    from types import FunctionType
+    from types import CodeType, FunctionType
 
     from streamlit.runtime.caching.cache_type import CacheType
+    from streamlit.runtime.scriptrunner_utils.script_run_context import (
+        ScriptRunContext,
+    )
 
 _LOGGER: Final = get_logger(__name__)
 
@@ -62,6 +90,103 @@ _LOGGER: Final = get_logger(__name__)
 # is exposed here as a constant so that it can be patched in unit tests.
 TTLCACHE_TIMER = time.monotonic
 
+# The timer function we use to record when cached results were written, to
+# tell whether they're stale. Unlike TTLCACHE_TIMER, this is wall-clock time,
+# as results persisted to disk outlive the process and the machine's uptime.
+RESULT_WRITTEN_AT_TIMER = time.time
+
+# The maximum number of lock-free cache hits that MemCache remembers in order
+# to update its LRU order on the next write.
+_MAX_PENDING_HITS: Final = 1024
+
+_V = TypeVar("_V")
+
+
+class MemCache(Generic[_V]):
+    """A thread-safe TTL and LRU in-memory cache whose reads don't take a lock.
+
+    Cache hits are the hot path of every cached function call, and a single
+    lock per cache would serialize all script threads reading from the same
+    function. So only writes hold the lock. Reads rely on the atomicity of
+    the underlying dict lookups and never mutate the cache.
+
+    Since cachetools.TTLCache updates its LRU order on reads, lock-free hits
+    are instead recorded in a bounded buffer that is applied to the LRU order
+    before the next write. Entries are only ever evicted during writes, so
+    eviction order is the same as if every hit had taken the lock (as long as
+    fewer than _MAX_PENDING_HITS hits happen between two writes).
+    """
+
+    def __init__(self, maxsize: float, ttl: float):
+        self._cache: TTLCache[str, _V] = TTLCache(
+            maxsize=maxsize, ttl=ttl, timer=TTLCACHE_TIMER
+        )
+        self._lock = threading.Lock()
+        self._pending_hits: deque[str] = deque(maxlen=_MAX_PENDING_HITS)
+
+    @property
+    def maxsize(self) -> float:
+        return self._cache.maxsize
+
+    @property
+    def ttl(self) -> float:
+        return self._cache.ttl
+
+    def get(self, key: str) -> _V:
+        """Return the value for key without taking the lock.
+
+        Raises
+        ------
+        KeyError
+            Raised if key is not in the cache, or its entry has expired.
+        """
+        # TTLCache.__contains__ checks expiration without updating the LRU
+        # order. Cache.__getitem__ then reads the value without touching
+        # TTLCache's bookkeeping. If a concurrent write removes the entry in
+        # between, it raises a KeyError, which is a cache miss for us too.
+        if key not in self._cache:
+            raise KeyError(key)
+        value = _CachetoolsCache.__getitem__(self._cache, key)
+        self._pending_hits.append(key)
+        return value
+
+    def set(self, key: str, value: _V) -> None:
+        with self._lock:
+            self._apply_pending_hits()
+            self._cache[key] = value
+
+    def pop(self, key: str, expected: Any = None) -> None:
+        """Remove key from the cache.
+
+        If `expected` is passed, the entry is only removed if it still holds
+        that value (i.e. it was not overwritten by a concurrent write).
+        """
+        with self._lock:
+            if expected is not None and self._cache.get(key) is not expected:
+                return
+            self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending_hits.clear()
+            self._cache.clear()
+
+    def values(self) -> list[_V]:
+        """Return a snapshot of the cache's values."""
+        with self._lock:
+            return list(self._cache.values())
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _apply_pending_hits(self) -> None:
+        """Move entries hit since the last write to the most recently used
+        position. Must be called with the lock held."""
+        while self._pending_hits:
+            # TTLCache.__getitem__ updates the LRU order (and doesn't return
+            # anything for expired entries).
+            self._cache.get(self._pending_hits.popleft())
+
 
 class Cache:
     """Function cache interface. Caches persist across script runs."""
@@ -69,6 +194,9 @@ class Cache:
     def __init__(self):
         self._value_locks: dict[str, threading.Lock] = defaultdict(threading.Lock)
         self._value_locks_lock = threading.Lock()
+        # The futures of the values of async functions that are being computed.
+        # Guarded by _value_locks_lock.
+        self._computations: dict[str, Future[Any]] = {}
 
     @abstractmethod
     def read_result(self, value_key: str) -> CachedResult:
@@ -82,6 +210,12 @@ class Cache:
         """
         raise NotImplementedError
 
+    def is_stale(self, result: CachedResult) -> bool:
+        """Return True if the result should still be served, but recomputed in
+        the background.
+        """
+        return False
+
     @abstractmethod
     def write_result(self, value_key: str, value: Any, messages: list[MsgData]) -> None:
         """Write a value and associated messages to the cache, overwriting any existing
@@ -98,9 +232,41 @@ class Cache:
         only one of those sessions computes the value, and the others block until
         the value is computed.
         """
+        # Fast path: locks for values that are already being computed (or have
+        # been computed before) can be retrieved without synchronization.
+        lock = self._value_locks.get(value_key)
+        if lock is not None:
+            return lock
+
         with self._value_locks_lock:
             return self._value_locks[value_key]
 
+    def get_or_start_computation(
+        self, value_key: str, start: Callable[[], Future[Any]]
+    ) -> tuple[Future[Any], bool]:
+        """Return the future of the value's computation, calling `start` to
+        start the computation unless it's already in flight.
+
+        This is the async counterpart of `compute_value_lock`: instead of
+        blocking on a lock, all callers that miss the cache while the value is
+        being computed share the future of a single computation. The second
+        item of the returned tuple is True if `start` was called.
+        """
+        with self._value_locks_lock:
+            future = self._computations.get(value_key)
+            if future is not None:
+                return future, False
+            future = start()
+            self._computations[value_key] = future
+
+        def discard(done_future: Future[Any]) -> None:
+            with self._value_locks_lock:
+                if self._computations.get(value_key) is done_future:
+                    del self._computations[value_key]
+
+        future.add_done_callback(discard)
+        return future, True
+
     def clear(self, key: str | None = None):
         """Clear values from this cache.
         If no argument is passed, all items are cleared from the cache.
@@ -108,8 +274,10 @@ class Cache:
         with self._value_locks_lock:
             if not key:
                 self._value_locks.clear()
-            elif key in self._value_locks:
-                del self._value_locks[key]
+                self._computations.clear()
+            else:
+                self._value_locks.pop(key, None)
+                self._computations.pop(key, None)
         self._clear(key=key)
 
     @abstractmethod
@@ -156,7 +324,8 @@ def make_cached_func_wrapper(info: CachedFuncInfo) -> Callable[..., Any]:
     value otherwise.
 
     The wrapper also has a `clear` function that can be called to clear
-    some or all of the wrapper's cached values.
+    some or all of the wrapper's cached values, and a `submit` function that
+    computes a value concurrently with the script.
     """
     cached_func = CachedFunc(info)
     return functools.update_wrapper(cached_func, info.func)
@@ -173,6 +342,9 @@ class BoundCachedFunc:
     def __call__(self, *args, **kwargs) -> Any:
         return self._cached_func(self._instance, *args, **kwargs)
 
+    def submit(self, *args, **kwargs) -> CachedFuncFuture:
+        return self._cached_func.submit(self._instance, *args, **kwargs)
+
     def __repr__(self):
         return f"<BoundCachedFunc: {self._cached_func._info.func} of {self._instance}>"
 
@@ -190,7 +362,10 @@ class BoundCachedFunc:
 class CachedFunc:
     def __init__(self, info: CachedFuncInfo):
         self._info = info
-        self._function_key = _make_function_key(info.cache_type, info.func)
+        self._hashing_plan = _hashing_plans.get_plan(info.cache_type, info.func)
+        self._function_key = self._hashing_plan.function_key
+        self._hash_funcs = normalize_hash_funcs(info.hash_funcs)
+        self._is_async = inspect.iscoroutinefunction(info.func)
 
     def __repr__(self):
         return f"<CachedFunc: {self._info.func}>"
@@ -205,17 +380,120 @@ class CachedFunc:
     def __call__(self, *args, **kwargs) -> Any:
         """The wrapper. We'll only call our underlying function on a cache miss."""
 
-        spinner_message: str | None = None
+        spinner_message = self._get_spinner_message(args, kwargs)
+
+        if self._is_async and _is_event_loop_running():
+            # Async code (e.g. another async cached function) awaits the value
+            # instead of blocking its event loop.
+            return self._get_or_create_cached_value_async(args, kwargs)
+        return self._get_or_create_cached_value(args, kwargs, spinner_message)
+
+    def _get_spinner_message(
+        self, func_args: tuple[Any, ...], func_kwargs: dict[str, Any]
+    ) -> str | None:
         if isinstance(self._info.show_spinner, str):
-            spinner_message = self._info.show_spinner
-        elif self._info.show_spinner is True:
+            return self._info.show_spinner
+        if self._info.show_spinner is True:
             name = self._info.func.__qualname__
-            if len(args) == 0 and len(kwargs) == 0:
-                spinner_message = f"Running `{name}()`."
+            if len(func_args) == 0 and len(func_kwargs) == 0:
+                return f"Running `{name}()`."
+            return f"Running `{name}(...)`."
+        return None
+
+    def submit(self, *args, **kwargs) -> CachedFuncFuture:
+        """Start computing the cached function's value for the given arguments
+        concurrently with the script, and return a future of the value.
+
+        On a cache miss, the function is called on a bounded pool of worker
+        threads that's shared by all sessions. Call the future's ``result()``
+        method to wait for the value, and display the elements that the
+        function created. To run several independent cached functions
+        concurrently, submit all of them before waiting for their results.
+
+        Parameters
+        ----------
+
+        *args: Any
+            Arguments of the cached functions.
+
+        **kwargs: Any
+            Keyword arguments of the cached function.
+
+        Returns
+        -------
+        CachedFuncFuture
+            The future of the value. Its elements are displayed where
+            ``result()`` is called, like when calling the function there.
+
+        Example
+        -------
+        >>> import streamlit as st
+        >>>
+        >>> @st.cache_data
+        >>> def load_table(name):
+        >>>     return run_query(f"SELECT * FROM {name}")
+        >>>
+        >>> orders = load_table.submit("orders")
+        >>> customers = load_table.submit("customers")
+        >>>
+        >>> st.dataframe(orders.result())
+        >>> st.dataframe(customers.result())
+
+        """
+        cache = self._info.get_function_cache(self._function_key)
+        # The value key is computed on the calling thread, so that unhashable
+        # arguments are reported where the function is submitted.
+        value_key = _make_value_key(
+            cache_type=self._info.cache_type,
+            func=self._info.func,
+            func_args=args,
+            func_kwargs=kwargs,
+            hash_funcs=self._hash_funcs,
+            hashing_plan=self._hashing_plan,
+        )
+
+        future: Future[Any] | None
+        try:
+            cache.read_result(value_key)
+            future = Future()
+            future.set_result(None)
+        except CacheKeyNotFoundError:
+            if self._is_async:
+                future, _ = self._get_or_start_async_computation(
+                    cache, value_key, args, kwargs
+                )
+            elif in_cached_function.get():
+                # Waiting on the pool from a function that may be running on
+                # the pool could exhaust it, so nested functions compute the
+                # value when its result is read, like a regular call.
+                future = None
             else:
-                spinner_message = f"Running `{name}(...)`."
+                future = _cached_call_executor.submit(
+                    self._compute_submitted_value,
+                    cache,
+                    value_key,
+                    args,
+                    kwargs,
+                    get_script_run_ctx(),
+                )
+        return CachedFuncFuture(self, cache, value_key, args, kwargs, future)
 
-        return self._get_or_create_cached_value(args, kwargs, spinner_message)
+    def _compute_submitted_value(
+        self,
+        cache: Cache,
+        value_key: str,
+        func_args: tuple[Any, ...],
+        func_kwargs: dict[str, Any],
+        ctx: ScriptRunContext | None,
+    ) -> None:
+        """Compute a submitted value on a worker thread, and write it to the
+        cache along with the messages to replay.
+        """
+        # Elements are recorded for replay with a detached copy of the script
+        # run's context; they're displayed when the script reads the result.
+        detached_ctx = _detach_script_run_ctx(ctx) if ctx is not None else None
+        with _attached_script_run_ctx(detached_ctx):
+            self._handle_cache_miss(cache, value_key, func_args, func_kwargs)
 
     def _get_or_create_cached_value(
         self,
@@ -235,11 +513,14 @@ class CachedFunc:
             func=self._info.func,
             func_args=func_args,
             func_kwargs=func_kwargs,
-            hash_funcs=self._info.hash_funcs,
+            hash_funcs=self._hash_funcs,
+            hashing_plan=self._hashing_plan,
         )
 
         with contextlib.suppress(CacheKeyNotFoundError):
             cached_result = cache.read_result(value_key)
+            if cache.is_stale(cached_result):
+                self._refresh_in_background(cache, value_key, func_args, func_kwargs)
             return self._handle_cache_hit(cached_result)
 
         # only show spinner if there is a message to show and always only for the
@@ -259,6 +540,31 @@ class CachedFunc:
         with spinner_or_no_context:
             return self._handle_cache_miss(cache, value_key, func_args, func_kwargs)
 
+    async def _get_or_create_cached_value_async(
+        self, func_args: tuple[Any, ...], func_kwargs: dict[str, Any]
+    ) -> Any:
+        cache = self._info.get_function_cache(self._function_key)
+        value_key = _make_value_key(
+            cache_type=self._info.cache_type,
+            func=self._info.func,
+            func_args=func_args,
+            func_kwargs=func_kwargs,
+            hash_funcs=self._hash_funcs,
+            hashing_plan=self._hashing_plan,
+        )
+
+        with contextlib.suppress(CacheKeyNotFoundError):
+            cached_result = cache.read_result(value_key)
+            if cache.is_stale(cached_result):
+                self._refresh_in_background(cache, value_key, func_args, func_kwargs)
+            return self._handle_cache_hit(cached_result)
+
+        future, is_computing_caller = self._get_or_start_async_computation(
+            cache, value_key, func_args, func_kwargs
+        )
+        value = await asyncio.wrap_future(future)
+        return self._get_computed_value(cache, value_key, value, is_computing_caller)
+
     def _handle_cache_hit(self, result: CachedResult) -> Any:
         """Handle a cache hit: replay the result's cached messages, and return its
         value."""
@@ -297,6 +603,17 @@ class CachedFunc:
         #   This means that the happy path ("cache entry exists") is a wee bit faster because
         #   no lock is acquired. But the unhappy path ("cache entry needs to be recomputed") is
         #   a wee bit slower, because we do two lookups for the entry.
+        #
+        # - Async functions don't take the lock. Their values are computed on the
+        #   shared event loop, and callers wait for the computation's future instead.
+
+        if self._is_async:
+            future, is_computing_caller = self._get_or_start_async_computation(
+                cache, value_key, func_args, func_kwargs
+            )
+            return self._get_computed_value(
+                cache, value_key, future.result(), is_computing_caller
+            )
 
         with cache.compute_value_lock(value_key):
             # We've acquired the lock - but another thread may have acquired it first
@@ -320,29 +637,128 @@ class CachedFunc:
             # We've computed our value, and now we need to write it back to the cache
             # along with any "replay messages" that were generated during value computation.
             messages = self._info.cached_message_replay_ctx._most_recent_messages
-            try:
-                cache.write_result(value_key, computed_value, messages)
-                return computed_value
-            except (CacheError, RuntimeError) as ex:
-                # An exception was thrown while we tried to write to the cache. Report
-                # it to the user. (We catch `RuntimeError` here because it will be
-                # raised by Apache Spark if we do not collect dataframe before
-                # using `st.cache_data`.)
-                if is_unevaluated_data_object(computed_value):
-                    # If the returned value is an unevaluated dataframe, raise an error.
-                    # Unevaluated dataframes are not yet in the local memory, which also
-                    # means they cannot be properly cached (serialized).
-                    raise UnevaluatedDataFrameError(
-                        f"The function {get_cached_func_name_md(self._info.func)} is "
-                        "decorated with `st.cache_data` but it returns an unevaluated "
-                        f"data object of type `{type_util.get_fqn_type(computed_value)}`. "
-                        "Please convert the object to a serializable format "
-                        "(e.g. Pandas DataFrame) before returning it, so "
-                        "`st.cache_data` can serialize and cache it."
-                    ) from ex
-                raise UnserializableReturnValueError(
-                    return_value=computed_value, func=self._info.func
+            self._write_result(cache, value_key, computed_value, messages)
+            return computed_value
+
+    def _write_result(
+        self,
+        cache: Cache,
+        value_key: str,
+        computed_value: Any,
+        messages: list[MsgData],
+    ) -> None:
+        try:
+            cache.write_result(value_key, computed_value, messages)
+        except (CacheError, RuntimeError) as ex:
+            # An exception was thrown while we tried to write to the cache. Report
+            # it to the user. (We catch `RuntimeError` here because it will be
+            # raised by Apache Spark if we do not collect dataframe before
+            # using `st.cache_data`.)
+            if is_unevaluated_data_object(computed_value):
+                # If the returned value is an unevaluated dataframe, raise an error.
+                # Unevaluated dataframes are not yet in the local memory, which also
+                # means they cannot be properly cached (serialized).
+                raise UnevaluatedDataFrameError(
+                    f"The function {get_cached_func_name_md(self._info.func)} is "
+                    "decorated with `st.cache_data` but it returns an unevaluated "
+                    f"data object of type `{type_util.get_fqn_type(computed_value)}`. "
+                    "Please convert the object to a serializable format "
+                    "(e.g. Pandas DataFrame) before returning it, so "
+                    "`st.cache_data` can serialize and cache it."
+                ) from ex
+            raise UnserializableReturnValueError(
+                return_value=computed_value, func=self._info.func
+            )
+
+    def _get_or_start_async_computation(
+        self,
+        cache: Cache,
+        value_key: str,
+        func_args: tuple[Any, ...],
+        func_kwargs: dict[str, Any],
+        check_cache: bool = True,
+    ) -> tuple[Future[Any], bool]:
+        """Return the future of the value's computation on the shared event
+        loop, and whether this call started it.
+
+        All callers that miss the cache while the value is being computed, in
+        any session, share a single computation.
+        """
+
+        async def compute() -> Any:
+            if check_cache:
+                # The value may have been computed since we missed the cache.
+                with contextlib.suppress(CacheKeyNotFoundError):
+                    return cache.read_result(value_key).value
+            computed_value = await self._info.func(*func_args, **func_kwargs)
+            # Writing the result may serialize (and persist) a large value, so
+            # it's done off the event loop. It's written before the future
+            # resolves, so that callers that arrive afterwards hit the cache.
+            await asyncio.to_thread(
+                self._write_result, cache, value_key, computed_value, []
+            )
+            return computed_value
+
+        return cache.get_or_start_computation(
+            value_key, lambda: _async_compute_loop.submit(compute())
+        )
+
+    def _get_computed_value(
+        self, cache: Cache, value_key: str, value: Any, is_computing_caller: bool
+    ) -> Any:
+        """Return the value of a finished async computation to one of its
+        callers.
+        """
+        if not is_computing_caller:
+            # Like the callers that wait for the compute_value_lock of a sync
+            # function, the other callers read the value from the cache, so that
+            # e.g. st.cache_data returns a copy to each of them.
+            with contextlib.suppress(CacheKeyNotFoundError):
+                return self._handle_cache_hit(cache.read_result(value_key))
+        return value
+
+    def _refresh_in_background(
+        self,
+        cache: Cache,
+        value_key: str,
+        func_args: tuple[Any, ...],
+        func_kwargs: dict[str, Any],
+    ) -> None:
+        """Recompute a stale value on the background refresh thread, and swap
+        it into the cache once it's computed.
+
+        The stale value (and its messages) keep being served in the meantime.
+        """
+        ctx = get_script_run_ctx()
+        detached_ctx = _detach_script_run_ctx(ctx) if ctx is not None else None
+
+        def refresh() -> None:
+            if self._is_async:
+                # Share the computation with callers that miss the cache
+                # meanwhile, like they'd share the compute_value_lock.
+                future, _ = self._get_or_start_async_computation(
+                    cache, value_key, func_args, func_kwargs, check_cache=False
                 )
+                future.result()
+                return
+
+            # Hold the compute_value_lock, so that a caller that missed the
+            # cache (because the entry reached its max age meanwhile) waits for
+            # our value instead of computing it again.
+            with _attached_script_run_ctx(detached_ctx), cache.compute_value_lock(
+                value_key
+            ):
+                with self._info.cached_message_replay_ctx.calling_cached_function(
+                    self._info.func
+                ):
+                    computed_value = self._info.func(*func_args, **func_kwargs)
+                messages = self._info.cached_message_replay_ctx._most_recent_messages
+                # The value and its messages are written as a single entry, so
+                # readers see either the stale result or the new one, never a
+                # mix of both.
+                cache.write_result(value_key, computed_value, messages)
+
+        _background_refresher.submit(cache, value_key, refresh)
 
     def clear(self, *args, **kwargs):
         """Clear the cached function's associated cache.
@@ -388,38 +804,267 @@ class CachedFunc:
                 func=self._info.func,
                 func_args=args,
                 func_kwargs=kwargs,
-                hash_funcs=self._info.hash_funcs,
+                hash_funcs=self._hash_funcs,
+                hashing_plan=self._hashing_plan,
             )
         else:
             key = None
         cache.clear(key=key)
 
 
+class _BackgroundRefresher:
+    """Runs the recomputation of stale cache entries on a single worker thread.
+
+    Each entry is refreshed at most once at a time: stale hits for an entry
+    that's already queued or being refreshed don't queue another refresh.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: set[tuple[Cache, str]] = set()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def submit(
+        self, cache: Cache, value_key: str, refresh: Callable[[], None]
+    ) -> Future[None] | None:
+        """Queue a refresh of the given entry, unless one is already pending.
+
+        Returns the refresh's future, or None if it wasn't queued.
+        """
+        with self._lock:
+            if (cache, value_key) in self._pending:
+                return None
+            self._pending.add((cache, value_key))
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="CacheRefresh"
+                )
+            return self._executor.submit(self._run, cache, value_key, refresh)
+
+    def _run(self, cache: Cache, value_key: str, refresh: Callable[[], None]) -> None:
+        try:
+            refresh()
+        except Exception:
+            # The stale entry is kept, and the refresh is retried on the next
+            # stale hit.
+            _LOGGER.warning(
+                "Failed to refresh cached value %s in the background",
+                value_key,
+                exc_info=True,
+            )
+        finally:
+            with self._lock:
+                self._pending.discard((cache, value_key))
+
+
+_background_refresher = _BackgroundRefresher()
+
+
+class CachedFuncFuture:
+    """The future of a value of a cached function, returned by its ``submit``
+    method.
+    """
+
+    def __init__(
+        self,
+        cached_func: CachedFunc,
+        cache: Cache,
+        value_key: str,
+        func_args: tuple[Any, ...],
+        func_kwargs: dict[str, Any],
+        future: Future[Any] | None,
+    ):
+        self._cached_func = cached_func
+        self._cache = cache
+        self._value_key = value_key
+        self._func_args = func_args
+        self._func_kwargs = func_kwargs
+        self._future = future
+
+    def __repr__(self):
+        return f"<CachedFuncFuture: {self._cached_func._info.func}>"
+
+    def done(self) -> bool:
+        """Return True if the value has been computed (or the computation
+        raised an exception).
+        """
+        return self._future is not None and self._future.done()
+
+    def result(self) -> Any:
+        """Wait for the value, display the elements that the cached function
+        created, and return the value.
+
+        If the function raised an exception, it's raised here.
+        """
+        if self._future is None:
+            return self._cached_func._get_or_create_cached_value(
+                self._func_args, self._func_kwargs
+            )
+
+        if not self._future.done():
+            spinner_message = self._cached_func._get_spinner_message(
+                self._func_args, self._func_kwargs
+            )
+            spinner_or_no_context = (
+                spinner(spinner_message, _cache=True)
+                if spinner_message is not None and not in_cached_function.get()
+                else contextlib.nullcontext()
+            )
+            with spinner_or_no_context:
+                self._future.result()
+        else:
+            self._future.result()
+
+        with contextlib.suppress(CacheKeyNotFoundError):
+            cached_result = self._cache.read_result(self._value_key)
+            if self._cache.is_stale(cached_result):
+                self._cached_func._refresh_in_background(
+                    self._cache, self._value_key, self._func_args, self._func_kwargs
+                )
+            return self._cached_func._handle_cache_hit(cached_result)
+
+        # The value was evicted (or cleared) since it was computed, so it's
+        # computed again, like on a cache miss of a regular call.
+        return self._cached_func._get_or_create_cached_value(
+            self._func_args, self._func_kwargs
+        )
+
+
+# The maximum number of submitted values that are computed at the same time,
+# across all sessions.
+_MAX_CACHED_CALL_WORKERS: Final = 16
+
+
+class _CachedCallExecutor:
+    """Computes the values submitted with CachedFunc.submit on a bounded pool
+    of worker threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def submit(self, fn: Callable[..., None], *args: Any) -> Future[None]:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=_MAX_CACHED_CALL_WORKERS,
+                    thread_name_prefix="CachedCall",
+                )
+            return self._executor.submit(fn, *args)
+
+
+_cached_call_executor = _CachedCallExecutor()
+
+
+class _AsyncComputeLoop:
+    """Runs the computations of async cached functions on an event loop that's
+    shared by all sessions.
+
+    The loop is started on a daemon thread when the first computation is
+    submitted, and runs for the lifetime of the process, like the caches.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future[Any]:
+        """Schedule the coroutine on the loop, and return its future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="CacheAsyncLoop", daemon=True
+                ).start()
+                self._loop = loop
+            return self._loop
+
+
+_async_compute_loop = _AsyncComputeLoop()
+
+
+def _is_event_loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _detach_script_run_ctx(ctx: ScriptRunContext) -> ScriptRunContext:
+    """Return a copy of ctx to run a cached function with outside of its script
+    run.
+
+    Elements created with the copy are recorded for replay like in the script
+    run, but they aren't sent to the session, and they don't affect the script
+    run's cursors and widget bookkeeping.
+    """
+    return dataclasses.replace(
+        ctx,
+        _enqueue=lambda msg: None,
+        tracked_commands=[],
+        tracked_commands_counter=collections.Counter(),
+        widget_ids_this_run=set(),
+        widget_user_keys_this_run=set(),
+        form_ids_this_run=set(),
+        cursors={},
+        script_requests=None,
+        current_fragment_id=None,
+        fragment_ids_this_run=None,
+        new_fragment_ids=set(),
+    )
+
+
+@contextlib.contextmanager
+def _attached_script_run_ctx(ctx: ScriptRunContext | None) -> Iterator[None]:
+    """Attach ctx to the current thread for the duration of the block."""
+    thread = threading.current_thread()
+    if ctx is not None:
+        add_script_run_ctx(thread, ctx)
+    try:
+        yield
+    finally:
+        if hasattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME):
+            delattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME)
+
+
 def _make_value_key(
     cache_type: CacheType,
     func: FunctionType,
     func_args: tuple[Any, ...],
     func_kwargs: dict[str, Any],
     hash_funcs: HashFuncsDict | None,
+    hashing_plan: _HashingPlan | None = None,
 ) -> str:
     """Create the key for a value within a cache.
 
     This key is generated from the function's arguments. All arguments
     will be hashed, except for those named with a leading "_".
 
+    If no hashing_plan is passed, the function's plan is looked up (or
+    created) in the process-wide plan registry.
+
     Raises
     ------
     StreamlitAPIException
         Raised (with a nicely-formatted explanation message) if we encounter
         an un-hashable arg.
     """
+    if hashing_plan is None:
+        hashing_plan = _hashing_plans.get_plan(cache_type, func)
 
     # Create a (name, value) list of all *args and **kwargs passed to the
     # function.
     arg_pairs: list[tuple[str | None, Any]] = []
-    for arg_idx in range(len(func_args)):
-        arg_name = _get_positional_arg_name(func, arg_idx)
-        arg_pairs.append((arg_name, func_args[arg_idx]))
+    positional_arg_names = hashing_plan.positional_arg_names
+    num_named_args = len(positional_arg_names)
+    for arg_idx, arg_value in enumerate(func_args):
+        arg_name = positional_arg_names[arg_idx] if arg_idx < num_named_args else None
+        arg_pairs.append((arg_name, arg_value))
 
     for kw_name, kw_val in func_kwargs.items():
         # **kwargs ordering is preserved, per PEP 468
@@ -437,15 +1082,11 @@ def _make_value_key(
             continue
 
         try:
-            update_hash(
-                arg_name,
-                hasher=args_hasher,
-                cache_type=cache_type,
-                hash_source=func,
-            )
-            # we call update_hash twice here, first time for `arg_name`
-            # without `hash_funcs`, and second time for `arg_value` with hash_funcs
-            # to evaluate user defined `hash_funcs` only for computing `arg_value` hash.
+            # The hash of `arg_name` is computed without `hash_funcs` and only
+            # depends on the name, so it's memoized by the plan. `arg_value` is
+            # hashed with hash_funcs, so that user defined `hash_funcs` are only
+            # evaluated for computing `arg_value` hash.
+            args_hasher.update(hashing_plan.get_arg_name_bytes(arg_name, func))
             update_hash(
                 arg_value,
                 hasher=args_hasher,
@@ -500,24 +1141,121 @@ def _make_function_key(cache_type: CacheType, func: FunctionType) -> str:
     return func_hasher.hexdigest()
 
 
-def _get_positional_arg_name(func: FunctionType, arg_index: int) -> str | None:
-    """Return the name of a function's positional argument.
+def _get_positional_arg_names(func: FunctionType) -> tuple[str | None, ...]:
+    """Return the names of a function's parameters, by position.
 
-    If arg_index is out of range, or refers to a parameter that is not a
-    named positional argument (e.g. an *args, **kwargs, or keyword-only param),
-    return None instead.
+    Entries for parameters that are not named positional arguments (e.g. an
+    *args, **kwargs, or keyword-only param) are None. Positional args passed at
+    an index beyond the returned tuple have no name either.
     """
-    if arg_index < 0:
-        return None
+    names: list[str | None] = []
+    for param in inspect.signature(func).parameters.values():
+        if param.kind in (
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            inspect.Parameter.POSITIONAL_ONLY,
+        ):
+            names.append(param.name)
+        else:
+            names.append(None)
+    return tuple(names)
 
-    params: list[inspect.Parameter] = list(inspect.signature(func).parameters.values())
-    if arg_index >= len(params):
-        return None
 
-    if params[arg_index].kind in (
-        inspect.Parameter.POSITIONAL_OR_KEYWORD,
-        inspect.Parameter.POSITIONAL_ONLY,
-    ):
-        return params[arg_index].name
+class _HashingPlan:
+    """The parts of a cached function's hashing that don't depend on its args.
+
+    Building a function key reads the function's source, and resolving the
+    names of positional args inspects its signature. Both are comparatively
+    slow, and cached functions defined in the main script are re-decorated on
+    every rerun, so we compute them once per code object (see
+    `_HashingPlanRegistry`) instead of on every decoration or call.
+    """
+
+    def __init__(self, cache_type: CacheType, func: FunctionType):
+        self.cache_type = cache_type
+        self.function_key = _make_function_key(cache_type, func)
+        self.positional_arg_names = _get_positional_arg_names(func)
+        # Maps arg names to the bytes they contribute to a value key. Filled
+        # lazily, since keyword arg names are only known at call time.
+        self._arg_name_bytes: dict[str | None, bytes] = {}
+
+    def get_arg_name_bytes(self, arg_name: str | None, func: FunctionType) -> bytes:
+        """Return the hash contribution of an argument's name."""
+        name_bytes = self._arg_name_bytes.get(arg_name)
+        if name_bytes is None:
+            name_bytes = hash_to_bytes(
+                arg_name, cache_type=self.cache_type, hash_source=func
+            )
+            self._arg_name_bytes[arg_name] = name_bytes
+        return name_bytes
+
 
-    return None
+class _HashingPlanRegistry:
+    """Process-wide store of hashing plans, keyed by function code object.
+
+    Code objects are compared by identity: when a script or module is edited,
+    it gets recompiled into new code objects, which get new plans. Entries are
+    dropped once their code object is garbage collected.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plans: dict[
+            int, tuple[weakref.ref[Any], dict[tuple[Any, ...], _HashingPlan]]
+        ] = {}
+        # IDs of collected code objects. Weakref callbacks may run at any time
+        # (including while self._lock is held by the same thread), so they only
+        # record the ID here and the actual cleanup happens in get_plan.
+        self._pending_removals: list[int] = []
+
+    def get_plan(self, cache_type: CacheType, func: FunctionType) -> _HashingPlan:
+        """Return the hashing plan for a function, creating it if needed."""
+        code = getattr(func, "__code__", None)
+        if (
+            code is None
+            or hasattr(func, "__wrapped__")
+            or hasattr(func, "__signature__")
+        ):
+            # The signature and source of wrapped or otherwise customized
+            # callables can't be derived from their code object alone.
+            return _HashingPlan(cache_type, func)
+
+        plan_key = (cache_type, func.__module__, func.__qualname__)
+        plan = self._lookup(code, plan_key)
+        if plan is not None:
+            return plan
+
+        # Create the plan outside of the lock, since it reads source files.
+        plan = _HashingPlan(cache_type, func)
+        code_id = id(code)
+        with self._lock:
+            self._purge_pending_removals()
+            entry = self._plans.get(code_id)
+            if entry is None or entry[0]() is not code:
+                entry = (
+                    weakref.ref(code, lambda _: self._pending_removals.append(code_id)),
+                    {},
+                )
+                self._plans[code_id] = entry
+            return entry[1].setdefault(plan_key, plan)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self._pending_removals.clear()
+
+    def _lookup(self, code: CodeType, plan_key: tuple[Any, ...]) -> _HashingPlan | None:
+        with self._lock:
+            entry = self._plans.get(id(code))
+            if entry is None or entry[0]() is not code:
+                return None
+            return entry[1].get(plan_key)
+
+    def _purge_pending_removals(self) -> None:
+        while self._pending_removals:
+            code_id = self._pending_removals.pop()
+            entry = self._plans.get(code_id)
+            if entry is not None and entry[0]() is None:
+                del self._plans[code_id]
+
+
+_hashing_plans: Final = _HashingPlanRegistry()
@@ -79,6 +79,10 @@ class CachedResult:
     messages: list[MsgData]
     main_id: str
     sidebar_id: str
+    # When the result was written, as returned by
+    # cache_utils.RESULT_WRITTEN_AT_TIMER. Entries pickled before this field
+    # existed are treated as written at 0.
+    written_at: float = 0.0
 
 
 """
@@ -41,6 +41,7 @@ from streamlit import type_util, util
 from streamlit.errors import StreamlitAPIException
 from streamlit.runtime.caching.cache_errors import UnhashableTypeError
 from streamlit.runtime.caching.cache_type import CacheType
+from streamlit.runtime.command_profiler import profile_section
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 from streamlit.util import HASHLIB_KWARGS
 
@@ -142,6 +143,7 @@ If you think this is actually a Streamlit bug, please
         }
 
 
+@profile_section("hashing")
 def update_hash(
     val: Any,
     hasher,
@@ -160,6 +162,44 @@ def update_hash(
     ch.update(hasher, val)
 
 
+@profile_section("hashing")
+def hash_to_bytes(
+    val: Any,
+    cache_type: CacheType,
+    hash_source: Callable[..., Any] | None = None,
+    hash_funcs: HashFuncsDict | None = None,
+) -> bytes:
+    """Return the bytes that `update_hash` would feed into a hasher for val.
+
+    This allows callers to compute the hash contribution of values that never
+    change (e.g. argument names) once, and reuse it across many hashes.
+    """
+
+    hash_stacks.current.hash_source = hash_source
+
+    ch = _CacheFuncHasher(cache_type, hash_funcs)
+    return ch.to_bytes(val)
+
+
+def normalize_hash_funcs(hash_funcs: HashFuncsDict | None) -> HashFuncsDict:
+    """Return a copy of hash_funcs keyed by fully-qualified type name strings.
+
+    Can't use types as the keys in the internal hash_funcs dict because
+    we always remove user-written modules from memory when rerunning a
+    script in order to reload it and grab the latest code changes.
+    (See LocalSourcesWatcher.py:on_file_changed) This causes
+    the type object to refer to different underlying class instances each run,
+    so type-based comparisons fail. To solve this, we use the types converted
+    to fully-qualified strings as keys.
+    """
+    if not hash_funcs:
+        return {}
+    return {
+        k if isinstance(k, str) else type_util.get_fqn(k): v
+        for k, v in hash_funcs.items()
+    }
+
+
 class _HashStack:
     """Stack of what has been hashed, for debug and circular reference detection.
 
@@ -279,21 +319,7 @@ class _CacheFuncHasher:
     """A hasher that can hash objects with cycles."""
 
     def __init__(self, cache_type: CacheType, hash_funcs: HashFuncsDict | None = None):
-        # Can't use types as the keys in the internal _hash_funcs because
-        # we always remove user-written modules from memory when rerunning a
-        # script in order to reload it and grab the latest code changes.
-        # (See LocalSourcesWatcher.py:on_file_changed) This causes
-        # the type object to refer to different underlying class instances each run,
-        # so type-based comparisons fail. To solve this, we use the types converted
-        # to fully-qualified strings as keys in our internal dict.
-        self._hash_funcs: HashFuncsDict
-        if hash_funcs:
-            self._hash_funcs = {
-                k if isinstance(k, str) else type_util.get_fqn(k): v
-                for k, v in hash_funcs.items()
-            }
-        else:
-            self._hash_funcs = {}
+        self._hash_funcs: HashFuncsDict = normalize_hash_funcs(hash_funcs)
         self._hashes: dict[Any, bytes] = {}
 
         # The number of the bytes in the hash.
@@ -14,12 +14,9 @@
 from __future__ import annotations
 
 import math
-import threading
-
-from cachetools import TTLCache
 
 from streamlit.logger import get_logger
-from streamlit.runtime.caching import cache_utils
+from streamlit.runtime.caching.cache_utils import MemCache
 from streamlit.runtime.caching.storage.cache_storage_protocol import (
     CacheStorage,
     CacheStorageContext,
@@ -50,9 +47,9 @@ class InMemoryCacheStorageWrapper(CacheStorage):
 
     Notes
     -----
-    Threading: in-memory caching layer is thread safe: we hold self._mem_cache_lock for
-    working with this self._mem_cache object.
-    However, we do not hold this lock when calling into the underlying storage,
+    Threading: in-memory caching layer is thread safe: self._mem_cache is a MemCache,
+    which takes a lock for writes and serves reads without locking.
+    However, we do not hold any lock when calling into the underlying storage,
     so it is the responsibility of the that storage to ensure that it is safe to use
     it from multiple threads.
     """
@@ -62,12 +59,10 @@ class InMemoryCacheStorageWrapper(CacheStorage):
         self.function_display_name = context.function_display_name
         self._ttl_seconds = context.ttl_seconds
         self._max_entries = context.max_entries
-        self._mem_cache: TTLCache[str, bytes] = TTLCache(
+        self._mem_cache: MemCache[bytes] = MemCache(
             maxsize=self.max_entries,
             ttl=self.ttl_seconds,
-            timer=cache_utils.TTLCACHE_TIMER,
         )
-        self._mem_cache_lock = threading.Lock()
         self._persist_storage = persist_storage
 
     @property
@@ -102,44 +97,35 @@ class InMemoryCacheStorageWrapper(CacheStorage):
 
     def clear(self) -> None:
         """Delete all keys for the in memory cache, and also the persistent storage"""
-        with self._mem_cache_lock:
-            self._mem_cache.clear()
+        self._mem_cache.clear()
         self._persist_storage.clear()
 
     def get_stats(self) -> list[CacheStat]:
         """Returns a list of stats in bytes for the cache memory storage per item"""
-        stats = []
-
-        with self._mem_cache_lock:
-            for item in self._mem_cache.values():
-                stats.append(
-                    CacheStat(
-                        category_name="st_cache_data",
-                        cache_name=self.function_display_name,
-                        byte_length=len(item),
-                    )
-                )
-        return stats
+        return [
+            CacheStat(
+                category_name="st_cache_data",
+                cache_name=self.function_display_name,
+                byte_length=len(item),
+            )
+            for item in self._mem_cache.values()
+        ]
 
     def close(self) -> None:
         """Closes the cache storage"""
         self._persist_storage.close()
 
     def _read_from_mem_cache(self, key: str) -> bytes:
-        with self._mem_cache_lock:
-            if key in self._mem_cache:
-                entry = bytes(self._mem_cache[key])
-                _LOGGER.debug("Memory cache HIT: %s", key)
-                return entry
-
-            else:
-                _LOGGER.debug("Memory cache MISS: %s", key)
-                raise CacheStorageKeyNotFoundError("Key not found in mem cache")
+        try:
+            entry = bytes(self._mem_cache.get(key))
+        except KeyError:
+            _LOGGER.debug("Memory cache MISS: %s", key)
+            raise CacheStorageKeyNotFoundError("Key not found in mem cache")
+        _LOGGER.debug("Memory cache HIT: %s", key)
+        return entry
 
     def _write_to_mem_cache(self, key: str, entry_bytes: bytes) -> None:
-        with self._mem_cache_lock:
-            self._mem_cache[key] = entry_bytes
+        self._mem_cache.set(key, entry_bytes)
 
     def _remove_from_mem_cache(self, key: str) -> None:
-        with self._mem_cache_lock:
-            self._mem_cache.pop(key, None)
+        self._mem_cache.pop(key)
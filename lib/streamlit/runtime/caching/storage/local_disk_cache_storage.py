@@ -18,7 +18,11 @@ InMemoryCacheStorageWrapper wrapper allows to have first layer of in-memory cach
 before accessing to LocalDiskCacheStorage itself.
 
 Declares the LocalDiskCacheStorage class, which is used to store cached
-values on disk.
+values on disk, in a single SQLite database in the `.streamlit/cache` folder.
+The database is indexed by function and key, enforces the TTL and max_entries
+of each function, and optionally a size limit for all persisted values. Values
+are written in transactions, so that a crashed write never leaves a partial
+value behind.
 
 How these classes work together
 -------------------------------
@@ -31,7 +35,7 @@ if the context is not valid.
 
 - LocalDiskCacheStorage : each instance of this is able to get, set, delete, and clear
 entries from disk for a single `@st.cache_data` decorated function if `persist="disk"`
-is used in CacheStorageContext.
+is used in CacheStorageContext. It stores them with a SQLiteCacheStorage.
 
 
     ┌───────────────────────────────┐
@@ -60,11 +64,10 @@ from __future__ import annotations
 
 import math
 import os
-import shutil
+import threading
 from typing import Final
 
-from streamlit import errors
-from streamlit.file_util import get_streamlit_file_path, streamlit_read, streamlit_write
+from streamlit.file_util import get_streamlit_file_path
 from streamlit.logger import get_logger
 from streamlit.runtime.caching.storage.cache_storage_protocol import (
     CacheStorage,
@@ -76,43 +79,56 @@ from streamlit.runtime.caching.storage.cache_storage_protocol import (
 from streamlit.runtime.caching.storage.in_memory_cache_storage_wrapper import (
     InMemoryCacheStorageWrapper,
 )
+from streamlit.runtime.caching.storage.sqlite_cache_storage import (
+    SQLiteCacheDatabase,
+    SQLiteCacheStorage,
+)
 
 _LOGGER: Final = get_logger(__name__)
 
 # Streamlit directory where persisted @st.cache_data objects live.
 # (This is the same directory that @st.cache persisted objects live.
-# But @st.cache_data uses a different extension, so they don't overlap.)
+# But @st.cache_data uses a different file, so they don't overlap.)
 _CACHE_DIR_NAME: Final = "cache"
 
-# The extension for our persisted @st.cache_data objects.
-# (`@st.cache_data` was originally called `@st.memo`)
-_CACHED_FILE_EXTENSION: Final = "memo"
+# The database file of our persisted @st.cache_data objects.
+_CACHE_DB_FILE_NAME: Final = "cache_data.sqlite"
+
+# The extension of the files that older versions persisted each
+# @st.cache_data object to. (`@st.cache_data` was originally called `@st.memo`)
+_LEGACY_CACHED_FILE_EXTENSION: Final = "memo"
+
+# The open persisted cache databases, by path. There's usually just one, but
+# the cache folder depends on the working directory.
+_databases: dict[str, SQLiteCacheDatabase] = {}
+_databases_lock = threading.Lock()
 
 
 class LocalDiskCacheStorageManager(CacheStorageManager):
+    def __init__(self, max_persisted_size_bytes: int | None = None):
+        """Create a LocalDiskCacheStorageManager.
+
+        If max_persisted_size_bytes is set, the least recently set persisted
+        values are removed from disk once all of them don't fit into it.
+        """
+        self._max_persisted_size_bytes = max_persisted_size_bytes
+
     def create(self, context: CacheStorageContext) -> CacheStorage:
         """Creates a new cache storage instance wrapped with in-memory cache layer"""
-        persist_storage = LocalDiskCacheStorage(context)
+        persist_storage = LocalDiskCacheStorage(context, self._max_persisted_size_bytes)
         return InMemoryCacheStorageWrapper(
             persist_storage=persist_storage, context=context
         )
 
     def clear_all(self) -> None:
-        cache_path = get_cache_folder_path()
-        if os.path.isdir(cache_path):
-            shutil.rmtree(cache_path)
+        database = _get_database(create=False)
+        if database is not None:
+            with database.transaction() as conn:
+                conn.execute("DELETE FROM cache_entries")
+        _remove_legacy_cache_files()
 
     def check_context(self, context: CacheStorageContext) -> None:
-        if (
-            context.persist == "disk"
-            and context.ttl_seconds is not None
-            and not math.isinf(context.ttl_seconds)
-        ):
-            _LOGGER.warning(
-                f"The cached function '{context.function_display_name}' has a TTL "
-                "that will be ignored. Persistent cached functions currently don't "
-                "support TTL."
-            )
+        pass
 
 
 class LocalDiskCacheStorage(CacheStorage):
@@ -120,11 +136,13 @@ class LocalDiskCacheStorage(CacheStorage):
     This is the default cache persistence layer for `@st.cache_data`
     """
 
-    def __init__(self, context: CacheStorageContext):
+    def __init__(self, context: CacheStorageContext, max_size_bytes: int | None = None):
         self.function_key = context.function_key
         self.persist = context.persist
+        self._context = context
         self._ttl_seconds = context.ttl_seconds
         self._max_entries = context.max_entries
+        self._max_size_bytes = max_size_bytes
 
     @property
     def ttl_seconds(self) -> float:
@@ -137,86 +155,101 @@ class LocalDiskCacheStorage(CacheStorage):
     def get(self, key: str) -> bytes:
         """
         Returns the stored value for the key if persisted,
-        raise CacheStorageKeyNotFoundError if not found, or not configured
+        raise CacheStorageKeyNotFoundError if not found, expired, or not configured
         with persist="disk"
         """
-        if self.persist == "disk":
-            path = self._get_cache_file_path(key)
-            try:
-                with streamlit_read(path, binary=True) as input:
-                    value = input.read()
-                    _LOGGER.debug("Disk cache HIT: %s", key)
-                    return bytes(value)
-            except FileNotFoundError:
-                raise CacheStorageKeyNotFoundError("Key not found in disk cache")
-            except Exception as ex:
-                _LOGGER.error(ex)
-                raise CacheStorageError("Unable to read from cache") from ex
-        else:
+        if self.persist != "disk":
             raise CacheStorageKeyNotFoundError(
                 f"Local disk cache storage is disabled (persist={self.persist})"
             )
+        storage = self._get_storage(create=False)
+        if storage is None:
+            raise CacheStorageKeyNotFoundError("Key not found in disk cache")
+        value = storage.get(key)
+        _LOGGER.debug("Disk cache HIT: %s", key)
+        return value
 
     def set(self, key: str, value: bytes) -> None:
         """Sets the value for a given key"""
         if self.persist == "disk":
-            path = self._get_cache_file_path(key)
-            try:
-                with streamlit_write(path, binary=True) as output:
-                    output.write(value)
-            except errors.Error as e:
-                _LOGGER.debug(e)
-                # Clean up file so we don't leave zero byte files.
-                try:
-                    os.remove(path)
-                except (FileNotFoundError, OSError):
-                    # If we can't remove the file, it's not a big deal.
-                    pass
-                raise CacheStorageError("Unable to write to cache") from e
+            storage = self._get_storage(create=True)
+            assert storage is not None
+            storage.set(key, value)
 
     def delete(self, key: str) -> None:
-        """Delete a cache file from disk. If the file does not exist on disk,
+        """Delete a value from disk. If the value does not exist on disk,
         return silently. If another exception occurs, log it. Does not throw.
         """
         if self.persist == "disk":
-            path = self._get_cache_file_path(key)
             try:
-                os.remove(path)
-            except FileNotFoundError:
-                # The file is already removed.
-                pass
-            except Exception as ex:
+                storage = self._get_storage(create=False)
+                if storage is not None:
+                    storage.delete(key)
+            except CacheStorageError as ex:
                 _LOGGER.exception(
-                    "Unable to remove a file from the disk cache", exc_info=ex
+                    "Unable to remove a value from the disk cache", exc_info=ex
                 )
 
     def clear(self) -> None:
         """Delete all keys for the current storage"""
-        cache_dir = get_cache_folder_path()
-
-        if os.path.isdir(cache_dir):
-            # We try to remove all files in the cache directory that start with
-            # the function key, whether `clear` called for `self.persist`
-            # storage or not, to avoid leaving orphaned files in the cache directory.
-            for file_name in os.listdir(cache_dir):
-                if self._is_cache_file(file_name):
-                    os.remove(os.path.join(cache_dir, file_name))
+        # We clear the function's entries whether `clear` is called for
+        # `self.persist` storage or not, to avoid leaving orphaned entries.
+        storage = self._get_storage(create=False)
+        if storage is not None:
+            storage.clear()
 
     def close(self) -> None:
         """Dummy implementation of close, we don't need to actually "close" anything"""
 
-    def _get_cache_file_path(self, value_key: str) -> str:
-        """Return the path of the disk cache file for the given value."""
-        cache_dir = get_cache_folder_path()
-        return os.path.join(
-            cache_dir, f"{self.function_key}-{value_key}.{_CACHED_FILE_EXTENSION}"
-        )
+    def _get_storage(self, create: bool) -> SQLiteCacheStorage | None:
+        """Return the SQLiteCacheStorage of this function's entries in the
+        persisted database, or None if the database doesn't exist and create
+        is False.
+        """
+        database = _get_database(create)
+        if database is None:
+            return None
+        return SQLiteCacheStorage(database, self._context, self._max_size_bytes)
 
-    def _is_cache_file(self, fname: str) -> bool:
-        """Return true if the given file name is a cache file for this storage."""
-        return fname.startswith(f"{self.function_key}-") and fname.endswith(
-            f".{_CACHED_FILE_EXTENSION}"
-        )
+
+def _get_database(create: bool) -> SQLiteCacheDatabase | None:
+    """Return the persisted cache database in the current cache folder.
+
+    If the database doesn't exist yet, it's created if create is True, and
+    None is returned otherwise.
+    """
+    cache_dir = get_cache_folder_path()
+    path = os.path.join(cache_dir, _CACHE_DB_FILE_NAME)
+    with _databases_lock:
+        database = _databases.get(path)
+        # The database file may have been removed, e.g. together with the
+        # whole cache folder.
+        if database is not None and os.path.exists(path):
+            return database
+        if not create and not os.path.exists(path):
+            return None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError as ex:
+            _LOGGER.error(ex)
+            raise CacheStorageError("Unable to create the cache folder") from ex
+        database = SQLiteCacheDatabase(path)
+        _databases[path] = database
+        return database
+
+
+def _remove_legacy_cache_files() -> None:
+    """Remove the cache files that older versions persisted values to."""
+    cache_dir = get_cache_folder_path()
+    if not os.path.isdir(cache_dir):
+        return
+    for file_name in os.listdir(cache_dir):
+        if file_name.endswith(f".{_LEGACY_CACHED_FILE_EXTENSION}"):
+            try:
+                os.remove(os.path.join(cache_dir, file_name))
+            except OSError:
+                # If we can't remove the file, it's not a big deal.
+                pass
 
 
 def get_cache_folder_path() -> str:
@@ -0,0 +1,371 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Declares the SQLiteCacheStorageManager class, which is used to create
+SQLiteCacheStorage instances that all store their values in a single SQLite
+database.
+
+Unlike the in-memory cache layer of the default cache storage, a SQLite database
+can be shared by several processes, such as the workers of a Streamlit server
+started with `server.workers` > 1. That way, a value computed by one worker is
+a cache hit for all other workers.
+
+How these classes work together
+-------------------------------
+
+- SQLiteCacheStorageManager : creates SQLiteCacheStorage instances for functions
+without `persist="disk"`, and LocalDiskCacheStorage instances for functions with
+`persist="disk"` (which are already shared by processes, as they're stored in
+their own database in the `.streamlit/cache` folder). It also clears all
+storages at once.
+
+- SQLiteCacheStorage : gets, sets, deletes, and clears the entries of a single
+`@st.cache_data` decorated function in the shared database.
+
+- SQLiteCacheDatabase : a database file and its connections. LocalDiskCacheStorage
+uses one too, to persist values across server restarts.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Final, Iterator
+
+from streamlit.logger import get_logger
+from streamlit.runtime.caching.storage.cache_storage_protocol import (
+    CacheStorage,
+    CacheStorageContext,
+    CacheStorageError,
+    CacheStorageKeyNotFoundError,
+    CacheStorageManager,
+)
+from streamlit.runtime.stats import CacheStat
+
+_LOGGER: Final = get_logger(__name__)
+
+# How long to wait for another process to release its lock on the database.
+_BUSY_TIMEOUT_SECONDS: Final = 30
+
+# The maximum number of idle connections that each process keeps open. More
+# connections are opened when more threads access the database at once, and
+# closed when they're done.
+_MAX_IDLE_CONNECTIONS: Final = 4
+
+_SCHEMA: Final = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        function_key TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL,
+        PRIMARY KEY (function_key, key)
+    ) WITHOUT ROWID
+    """,
+    # Evicting the oldest entries of a function, or of the whole database, must
+    # not scan all entries.
+    """
+    CREATE INDEX IF NOT EXISTS cache_entries_by_function_age
+    ON cache_entries (function_key, created_at)
+    """,
+    "CREATE INDEX IF NOT EXISTS cache_entries_by_age ON cache_entries (created_at)",
+    # The total size of all values, kept up to date by triggers, so that the
+    # size limit can be checked without summing the sizes of all entries.
+    """
+    CREATE TABLE IF NOT EXISTS cache_size (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        total INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO cache_size (id, total) VALUES (0, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS cache_entries_insert AFTER INSERT ON cache_entries
+    BEGIN UPDATE cache_size SET total = total + NEW.size; END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cache_entries_update AFTER UPDATE ON cache_entries
+    BEGIN UPDATE cache_size SET total = total - OLD.size + NEW.size; END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cache_entries_delete AFTER DELETE ON cache_entries
+    BEGIN UPDATE cache_size SET total = total - OLD.size; END
+    """,
+)
+
+
+class SQLiteCacheDatabase:
+    """A SQLite database file that stores the entries of all SQLiteCacheStorages.
+
+    Each statement or transaction borrows a connection from a small pool of
+    idle connections, so instances can be used from any thread. Script runs
+    get a new thread each, so connections aren't tied to threads, which
+    would leak one connection per thread. Each process has its own pool, so
+    instances can be created before forking worker processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._idle_connections: list[sqlite3.Connection] = []
+        self._pid = os.getpid()
+        with self.transaction() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=_BUSY_TIMEOUT_SECONDS,
+            # We manage transactions ourselves.
+            isolation_level=None,
+            # Connections are used by one thread at a time, but not always
+            # the same one.
+            check_same_thread=False,
+        )
+        # Write-ahead logging lets readers proceed while a process writes.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection from the pool, or open a new one if none is idle.
+
+        The connection is returned to the pool afterwards, unless the pool is
+        full, or the connection raised, as it may be in an unknown state.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections must not be shared with a forked process.
+                self._idle_connections = []
+                self._pid = os.getpid()
+            conn = self._idle_connections.pop() if self._idle_connections else None
+        if conn is None:
+            conn = self._connect()
+
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+
+        with self._lock:
+            if (
+                self._pid == os.getpid()
+                and len(self._idle_connections) < _MAX_IDLE_CONNECTIONS
+            ):
+                self._idle_connections.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a transaction, raising CacheStorageError on failure."""
+        try:
+            with self._connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+        except sqlite3.Error as ex:
+            _LOGGER.error(ex)
+            raise CacheStorageError("Unable to access the cache database") from ex
+
+    def query(self, sql: str, params: tuple[object, ...]) -> list[tuple[object, ...]]:
+        """Run a read-only query, raising CacheStorageError on failure."""
+        try:
+            with self._connection() as conn:
+                return conn.execute(sql, params).fetchall()
+        except sqlite3.Error as ex:
+            _LOGGER.error(ex)
+            raise CacheStorageError("Unable to read from the cache database") from ex
+
+
+class SQLiteCacheStorageManager(CacheStorageManager):
+    def __init__(self, path: str, max_persisted_size_bytes: int | None = None):
+        """Create a SQLiteCacheStorageManager that stores cached values in the
+        SQLite database at the given path. The database is created if it doesn't
+        exist yet.
+
+        max_persisted_size_bytes limits the size of the values persisted with
+        `persist="disk"`, which are stored in their own database.
+        """
+        # This needs to be lazily imported to avoid a dependency cycle.
+        from streamlit.runtime.caching.storage.local_disk_cache_storage import (
+            LocalDiskCacheStorageManager,
+        )
+
+        self._database = SQLiteCacheDatabase(path)
+        self._local_disk_manager = LocalDiskCacheStorageManager(
+            max_persisted_size_bytes
+        )
+
+    def create(self, context: CacheStorageContext) -> CacheStorage:
+        """Creates a new cache storage instance"""
+        if context.persist == "disk":
+            return self._local_disk_manager.create(context)
+        return SQLiteCacheStorage(self._database, context)
+
+    def clear_all(self) -> None:
+        with self._database.transaction() as conn:
+            conn.execute("DELETE FROM cache_entries")
+        self._local_disk_manager.clear_all()
+
+    def check_context(self, context: CacheStorageContext) -> None:
+        self._local_disk_manager.check_context(context)
+
+
+class SQLiteCacheStorage(CacheStorage):
+    """Cache storage that stores the entries of a single function in a SQLite
+    database shared by all SQLiteCacheStorages of a SQLiteCacheStorageManager.
+
+    Entries expire ttl_seconds after they're set. If there are more than
+    max_entries entries, the least recently set entries are removed. If
+    max_size_bytes is set, the least recently set entries of all functions are
+    removed until the database's values fit into it.
+
+    Notes
+    -----
+    Threading: this is thread-safe, and the same database can be used by several
+    processes at once.
+    """
+
+    def __init__(
+        self,
+        database: SQLiteCacheDatabase,
+        context: CacheStorageContext,
+        max_size_bytes: int | None = None,
+    ):
+        self.function_key = context.function_key
+        self.function_display_name = context.function_display_name
+        self._database = database
+        self._ttl_seconds = context.ttl_seconds
+        self._max_entries = context.max_entries
+        self._max_size_bytes = max_size_bytes
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds if self._ttl_seconds is not None else math.inf
+
+    @property
+    def max_entries(self) -> float:
+        return float(self._max_entries) if self._max_entries is not None else math.inf
+
+    def get(self, key: str) -> bytes:
+        """
+        Returns the stored value for the key or raise CacheStorageKeyNotFoundError if
+        the key is not found or has expired
+        """
+        rows = self._database.query(
+            "SELECT value FROM cache_entries WHERE function_key = ? AND key = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (self.function_key, key, time.time()),
+        )
+        if not rows:
+            _LOGGER.debug("SQLite cache MISS: %s", key)
+            raise CacheStorageKeyNotFoundError("Key not found in SQLite cache")
+        _LOGGER.debug("SQLite cache HIT: %s", key)
+        return bytes(rows[0][0])  # type: ignore[arg-type]
+
+    def set(self, key: str, value: bytes) -> None:
+        """Sets the value for a given key"""
+        now = time.time()
+        expires_at = None if math.isinf(self.ttl_seconds) else now + self.ttl_seconds
+        with self._database.transaction() as conn:
+            conn.execute(
+                "INSERT INTO cache_entries "
+                "(function_key, key, value, size, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (function_key, key) DO UPDATE SET "
+                "value = excluded.value, size = excluded.size, "
+                "created_at = excluded.created_at, expires_at = excluded.expires_at",
+                (
+                    self.function_key,
+                    key,
+                    sqlite3.Binary(value),
+                    len(value),
+                    now,
+                    expires_at,
+                ),
+            )
+            conn.execute(
+                "DELETE FROM cache_entries WHERE function_key = ? AND expires_at <= ?",
+                (self.function_key, now),
+            )
+            if self._max_entries is not None:
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE function_key = ? AND key IN ("
+                    "SELECT key FROM cache_entries WHERE function_key = ? "
+                    "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.function_key, self.function_key, self._max_entries),
+                )
+            if self._max_size_bytes is not None:
+                self._enforce_max_size(conn, self._max_size_bytes)
+
+    @staticmethod
+    def _enforce_max_size(conn: sqlite3.Connection, max_size_bytes: int) -> None:
+        """Remove the least recently set entries of all functions until the
+        database's values fit into max_size_bytes.
+        """
+        [(total,)] = conn.execute("SELECT total FROM cache_size").fetchall()
+        if total <= max_size_bytes:
+            return
+        conn.execute(
+            "DELETE FROM cache_entries WHERE (function_key, key) IN ("
+            "SELECT function_key, key FROM ("
+            "SELECT function_key, key, SUM(size) OVER ("
+            "ORDER BY created_at DESC, function_key, key) AS newer_size "
+            "FROM cache_entries) WHERE newer_size > ?)",
+            (max_size_bytes,),
+        )
+
+    def delete(self, key: str) -> None:
+        """Delete a given key"""
+        with self._database.transaction() as conn:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE function_key = ? AND key = ?",
+                (self.function_key, key),
+            )
+
+    def clear(self) -> None:
+        """Delete all keys for the current storage"""
+        with self._database.transaction() as conn:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE function_key = ?",
+                (self.function_key,),
+            )
+
+    def get_stats(self) -> list[CacheStat]:
+        """Returns a list of stats in bytes for the cache storage per item"""
+        rows = self._database.query(
+            "SELECT size FROM cache_entries WHERE function_key = ?",
+            (self.function_key,),
+        )
+        return [
+            CacheStat(
+                category_name="st_cache_data",
+                cache_name=self.function_display_name,
+                byte_length=int(row[0]),  # type: ignore[call-overload]
+            )
+            for row in rows
+        ]
@@ -0,0 +1,255 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Server-side latency profiling of Streamlit commands.
+
+Enabled with the `runner.profileCommands` config option. While enabled, every
+command wrapped with `gather_metrics`, and every function wrapped with
+`profile_section` (e.g. Arrow conversion and hashing), is timed. Timings are
+aggregated per call stack: the line of the app's source code that called the
+outermost command, followed by the names of the nested commands and sections.
+
+The aggregates can be read on the `/_stcore/command-profile` endpoint, as JSON
+or in the "folded stacks" format used by flamegraph tools.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import sysconfig
+import threading
+from dataclasses import dataclass
+from functools import wraps
+from timeit import default_timer as timer
+from typing import Any, Callable, Final, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# The maximum number of distinct call stacks that are aggregated. Timings of
+# call stacks beyond this limit are aggregated under _OVERFLOW_STACK.
+_MAX_STACKS: Final = 10_000
+_OVERFLOW_STACK: Final = ("[other]",)
+
+# Frames in these directories are skipped when looking for the call site.
+_SKIPPED_DIRS: Final = (
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    sysconfig.get_paths()["stdlib"],
+)
+
+
+@dataclass
+class CommandProfileStat:
+    """The aggregated timings of a call stack.
+
+    Properties
+    ----------
+    stack : tuple of str
+        The call site in the app, followed by the names of the commands and
+        sections, outermost first.
+    count : int
+        The number of calls.
+    total_seconds : float
+        The total time spent in the calls, including nested commands and
+        sections.
+    self_seconds : float
+        The time spent in the calls, excluding nested commands and sections.
+        For a command, this is mostly the time spent marshalling its protobuf.
+    max_seconds : float
+        The duration of the slowest call.
+    """
+
+    stack: tuple[str, ...]
+    count: int = 0
+    total_seconds: float = 0
+    self_seconds: float = 0
+    max_seconds: float = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stack": list(self.stack),
+            "count": self.count,
+            "total_seconds": round(self.total_seconds, 6),
+            "self_seconds": round(self.self_seconds, 6),
+            "max_seconds": round(self.max_seconds, 6),
+        }
+
+
+class _Frame:
+    __slots__ = ("name", "start", "child_seconds")
+
+    def __init__(self, name: str, start: float) -> None:
+        self.name = name
+        self.start = start
+        self.child_seconds = 0.0
+
+
+class CommandProfiler:
+    """Aggregates the timings of commands and sections per call stack.
+
+    Each thread (i.e. each script run) has its own stack of frames. Aggregates
+    are shared by all threads.
+    """
+
+    def __init__(self, max_stacks: int = _MAX_STACKS) -> None:
+        self._max_stacks = max_stacks
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str, ...], CommandProfileStat] = {}
+        self._local = threading.local()
+
+    def _get_frames(self) -> list[_Frame]:
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return cast(list[_Frame], frames)
+
+    def push(self, name: str) -> bool:
+        """Start timing a command or section named name.
+
+        Returns False if nothing was pushed because the innermost frame already
+        has the same name (e.g. for recursive calls), in which case pop() must
+        not be called.
+        """
+        frames = self._get_frames()
+        if frames and frames[-1].name == name:
+            return False
+        if not frames:
+            frames.append(_Frame(_get_call_site(), 0))
+        frames.append(_Frame(name, timer()))
+        return True
+
+    def pop(self) -> None:
+        """Stop timing the innermost command or section."""
+        end = timer()
+        frames = self._get_frames()
+        frame = frames[-1]
+        elapsed = end - frame.start
+        stack = tuple(f.name for f in frames)
+
+        frames.pop()
+        if len(frames) == 1:
+            # Only the call site is left.
+            frames.pop()
+        else:
+            frames[-1].child_seconds += elapsed
+
+        with self._lock:
+            stat = self._stats.get(stack)
+            if stat is None:
+                if len(self._stats) >= self._max_stacks:
+                    stack = _OVERFLOW_STACK
+                stat = self._stats.setdefault(stack, CommandProfileStat(stack))
+            stat.count += 1
+            stat.total_seconds += elapsed
+            stat.self_seconds += max(0.0, elapsed - frame.child_seconds)
+            stat.max_seconds = max(stat.max_seconds, elapsed)
+
+    def get_stats(self) -> list[CommandProfileStat]:
+        """Return the aggregates of all call stacks, slowest first."""
+        with self._lock:
+            stats = [
+                CommandProfileStat(
+                    s.stack, s.count, s.total_seconds, s.self_seconds, s.max_seconds
+                )
+                for s in self._stats.values()
+            ]
+        return sorted(stats, key=lambda s: s.total_seconds, reverse=True)
+
+    def get_stats_by_name(self) -> list[CommandProfileStat]:
+        """Return the aggregates of each command and section over all of its
+        call stacks, slowest first. The stack of each aggregate is its name.
+        """
+        by_name: dict[str, CommandProfileStat] = {}
+        for stat in self.get_stats():
+            name = stat.stack[-1]
+            total = by_name.setdefault(name, CommandProfileStat((name,)))
+            total.count += stat.count
+            total.total_seconds += stat.total_seconds
+            total.self_seconds += stat.self_seconds
+            total.max_seconds = max(total.max_seconds, stat.max_seconds)
+        return sorted(by_name.values(), key=lambda s: s.total_seconds, reverse=True)
+
+    def to_folded_stacks(self) -> str:
+        """Return the aggregates in the folded stacks format read by flamegraph
+        tools (e.g. flamegraph.pl or speedscope): one line per call stack, with
+        the self time of the stack in microseconds.
+        """
+        lines = []
+        for stat in self.get_stats():
+            self_us = round(stat.self_seconds * 1_000_000)
+            if self_us > 0:
+                stack = ";".join(name.replace(";", ":") for name in stat.stack)
+                lines.append(f"{stack} {self_us}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def clear(self) -> None:
+        """Remove all aggregates."""
+        with self._lock:
+            self._stats.clear()
+
+
+def _get_call_site() -> str:
+    """Return "filename:lineno" of the innermost frame outside of Streamlit and
+    the standard library.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.startswith(_SKIPPED_DIRS):
+            return f"{os.path.basename(filename)}:{frame.f_lineno}"
+        frame = frame.f_back  # type: ignore[assignment]
+    return "[unknown]"
+
+
+# The active profiler, or None if profiling is disabled.
+_profiler: CommandProfiler | None = None
+
+
+def get_command_profiler() -> CommandProfiler | None:
+    """Return the active CommandProfiler, or None if profiling is disabled."""
+    return _profiler
+
+
+def set_command_profiling_enabled(enabled: bool) -> None:
+    """Enable or disable command profiling. Enabling it again keeps the
+    existing aggregates.
+    """
+    global _profiler
+    if not enabled:
+        _profiler = None
+    elif _profiler is None:
+        _profiler = CommandProfiler()
+
+
+def profile_section(name: str) -> Callable[[F], F]:
+    """Function decorator that times the decorated function as a section named
+    name while command profiling is enabled.
+
+    This costs a single global lookup per call while profiling is disabled.
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapped_func(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None or not profiler.push(name):
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.pop()
+
+        return cast(F, wrapped_func)
+
+    return decorator
@@ -0,0 +1,199 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tracks the elements that a client displays, so that elements that are
+unchanged since the previous script run don't have to be sent again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.util import HASHLIB_KWARGS
+
+DeltaPath = Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class _Entry:
+    """The content of a node in the client's element tree."""
+
+    # The hash of the Delta that created the node. Empty for blocks.
+    delta_hash: str
+    active_script_hash: str
+    fragment_id: str
+    # The type of the node's Block, or None if the node is an element.
+    block_type: str | None = None
+
+
+def _hash_delta(msg: ForwardMsg) -> str:
+    if msg.hash:
+        # Set by populate_hash_if_needed. It's the hash of the message without
+        # its metadata, which for a delta message is just the delta.
+        return msg.hash
+    # MD5 is good enough for what we need, which is uniqueness.
+    hasher = hashlib.md5(**HASHLIB_KWARGS)
+    hasher.update(msg.delta.SerializeToString())
+    return hasher.hexdigest()
+
+
+def _sets_widget_value(msg: ForwardMsg) -> bool:
+    """True if the message's element sets the value of a widget.
+
+    The client applies such values when it receives the element, even if it
+    already displays the same element, so they must always be sent.
+    """
+    element = msg.delta.new_element
+    element_type = element.WhichOneof("type")
+    if element_type is None:
+        return False
+    return bool(getattr(getattr(element, element_type), "set_value", False))
+
+
+def _create_unchanged_msg(msg: ForwardMsg) -> ForwardMsg:
+    unchanged_msg = ForwardMsg()
+    unchanged_msg.delta.unchanged_element.SetInParent()
+    unchanged_msg.metadata.CopyFrom(msg.metadata)
+    # The marker itself must not be cached by the client.
+    unchanged_msg.metadata.cacheable = False
+    return unchanged_msg
+
+
+class ElementSnapshot:
+    """The elements that a client displays, by delta path.
+
+    For each message that's sent to the client, `get_msg_to_send` updates the
+    snapshot the same way the client updates its element tree, and replaces
+    elements that the client already displays at the same path with compact
+    "unchanged" markers.
+
+    Whenever the snapshot can't tell what the client does with its tree (e.g.
+    which elements a fragment run clears), it forgets the affected nodes,
+    which are then sent again in full.
+
+    Notes
+    -----
+    Threading: UNSAFE. Must only be used on the eventloop thread.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[DeltaPath, _Entry] = {}
+        # The paths of the nodes sent during the current script run.
+        self._paths_this_run: set[DeltaPath] = set()
+        # The (main_script_path, page_script_hash) of the current script run.
+        self._page: tuple[str, str] | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._paths_this_run.clear()
+        self._page = None
+
+    def get_msg_to_send(self, msg: ForwardMsg) -> ForwardMsg:
+        """Record that the message is sent to the client, and return the
+        message to send instead: either the message itself, or an "unchanged"
+        marker if the client already displays the message's element.
+        """
+        msg_type = msg.WhichOneof("type")
+        if msg_type == "new_session":
+            self._on_new_session(msg)
+        elif msg_type == "script_finished":
+            self._on_script_finished(msg.script_finished)
+        elif msg_type == "delta":
+            return self._on_delta(msg)
+        return msg
+
+    def _on_new_session(self, msg: ForwardMsg) -> None:
+        page = (msg.new_session.main_script_path, msg.new_session.page_script_hash)
+        if page != self._page:
+            # The client clears (most of) its elements when the page changes.
+            self._entries.clear()
+            self._page = page
+        self._paths_this_run.clear()
+
+    def _on_script_finished(
+        self, status: ForwardMsg.ScriptFinishedStatus.ValueType
+    ) -> None:
+        # Mirrors which stale nodes the client clears when a run finishes.
+        if status == ForwardMsg.FINISHED_SUCCESSFULLY:
+            self._remove_stale_entries(lambda entry: True)
+        elif status == ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY:
+            # Fragment runs only clear nodes that belong to a fragment.
+            self._remove_stale_entries(lambda entry: entry.fragment_id != "")
+
+    def _on_delta(self, msg: ForwardMsg) -> ForwardMsg:
+        path = tuple(msg.metadata.delta_path)
+        delta_type = msg.delta.WhichOneof("type")
+        prev_entry = self._entries.get(path)
+
+        if delta_type == "new_element":
+            self._paths_this_run.add(path)
+            entry = _Entry(
+                _hash_delta(msg),
+                msg.metadata.active_script_hash,
+                msg.delta.fragment_id,
+            )
+            if entry == prev_entry and not _sets_widget_value(msg):
+                return _create_unchanged_msg(msg)
+            if prev_entry is not None and prev_entry.block_type is not None:
+                # The element replaces a block, and with it the block's children.
+                self._remove_descendants(path)
+            self._entries[path] = entry
+
+        elif delta_type == "add_block":
+            self._paths_this_run.add(path)
+            block_type = msg.delta.add_block.WhichOneof("type") or ""
+            if prev_entry is None or prev_entry.block_type != block_type:
+                # The client only keeps the children of a block that's
+                # replaced by a block of the same type.
+                self._remove_descendants(path)
+            self._entries[path] = _Entry(
+                "", msg.metadata.active_script_hash, msg.delta.fragment_id, block_type
+            )
+
+        else:
+            # Other deltas (e.g. add_rows) change the element in place.
+            self._entries.pop(path, None)
+
+        return msg
+
+    def _remove_descendants(self, path: DeltaPath) -> None:
+        depth = len(path)
+        for entry_path in list(self._entries):
+            if len(entry_path) > depth and entry_path[:depth] == path:
+                del self._entries[entry_path]
+
+    def _remove_stale_entries(self, is_cleared: Callable[[_Entry], bool]) -> None:
+        """Remove the entries of nodes that weren't sent during the current
+        script run and that the client clears, including their descendants.
+        """
+        removed_paths = {
+            path
+            for path, entry in self._entries.items()
+            if path not in self._paths_this_run and is_cleared(entry)
+        }
+        if not removed_paths:
+            return
+        self._entries = {
+            path: entry
+            for path, entry in self._entries.items()
+            if not any(
+                path[:depth] in removed_paths for depth in range(1, len(path) + 1)
+            )
+        }
@@ -22,12 +22,17 @@ from copy import deepcopy
 from functools import wraps
 from typing import TYPE_CHECKING, Any, Callable, Protocol, TypeVar, overload
 
+from streamlit import runtime
 from streamlit.deprecation_util import (
     make_deprecated_name_warning,
     show_deprecation_warning,
 )
 from streamlit.error_util import handle_uncaught_app_exception
-from streamlit.errors import FragmentHandledException, FragmentStorageKeyError
+from streamlit.errors import (
+    FragmentHandledException,
+    FragmentStorageKeyError,
+    StreamlitAPIException,
+)
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime.metrics_util import gather_metrics
 from streamlit.runtime.scriptrunner_utils.exceptions import (
@@ -135,6 +140,7 @@ def _fragment(
     func: F | None = None,
     *,
     run_every: int | float | timedelta | str | None = None,
+    shared: bool = False,
     additional_hash_info: str = "",
     should_show_deprecation_warning: bool = False,
 ) -> Callable[[F], F] | F:
@@ -145,12 +151,19 @@ def _fragment(
     (note that the @gather_metrics annotation is only on the publicly exposed function)
     """
 
+    if shared and not run_every:
+        raise StreamlitAPIException(
+            "`shared=True` requires `run_every`, the interval at which the shared "
+            "fragment is rerun for all sessions."
+        )
+
     if func is None:
         # Support passing the params via function decorator
         def wrapper(f: F) -> F:
             return fragment(
                 func=f,
                 run_every=run_every,
+                shared=shared,
             )
 
         return wrapper
@@ -165,6 +178,12 @@ def _fragment(
         if ctx is None:
             return None
 
+        if shared and (args or kwargs):
+            raise StreamlitAPIException(
+                "Shared fragments can't take arguments, because they're run once "
+                "for all sessions."
+            )
+
         cursors_snapshot = deepcopy(ctx.cursors)
         dg_stack_snapshot = deepcopy(context_dg_stack.get())
         h = hashlib.new("md5")
@@ -268,7 +287,12 @@ def _fragment(
 
         ctx.fragment_storage.set(fragment_id, wrapped_fragment)
 
-        if run_every:
+        if shared and runtime.exists():
+            # The runtime reruns the fragment, instead of each browser.
+            runtime.get_instance().shared_fragments.subscribe(
+                fragment_id, wrapped_fragment, time_to_seconds(run_every), ctx
+            )
+        elif run_every:
             msg = ForwardMsg()
             msg.auto_rerun.interval = time_to_seconds(run_every)
             msg.auto_rerun.fragment_id = fragment_id
@@ -291,6 +315,7 @@ def fragment(
     func: F,
     *,
     run_every: int | float | timedelta | str | None = None,
+    shared: bool = False,
 ) -> F: ...
 
 
@@ -301,6 +326,7 @@ def fragment(
     func: None = None,
     *,
     run_every: int | float | timedelta | str | None = None,
+    shared: bool = False,
 ) -> Callable[[F], F]: ...
 
 
@@ -309,6 +335,7 @@ def fragment(
     func: F | None = None,
     *,
     run_every: int | float | timedelta | str | None = None,
+    shared: bool = False,
 ) -> Callable[[F], F] | F:
     """Decorator to turn a function into a fragment which can rerun independently\
     of the full app.
@@ -367,6 +394,18 @@ def fragment(
         If ``run_every`` is ``None``, the fragment will only rerun from
         user-triggered events.
 
+    shared: bool
+        Whether the fragment's automatic reruns are shared by all sessions.
+        If ``False`` (default), each session reruns the fragment every
+        ``run_every``. If ``True``, Streamlit reruns the fragment once every
+        ``run_every``, and shows the result in every session that rendered
+        the fragment. This is useful for live dashboards with many viewers.
+        Requires ``run_every``.
+
+        A shared fragment can't take arguments, and its automatic reruns don't
+        have access to any session's Session State, query parameters, or user
+        info. Shared fragments shouldn't contain widgets.
+
     Examples
     --------
     The following example demonstrates basic usage of
@@ -448,7 +487,7 @@ def fragment(
         height: 400px
 
     """
-    return _fragment(func, run_every=run_every)
+    return _fragment(func, run_every=run_every, shared=shared)
 
 
 @overload
@@ -14,12 +14,57 @@
 
 from __future__ import annotations
 
-from typing import MutableMapping
+import time
+from typing import TYPE_CHECKING, Any, Callable, Final
 
-from cachetools import TTLCache
+from cachetools import Cache, TTLCache
 
+from streamlit.logger import get_logger
 from streamlit.runtime.session_manager import SessionInfo, SessionStorage
 
+if TYPE_CHECKING:
+    from streamlit.runtime.session_hibernation import SessionHibernator
+
+_LOGGER: Final = get_logger(__name__)
+
+
+class _SessionCache(TTLCache):
+    """A TTLCache that passes the entries it evicts to a callback.
+
+    Entries removed with `del` or `pop` aren't considered evicted.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        on_evict: Callable[[SessionInfo], None],
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(maxsize=maxsize, ttl=ttl, timer=timer)
+        self._on_evict = on_evict
+
+    def popitem(self) -> tuple[str, SessionInfo]:
+        # Called by Cache.__setitem__ to make room for a new entry.
+        key, session_info = super().popitem()
+        self._on_evict(session_info)
+        return key, session_info
+
+    def expire(self, time: Any = None) -> list[tuple[str, SessionInfo]]:
+        # TTLCache.expire only returns the expired entries as of cachetools 5.3,
+        # so find them by comparing the cache's contents. Cache.__iter__
+        # doesn't skip expired entries, unlike TTLCache.__iter__.
+        entries = {key: Cache.__getitem__(self, key) for key in Cache.__iter__(self)}
+        super().expire(time)
+        expired = [
+            (key, session_info)
+            for key, session_info in entries.items()
+            if not Cache.__contains__(self, key)
+        ]
+        for _, session_info in expired:
+            self._on_evict(session_info)
+        return expired
+
 
 class MemorySessionStorage(SessionStorage):
     """A SessionStorage that stores sessions in memory.
@@ -27,6 +72,10 @@ class MemorySessionStorage(SessionStorage):
     At most maxsize sessions are stored with a TTL of ttl seconds. This class is really
     just a thin wrapper around cachetools.TTLCache that complies with the SessionStorage
     protocol.
+
+    Sessions that expire or are evicted to make room for newer ones are shut down. If a
+    SessionHibernator is given, their Session State is handed to it first, and they're
+    transparently restored when they're fetched again.
     """
 
     # NOTE: The defaults for maxsize and ttl are chosen arbitrarily for now. These
@@ -39,6 +88,7 @@ class MemorySessionStorage(SessionStorage):
         self,
         maxsize: int = 128,
         ttl_seconds: int = 2 * 60,  # 2 minutes
+        hibernator: SessionHibernator | None = None,
     ) -> None:
         """Instantiate a new MemorySessionStorage.
 
@@ -55,20 +105,44 @@ class MemorySessionStorage(SessionStorage):
             The time in seconds for an entry added to a MemorySessionStorage to live.
             After this amount of time has passed for a given entry, it becomes
             inaccessible and will be removed eventually.
+
+        hibernator
+            If set, removed entries are hibernated with it before they're shut down,
+            and `get` restores them from it.
         """
 
-        self._cache: MutableMapping[str, SessionInfo] = TTLCache(
-            maxsize=maxsize, ttl=ttl_seconds
+        self._cache: _SessionCache = _SessionCache(
+            maxsize=maxsize, ttl=ttl_seconds, on_evict=self._on_evict
         )
+        self._hibernator = hibernator
+
+    def _on_evict(self, session_info: SessionInfo) -> None:
+        session = session_info.session
+        if self._hibernator is not None and self._hibernator.hibernate(session):
+            _LOGGER.debug("Hibernated session %s.", session.id)
+        session.shutdown()
 
     def get(self, session_id: str) -> SessionInfo | None:
-        return self._cache.get(session_id, None)
+        self._cache.expire()
+        session_info = self._cache.get(session_id, None)
+        if session_info is None and self._hibernator is not None:
+            session = self._hibernator.restore(session_id)
+            if session is not None:
+                _LOGGER.debug("Restored hibernated session %s.", session_id)
+                session_info = SessionInfo(client=None, session=session)
+                self._cache[session_id] = session_info
+        return session_info
 
     def save(self, session_info: SessionInfo) -> None:
         self._cache[session_info.session.id] = session_info
 
     def delete(self, session_id: str) -> None:
-        del self._cache[session_id]
+        if self._hibernator is not None:
+            self._hibernator.discard(session_id)
+        self._cache.pop(session_id, None)
 
     def list(self) -> list[SessionInfo]:
+        # Hibernated sessions aren't listed, as they're not AppSessions until they
+        # are restored.
+        self._cache.expire()
         return list(self._cache.values())
@@ -29,6 +29,7 @@ from streamlit import config, util
 from streamlit.logger import get_logger
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.proto.PageProfile_pb2 import Argument, Command
+from streamlit.runtime.command_profiler import get_command_profiler
 from streamlit.runtime.scriptrunner_utils.exceptions import RerunException
 from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
 
@@ -405,6 +406,10 @@ def gather_metrics(name: str, func: F | None = None) -> Callable[[F], F] | F:
                 # Always capture all exceptions since we want to make sure that
                 # the telemetry never causes any issues.
                 _LOGGER.debug("Failed to collect command telemetry", exc_info=ex)
+
+        # Time the command if command profiling is enabled.
+        profiler = get_command_profiler()
+        is_profiled = profiler is not None and profiler.push(name)
         try:
             result = non_optional_func(*args, **kwargs)
         except RerunException as ex:
@@ -419,6 +424,8 @@ def gather_metrics(name: str, func: F | None = None) -> Callable[[F], F] | F:
             # flag to deactivate tracking.
             if ctx and has_set_command_tracking_deactivated:
                 ctx.command_tracking_deactivated = False
+            if is_profiled:
+                profiler.pop()  # type: ignore[union-attr]
 
         if tracking_activated and command_telemetry:
             # Set the execution time to the measured value
@@ -15,8 +15,12 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import threading
 import time
 import traceback
+import types
+import uuid
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING, Awaitable, Final, NamedTuple
@@ -33,16 +37,33 @@ from streamlit.runtime.caching import (
 from streamlit.runtime.caching.storage.local_disk_cache_storage import (
     LocalDiskCacheStorageManager,
 )
+from streamlit.runtime.command_profiler import set_command_profiling_enabled
 from streamlit.runtime.forward_msg_cache import (
     ForwardMsgCache,
     create_reference_msg,
     populate_hash_if_needed,
 )
+from streamlit.runtime.fragment import MemoryFragmentStorage
 from streamlit.runtime.media_file_manager import MediaFileManager
 from streamlit.runtime.memory_session_storage import MemorySessionStorage
+from streamlit.runtime.pages_manager import PagesManager
+from streamlit.runtime.runtime_metrics import (
+    EventLoopLagProbe,
+    RuntimeMetrics,
+    get_runtime_metrics,
+)
 from streamlit.runtime.runtime_util import is_cacheable_msg
 from streamlit.runtime.script_data import ScriptData
+from streamlit.runtime.script_health_checker import (
+    ScriptHealthChecker,
+    ScriptHealthCheckResult,
+)
 from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.scriptrunner_utils.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME,
+    ScriptRunContext,
+    add_script_run_ctx,
+)
 from streamlit.runtime.session_manager import (
     ActiveSessionInfo,
     SessionClient,
@@ -50,8 +71,11 @@ from streamlit.runtime.session_manager import (
     SessionManager,
     SessionStorage,
 )
+from streamlit.runtime.shared_fragment_scheduler import SharedFragmentScheduler
 from streamlit.runtime.state import (
     SCRIPT_RUN_WITHOUT_ERRORS_KEY,
+    SafeSessionState,
+    SessionState,
     SessionStateStatProvider,
 )
 from streamlit.runtime.stats import StatsManager
@@ -67,6 +91,11 @@ if TYPE_CHECKING:
 # Wait for the script run result for 60s and if no result is available give up
 SCRIPT_RUN_CHECK_TIMEOUT: Final = 60
 
+# Wait for the warmup script for 10 minutes, as it may e.g. load large models.
+# Python threads can't be stopped, so a script that takes longer keeps running
+# in the background; the runtime just stops waiting for it.
+WARMUP_SCRIPT_TIMEOUT: Final = 600
+
 _LOGGER: Final = get_logger(__name__)
 
 
@@ -198,6 +227,8 @@ class Runtime:
         self._is_hello = config.is_hello
 
         self._state = RuntimeState.INITIAL
+        # True until `warm_up` completes, if the server warms up at all.
+        self._is_warming_up = False
 
         # Initialize managers
         self._component_registry = config.component_registry
@@ -206,6 +237,9 @@ class Runtime:
         self._media_file_mgr = MediaFileManager(storage=config.media_file_storage)
         self._cache_storage_manager = config.cache_storage_manager
         self._script_cache = ScriptCache()
+        self._script_cache.on_cleared.connect(self._on_script_cache_cleared)
+        # Will be created when we start.
+        self._script_health_checker: ScriptHealthChecker | None = None
 
         self._session_mgr = config.session_manager_class(
             session_storage=config.session_storage,
@@ -214,6 +248,10 @@ class Runtime:
             message_enqueued_callback=self._enqueued_some_message,
         )
 
+        self._shared_fragments = SharedFragmentScheduler(
+            self._get_active_session, self._media_file_mgr
+        )
+
         self._stats_mgr = StatsManager()
         self._stats_mgr.register_provider(get_data_cache_stats_provider())
         self._stats_mgr.register_provider(get_resource_cache_stats_provider())
@@ -221,6 +259,9 @@ class Runtime:
         self._stats_mgr.register_provider(self._uploaded_file_mgr)
         self._stats_mgr.register_provider(SessionStateStatProvider(self._session_mgr))
 
+        self._metrics = get_runtime_metrics()
+        self._event_loop_lag_probe = EventLoopLagProbe(self._metrics.event_loop_lag)
+
     @property
     def state(self) -> RuntimeState:
         return self._state
@@ -245,10 +286,18 @@ class Runtime:
     def media_file_mgr(self) -> MediaFileManager:
         return self._media_file_mgr
 
+    @property
+    def shared_fragments(self) -> SharedFragmentScheduler:
+        return self._shared_fragments
+
     @property
     def stats_mgr(self) -> StatsManager:
         return self._stats_mgr
 
+    @property
+    def metrics(self) -> RuntimeMetrics:
+        return self._metrics
+
     @property
     def stopped(self) -> Awaitable[None]:
         """A Future that completes when the Runtime's run loop has exited."""
@@ -273,6 +322,15 @@ class Runtime:
             return None
         return session_info.client
 
+    def _get_active_session(self, session_id: str) -> AppSession | None:
+        """Return the active AppSession with the given session_id, or None if
+        no such session exists.
+        """
+        session_info = self._session_mgr.get_active_session_info(session_id)
+        if session_info is None:
+            return None
+        return session_info.session
+
     async def start(self) -> None:
         """Start the runtime. This must be called only once, before
         any other functions are called.
@@ -284,6 +342,17 @@ class Runtime:
         Threading: UNSAFE. Must be called on the eventloop thread.
         """
 
+        set_command_profiling_enabled(config.get_option("runner.profileCommands"))
+        # Set before we start, so that we're never reported as ready before
+        # `warm_up` is called.
+        self._is_warming_up = config.get_option("server.warmup")
+
+        self._script_health_checker = ScriptHealthChecker(
+            self._run_script_health_check,
+            ttl_seconds=config.get_option("server.scriptHealthCheckTtl"),
+            interval_seconds=config.get_option("server.scriptHealthCheckInterval"),
+        )
+
         # Create our AsyncObjects. We need to have a running eventloop to
         # instantiate our various synchronization primitives.
         async_objs = AsyncObjects(
@@ -332,6 +401,15 @@ class Runtime:
         """
         return self._session_mgr.is_active_session(session_id)
 
+    def session_exists(self, session_id: str) -> bool:
+        """True if the session_id belongs to an active or disconnected session.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        return self._session_mgr.get_session_info(session_id) is not None
+
     def connect_session(
         self,
         client: SessionClient,
@@ -388,6 +466,11 @@ class Runtime:
             existing_session_id=existing_session_id,
             session_id_override=session_id_override,
         )
+        session_info = self._session_mgr.get_active_session_info(session_id)
+        if session_info is not None:
+            # A client that (re)connects may not display any elements yet,
+            # e.g. after the browser tab was reloaded.
+            session_info.session.element_snapshot.clear()
         self._set_state(RuntimeState.ONE_OR_MORE_SESSIONS_CONNECTED)
         self._get_async_objs().has_connection.set()
 
@@ -536,18 +619,165 @@ class Runtime:
             RuntimeState.STOPPING,
             RuntimeState.STOPPED,
         ):
+            if self._is_warming_up:
+                return False, "warming up"
             return True, "ok"
 
         return False, "unavailable"
 
-    async def does_script_run_without_error(self) -> tuple[bool, str]:
-        """Load and execute the app's script to verify it runs without an error.
+    async def warm_up(self, warmup_script_path: str | None = None) -> None:
+        """Prepare the runtime for its first sessions.
+
+        This compiles the scripts of all of the app's pages (which persists
+        their bytecode, see `ScriptCache`), and then runs the warmup script,
+        if any. Until it returns, the runtime isn't reported as ready for
+        browser connections if `server.warmup` is enabled.
+
+        Errors are logged rather than raised: the app is served either way.
+
+        Parameters
+        ----------
+        warmup_script_path
+            The script to run, e.g. to import modules and to initialize
+            `@st.cache_resource` functions that the app uses. It runs on a
+            daemon thread of its own. If it doesn't finish within
+            `WARMUP_SCRIPT_TIMEOUT`, the runtime becomes ready anyway, but the
+            script isn't stopped: it keeps running until it returns, or until
+            the process exits.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._compile_pages)
+            if warmup_script_path is not None:
+                await asyncio.wait_for(
+                    asyncio.wrap_future(self._start_warmup_script(warmup_script_path)),
+                    WARMUP_SCRIPT_TIMEOUT,
+                )
+        except asyncio.TimeoutError:
+            _LOGGER.warning(
+                "Warmup script %s didn't finish within %s seconds",
+                warmup_script_path,
+                WARMUP_SCRIPT_TIMEOUT,
+            )
+        except Exception:
+            _LOGGER.warning("Failed to warm up", exc_info=True)
+        finally:
+            self._is_warming_up = False
+        _LOGGER.info("Warmed up in %.1f seconds", time.perf_counter() - start)
+
+    def _create_pages_manager(self) -> PagesManager:
+        return PagesManager(
+            self._main_script_path, self._script_cache, setup_watcher=False
+        )
+
+    def _compile_pages(self) -> None:
+        """Compile the scripts of all of the app's pages into the ScriptCache.
+
+        Notes
+        -----
+        Threading: SAFE. May be called on any thread.
+        """
+        script_paths = {self._main_script_path}
+        script_paths.update(
+            page["script_path"]
+            for page in self._create_pages_manager().get_pages().values()
+        )
+        for script_path in sorted(script_paths):
+            try:
+                self._script_cache.get_bytecode(script_path)
+            except Exception:
+                # The error is shown to users when they open the page.
+                _LOGGER.warning("Failed to compile %s", script_path, exc_info=True)
+
+    def _start_warmup_script(self, script_path: str) -> concurrent.futures.Future[None]:
+        """Run the warmup script on a new daemon thread.
+
+        Unlike the default executor's threads, a daemon thread doesn't keep
+        the process alive on shutdown if the script never returns.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Resolved when the script has finished.
+        """
+        future: concurrent.futures.Future[None] = concurrent.futures.Future()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                self._run_warmup_script(script_path)
+            except BaseException as ex:
+                future.set_exception(ex)
+            else:
+                future.set_result(None)
+
+        threading.Thread(target=run, name="WarmupScript", daemon=True).start()
+        return future
+
+    def _run_warmup_script(self, script_path: str) -> None:
+        """Run the warmup script on the current (worker) thread.
+
+        The script isn't run in an AppSession, as that would run the app's
+        main script instead. It has a context of its own, so that Streamlit
+        commands work, but its output isn't sent anywhere.
+
+        Raises
+        ------
+        Any Exception raised while compiling or running the script.
+
+        Notes
+        -----
+        Threading: SAFE. May be called on any thread.
+        """
+        bytecode = self._script_cache.get_bytecode(script_path)
+        ctx = ScriptRunContext(
+            session_id=f"warmup-{uuid.uuid4()}",
+            _enqueue=lambda msg: None,
+            query_string="",
+            session_state=SafeSessionState(SessionState(), lambda: None),
+            uploaded_file_mgr=self._uploaded_file_mgr,
+            main_script_path=self._main_script_path,
+            user_info={},
+            fragment_storage=MemoryFragmentStorage(),
+            pages_manager=self._create_pages_manager(),
+            _has_script_started=True,
+        )
+
+        thread = threading.current_thread()
+        add_script_run_ctx(thread, ctx)
+        try:
+            module = types.ModuleType("__main__")
+            module.__dict__["__file__"] = script_path
+            exec(bytecode, module.__dict__)
+        finally:
+            delattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME)
+
+    async def does_script_run_without_error(self) -> ScriptHealthCheckResult:
+        """Return whether the app's script runs without an error.
+
+        The script is only run if there's no recent result for it, as it may
+        be requested very often. See `ScriptHealthChecker`.
 
         Returns
         -------
         (True, "ok") if the script completes without error, or (False, err_msg)
         if the script raises an exception.
 
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        return await self._get_script_health_checker().get_result()
+
+    async def _run_script_health_check(self) -> ScriptHealthCheckResult:
+        """Load and execute the app's script to verify it runs without an error.
+
         Notes
         -----
         Threading: UNSAFE. Must be called on the eventloop thread.
@@ -609,6 +839,10 @@ class Runtime:
 
             # Signal that we're started and ready to accept sessions
             async_objs.started.set_result(None)
+            self._event_loop_lag_probe.start()
+            self._shared_fragments.start()
+            if config.get_option("server.scriptHealthCheckEnabled"):
+                self._get_script_health_checker().start()
 
             while not async_objs.must_stop.is_set():
                 if self._state == RuntimeState.NO_SESSIONS_CONNECTED:  # type: ignore[comparison-overlap]
@@ -631,17 +865,26 @@ class Runtime:
 
                     for active_session_info in self._session_mgr.list_active_sessions():
                         msg_list = active_session_info.session.flush_browser_queue()
+                        flushed_bytes = 0
                         for msg in msg_list:
+                            self._metrics.start_counting_sent_bytes()
                             try:
                                 self._send_message(active_session_info, msg)
                             except SessionClientDisconnectedError:
                                 self._session_mgr.disconnect_session(
                                     active_session_info.session.id
                                 )
+                            finally:
+                                flushed_bytes += (
+                                    self._metrics.stop_counting_sent_bytes()
+                                )
 
                             # Yield for a tick after sending a message.
                             await asyncio.sleep(0)
 
+                        if flushed_bytes:
+                            self._metrics.session_flush_bytes.observe(flushed_bytes)
+
                     # Yield for a few milliseconds between session message
                     # flushing.
                     await asyncio.sleep(0.01)
@@ -671,6 +914,9 @@ class Runtime:
                 # is no longer so tightly coupled to a browser tab.
                 self._session_mgr.close_session(session_info.session.id)
 
+            self._event_loop_lag_probe.stop()
+            self._shared_fragments.stop()
+            self._get_script_health_checker().stop()
             self._set_state(RuntimeState.STOPPED)
             async_objs.stopped.set_result(None)
 
@@ -686,9 +932,10 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
     def _send_message(self, session_info: ActiveSessionInfo, msg: ForwardMsg) -> None:
         """Send a message to a client.
 
-        If the client is likely to have already cached the message, we may
-        instead send a "reference" message that contains only the hash of the
-        message.
+        If the client already displays the message's element at the same
+        position, we send an "unchanged" marker instead. Otherwise, if the
+        client is likely to have already cached the message, we may instead
+        send a "reference" message that contains only the hash of the message.
 
         Parameters
         ----------
@@ -702,10 +949,21 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
         Threading: UNSAFE. Must be called on the eventloop thread.
         """
         msg.metadata.cacheable = is_cacheable_msg(msg)
-        msg_to_send = msg
         if msg.metadata.cacheable:
             populate_hash_if_needed(msg)
 
+        if config.get_option("server.enableElementDiffing"):
+            msg_to_send = session_info.session.element_snapshot.get_msg_to_send(msg)
+            if msg_to_send is not msg:
+                # The client already displays the message's element.
+                _LOGGER.debug(
+                    "Sending unchanged element (path=%s)", msg.metadata.delta_path
+                )
+                session_info.client.write_forward_msg(msg_to_send)
+                return
+
+        msg_to_send = msg
+        if msg.metadata.cacheable:
             if self._message_cache.has_message_reference(
                 msg, session_info.session, session_info.script_run_count
             ):
@@ -713,6 +971,9 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
                 # a reference instead.
                 _LOGGER.debug("Sending cached message ref (hash=%s)", msg.hash)
                 msg_to_send = create_reference_msg(msg)
+                self._metrics.forward_msg_cache_hits.inc()
+            else:
+                self._metrics.forward_msg_cache_misses.inc()
 
             # Cache the message so it can be referenced in the future.
             # If the message is already cached, this will reset its
@@ -754,6 +1015,18 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
         async_objs = self._get_async_objs()
         async_objs.eventloop.call_soon_threadsafe(async_objs.need_send_data.set)
 
+    def _on_script_cache_cleared(self, _sender: ScriptCache) -> None:
+        """Callback called when a source file changed, and the script cache was
+        cleared. Invalidates the script health check's cached result.
+
+        Notes
+        -----
+        Threading: SAFE. May be called on any thread.
+        """
+        # Before we start, there's no result to invalidate.
+        if self._script_health_checker is not None:
+            self._script_health_checker.invalidate()
+
     def _get_async_objs(self) -> AsyncObjects:
         """Return our AsyncObjects instance. If the Runtime hasn't been
         started, this will raise an error.
@@ -762,6 +1035,14 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
             raise RuntimeError("Runtime hasn't started yet!")
         return self._async_objs
 
+    def _get_script_health_checker(self) -> ScriptHealthChecker:
+        """Return our ScriptHealthChecker instance. If the Runtime hasn't been
+        started, this will raise an error.
+        """
+        if self._script_health_checker is None:
+            raise RuntimeError("Runtime hasn't started yet!")
+        return self._script_health_checker
+
     def _on_session_disconnected(self) -> None:
         """Set the runtime state to NO_SESSIONS_CONNECTED if the last active
         session was disconnected.
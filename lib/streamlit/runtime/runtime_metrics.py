@@ -0,0 +1,364 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Server-side timing and throughput metrics of the Runtime.
+
+These metrics are exported on the `/_stcore/metrics` endpoint. They're always
+recorded: each observation only costs a bisect and a few additions, and memory
+use is fixed, since histograms only keep per-bucket counts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Final, Protocol
+
+if TYPE_CHECKING:
+    from streamlit.proto.openmetrics_data_model_pb2 import (
+        MetricFamily as MetricFamilyProto,
+    )
+
+# Bucket upper bounds, in seconds, for latencies of event loop callbacks.
+_EVENT_LOOP_LAG_BUCKETS: Final = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+# Bucket upper bounds, in seconds, for the time spent handling a message.
+_MESSAGE_HANDLING_BUCKETS: Final = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+)
+
+# Bucket upper bounds, in seconds, for latencies of script runs.
+_SCRIPT_RUN_BUCKETS: Final = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Bucket upper bounds, in bytes, for the size of a session's flushed messages.
+_FLUSH_BYTES_BUCKETS: Final = (
+    256,
+    1024,
+    4096,
+    16384,
+    65536,
+    262144,
+    1048576,
+    4194304,
+    16777216,
+)
+
+# How often the event loop lag is sampled, in seconds.
+_EVENT_LOOP_LAG_INTERVAL: Final = 0.5
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Histogram:
+    """A histogram with fixed buckets. Thread-safe."""
+
+    def __init__(
+        self, name: str, unit: str, help: str, buckets: tuple[float, ...]
+    ) -> None:
+        self.name = name
+        self.unit = unit
+        self.help = help
+        self._bounds = buckets
+        self._lock = threading.Lock()
+        # One count per bucket, plus one for values above the largest bound.
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum: float = 0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def get_cumulative_buckets(self) -> list[tuple[float, int]]:
+        """Return each bucket's upper bound and the number of values less than
+        or equal to it. The last bound is infinity.
+        """
+        return self._snapshot()[0]
+
+    def _snapshot(self) -> tuple[list[tuple[float, int]], float]:
+        with self._lock:
+            counts = list(self._counts)
+            value_sum = self._sum
+        buckets = []
+        total = 0
+        for bound, count in zip((*self._bounds, math.inf), counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets, value_sum
+
+    def to_metric_str(self) -> list[str]:
+        """Return the histogram's samples in OpenMetrics text format."""
+        buckets, value_sum = self._snapshot()
+        lines = []
+        for bound, count in buckets:
+            le = "+Inf" if math.isinf(bound) else _format_value(bound)
+            lines.append(f'{self.name}_bucket{{le="{le}"}} {count}')
+        lines.append(f"{self.name}_sum {_format_value(round(value_sum, 6))}")
+        lines.append(f"{self.name}_count {buckets[-1][1]}")
+        return lines
+
+    def marshall_metric_proto(self, metric_family: MetricFamilyProto) -> None:
+        """Add the histogram's samples to an OpenMetrics `MetricFamily`
+        protobuf object.
+        """
+        buckets, value_sum = self._snapshot()
+        histogram = metric_family.metrics.add().metric_points.add().histogram_value
+        histogram.double_value = value_sum
+        histogram.count = buckets[-1][1]
+        for bound, count in buckets:
+            bucket = histogram.buckets.add()
+            bucket.upper_bound = bound
+            bucket.count = count
+
+
+class Counter:
+    """A monotonically increasing counter. Thread-safe."""
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.unit = ""
+        self.help = help
+        self._lock = threading.Lock()
+        self._value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def to_metric_str(self) -> list[str]:
+        """Return the counter's sample in OpenMetrics text format."""
+        return [f"{self.name}_total {self._value}"]
+
+    def marshall_metric_proto(self, metric_family: MetricFamilyProto) -> None:
+        """Add the counter's sample to an OpenMetrics `MetricFamily` protobuf
+        object.
+        """
+        metric_point = metric_family.metrics.add().metric_points.add()
+        metric_point.counter_value.int_value = self._value
+
+
+class MetricsSource(Protocol):
+    """An object whose histograms and counters are exported on the
+    `/_stcore/metrics` endpoint.
+    """
+
+    @property
+    def histograms(self) -> list[Histogram]: ...
+
+    @property
+    def counters(self) -> list[Counter]: ...
+
+
+class RuntimeMetrics:
+    """The Runtime's timing and throughput metrics."""
+
+    def __init__(self) -> None:
+        self.event_loop_lag = Histogram(
+            "event_loop_lag_seconds",
+            "seconds",
+            "How late the event loop ran a callback that was scheduled for a "
+            "specific time.",
+            _EVENT_LOOP_LAG_BUCKETS,
+        )
+        self.script_queue_wait = Histogram(
+            "script_queue_wait_seconds",
+            "seconds",
+            "Time from receiving a rerun request to starting the script run.",
+            _SCRIPT_RUN_BUCKETS,
+        )
+        self.script_exec = Histogram(
+            "script_exec_seconds",
+            "seconds",
+            "Time from starting a script run to its end.",
+            _SCRIPT_RUN_BUCKETS,
+        )
+        self.first_delta = Histogram(
+            "rerun_first_delta_seconds",
+            "seconds",
+            "Time from receiving a rerun request to the first delta of the "
+            "resulting script run.",
+            _SCRIPT_RUN_BUCKETS,
+        )
+        self.session_flush_bytes = Histogram(
+            "session_flush_bytes",
+            "bytes",
+            "Serialized size of the messages sent to a session in a single flush.",
+            _FLUSH_BYTES_BUCKETS,
+        )
+        self.backmsg_handling = Histogram(
+            "backmsg_handling_seconds",
+            "seconds",
+            "Event loop time spent handling a message received from a browser.",
+            _MESSAGE_HANDLING_BUCKETS,
+        )
+        self.forward_msg_cache_hits = Counter(
+            "forward_msg_cache_hits",
+            "Number of messages replaced by a reference to a message the client "
+            "has already received.",
+        )
+        self.forward_msg_cache_misses = Counter(
+            "forward_msg_cache_misses",
+            "Number of cacheable messages that had to be sent in full.",
+        )
+        self.coalesced_reruns = Counter(
+            "coalesced_reruns",
+            "Number of rerun requests merged into a later rerun request before "
+            "reaching their session.",
+        )
+
+        # The number of bytes sent since start_counting_sent_bytes() was
+        # called, or None if bytes aren't being counted.
+        self._sent_bytes: int | None = None
+
+    @property
+    def histograms(self) -> list[Histogram]:
+        return [
+            self.event_loop_lag,
+            self.script_queue_wait,
+            self.script_exec,
+            self.first_delta,
+            self.session_flush_bytes,
+            self.backmsg_handling,
+        ]
+
+    @property
+    def counters(self) -> list[Counter]:
+        return [
+            self.forward_msg_cache_hits,
+            self.forward_msg_cache_misses,
+            self.coalesced_reruns,
+        ]
+
+    def start_counting_sent_bytes(self) -> None:
+        """Start counting the bytes passed to record_sent_bytes().
+
+        The Runtime uses this to measure the size of each session's flush.
+
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        self._sent_bytes = 0
+
+    def stop_counting_sent_bytes(self) -> int:
+        """Stop counting sent bytes, and return the number of bytes counted.
+
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        sent_bytes = self._sent_bytes or 0
+        self._sent_bytes = None
+        return sent_bytes
+
+    def record_sent_bytes(self, num_bytes: int) -> None:
+        """Count bytes serialized for a client, if bytes are being counted.
+
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        if self._sent_bytes is not None:
+            self._sent_bytes += num_bytes
+
+
+class EventLoopLagProbe:
+    """Periodically measures how late the event loop runs a timed callback."""
+
+    def __init__(
+        self,
+        histogram: Histogram,
+        interval_seconds: float = _EVENT_LOOP_LAG_INTERVAL,
+    ) -> None:
+        self._histogram = histogram
+        self._interval = interval_seconds
+        self._handle: asyncio.TimerHandle | None = None
+
+    def start(self) -> None:
+        """Start measuring on the running event loop."""
+        if self._handle is None:
+            self._schedule(asyncio.get_running_loop())
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        expected = time.monotonic() + self._interval
+        self._handle = loop.call_later(self._interval, self._on_timer, loop, expected)
+
+    def _on_timer(self, loop: asyncio.AbstractEventLoop, expected: float) -> None:
+        self._histogram.observe(max(0.0, time.monotonic() - expected))
+        self._schedule(loop)
+
+
+_runtime_metrics = RuntimeMetrics()
+
+
+def get_runtime_metrics() -> RuntimeMetrics:
+    """Return the process-wide RuntimeMetrics."""
+    return _runtime_metrics
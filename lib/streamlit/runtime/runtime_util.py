@@ -21,6 +21,7 @@ from typing import TYPE_CHECKING, Any
 from streamlit import config
 from streamlit.errors import MarkdownFormattedException, StreamlitAPIException
 from streamlit.runtime.forward_msg_cache import populate_hash_if_needed
+from streamlit.runtime.runtime_metrics import get_runtime_metrics
 
 if TYPE_CHECKING:
     from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
@@ -85,6 +86,7 @@ def serialize_forward_msg(msg: ForwardMsg) -> bytes:
         exception.marshall(msg.delta.new_element.exception, MessageSizeError(msg_str))
         msg_str = msg.SerializeToString()
 
+    get_runtime_metrics().record_sent_bytes(len(msg_str))
     return msg_str
 
 
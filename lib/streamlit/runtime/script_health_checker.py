@@ -0,0 +1,171 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cached, scheduled runs of the app's script for the script health check.
+
+Each script health check runs the whole app script, so we don't want to run it
+for every request to the script health check endpoint, which load balancers
+may probe every few seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable
+
+from typing_extensions import TypeAlias
+
+from streamlit.logger import get_logger
+
+_LOGGER = get_logger(__name__)
+
+# The result of a script health check: whether the script ran without error,
+# and a message describing the result.
+ScriptHealthCheckResult: TypeAlias = "tuple[bool, str]"
+
+
+class ScriptHealthChecker:
+    """Runs the script health check, and caches its result.
+
+    At most one check runs at a time, and requests that arrive while a check is
+    running share its result. A result is served for `ttl_seconds` after its
+    check started, or until it's invalidated because a source file changed.
+    Once started, the checker also re-runs the check every `interval_seconds`
+    in the background, so requests rarely have to wait for the script to run.
+
+    Notes
+    -----
+    Threading: UNSAFE, except for `invalidate`. Must be used on the eventloop
+    thread.
+    """
+
+    def __init__(
+        self,
+        run_check: Callable[[], Awaitable[ScriptHealthCheckResult]],
+        ttl_seconds: float,
+        interval_seconds: float,
+    ) -> None:
+        """Initialize the checker.
+
+        Parameters
+        ----------
+        run_check
+            The coroutine function that runs the app's script, and returns the
+            check's result.
+
+        ttl_seconds
+            How long a check's result is served for. If 0, results aren't cached.
+
+        interval_seconds
+            How often the check is re-run in the background, once started. If 0,
+            checks only run when a result is requested.
+        """
+        self._run_check = run_check
+        self._ttl = ttl_seconds
+        self._interval = interval_seconds
+
+        self._result: ScriptHealthCheckResult | None = None
+        self._result_expiry = 0.0
+        self._task: asyncio.Task[ScriptHealthCheckResult] | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        # Incremented on every invalidation, so that the results of checks that
+        # started before a source file changed aren't cached.
+        self._generation = 0
+        # Guards the result and generation, which are also written by invalidate.
+        self._lock = threading.Lock()
+
+    async def get_result(self) -> ScriptHealthCheckResult:
+        """Return the result of the latest check, running a new check if there's
+        no valid result.
+        """
+        with self._lock:
+            result, expiry = self._result, self._result_expiry
+        if result is not None and time.monotonic() < expiry:
+            return result
+
+        # Shield the check, so that it isn't cancelled with a single request, as
+        # other requests may be waiting for its result.
+        return await asyncio.shield(self._get_or_create_task())
+
+    def invalidate(self) -> None:
+        """Discard the cached result, e.g. because a source file changed.
+
+        Notes
+        -----
+        Threading: SAFE. May be called on any thread.
+        """
+        with self._lock:
+            self._result = None
+            self._generation += 1
+
+    def start(self) -> None:
+        """Start re-running the check in the background on the running event
+        loop, if an interval is set.
+        """
+        if self._interval > 0 and self._handle is None:
+            self._schedule(asyncio.get_running_loop())
+
+    def stop(self) -> None:
+        """Stop re-running the check in the background, and cancel the running
+        check, if any.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._task is not None:
+            self._task.cancel()
+
+    def _get_or_create_task(self) -> asyncio.Task[ScriptHealthCheckResult]:
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._check(), name="ScriptHealthChecker.check"
+            )
+        return self._task
+
+    async def _check(self) -> ScriptHealthCheckResult:
+        generation = self._generation
+        expiry = time.monotonic() + self._ttl
+        try:
+            result = await self._run_check()
+        finally:
+            self._task = None
+
+        with self._lock:
+            if generation == self._generation:
+                self._result = result
+                self._result_expiry = expiry
+        return result
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._handle = loop.call_later(self._interval, self._on_timer, loop)
+
+    def _on_timer(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._get_or_create_task().add_done_callback(
+            lambda task: self._on_scheduled_check_done(loop, task)
+        )
+
+    def _on_scheduled_check_done(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        task: asyncio.Task[ScriptHealthCheckResult],
+    ) -> None:
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            _LOGGER.warning("Script health check failed", exc_info=task.exception())
+        # Schedule the next check only if we haven't been stopped meanwhile.
+        if self._handle is not None:
+            self._schedule(loop)
@@ -14,22 +14,106 @@
 
 from __future__ import annotations
 
+import glob
+import importlib.util
+import marshal
 import os.path
 import threading
-from typing import Any
+from typing import Any, Final
 
-from streamlit import config
+from blinker import Signal
+
+from streamlit import config, util
+from streamlit.file_util import get_streamlit_file_path
+from streamlit.logger import get_logger
 from streamlit.runtime.scriptrunner import magic
 from streamlit.source_util import open_python_file
+from streamlit.version import STREAMLIT_VERSION_STRING
+
+_LOGGER: Final = get_logger(__name__)
+
+# The extension of the files that compiled scripts are persisted to.
+_BYTECODE_FILE_EXTENSION: Final = "bytecode"
+
+
+def get_default_bytecode_dir() -> str:
+    """Return the folder that compiled scripts are persisted to by default."""
+    return get_streamlit_file_path("cache", "bytecode")
+
+
+def _compile(script_path: str) -> Any:
+    with open_python_file(script_path) as f:
+        filebody = f.read()
+
+    if config.get_option("runner.magicEnabled"):
+        filebody = magic.add_magic(filebody, script_path)
+
+    return compile(  # type: ignore
+        filebody,
+        # Pass in the file path so it can show up in exceptions.
+        script_path,
+        # We're compiling entire blocks of Python, so we need "exec"
+        # mode (as opposed to "eval" or "single").
+        mode="exec",
+        # Don't inherit any flags or "future" statements.
+        flags=0,
+        dont_inherit=1,
+        # Use the default optimization options.
+        optimize=-1,
+    )
+
+
+def _get_bytecode_key(script_path: str) -> str:
+    """Return a key that changes whenever the compiled script would.
+
+    Raises
+    ------
+    OSError if the script doesn't exist.
+    """
+    stat = os.stat(script_path)
+    return util.calc_md5(
+        "\0".join(
+            str(part)
+            for part in (
+                # Marshalled code is only compatible with the same Python version.
+                importlib.util.MAGIC_NUMBER.hex(),
+                # Magic may transform scripts differently in other versions.
+                STREAMLIT_VERSION_STRING,
+                config.get_option("runner.magicEnabled"),
+                config.get_option("magic.displayRootDocString"),
+                config.get_option("magic.displayLastExprIfNoSemicolon"),
+                stat.st_mtime_ns,
+                stat.st_size,
+            )
+        )
+    )
 
 
 class ScriptCache:
-    """Thread-safe cache of Python script bytecode."""
+    """Thread-safe cache of Python script bytecode.
+
+    If `server.warmup` is enabled, compiled scripts are also persisted to disk,
+    keyed by their modification times, and loaded from there by other
+    processes (e.g. after a restart).
+    """
 
-    def __init__(self):
+    def __init__(self, bytecode_dir: str | None = None):
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        bytecode_dir
+            The folder that compiled scripts are persisted to. Defaults to
+            ~/.streamlit/cache/bytecode.
+        """
         # Mapping of script_path: bytecode
         self._cache: dict[str, Any] = {}
         self._lock = threading.Lock()
+        self._bytecode_dir = bytecode_dir or get_default_bytecode_dir()
+
+        self.on_cleared = Signal(
+            doc="Emitted, on the clearing thread, when the cache is cleared."
+        )
 
     def clear(self) -> None:
         """Remove all entries from the cache.
@@ -40,6 +124,7 @@ class ScriptCache:
         """
         with self._lock:
             self._cache.clear()
+        self.on_cleared.send(self)
 
     def get_bytecode(self, script_path: str) -> Any:
         """Return the bytecode for the Python script at the given path.
@@ -64,26 +149,52 @@ class ScriptCache:
                 # Fast path: the code is already cached.
                 return bytecode
 
-            # Populate the cache
-            with open_python_file(script_path) as f:
-                filebody = f.read()
-
-            if config.get_option("runner.magicEnabled"):
-                filebody = magic.add_magic(filebody, script_path)
-
-            bytecode = compile(  # type: ignore
-                filebody,
-                # Pass in the file path so it can show up in exceptions.
-                script_path,
-                # We're compiling entire blocks of Python, so we need "exec"
-                # mode (as opposed to "eval" or "single").
-                mode="exec",
-                # Don't inherit any flags or "future" statements.
-                flags=0,
-                dont_inherit=1,
-                # Use the default optimization options.
-                optimize=-1,
-            )
+            if config.get_option("server.warmup"):
+                bytecode = self._get_persisted_bytecode(script_path)
+            else:
+                bytecode = _compile(script_path)
 
             self._cache[script_path] = bytecode
             return bytecode
+
+    def _get_persisted_bytecode(self, script_path: str) -> Any:
+        """Load the script's bytecode from disk, or compile the script and
+        persist its bytecode if it wasn't persisted for its current version.
+        """
+        key = _get_bytecode_key(script_path)
+        path_hash = util.calc_md5(script_path)
+        bytecode_path = os.path.join(
+            self._bytecode_dir, f"{path_hash}-{key}.{_BYTECODE_FILE_EXTENSION}"
+        )
+
+        try:
+            with open(bytecode_path, "rb") as f:
+                return marshal.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # E.g. a corrupted file, which is replaced below.
+            _LOGGER.debug("Failed to load %s", bytecode_path, exc_info=True)
+
+        bytecode = _compile(script_path)
+
+        try:
+            os.makedirs(self._bytecode_dir, exist_ok=True)
+            # Remove the bytecode of the script's older versions.
+            for stale_path in glob.glob(
+                os.path.join(
+                    glob.escape(self._bytecode_dir),
+                    f"{path_hash}-*.{_BYTECODE_FILE_EXTENSION}",
+                )
+            ):
+                os.remove(stale_path)
+            # Write to a temporary file first, so that other processes never
+            # load partially written bytecode.
+            tmp_path = f"{bytecode_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                marshal.dump(bytecode, f)
+            os.replace(tmp_path, bytecode_path)
+        except OSError:
+            _LOGGER.warning("Failed to persist %s", bytecode_path, exc_info=True)
+
+        return bytecode
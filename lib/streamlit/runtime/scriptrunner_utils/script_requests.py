@@ -89,7 +89,7 @@ def _fragment_run_should_not_preempt_script(
     return bool(fragment_id_queue) and not is_fragment_scoped_rerun
 
 
-def _coalesce_widget_states(
+def coalesce_widget_states(
     old_states: WidgetStates | None, new_states: WidgetStates | None
 ) -> WidgetStates | None:
     """Coalesce an older WidgetStates into a newer one, and return a new
@@ -146,6 +146,10 @@ def _coalesce_widget_states(
     return coalesced
 
 
+# The original private name, kept for existing callers.
+_coalesce_widget_states = coalesce_widget_states
+
+
 class ScriptRequests:
     """An interface for communicating with a ScriptRunner. Thread-safe.
 
@@ -201,7 +205,7 @@ class ScriptRequests:
                 # We already have an existing Rerun request, so we can coalesce the new
                 # rerun request into the existing one.
 
-                coalesced_states = _coalesce_widget_states(
+                coalesced_states = coalesce_widget_states(
                     self._rerun_data.widget_states, new_data.widget_states
                 )
 
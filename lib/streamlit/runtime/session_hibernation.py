@@ -0,0 +1,321 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import glob
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any, Callable, Final
+
+from streamlit.logger import get_logger
+
+if TYPE_CHECKING:
+    from streamlit.runtime.app_session import AppSession
+
+_LOGGER: Final = get_logger(__name__)
+
+_DIR_PREFIX: Final = "sessions-"
+_LOCK_SUFFIX: Final = ".lock"
+
+
+@dataclass(frozen=True)
+class _HibernatedSession:
+    # Creates the AppSession again when it's restored. This only references
+    # objects shared by all sessions, and the session's (small) ScriptData and
+    # user info.
+    restore_session: Callable[[], AppSession]
+    path: str
+    size_bytes: int
+
+
+class SessionHibernator:
+    """Keeps the Session State of sessions that have been shut down on disk, so
+    that the sessions can be restored when their browser reconnects.
+
+    Only values that user code stored in Session State are kept. Widget values
+    are sent by the browser with its first rerun request after reconnecting,
+    and values that can't be pickled are dropped.
+
+    At most max_sessions sessions taking up at most max_bytes are kept. If
+    either limit is exceeded, the least recently hibernated sessions are
+    discarded.
+
+    Each SessionHibernator holds a lock on its directory while it's in use.
+    Directories that aren't locked were left behind by servers that didn't
+    shut down cleanly, and are removed when a new SessionHibernator is
+    created in the same parent directory.
+
+    Not thread-safe: this must only be used from the runtime's event loop.
+    """
+
+    def __init__(self, directory: str, max_sessions: int, max_bytes: int) -> None:
+        """Initialize a SessionHibernator.
+
+        Parameters
+        ----------
+        directory
+            The directory in which to store hibernated sessions. Each
+            SessionHibernator creates its own subdirectory in it, so the same
+            directory can be used by several Streamlit servers. Subdirectories
+            of servers that are no longer running are removed.
+
+        max_sessions
+            The maximum number of sessions to keep.
+
+        max_bytes
+            The maximum total size of the files that sessions are stored in.
+        """
+        os.makedirs(directory, exist_ok=True)
+        _remove_stale_dirs(directory)
+        # Take the lock before creating the directory, so that it's never
+        # mistaken for a stale one.
+        fd, lock_path = tempfile.mkstemp(
+            prefix=_DIR_PREFIX, suffix=_LOCK_SUFFIX, dir=directory
+        )
+        self._lock_file: IO[bytes] | None = os.fdopen(fd, "wb")
+        if not _try_lock(self._lock_file):
+            # Should never happen, as the lock file was just created.
+            _LOGGER.warning("Failed to lock %s.", lock_path)
+        self._dir = lock_path[: -len(_LOCK_SUFFIX)]
+        os.mkdir(self._dir)
+        self._max_sessions = max_sessions
+        self._max_bytes = max_bytes
+        self._sessions: OrderedDict[str, _HibernatedSession] = OrderedDict()
+        self._total_bytes = 0
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def total_bytes(self) -> int:
+        """The total size of the files that hibernated sessions are stored in."""
+        return self._total_bytes
+
+    def hibernate(self, session: AppSession) -> bool:
+        """Store the Session State of the given session on disk.
+
+        The session itself is left untouched. It's up to the caller to shut it
+        down afterwards.
+
+        Returns
+        -------
+        bool
+            True if the session was stored. False if there was nothing worth
+            storing, or if the session couldn't be stored.
+        """
+        self.discard(session.id)
+
+        values = _pickle_values(session.session_state.get_user_values())
+        if not values:
+            return False
+
+        data = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self._max_bytes:
+            _LOGGER.debug(
+                "Not hibernating session %s: its state takes up %s bytes.",
+                session.id,
+                len(data),
+            )
+            return False
+
+        path = os.path.join(self._dir, f"{session.id}.pickle")
+        try:
+            _write_atomically(path, data)
+        except OSError:
+            _LOGGER.warning(
+                "Failed to hibernate session %s.", session.id, exc_info=True
+            )
+            return False
+
+        self._sessions[session.id] = _HibernatedSession(
+            restore_session=session.make_restorer(),
+            path=path,
+            size_bytes=len(data),
+        )
+        self._total_bytes += len(data)
+        self._enforce_limits()
+        return True
+
+    def restore(self, session_id: str) -> AppSession | None:
+        """Create a new AppSession with the ID and Session State of the given
+        hibernated session, and stop tracking the hibernated session.
+
+        Must be called from the runtime's event loop, as creating an AppSession
+        requires a running event loop. The new session's file watchers are
+        disconnected, as with any other disconnected session.
+
+        Returns
+        -------
+        AppSession or None
+            The restored session, or None if no session with the given ID is
+            hibernated or it couldn't be read.
+        """
+        hibernated = self._pop(session_id)
+        if hibernated is None:
+            return None
+
+        try:
+            with open(hibernated.path, "rb") as f:
+                values: dict[str, bytes] = pickle.load(f)
+        except Exception:
+            _LOGGER.warning("Failed to restore session %s.", session_id, exc_info=True)
+            return None
+        finally:
+            _remove_file(hibernated.path)
+
+        session = hibernated.restore_session()
+        session.disconnect_file_watchers()
+        session_state = session.session_state
+        for key, pickled_value in values.items():
+            try:
+                session_state[key] = pickle.loads(pickled_value)
+            except Exception:
+                _LOGGER.debug(
+                    "Failed to restore %s in session %s.",
+                    key,
+                    session_id,
+                    exc_info=True,
+                )
+        return session
+
+    def discard(self, session_id: str) -> None:
+        """Stop tracking the given session and delete its state from disk.
+
+        Discarding a session that isn't hibernated is a no-op.
+        """
+        hibernated = self._pop(session_id)
+        if hibernated is not None:
+            _remove_file(hibernated.path)
+
+    def clear(self) -> None:
+        """Discard all hibernated sessions."""
+        for session_id in list(self._sessions):
+            self.discard(session_id)
+
+    def close(self) -> None:
+        """Discard all hibernated sessions, and remove the SessionHibernator's
+        directory. The SessionHibernator must not be used afterwards.
+        """
+        self.clear()
+        if self._lock_file is None:
+            return
+        shutil.rmtree(self._dir, ignore_errors=True)
+        self._lock_file.close()
+        self._lock_file = None
+        _remove_file(_lock_path(self._dir))
+
+    def _pop(self, session_id: str) -> _HibernatedSession | None:
+        hibernated = self._sessions.pop(session_id, None)
+        if hibernated is not None:
+            self._total_bytes -= hibernated.size_bytes
+        return hibernated
+
+    def _enforce_limits(self) -> None:
+        while self._sessions and (
+            len(self._sessions) > self._max_sessions
+            or self._total_bytes > self._max_bytes
+        ):
+            oldest_session_id = next(iter(self._sessions))
+            _LOGGER.debug("Discarding hibernated session %s.", oldest_session_id)
+            self.discard(oldest_session_id)
+
+
+def _lock_path(session_dir: str) -> str:
+    return f"{session_dir}{_LOCK_SUFFIX}"
+
+
+def _try_lock(lock_file: IO[bytes]) -> bool:
+    """Take an exclusive lock on the given file without blocking. The lock is
+    released when the file is closed, including when its process exits.
+
+    Returns
+    -------
+    bool
+        True if the lock was taken, False if someone else holds it.
+    """
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _remove_stale_dirs(directory: str) -> None:
+    """Remove the subdirectories of directory (and their lock files) that no
+    SessionHibernator holds a lock on, e.g. because their server was killed.
+    """
+    session_dirs = {
+        path.removesuffix(_LOCK_SUFFIX)
+        for path in glob.glob(os.path.join(directory, f"{_DIR_PREFIX}*"))
+    }
+    for session_dir in sorted(session_dirs):
+        lock_path = _lock_path(session_dir)
+        try:
+            lock_file = open(lock_path, "ab")
+        except OSError:
+            continue
+        with lock_file:
+            if not _try_lock(lock_file):
+                continue
+            _LOGGER.debug("Removing stale hibernated sessions in %s.", session_dir)
+            shutil.rmtree(session_dir, ignore_errors=True)
+        _remove_file(lock_path)
+
+
+def _pickle_values(values: dict[str, Any]) -> dict[str, bytes]:
+    """Pickle each of the given values, skipping those that can't be pickled."""
+    pickled_values: dict[str, bytes] = {}
+    for key, value in values.items():
+        try:
+            pickled_values[key] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            _LOGGER.debug("Not hibernating unpicklable value %s.", key, exc_info=True)
+    return pickled_values
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    """Write data to path, such that path never holds partially written data."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove_file(tmp_path)
+        raise
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        _LOGGER.warning("Failed to remove %s.", path, exc_info=True)
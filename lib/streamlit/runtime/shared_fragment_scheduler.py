@@ -0,0 +1,290 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Scheduled runs of shared fragments.
+
+A fragment declared with `@st.fragment(run_every=..., shared=True)` isn't
+rerun by each browser. Instead, the runtime runs it once per interval, and
+sends the resulting messages to every session that rendered it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Final
+
+from streamlit.errors import FragmentHandledException
+from streamlit.logger import get_logger
+from streamlit.runtime.forward_msg_cache import populate_hash_if_needed
+from streamlit.runtime.fragment import MemoryFragmentStorage
+from streamlit.runtime.scriptrunner_utils.exceptions import (
+    RerunException,
+    StopException,
+)
+from streamlit.runtime.scriptrunner_utils.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME,
+    ScriptRunContext,
+    add_script_run_ctx,
+)
+
+if TYPE_CHECKING:
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from streamlit.runtime.app_session import AppSession
+    from streamlit.runtime.media_file_manager import MediaFileManager
+
+_LOGGER: Final = get_logger(__name__)
+
+
+@dataclass
+class _SharedFragment:
+    run: Callable[[], Any]
+    interval_seconds: float
+    # The ScriptRunContext of the latest script run that rendered the
+    # fragment. Shared runs take the app-level (not session-level) fields of
+    # their context from it.
+    declaring_ctx: ScriptRunContext
+    session_ids: set[str] = field(default_factory=set)
+    handle: asyncio.TimerHandle | None = None
+
+
+def _get_shared_session_id(fragment_id: str) -> str:
+    """Return the session ID that a shared fragment's runs use, e.g. to
+    reference their media files.
+    """
+    return f"shared-fragment-{fragment_id}"
+
+
+class SharedFragmentScheduler:
+    """Runs each shared fragment once per interval, and sends the result to all
+    sessions that render it.
+
+    Sessions subscribe to a shared fragment when their script run renders it,
+    and are unsubscribed once they don't render it anymore (or disconnect).
+    The fragment's runs stop when it has no subscribed sessions.
+
+    Notes
+    -----
+    Threading: UNSAFE, except for `subscribe`. Must be used on the eventloop
+    thread.
+    """
+
+    def __init__(
+        self,
+        get_session: Callable[[str], AppSession | None],
+        media_file_mgr: MediaFileManager,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Parameters
+        ----------
+        get_session
+            Returns the active session with the given ID, or None if there's
+            no such session.
+
+        media_file_mgr
+            The runtime's MediaFileManager, which stores the media files of
+            shared fragment runs.
+        """
+        self._get_session = get_session
+        self._media_file_mgr = media_file_mgr
+
+        # Guards _fragments, and the session_ids of its entries, which are
+        # also written by subscribe.
+        self._lock = threading.Lock()
+        self._fragments: dict[str, _SharedFragment] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        # References to running ticks, so that they aren't garbage collected.
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def subscribe(
+        self,
+        fragment_id: str,
+        run: Callable[[], Any],
+        interval_seconds: float,
+        ctx: ScriptRunContext,
+    ) -> None:
+        """Subscribe the session of ctx to the shared fragment's runs.
+
+        Notes
+        -----
+        Threading: SAFE. May be called on any thread.
+        """
+        with self._lock:
+            fragment = self._fragments.get(fragment_id)
+            is_new = fragment is None
+            if fragment is None:
+                fragment = _SharedFragment(run, interval_seconds, ctx)
+                self._fragments[fragment_id] = fragment
+            else:
+                # The latest declaration wins, e.g. if the app's source changed.
+                fragment.run = run
+                fragment.interval_seconds = interval_seconds
+                fragment.declaring_ctx = ctx
+            fragment.session_ids.add(ctx.session_id)
+            loop = self._loop
+
+        if is_new and loop is not None:
+            loop.call_soon_threadsafe(self._schedule, fragment_id)
+
+    def start(self) -> None:
+        """Start running the shared fragments on the running event loop."""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(thread_name_prefix="SharedFragment")
+        with self._lock:
+            fragment_ids = list(self._fragments)
+        for fragment_id in fragment_ids:
+            self._schedule(fragment_id)
+
+    def stop(self) -> None:
+        """Stop running the shared fragments."""
+        with self._lock:
+            for fragment in self._fragments.values():
+                if fragment.handle is not None:
+                    fragment.handle.cancel()
+                    fragment.handle = None
+        for task in self._tasks:
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._loop = None
+
+    def _schedule(self, fragment_id: str) -> None:
+        with self._lock:
+            fragment = self._fragments.get(fragment_id)
+            if fragment is None or self._loop is None or fragment.handle is not None:
+                return
+            fragment.handle = self._loop.call_later(
+                fragment.interval_seconds, self._on_timer, fragment_id
+            )
+
+    def _on_timer(self, fragment_id: str) -> None:
+        task = asyncio.create_task(
+            self._tick(fragment_id), name=f"SharedFragmentScheduler.tick.{fragment_id}"
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _tick(self, fragment_id: str) -> None:
+        with self._lock:
+            fragment = self._fragments.get(fragment_id)
+            if fragment is None:
+                return
+            fragment.handle = None
+
+        if not self._prune_sessions(fragment_id, fragment):
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            msgs = await loop.run_in_executor(
+                self._executor, self._run_fragment, fragment_id, fragment
+            )
+        except Exception:
+            _LOGGER.warning(
+                "Failed to run shared fragment %s", fragment_id, exc_info=True
+            )
+        else:
+            self._fan_out(fragment_id, msgs)
+        self._schedule(fragment_id)
+
+    def _prune_sessions(self, fragment_id: str, fragment: _SharedFragment) -> bool:
+        """Unsubscribe sessions that don't render the fragment anymore, and
+        remove the fragment if no sessions are left.
+
+        Returns True if the fragment still has subscribed sessions.
+        """
+        with self._lock:
+            session_ids = list(fragment.session_ids)
+
+        for session_id in session_ids:
+            session = self._get_session(session_id)
+            if session is None or not session.renders_fragment(fragment_id):
+                with self._lock:
+                    fragment.session_ids.discard(session_id)
+
+        with self._lock:
+            if fragment.session_ids:
+                return True
+            del self._fragments[fragment_id]
+
+        _LOGGER.debug("Stopping shared fragment %s without sessions", fragment_id)
+        self._media_file_mgr.clear_session_refs(_get_shared_session_id(fragment_id))
+        self._media_file_mgr.remove_orphaned_files()
+        return False
+
+    def _run_fragment(self, fragment_id: str, fragment: _SharedFragment) -> list[bytes]:
+        """Run the fragment on the current (worker) thread, and return its
+        messages, hashed and serialized.
+        """
+        session_id = _get_shared_session_id(fragment_id)
+        msgs: list[ForwardMsg] = []
+        declaring_ctx = fragment.declaring_ctx
+
+        # This needs to be lazily imported to avoid a dependency cycle.
+        from streamlit.runtime.state import SafeSessionState, SessionState
+
+        # Shared runs are independent of any session: they get their own
+        # session state, and no user info or query params.
+        ctx = ScriptRunContext(
+            session_id=session_id,
+            _enqueue=msgs.append,
+            query_string="",
+            session_state=SafeSessionState(SessionState(), lambda: None),
+            uploaded_file_mgr=declaring_ctx.uploaded_file_mgr,
+            main_script_path=declaring_ctx.main_script_path,
+            user_info={},
+            fragment_storage=MemoryFragmentStorage(),
+            pages_manager=declaring_ctx.pages_manager,
+            fragment_ids_this_run=[fragment_id],
+            _has_script_started=True,
+            _active_script_hash=declaring_ctx.active_script_hash,
+        )
+
+        thread = threading.current_thread()
+        add_script_run_ctx(thread, ctx)
+        self._media_file_mgr.clear_session_refs(session_id)
+        try:
+            fragment.run()
+        except FragmentHandledException:
+            # The fragment already enqueued an exception element, which is sent
+            # to the sessions like the fragment's other elements.
+            pass
+        except (RerunException, StopException):
+            _LOGGER.debug("Shared fragment %s stopped early", fragment_id)
+        finally:
+            delattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME)
+            self._media_file_mgr.remove_orphaned_files()
+
+        serialized_msgs = []
+        for msg in msgs:
+            populate_hash_if_needed(msg)
+            serialized_msgs.append(msg.SerializeToString())
+        return serialized_msgs
+
+    def _fan_out(self, fragment_id: str, msgs: list[bytes]) -> None:
+        with self._lock:
+            fragment = self._fragments.get(fragment_id)
+            session_ids = list(fragment.session_ids) if fragment else []
+
+        for session_id in session_ids:
+            session = self._get_session(session_id)
+            if session is not None:
+                session.handle_shared_fragment_run(fragment_id, msgs)
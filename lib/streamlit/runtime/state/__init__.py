@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from streamlit.runtime.state.client_widget_states import ClientWidgetStates
 from streamlit.runtime.state.common import WidgetArgs, WidgetCallback, WidgetKwargs
 from streamlit.runtime.state.query_params_proxy import QueryParamsProxy
 from streamlit.runtime.state.safe_session_state import SafeSessionState
@@ -27,6 +28,7 @@ from streamlit.runtime.state.session_state_proxy import (
 from streamlit.runtime.state.widgets import register_widget
 
 __all__ = [
+    "ClientWidgetStates",
     "WidgetArgs",
     "WidgetCallback",
     "WidgetKwargs",
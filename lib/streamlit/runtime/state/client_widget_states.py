@@ -0,0 +1,93 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+from streamlit.logger import get_logger
+from streamlit.proto.ClientState_pb2 import ClientState
+
+if TYPE_CHECKING:
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+_LOGGER: Final = get_logger(__name__)
+
+
+class ClientWidgetStates:
+    """The widget states most recently sent by a session's browser.
+
+    If "server.enableWidgetStateDeltas" is set, browsers only send the widgets
+    whose state changed since their previous rerun request, stamped with the
+    version of the widget states the delta applies to. This class keeps the
+    full widget states of the browser, so that deltas can be resolved into
+    complete WidgetStates before they're handed to the ScriptRunner.
+
+    Not thread-safe: this is only used from the AppSession's event loop.
+    """
+
+    def __init__(self):
+        self._states: dict[str, WidgetState] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """The version of the most recently received widget states."""
+        return self._version
+
+    def resolve(self, client_state: ClientState) -> ClientState | None:
+        """Record the widget states of a ClientState received from the browser.
+
+        Returns a ClientState with the browser's complete widget states. If
+        client_state doesn't hold a delta, it's returned as-is.
+
+        Returns None if client_state holds a delta against widget states other
+        than the latest known ones. The delta is dropped, and the browser must
+        be asked to send its complete widget states.
+        """
+        widget_states = client_state.widget_states
+        if not widget_states.base_version:
+            # The browser sent the state of every widget. Note that we keep
+            # references to the WidgetState messages rather than copies.
+            self._states = {state.id: state for state in widget_states.widgets}
+            self._version = widget_states.version
+            return client_state
+
+        if widget_states.base_version != self._version:
+            # This can only happen if the browser and server disagree about
+            # which messages were received, e.g. if the session was restored
+            # on a new server. Applying the delta to other states than its
+            # base would run the script with widget values that the browser
+            # never had.
+            _LOGGER.warning(
+                "Received widget state delta for version %s, but the latest "
+                "known version is %s. Requesting the complete widget states.",
+                widget_states.base_version,
+                self._version,
+            )
+            return None
+
+        for widget_id in widget_states.removed_widget_ids:
+            self._states.pop(widget_id, None)
+        for state in widget_states.widgets:
+            self._states[state.id] = state
+        self._version = widget_states.version
+
+        resolved = ClientState()
+        resolved.CopyFrom(client_state)
+        resolved.widget_states.ClearField("widgets")
+        resolved.widget_states.ClearField("removed_widget_ids")
+        resolved.widget_states.ClearField("base_version")
+        resolved.widget_states.widgets.extend(self._states.values())
+        return resolved
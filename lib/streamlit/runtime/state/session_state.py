@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import datetime
 import json
 import pickle
 from copy import deepcopy
@@ -24,7 +25,6 @@ from typing import (
     Final,
     Iterator,
     KeysView,
-    List,
     MutableMapping,
     Union,
     cast,
@@ -73,6 +73,9 @@ class Value:
 
     value: Any
 
+    # The serialized value that `value` was deserialized from, if any.
+    serialized: WidgetStateProto | None = field(default=None, compare=False)
+
 
 WState: TypeAlias = Union[Value, Serialized]
 
@@ -138,7 +141,7 @@ class WStates(MutableMapping[str, Any]):
             )
         )
 
-        self.states[k] = Value(deserialized)
+        self.states[k] = Value(deserialized, serialized=wstate.value)
         return deserialized
 
     def __setitem__(self, k: str, v: WState) -> None:
@@ -246,14 +249,26 @@ class WStates(MutableMapping[str, Any]):
 
         return widget
 
+    def get_source_proto(self, k: str, value: Any) -> WidgetStateProto | None:
+        """Return the WidgetStateProto that the given value of widget k was
+        deserialized from.
+
+        Return None if the widget's current value isn't `value` (by identity),
+        or if it wasn't deserialized from a WidgetStateProto (e.g. because it
+        was set from Python).
+        """
+        wstate = self.states.get(k)
+        if isinstance(wstate, Value) and wstate.value is value:
+            return wstate.serialized
+        return None
+
     def as_widget_states(self) -> list[WidgetStateProto]:
         """Return a list of serialized widget values for each widget with a value."""
-        states = [
-            self.get_serialized(widget_id)
-            for widget_id in self.states.keys()
-            if self.get_serialized(widget_id)
-        ]
-        states = cast(List[WidgetStateProto], states)
+        states: list[WidgetStateProto] = []
+        for widget_id in self.states.keys():
+            serialized = self.get_serialized(widget_id)
+            if serialized:
+                states.append(serialized)
         return states
 
     def call_callback(self, widget_id: str) -> None:
@@ -365,6 +380,11 @@ class SessionState:
     # widget state at one point.
     query_params: QueryParams = field(default_factory=QueryParams)
 
+    # The WidgetStateProtos that widget values in _old_state were deserialized
+    # from, keyed by widget id. Used to detect unchanged widgets by comparing
+    # serialized values, without deserializing them.
+    _old_widget_protos: dict[str, WidgetStateProto] = field(default_factory=dict)
+
     def __repr__(self):
         return util.repr_(self)
 
@@ -374,19 +394,26 @@ class SessionState:
         _old_state dict, and then clear our current session_state and
         widget_state.
         """
+        self._old_widget_protos = {}
         for key_or_wid in self:
             try:
-                self._old_state[key_or_wid] = self[key_or_wid]
+                value = self[key_or_wid]
             except KeyError:
                 # handle key errors from widget state not having metadata gracefully
                 # https://github.com/streamlit/streamlit/issues/7206
-                pass
+                continue
+
+            self._old_state[key_or_wid] = value
+            source_proto = self._new_widget_state.get_source_proto(key_or_wid, value)
+            if source_proto is not None:
+                self._old_widget_protos[key_or_wid] = source_proto
         self._new_session_state.clear()
         self._new_widget_state.clear()
 
     def clear(self) -> None:
         """Reset self completely, clearing all current and old values."""
         self._old_state.clear()
+        self._old_widget_protos.clear()
         self._new_session_state.clear()
         self._new_widget_state.clear()
         self._key_id_mapper.clear()
@@ -417,6 +444,18 @@ class SessionState:
 
         return state
 
+    def get_user_values(self) -> dict[str, Any]:
+        """The values set in session state by user code, keyed by user key.
+
+        Unlike filtered_state, this excludes the values of keyed widgets,
+        which browsers send along with every rerun request.
+        """
+        return {
+            k: self[k]
+            for k in self._keys()
+            if not is_element_id(k) and not _is_internal_key(k)
+        }
+
     def _keys(self) -> set[str]:
         """All keys active in Session State, with widget keys converted
         to widget ids when one is known. (This includes autogenerated keys
@@ -556,8 +595,32 @@ class SessionState:
         self._reset_triggers()
         self._compact_state()
         self.set_widgets_from_proto(latest_widget_states)
+        self._reuse_unchanged_widget_values()
         self._call_callbacks()
 
+    def _reuse_unchanged_widget_values(self) -> None:
+        """Reuse the old values of widgets whose serialized value is the same
+        as the one their old value was deserialized from.
+
+        This saves deserializing unchanged values, e.g. long strings or tuples,
+        when the script reads them.
+
+        Only immutable values are reused: the previous script run may have
+        mutated a list or dict in place (e.g. appended to the value of
+        st.multiselect), so those are deserialized again.
+        """
+        for widget_id, old_proto in self._old_widget_protos.items():
+            new_wstate = self._new_widget_state.states.get(widget_id)
+            old_value = self._old_state[widget_id]
+            if (
+                isinstance(new_wstate, Serialized)
+                and new_wstate.value == old_proto
+                and _is_immutable(old_value)
+            ):
+                self._new_widget_state[widget_id] = Value(
+                    old_value, serialized=new_wstate.value
+                )
+
     def _call_callbacks(self) -> None:
         """Call any callback associated with each widget whose value
         changed between the previous and current script runs.
@@ -577,8 +640,20 @@ class SessionState:
         """True if the given widget's value changed between the previous
         script run and the current script run.
         """
+        new_wstate = self._new_widget_state.states.get(widget_id)
+        if isinstance(new_wstate, Serialized) and new_wstate.value == (
+            self._old_widget_protos.get(widget_id)
+        ):
+            # The widget's serialized value is the one its old value was
+            # deserialized from, so there's no need to deserialize it.
+            return False
+
         new_value = self._new_widget_state.get(widget_id)
         old_value = self._old_state.get(widget_id)
+        if new_value is old_value:
+            # See _reuse_unchanged_widget_values. This avoids potentially
+            # expensive comparisons of large values.
+            return False
         changed: bool = new_value != old_value
         return changed
 
@@ -736,6 +811,29 @@ class SessionState:
             self._check_serializable()
 
 
+_IMMUTABLE_TYPES: Final = (
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+)
+
+
+def _is_immutable(value: Any) -> bool:
+    """True if value can't be changed in place. Only covers the types that
+    widget values are commonly made of; anything else counts as mutable.
+    """
+    if isinstance(value, (tuple, frozenset)):
+        return all(_is_immutable(item) for item in value)
+    return isinstance(value, _IMMUTABLE_TYPES)
+
+
 def _is_internal_key(key: str) -> bool:
     return key.startswith(STREAMLIT_INTERNAL_KEY_PREFIX)
 
@@ -39,7 +39,13 @@ def patch_config_options(config_overrides: dict[str, Any]):
 
     mock_get_option = build_mock_config_get_option(config_overrides)
     with patch.object(config, "get_option", new=mock_get_option):
-        yield
+        # Values derived from config options must be computed again, both
+        # with and after the overrides.
+        config.bump_config_version()
+        try:
+            yield
+        finally:
+            config.bump_config_version()
 
 
 def build_mock_config_get_option(overrides_dict):
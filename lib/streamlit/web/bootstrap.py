@@ -26,6 +26,8 @@ from streamlit.git_util import MIN_GIT_VERSION, GitRepo
 from streamlit.logger import get_logger
 from streamlit.watcher import report_watchdog_availability, watch_file
 from streamlit.web.server import Server, server_address_is_unix_socket, server_util
+from streamlit.web.server.server import bind_listening_sockets
+from streamlit.web.server.workers import Worker, start_workers
 
 _LOGGER: Final = get_logger(__name__)
 
@@ -102,10 +104,14 @@ def _fix_sys_argv(main_script_path: str, args: list[str]) -> None:
 
 
 def _on_server_start(server: Server) -> None:
-    _maybe_print_old_git_warning(server.main_script_path)
-    _maybe_print_static_folder_warning(server.main_script_path)
-    _print_url(server.is_running_hello)
-    report_watchdog_availability()
+    # In worker mode, all workers serve the same URL. Only print it (and open
+    # the browser) once.
+    is_primary_worker = server.is_primary_worker
+    if is_primary_worker:
+        _maybe_print_old_git_warning(server.main_script_path)
+        _maybe_print_static_folder_warning(server.main_script_path)
+        _print_url(server.is_running_hello)
+        report_watchdog_availability()
 
     # Load secrets.toml if it exists. If the file doesn't exist, this
     # function will return without raising an exception. We catch any parse
@@ -133,7 +139,45 @@ def _on_server_start(server: Server) -> None:
         cli_util.open_browser(server_util.get_url(addr))
 
     # Schedule the browser to open on the main thread.
-    asyncio.get_running_loop().call_soon(maybe_open_browser)
+    if is_primary_worker:
+        asyncio.get_running_loop().call_soon(maybe_open_browser)
+
+
+async def _maybe_warm_up(server: Server) -> None:
+    """Warm up the server if `server.warmup` is enabled.
+
+    Until this returns, the server's health endpoint doesn't report it as
+    ready.
+    """
+    if not config.get_option("server.warmup"):
+        return
+
+    warmup_script = config.get_option("server.warmupScript")
+    await server.warm_up(os.path.abspath(warmup_script) if warmup_script else None)
+
+
+def _maybe_start_workers() -> Worker | None:
+    """Fork worker processes if `server.workers` is greater than 1.
+
+    Returns the current worker in worker processes, and None if worker mode is
+    disabled. The original process supervises the workers and never returns.
+    """
+    num_workers = config.get_option("server.workers")
+    if num_workers <= 1:
+        return None
+
+    if not hasattr(os, "fork"):
+        _LOGGER.warning(
+            "server.workers is set to %s, but worker processes aren't supported "
+            "on this platform. Running a single server process instead.",
+            num_workers,
+        )
+        return None
+
+    # Bind the public sockets before forking, so that all workers accept
+    # connections from them, and so that the port is only chosen once.
+    sockets = bind_listening_sockets()
+    return start_workers(num_workers, sockets)
 
 
 def _fix_pydeck_mapbox_api_warning() -> None:
@@ -307,10 +351,11 @@ def run(
     _fix_tornado_crash()
     _fix_sys_argv(main_script_path, args)
     _fix_pydeck_mapbox_api_warning()
+    worker = _maybe_start_workers()
     _install_config_watchers(flag_options)
 
     # Create the server. It won't start running yet.
-    server = Server(main_script_path, is_hello)
+    server = Server(main_script_path, is_hello, worker)
 
     async def run_server() -> None:
         # Start the server
@@ -321,6 +366,8 @@ def run(
         # and close all our threads
         _set_up_signal_handler(server)
 
+        await _maybe_warm_up(server)
+
         # Wait until `Server.stop` is called, either by our signal handler, or
         # by a debug websocket session.
         await server.stopped
@@ -16,23 +16,41 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from streamlit import config
 from streamlit.runtime.caching.storage.local_disk_cache_storage import (
     LocalDiskCacheStorageManager,
 )
+from streamlit.runtime.caching.storage.sqlite_cache_storage import (
+    SQLiteCacheStorageManager,
+)
 
 if TYPE_CHECKING:
     from streamlit.runtime.caching.storage import CacheStorageManager
 
 
-def create_default_cache_storage_manager() -> CacheStorageManager:
+def create_default_cache_storage_manager(
+    shared_cache_path: str | None = None,
+) -> CacheStorageManager:
     """
     Get the cache storage manager.
     It would be used both in server.py and in cli.py to have unified cache storage
 
+    Parameters
+    ----------
+    shared_cache_path
+        If set, cached values are stored in a SQLite database at this path, so
+        that they're shared by all processes using it (e.g. server workers).
+
     Returns
     -------
     CacheStorageManager
         The cache storage manager.
 
     """
-    return LocalDiskCacheStorageManager()
+    max_persisted_size_mb = config.get_option("server.maxPersistedCacheSize")
+    max_persisted_size_bytes = (
+        max_persisted_size_mb * 1024 * 1024 if max_persisted_size_mb > 0 else None
+    )
+    if shared_cache_path is not None:
+        return SQLiteCacheStorageManager(shared_cache_path, max_persisted_size_bytes)
+    return LocalDiskCacheStorageManager(max_persisted_size_bytes)
@@ -17,9 +17,11 @@ from __future__ import annotations
 import base64
 import binascii
 import json
+from timeit import default_timer as timer
 from typing import TYPE_CHECKING, Any, Awaitable, Final
 
 import tornado.concurrent
+import tornado.ioloop
 import tornado.locks
 import tornado.netutil
 import tornado.web
@@ -30,21 +32,57 @@ from streamlit import config
 from streamlit.logger import get_logger
 from streamlit.proto.BackMsg_pb2 import BackMsg
 from streamlit.runtime import Runtime, SessionClient, SessionClientDisconnectedError
+from streamlit.runtime.runtime_metrics import get_runtime_metrics
 from streamlit.runtime.runtime_util import serialize_forward_msg
+from streamlit.web.server.rerun_coalescer import RerunCoalescer
 from streamlit.web.server.server_util import is_url_from_allowed_origins
 
 if TYPE_CHECKING:
+    from tornado.httputil import HTTPHeaders
+
     from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from streamlit.web.server.websocket_keepalive import WebSocketKeepalive
+    from streamlit.web.server.workers import WorkerRouting
 
 _LOGGER: Final = get_logger(__name__)
 
+# Messages at least this large are parsed in a thread, off the event loop.
+_MIN_OFF_LOOP_PARSE_BYTES: Final = 1024 * 1024
+
+
+def get_existing_session_id(headers: HTTPHeaders) -> str | None:
+    """Return the ID of the session that a websocket connection request wants to
+    reconnect to, if any.
+
+    See the NOTE in the docstring of `BrowserWebSocketHandler.select_subprotocol`
+    for why the session ID is passed in the Sec-WebSocket-Protocol header.
+    """
+    try:
+        ws_protocols = [p.strip() for p in headers["Sec-Websocket-Protocol"].split(",")]
+    except KeyError:
+        return None
+
+    if len(ws_protocols) >= 3:
+        return ws_protocols[2]
+    return None
+
 
 class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
     """Handles a WebSocket connection from the browser"""
 
-    def initialize(self, runtime: Runtime) -> None:
+    def initialize(
+        self,
+        runtime: Runtime,
+        keepalive: WebSocketKeepalive | None = None,
+        worker_routing: WorkerRouting | None = None,
+    ) -> None:
         self._runtime = runtime
+        self._keepalive = keepalive
+        self._worker_routing = worker_routing
         self._session_id: str | None = None
+        self._rerun_coalescer = RerunCoalescer(
+            config.get_option("server.rerunCoalescingWindow"), self._forward_backmsg
+        )
         # The XSRF cookie is normally set when xsrf_form_html is used, but in a
         # pure-Javascript application that does not use any regular forms we just
         # need to read the self.xsrf_token manually to set the cookie as a side
@@ -107,32 +145,40 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
             "email": None if is_public_cloud_app else email
         }
 
-        existing_session_id = None
-        try:
-            ws_protocols = [
-                p.strip()
-                for p in self.request.headers["Sec-Websocket-Protocol"].split(",")
-            ]
-
-            if len(ws_protocols) >= 3:
-                # See the NOTE in the docstring of the `select_subprotocol` method above
-                # for a detailed explanation of why this is done.
-                existing_session_id = ws_protocols[2]
-        except KeyError:
-            # Just let existing_session_id=None if we run into any error while trying to
-            # extract it from the Sec-Websocket-Protocol header.
-            pass
-
-        self._session_id = self._runtime.connect_session(
-            client=self,
-            user_info=user_info,
-            existing_session_id=existing_session_id,
-        )
+        existing_session_id = get_existing_session_id(self.request.headers)
+
+        if self._worker_routing is not None and not (
+            existing_session_id and self._runtime.session_exists(existing_session_id)
+        ):
+            # In worker mode, new sessions get an ID that tells other workers
+            # that the session lives in this worker.
+            self._session_id = self._runtime.connect_session(
+                client=self,
+                user_info=user_info,
+                session_id_override=self._worker_routing.new_session_id(),
+            )
+        else:
+            self._session_id = self._runtime.connect_session(
+                client=self,
+                user_info=user_info,
+                existing_session_id=existing_session_id,
+            )
+
+        if self._keepalive is not None:
+            self._keepalive.register(self)
         return None
 
+    def on_pong(self, data: bytes) -> None:
+        if self._keepalive is not None:
+            self._keepalive.on_pong(self)
+
     def on_close(self) -> None:
+        if self._keepalive is not None:
+            self._keepalive.unregister(self)
         if not self._session_id:
             return
+        # Let the session handle the last rerun request the browser sent.
+        self._rerun_coalescer.flush()
         self._runtime.disconnect_session(self._session_id)
         self._session_id = None
 
@@ -148,32 +194,74 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
             return {}
         return None
 
-    def on_message(self, payload: str | bytes) -> None:
+    def on_message(self, payload: str | bytes) -> Awaitable[None] | None:
+        if self._keepalive is not None:
+            self._keepalive.on_received(self)
+
         if not self._session_id:
-            return
+            return None
 
-        try:
-            if isinstance(payload, str):
-                # Sanity check. (The frontend should only be sending us bytes;
-                # Protobuf.ParseFromString does not accept str input.)
-                raise RuntimeError(
-                    "WebSocket received an unexpected `str` message. "
-                    "(We expect `bytes` only.)"
-                )
+        if len(payload) >= _MIN_OFF_LOOP_PARSE_BYTES:
+            # Parsing large messages (e.g. data editor edits) could block the
+            # event loop for a while. Tornado waits for the returned coroutine
+            # before calling on_message again, so messages are still handled
+            # in order.
+            return self._parse_off_loop_and_handle(payload)
 
-            msg = BackMsg()
-            msg.ParseFromString(payload)
-            _LOGGER.debug("Received the following back message:\n%s", msg)
+        start = timer()
+        try:
+            msg = _parse_backmsg(payload)
+        except Exception as ex:
+            self._handle_deserialization_exception(ex)
+        else:
+            self._handle_backmsg(msg)
+        finally:
+            get_runtime_metrics().backmsg_handling.observe(timer() - start)
+        return None
 
+    async def _parse_off_loop_and_handle(self, payload: str | bytes) -> None:
+        try:
+            msg = await tornado.ioloop.IOLoop.current().run_in_executor(
+                None, _parse_backmsg, payload
+            )
         except Exception as ex:
-            _LOGGER.error(ex)
-            self._runtime.handle_backmsg_deserialization_exception(self._session_id, ex)
+            if self._session_id:
+                self._handle_deserialization_exception(ex)
+            return
+
+        if not self._session_id:
+            # The connection was closed while parsing.
             return
 
+        start = timer()
+        self._handle_backmsg(msg)
+        get_runtime_metrics().backmsg_handling.observe(timer() - start)
+
+    def _handle_deserialization_exception(self, ex: Exception) -> None:
+        assert self._session_id is not None
+        _LOGGER.error(ex)
+        self._runtime.handle_backmsg_deserialization_exception(self._session_id, ex)
+
+    def _handle_backmsg(self, msg: BackMsg) -> None:
+        _LOGGER.debug("Received the following back message:\n%s", msg)
+
+        msg_type = msg.WhichOneof("type")
+        if msg_type == "app_heartbeat":
+            # App heartbeats only keep the connection alive, which receiving
+            # them already did.
+            return
+
+        if msg_type == "rerun_script":
+            self._rerun_coalescer.on_rerun(msg)
+            return
+
+        # Forward any pending rerun request first, to keep messages in order.
+        self._rerun_coalescer.flush()
+
         # "debug_disconnect_websocket" and "debug_shutdown_runtime" are special
         # developmentMode-only messages used in e2e tests to test reconnect handling and
         # disabling widgets.
-        if msg.WhichOneof("type") == "debug_disconnect_websocket":
+        if msg_type == "debug_disconnect_websocket":
             if config.get_option("global.developmentMode") or config.get_option(
                 "global.e2eTest"
             ):
@@ -182,7 +270,7 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
                 _LOGGER.warning(
                     "Client tried to disconnect websocket when not in development mode or e2e testing."
                 )
-        elif msg.WhichOneof("type") == "debug_shutdown_runtime":
+        elif msg_type == "debug_shutdown_runtime":
             if config.get_option("global.developmentMode") or config.get_option(
                 "global.e2eTest"
             ):
@@ -193,4 +281,22 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
                 )
         else:
             # AppSession handles all other BackMsg types.
+            self._forward_backmsg(msg)
+
+    def _forward_backmsg(self, msg: BackMsg) -> None:
+        if self._session_id:
             self._runtime.handle_backmsg(self._session_id, msg)
+
+
+def _parse_backmsg(payload: str | bytes) -> BackMsg:
+    if isinstance(payload, str):
+        # Sanity check. (The frontend should only be sending us bytes;
+        # Protobuf.ParseFromString does not accept str input.)
+        raise RuntimeError(
+            "WebSocket received an unexpected `str` message. "
+            "(We expect `bytes` only.)"
+        )
+
+    msg = BackMsg()
+    msg.ParseFromString(payload)
+    return msg
@@ -0,0 +1,193 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Coalesces rerun requests that a browser sends in quick succession.
+
+While a user drags a slider, the browser sends a rerun request for each new
+value. Each request would interrupt the script run started by the previous one,
+so forwarding all of them to the session mostly costs event loop time. Instead,
+each websocket connection forwards at most one rerun request per
+`server.rerunCoalescingWindow`, and rerun requests received in between are
+merged into a single pending request that's forwarded when the window ends.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Callable
+
+import tornado.ioloop
+
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.proto.WidgetStates_pb2 import WidgetStates
+from streamlit.runtime.runtime_metrics import get_runtime_metrics
+from streamlit.runtime.scriptrunner_utils.script_requests import coalesce_widget_states
+
+if TYPE_CHECKING:
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+
+
+def coalesce_client_states(old: ClientState, new: ClientState) -> ClientState:
+    """Merge two consecutive rerun requests' ClientStates into one that has the
+    same effect as handling both in order.
+
+    The result is `new`, with widget states that also include `old`'s widget
+    states if `new` only holds a delta of the widget states (see
+    "server.enableWidgetStateDeltas"), with `old`'s button triggers, so that
+    button clicks don't go missing, and with `old`'s request to resend all
+    elements.
+    """
+    old_states = old.widget_states
+    new_states = new.widget_states
+    new_is_delta = new_states.base_version != 0
+
+    removed_ids: dict[str, None] = {}
+    if new_is_delta:
+        # Apply the delta to the old widget states.
+        states_by_id = {state.id: state for state in old_states.widgets}
+        removed_ids = dict.fromkeys(old_states.removed_widget_ids)
+        for widget_id in new_states.removed_widget_ids:
+            states_by_id.pop(widget_id, None)
+            removed_ids[widget_id] = None
+        for state in new_states.widgets:
+            states_by_id[state.id] = state
+            removed_ids.pop(state.id, None)
+        applied_states = WidgetStates()
+        applied_states.widgets.extend(states_by_id.values())
+    else:
+        applied_states = new_states
+
+    coalesced_states = coalesce_widget_states(old_states, applied_states)
+
+    result = ClientState()
+    result.CopyFrom(new)
+    result.resend_elements = old.resend_elements or new.resend_elements
+    result.widget_states.ClearField("widgets")
+    result.widget_states.ClearField("removed_widget_ids")
+    if coalesced_states is not None:
+        result.widget_states.widgets.extend(coalesced_states.widgets)
+
+    if new_is_delta and old_states.base_version != 0:
+        # Both are deltas, so the result is a delta against old's base.
+        widget_ids = {state.id for state in result.widget_states.widgets}
+        result.widget_states.removed_widget_ids.extend(
+            widget_id for widget_id in removed_ids if widget_id not in widget_ids
+        )
+        result.widget_states.base_version = old_states.base_version
+    else:
+        # At least one of them holds every widget's state, so the result does
+        # too.
+        result.widget_states.base_version = 0
+
+    return result
+
+
+class RerunCoalescer:
+    """Forwards a connection's rerun requests at most once per window.
+
+    The first rerun request after a quiet period is forwarded immediately.
+    Rerun requests that arrive less than a window after the previously
+    forwarded one are merged into a single pending request, which is forwarded
+    when the window ends.
+
+    Not thread-safe: this must only be used from the server's event loop.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        forward: Callable[[BackMsg], None],
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a RerunCoalescer.
+
+        Parameters
+        ----------
+        window_seconds
+            The minimum time between two forwarded rerun requests. If 0, rerun
+            requests are always forwarded immediately.
+
+        forward
+            Called with each BackMsg to forward to the session.
+
+        timer
+            The clock to measure time with.
+        """
+        self._window = window_seconds
+        self._forward = forward
+        self._timer = timer
+        self._last_forwarded_at: float | None = None
+        self._pending: BackMsg | None = None
+        self._flush_handle: object | None = None
+
+    @property
+    def has_pending_rerun(self) -> bool:
+        return self._pending is not None
+
+    def on_rerun(self, msg: BackMsg) -> None:
+        """Forward the given rerun_script BackMsg now, or merge it into the
+        pending rerun request.
+        """
+        if self._pending is not None:
+            if self._pending.rerun_script.fragment_id == msg.rerun_script.fragment_id:
+                merged = coalesce_client_states(
+                    self._pending.rerun_script, msg.rerun_script
+                )
+                msg.rerun_script.CopyFrom(merged)
+                self._pending = msg
+                get_runtime_metrics().coalesced_reruns.inc()
+                return
+            # Reruns of different fragments (or of a fragment and the whole
+            # script) can't be merged.
+            self.flush()
+
+        now = self._timer()
+        if self._last_forwarded_at is None or now - self._last_forwarded_at >= (
+            self._window
+        ):
+            self._last_forwarded_at = now
+            self._forward(msg)
+            return
+
+        self._pending = msg
+        self._flush_handle = tornado.ioloop.IOLoop.current().call_later(
+            self._last_forwarded_at + self._window - now, self._on_window_end
+        )
+
+    def flush(self) -> None:
+        """Forward the pending rerun request, if any, now.
+
+        This must be called before forwarding any other message, so that
+        messages are forwarded in the order they were received.
+        """
+        self._cancel_flush()
+        if self._pending is not None:
+            msg = self._pending
+            self._pending = None
+            self._last_forwarded_at = self._timer()
+            self._forward(msg)
+
+    def close(self) -> None:
+        """Drop the pending rerun request, if any."""
+        self._cancel_flush()
+        self._pending = None
+
+    def _on_window_end(self) -> None:
+        self._flush_handle = None
+        self.flush()
+
+    def _cancel_flush(self) -> None:
+        if self._flush_handle is not None:
+            tornado.ioloop.IOLoop.current().remove_timeout(self._flush_handle)
+            self._flush_handle = None
@@ -15,7 +15,7 @@
 from __future__ import annotations
 
 import os
-from typing import Final, Sequence
+from typing import TYPE_CHECKING, Callable, Final, Sequence
 
 import tornado.web
 
@@ -24,6 +24,9 @@ from streamlit.logger import get_logger
 from streamlit.runtime.runtime_util import serialize_forward_msg
 from streamlit.web.server.server_util import emit_endpoint_deprecation_notice
 
+if TYPE_CHECKING:
+    from streamlit.runtime.command_profiler import CommandProfiler
+
 _LOGGER: Final = get_logger(__name__)
 
 
@@ -236,6 +239,36 @@ class HostConfigHandler(_SpecialRequestHandler):
         self.set_status(200)
 
 
+class CommandProfileHandler(_SpecialRequestHandler):
+    """Returns the aggregated timings of the command profiler.
+
+    By default, the timings are returned as JSON. With `?format=folded`, they're
+    returned in the folded stacks format read by flamegraph tools.
+    """
+
+    def initialize(self, get_profiler: Callable[[], CommandProfiler | None]) -> None:
+        self._get_profiler = get_profiler
+
+    def get(self) -> None:
+        profiler = self._get_profiler()
+        if profiler is None:
+            self.set_status(404)
+            self.finish()
+            return
+
+        if self.get_argument("format", None) == "folded":
+            self.set_header("Content-Type", "text/plain; charset=utf-8")
+            self.write(profiler.to_folded_stacks())
+        else:
+            self.write(
+                {
+                    "commands": [s.to_dict() for s in profiler.get_stats_by_name()],
+                    "stacks": [s.to_dict() for s in profiler.get_stats()],
+                }
+            )
+        self.set_status(200)
+
+
 class MessageCacheHandler(tornado.web.RequestHandler):
     """Returns ForwardMsgs from our MessageCache"""
 
@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import errno
 import logging
 import mimetypes
@@ -27,25 +28,33 @@ import tornado.locks
 import tornado.netutil
 import tornado.web
 import tornado.websocket
+from tornado import httputil
 from tornado.httpserver import HTTPServer
+from tornado.routing import Rule
 
 from streamlit import cli_util, config, file_util, util
 from streamlit.config_option import ConfigOption
 from streamlit.logger import get_logger
 from streamlit.runtime import Runtime, RuntimeConfig, RuntimeState
+from streamlit.runtime.command_profiler import get_command_profiler
 from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.memory_session_storage import MemorySessionStorage
 from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
 from streamlit.runtime.runtime_util import get_max_message_size_bytes
+from streamlit.runtime.session_hibernation import SessionHibernator
 from streamlit.web.cache_storage_manager_config import (
     create_default_cache_storage_manager,
 )
 from streamlit.web.server.app_static_file_handler import AppStaticFileHandler
-from streamlit.web.server.browser_websocket_handler import BrowserWebSocketHandler
+from streamlit.web.server.browser_websocket_handler import (
+    BrowserWebSocketHandler,
+    get_existing_session_id,
+)
 from streamlit.web.server.component_request_handler import ComponentRequestHandler
 from streamlit.web.server.media_file_handler import MediaFileHandler
 from streamlit.web.server.routes import (
     AddSlashHandler,
+    CommandProfileHandler,
     HealthHandler,
     HostConfigHandler,
     MessageCacheHandler,
@@ -55,24 +64,25 @@ from streamlit.web.server.routes import (
 from streamlit.web.server.server_util import DEVELOPMENT_PORT, make_url_path_regex
 from streamlit.web.server.stats_request_handler import StatsRequestHandler
 from streamlit.web.server.upload_file_request_handler import UploadFileRequestHandler
+from streamlit.web.server.websocket_keepalive import WebSocketKeepalive
 
 if TYPE_CHECKING:
+    import socket
     from ssl import SSLContext
 
+    from tornado.httputil import HTTPServerRequest
+
+    from streamlit.web.server.workers import Worker, WorkerRouting
+
 _LOGGER: Final = get_logger(__name__)
 
 TORNADO_SETTINGS = {
     # Gzip HTTP responses.
     "compress_response": True,
-    # Ping every 1s to keep WS alive.
-    # 2021.06.22: this value was previously 20s, and was causing
-    # connection instability for a small number of users. This smaller
-    # ping_interval fixes that instability.
-    # https://github.com/streamlit/streamlit/issues/3196
-    "websocket_ping_interval": 1,
-    # If we don't get a ping response within 30s, the connection
-    # is timed out.
-    "websocket_ping_timeout": 30,
+    # Websocket connections are kept alive by a WebSocketKeepalive, which only
+    # pings idle connections (see server.websocketPingInterval), rather than
+    # by Tornado's fixed-interval pings.
+    "websocket_ping_interval": 0,
     "xsrf_cookie_name": "_streamlit_xsrf",
 }
 
@@ -92,6 +102,7 @@ MESSAGE_ENDPOINT: Final = r"_stcore/message"
 NEW_HEALTH_ENDPOINT: Final = "_stcore/health"
 HEALTH_ENDPOINT: Final = rf"(?:healthz|{NEW_HEALTH_ENDPOINT})"
 HOST_CONFIG_ENDPOINT: Final = r"_stcore/host-config"
+COMMAND_PROFILE_ENDPOINT: Final = r"_stcore/command-profile"
 SCRIPT_HEALTH_CHECK_ENDPOINT: Final = (
     r"(?:script-health-check|_stcore/script-health-check)"
 )
@@ -110,24 +121,72 @@ def server_address_is_unix_socket() -> bool:
     return address is not None and address.startswith(UNIX_SOCKET_PREFIX)
 
 
-def start_listening(app: tornado.web.Application) -> None:
+class _SocketBinder:
+    """Binds listening sockets like HTTPServer does, without serving them."""
+
+    def __init__(self) -> None:
+        self.sockets: list[socket.socket] = []
+
+    def listen(self, port: int, address: str | None = None) -> None:
+        self.sockets.extend(tornado.netutil.bind_sockets(port, address))
+
+    def add_socket(self, sock: socket.socket) -> None:
+        self.sockets.append(sock)
+
+
+def bind_listening_sockets() -> list[socket.socket]:
+    """Bind the listening sockets at the configured address and port, so that
+    they can be shared by several worker processes.
+
+    Ports are chosen like in `start_listening`.
+    """
+    binder = _SocketBinder()
+    if server_address_is_unix_socket():
+        start_listening_unix_socket(binder)
+    else:
+        start_listening_tcp_socket(binder)
+    return binder.sockets
+
+
+def start_listening(
+    app: tornado.web.Application,
+    sockets: list[socket.socket] | None = None,
+    private_sockets: list[socket.socket] | None = None,
+) -> None:
     """Makes the server start listening at the configured port.
 
     In case the port is already taken it tries listening to the next available
     port.  It will error after MAX_PORT_SEARCH_RETRIES attempts.
 
+    If sockets are given, the server listens on them instead.
+
+    private_sockets are a worker's loopback sockets that other workers forward
+    requests to (see `workers.py`). They're served without SSL, because workers
+    forward requests with http:// and ws:// URLs. Only requests on them are
+    treated as forwarded requests.
     """
     cert_file = config.get_option("server.sslCertFile")
     key_file = config.get_option("server.sslKeyFile")
     ssl_options = _get_ssl_options(cert_file, key_file)
+    max_buffer_size = config.get_option("server.maxUploadSize") * 1024 * 1024
+
+    public_app: httputil.HTTPServerConnectionDelegate = app
+    if private_sockets:
+        from streamlit.web.server.workers import PublicRequestDelegate
+
+        public_app = PublicRequestDelegate(app)
+        private_http_server = HTTPServer(app, max_buffer_size=max_buffer_size)
+        private_http_server.add_sockets(private_sockets)
 
     http_server = HTTPServer(
-        app,
-        max_buffer_size=config.get_option("server.maxUploadSize") * 1024 * 1024,
+        public_app,
+        max_buffer_size=max_buffer_size,
         ssl_options=ssl_options,
     )
 
-    if server_address_is_unix_socket():
+    if sockets is not None:
+        http_server.add_sockets(sockets)
+    elif server_address_is_unix_socket():
         start_listening_unix_socket(http_server)
     else:
         start_listening_tcp_socket(http_server)
@@ -177,7 +236,18 @@ def _get_ssl_options(cert_file: str | None, key_file: str | None) -> SSLContext
     return None
 
 
-def start_listening_unix_socket(http_server: HTTPServer) -> None:
+def _create_session_hibernator() -> SessionHibernator | None:
+    hibernation_dir = config.get_option("server.sessionHibernationDir")
+    if not hibernation_dir:
+        return None
+    return SessionHibernator(
+        hibernation_dir,
+        max_sessions=config.get_option("server.maxHibernatedSessions"),
+        max_bytes=config.get_option("server.maxHibernatedSessionsSize") * 1024 * 1024,
+    )
+
+
+def start_listening_unix_socket(http_server: HTTPServer | _SocketBinder) -> None:
     address = config.get_option("server.address")
     file_name = os.path.expanduser(address[len(UNIX_SOCKET_PREFIX) :])
 
@@ -185,7 +255,7 @@ def start_listening_unix_socket(http_server: HTTPServer) -> None:
     http_server.add_socket(unix_socket)
 
 
-def start_listening_tcp_socket(http_server: HTTPServer) -> None:
+def start_listening_tcp_socket(http_server: HTTPServer | _SocketBinder) -> None:
     call_count = 0
 
     port = None
@@ -234,29 +304,44 @@ def start_listening_tcp_socket(http_server: HTTPServer) -> None:
 
 
 class Server:
-    def __init__(self, main_script_path: str, is_hello: bool):
-        """Create the server. It won't be started yet."""
+    def __init__(
+        self, main_script_path: str, is_hello: bool, worker: Worker | None = None
+    ):
+        """Create the server. It won't be started yet.
+
+        If worker is set, the server runs as one of several worker processes
+        (see `streamlit.web.server.workers`).
+        """
         _set_tornado_log_levels()
         self.initialize_mimetypes()
 
         self._main_script_path = main_script_path
+        self._worker = worker
+        self._keepalive = WebSocketKeepalive.from_config()
 
         # Initialize MediaFileStorage and its associated endpoint
-        media_file_storage = MemoryMediaFileStorage(MEDIA_ENDPOINT)
+        media_endpoint = MEDIA_ENDPOINT
+        if worker is not None:
+            media_endpoint = f"{MEDIA_ENDPOINT}/{worker.routing.media_path_prefix}"
+        media_file_storage = MemoryMediaFileStorage(media_endpoint)
         MediaFileHandler.initialize_storage(media_file_storage)
 
         uploaded_file_mgr = MemoryUploadedFileManager(UPLOAD_FILE_ENDPOINT)
 
+        self._session_hibernator = _create_session_hibernator()
         self._runtime = Runtime(
             RuntimeConfig(
                 script_path=main_script_path,
                 command_line=None,
                 media_file_storage=media_file_storage,
                 uploaded_file_manager=uploaded_file_mgr,
-                cache_storage_manager=create_default_cache_storage_manager(),
+                cache_storage_manager=create_default_cache_storage_manager(
+                    worker.cache_db_path if worker is not None else None
+                ),
                 is_hello=is_hello,
                 session_storage=MemorySessionStorage(
-                    ttl_seconds=config.get_option("server.disconnectedSessionTTL")
+                    ttl_seconds=config.get_option("server.disconnectedSessionTTL"),
+                    hibernator=self._session_hibernator,
                 ),
             ),
         )
@@ -278,6 +363,11 @@ class Server:
     def main_script_path(self) -> str:
         return self._main_script_path
 
+    @property
+    def is_primary_worker(self) -> bool:
+        """False if this is a worker process other than the first one."""
+        return self._worker is None or self._worker.routing.index == 0
+
     async def start(self) -> None:
         """Start the server.
 
@@ -287,13 +377,31 @@ class Server:
         _LOGGER.debug("Starting server...")
 
         app = self._create_app()
-        start_listening(app)
+        if self._worker is not None:
+            start_listening(
+                app, self._worker.public_sockets, self._worker.private_sockets
+            )
+        else:
+            start_listening(app)
 
         port = config.get_option("server.port")
         _LOGGER.debug("Server started on port %s", port)
 
+        self._keepalive.start()
         await self._runtime.start()
 
+        if self._session_hibernator is not None:
+            # Sessions may be hibernated until the runtime has shut them all
+            # down, so only remove their files once it has stopped.
+            hibernator = self._session_hibernator
+            asyncio.ensure_future(self._runtime.stopped).add_done_callback(
+                lambda _: hibernator.close()
+            )
+
+    async def warm_up(self, warmup_script_path: str | None = None) -> None:
+        """Warm up the server's runtime. See `Runtime.warm_up`."""
+        await self._runtime.warm_up(warmup_script_path)
+
     @property
     def stopped(self) -> Awaitable[None]:
         """A Future that completes when the Server's run loop has exited."""
@@ -302,54 +410,78 @@ class Server:
     def _create_app(self) -> tornado.web.Application:
         """Create our tornado web app."""
         base = config.get_option("server.baseUrlPath")
+        media_endpoint = MEDIA_ENDPOINT
+        if self._worker is not None:
+            media_endpoint = (
+                f"{MEDIA_ENDPOINT}/{self._worker.routing.media_path_prefix}"
+            )
+        worker_routing = self._worker.routing if self._worker is not None else None
 
-        routes: list[Any] = [
-            (
-                make_url_path_regex(base, STREAM_ENDPOINT),
-                BrowserWebSocketHandler,
-                {"runtime": self._runtime},
-            ),
-            (
-                make_url_path_regex(base, HEALTH_ENDPOINT),
-                HealthHandler,
-                {"callback": lambda: self._runtime.is_ready_for_browser_connection},
-            ),
-            (
-                make_url_path_regex(base, MESSAGE_ENDPOINT),
-                MessageCacheHandler,
-                {"cache": self._runtime.message_cache},
-            ),
-            (
-                make_url_path_regex(base, METRIC_ENDPOINT),
-                StatsRequestHandler,
-                {"stats_manager": self._runtime.stats_mgr},
-            ),
-            (
-                make_url_path_regex(base, HOST_CONFIG_ENDPOINT),
-                HostConfigHandler,
-            ),
-            (
-                make_url_path_regex(
-                    base,
-                    rf"{UPLOAD_FILE_ENDPOINT}/(?P<session_id>[^/]+)/(?P<file_id>[^/]+)",
+        routes: list[Any] = []
+        if worker_routing is not None:
+            routes.extend(
+                _create_worker_forwarding_routes(base, worker_routing, self._keepalive)
+            )
+
+        routes.extend(
+            [
+                (
+                    make_url_path_regex(base, STREAM_ENDPOINT),
+                    BrowserWebSocketHandler,
+                    {
+                        "runtime": self._runtime,
+                        "keepalive": self._keepalive,
+                        "worker_routing": worker_routing,
+                    },
                 ),
-                UploadFileRequestHandler,
-                {
-                    "file_mgr": self._runtime.uploaded_file_mgr,
-                    "is_active_session": self._runtime.is_active_session,
-                },
-            ),
-            (
-                make_url_path_regex(base, f"{MEDIA_ENDPOINT}/(.*)"),
-                MediaFileHandler,
-                {"path": ""},
-            ),
-            (
-                make_url_path_regex(base, "component/(.*)"),
-                ComponentRequestHandler,
-                {"registry": self._runtime.component_registry},
-            ),
-        ]
+                (
+                    make_url_path_regex(base, HEALTH_ENDPOINT),
+                    HealthHandler,
+                    {"callback": lambda: self._runtime.is_ready_for_browser_connection},
+                ),
+                _create_worker_aware_route(
+                    make_url_path_regex(base, MESSAGE_ENDPOINT),
+                    MessageCacheHandler,
+                    {"cache": self._runtime.message_cache},
+                    worker_routing,
+                ),
+                (
+                    make_url_path_regex(base, METRIC_ENDPOINT),
+                    StatsRequestHandler,
+                    {
+                        "stats_manager": self._runtime.stats_mgr,
+                        "keepalive": self._keepalive,
+                        "runtime_metrics": self._runtime.metrics,
+                    },
+                ),
+                (
+                    make_url_path_regex(base, HOST_CONFIG_ENDPOINT),
+                    HostConfigHandler,
+                ),
+                (
+                    make_url_path_regex(
+                        base,
+                        rf"{UPLOAD_FILE_ENDPOINT}/(?P<session_id>[^/]+)/(?P<file_id>[^/]+)",
+                    ),
+                    UploadFileRequestHandler,
+                    {
+                        "file_mgr": self._runtime.uploaded_file_mgr,
+                        "is_active_session": self._runtime.is_active_session,
+                    },
+                ),
+                (
+                    make_url_path_regex(base, f"{media_endpoint}/(.*)"),
+                    MediaFileHandler,
+                    {"path": ""},
+                ),
+                _create_worker_aware_route(
+                    make_url_path_regex(base, "component/(.*)"),
+                    ComponentRequestHandler,
+                    {"registry": self._runtime.component_registry},
+                    worker_routing,
+                ),
+            ]
+        )
 
         if config.get_option("server.scriptHealthCheckEnabled"):
             routes.extend(
@@ -364,6 +496,17 @@ class Server:
                 ]
             )
 
+        if config.get_option("runner.profileCommands"):
+            routes.extend(
+                [
+                    (
+                        make_url_path_regex(base, COMMAND_PROFILE_ENDPOINT),
+                        CommandProfileHandler,
+                        {"get_profiler": get_command_profiler},
+                    )
+                ]
+            )
+
         if config.get_option("server.enableStaticServing"):
             routes.extend(
                 [
@@ -434,9 +577,91 @@ class Server:
 
     def stop(self) -> None:
         cli_util.print_to_cli("  Stopping...", fg="blue")
+        self._keepalive.stop()
         self._runtime.stop()
 
 
+def _create_worker_forwarding_routes(
+    base: str, routing: WorkerRouting, keepalive: WebSocketKeepalive
+) -> list[Rule]:
+    """Create the routes that forward requests for resources owned by other
+    workers to them.
+    """
+    from streamlit.web.server.worker_forwarding_handlers import (
+        WorkerRequestForwardingHandler,
+        WorkerWebSocketForwardingHandler,
+    )
+    from streamlit.web.server.workers import OwnedByOtherWorker
+
+    def get_stream_owner(request: HTTPServerRequest, _: dict[str, Any]) -> int | None:
+        return routing.get_session_owner(get_existing_session_id(request.headers))
+
+    def get_upload_owner(
+        _: HTTPServerRequest, path_match: dict[str, Any]
+    ) -> int | None:
+        session_id = path_match["path_kwargs"]["session_id"]
+        return routing.get_session_owner(session_id.decode("utf-8", "replace"))
+
+    def get_media_owner(_: HTTPServerRequest, path_match: dict[str, Any]) -> int | None:
+        return routing.get_media_owner(path_match["path_args"][0].decode())
+
+    kwargs = {"routing": routing}
+    return [
+        Rule(
+            OwnedByOtherWorker(
+                make_url_path_regex(base, STREAM_ENDPOINT), routing, get_stream_owner
+            ),
+            WorkerWebSocketForwardingHandler,
+            {**kwargs, "keepalive": keepalive},
+        ),
+        Rule(
+            OwnedByOtherWorker(
+                make_url_path_regex(
+                    base,
+                    rf"{UPLOAD_FILE_ENDPOINT}/(?P<session_id>[^/]+)/(?P<file_id>[^/]+)",
+                ),
+                routing,
+                get_upload_owner,
+            ),
+            WorkerRequestForwardingHandler,
+            kwargs,
+        ),
+        Rule(
+            OwnedByOtherWorker(
+                make_url_path_regex(base, f"{MEDIA_ENDPOINT}/(.*)"),
+                routing,
+                get_media_owner,
+            ),
+            WorkerRequestForwardingHandler,
+            kwargs,
+        ),
+    ]
+
+
+def _create_worker_aware_route(
+    pattern: str,
+    handler: type[tornado.web.RequestHandler],
+    kwargs: dict[str, Any],
+    routing: WorkerRouting | None,
+) -> tuple[str, type[tornado.web.RequestHandler], dict[str, Any]]:
+    """Return a route for the given handler, or for a variant of it that asks
+    other workers for resources that the current worker doesn't have.
+    """
+    if routing is None:
+        return (pattern, handler, kwargs)
+
+    from streamlit.web.server.worker_forwarding_handlers import (
+        WorkerComponentRequestHandler,
+        WorkerMessageCacheHandler,
+    )
+
+    worker_handlers: dict[type[tornado.web.RequestHandler], Any] = {
+        MessageCacheHandler: WorkerMessageCacheHandler,
+        ComponentRequestHandler: WorkerComponentRequestHandler,
+    }
+    return (pattern, worker_handlers[handler], {**kwargs, "routing": routing})
+
+
 def _set_tornado_log_levels() -> None:
     if not config.get_option("global.developmentMode"):
         # Hide logs unless they're super important.
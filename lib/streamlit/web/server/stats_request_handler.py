@@ -23,12 +23,21 @@ from streamlit.web.server.server_util import emit_endpoint_deprecation_notice
 
 if TYPE_CHECKING:
     from streamlit.proto.openmetrics_data_model_pb2 import MetricSet as MetricSetProto
+    from streamlit.runtime.runtime_metrics import MetricsSource, RuntimeMetrics
     from streamlit.runtime.stats import CacheStat, StatsManager
+    from streamlit.web.server.websocket_keepalive import WebSocketKeepalive
 
 
 class StatsRequestHandler(tornado.web.RequestHandler):
-    def initialize(self, stats_manager: StatsManager) -> None:
+    def initialize(
+        self,
+        stats_manager: StatsManager,
+        keepalive: WebSocketKeepalive | None = None,
+        runtime_metrics: RuntimeMetrics | None = None,
+    ) -> None:
         self._manager = stats_manager
+        self._keepalive = keepalive
+        self._runtime_metrics = runtime_metrics
 
     def set_default_headers(self):
         if allow_cross_origin_requests():
@@ -44,15 +53,26 @@ class StatsRequestHandler(tornado.web.RequestHandler):
             emit_endpoint_deprecation_notice(self, new_path="/_stcore/metrics")
 
         stats = self._manager.get_stats()
+        metrics_sources: list[MetricsSource] = [
+            source
+            for source in (self._keepalive, self._runtime_metrics)
+            if source is not None
+        ]
 
         # If the request asked for protobuf output, we return a serialized
         # protobuf. Else we return text.
         if "application/x-protobuf" in self.request.headers.get_list("Accept"):
-            self.write(self._stats_to_proto(stats).SerializeToString())
+            metric_set = self._stats_to_proto(stats)
+            for source in metrics_sources:
+                self._add_metrics_to_proto(metric_set, source)
+            self.write(metric_set.SerializeToString())
             self.set_header("Content-Type", "application/x-protobuf")
             self.set_status(200)
         else:
-            self.write(self._stats_to_text(self._manager.get_stats()))
+            text = self._stats_to_text(stats)
+            for source in metrics_sources:
+                text = self._add_metrics_to_text(text, source)
+            self.write(text)
             self.set_header("Content-Type", "application/openmetrics-text")
             self.set_status(200)
 
@@ -93,3 +113,42 @@ class StatsRequestHandler(tornado.web.RequestHandler):
         metric_set = MetricSetProto()
         metric_set.metric_families.append(metric_family)
         return metric_set
+
+    @staticmethod
+    def _add_metrics_to_text(text: str, source: MetricsSource) -> str:
+        openmetrics_eof = "# EOF\n"
+        result = [text[: -len(openmetrics_eof)].rstrip("\n")]
+        families = [
+            ("histogram", source.histograms),
+            ("counter", source.counters),
+        ]
+        for metric_type, metrics in families:
+            for metric in metrics:
+                result.append(f"# TYPE {metric.name} {metric_type}")
+                if metric.unit:
+                    result.append(f"# UNIT {metric.name} {metric.unit}")
+                result.append(f"# HELP {metric.name} {metric.help}")
+                result.extend(metric.to_metric_str())
+        result.append(openmetrics_eof)
+
+        return "\n".join(result)
+
+    @staticmethod
+    def _add_metrics_to_proto(
+        metric_set: MetricSetProto, source: MetricsSource
+    ) -> None:
+        # Lazy load the import of this proto message for better performance:
+        from streamlit.proto.openmetrics_data_model_pb2 import COUNTER, HISTOGRAM
+
+        families = [
+            (HISTOGRAM, source.histograms),
+            (COUNTER, source.counters),
+        ]
+        for metric_type, metrics in families:
+            for metric in metrics:
+                metric_family = metric_set.metric_families.add()
+                metric_family.name = metric.name
+                metric_family.type = metric_type
+                metric_family.unit = metric.unit
+                metric_family.help = metric.help
+                metric.marshall_metric_proto(metric_family)
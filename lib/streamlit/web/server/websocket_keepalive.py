@@ -0,0 +1,232 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Keeps websocket connections alive, and detects dead ones.
+
+Tornado can ping each websocket connection on a fixed interval, but that costs a
+ping and a pong per connection per interval even when the connection is busy.
+Instead, a single WebSocketKeepalive per server checks all connections
+periodically, and only pings connections that haven't received anything for
+`server.websocketPingInterval` seconds. Any frame received from the browser
+(including pongs and app heartbeats) counts as a sign of life, and connections
+that stay silent for `server.websocketPingTimeout` seconds after a ping are
+closed.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Final
+
+import tornado.ioloop
+import tornado.websocket
+
+from streamlit import config
+from streamlit.logger import get_logger
+from streamlit.runtime.runtime_metrics import Counter, Histogram
+
+_LOGGER: Final = get_logger(__name__)
+
+# Connections are checked this many times per ping interval, so pings are sent
+# at most interval / _CHECKS_PER_INTERVAL seconds late.
+_CHECKS_PER_INTERVAL: Final = 4
+
+# Bucket upper bounds, in seconds, for ping round-trip times.
+_PING_RTT_BUCKETS: Final = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+@dataclass
+class _Connection:
+    handler: tornado.websocket.WebSocketHandler
+    report_metrics: bool
+    last_received_at: float
+    # When the unanswered ping was sent, or None if no ping is pending.
+    ping_sent_at: float | None = None
+
+
+class WebSocketKeepalive:
+    """Pings idle websocket connections, and closes dead ones.
+
+    The liveness of the connections is exported on the `/_stcore/metrics`
+    endpoint as aggregate metrics over all connections. Individual connections
+    aren't labeled, so that the endpoint doesn't reveal anything about the
+    sessions that they belong to.
+
+    Not thread-safe: this must only be used from the server's event loop.
+    """
+
+    def __init__(
+        self,
+        ping_interval_seconds: float,
+        ping_timeout_seconds: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a WebSocketKeepalive.
+
+        Parameters
+        ----------
+        ping_interval_seconds
+            Connections that haven't received anything for this long are pinged.
+            If 0, connections are never pinged.
+
+        ping_timeout_seconds
+            Connections that haven't received anything for this long after
+            being pinged are closed. If 0, connections are never closed.
+
+        timer
+            The clock to measure time with.
+        """
+        self._ping_interval = ping_interval_seconds
+        self._ping_timeout = ping_timeout_seconds
+        self._timer = timer
+        self._connections: dict[tornado.websocket.WebSocketHandler, _Connection] = {}
+        self._periodic_check: tornado.ioloop.PeriodicCallback | None = None
+
+        self.ping_rtt = Histogram(
+            "websocket_ping_rtt_seconds",
+            "seconds",
+            "Round-trip time of answered pings on websocket connections.",
+            _PING_RTT_BUCKETS,
+        )
+        self.pings_sent = Counter(
+            "websocket_pings_sent", "Number of pings sent on websocket connections."
+        )
+        self.pongs_received = Counter(
+            "websocket_pongs_received",
+            "Number of pongs received on websocket connections.",
+        )
+        self.ping_timeouts = Counter(
+            "websocket_ping_timeouts",
+            "Number of websocket connections closed because a ping timed out.",
+        )
+
+    @classmethod
+    def from_config(cls) -> WebSocketKeepalive:
+        """Create a WebSocketKeepalive with the interval and timeout set in the
+        config.
+        """
+        return cls(
+            ping_interval_seconds=config.get_option("server.websocketPingInterval"),
+            ping_timeout_seconds=config.get_option("server.websocketPingTimeout"),
+        )
+
+    @property
+    def num_connections(self) -> int:
+        return len(self._connections)
+
+    @property
+    def histograms(self) -> list[Histogram]:
+        return [self.ping_rtt]
+
+    @property
+    def counters(self) -> list[Counter]:
+        return [self.pings_sent, self.pongs_received, self.ping_timeouts]
+
+    def start(self) -> None:
+        """Start checking connections periodically on the current event loop."""
+        if self._periodic_check is not None or self._ping_interval <= 0:
+            return
+        self._periodic_check = tornado.ioloop.PeriodicCallback(
+            self.check_connections,
+            self._ping_interval * 1000 / _CHECKS_PER_INTERVAL,
+        )
+        self._periodic_check.start()
+
+    def stop(self) -> None:
+        """Stop checking connections."""
+        if self._periodic_check is not None:
+            self._periodic_check.stop()
+            self._periodic_check = None
+
+    def register(
+        self,
+        handler: tornado.websocket.WebSocketHandler,
+        report_metrics: bool = True,
+    ) -> None:
+        """Start keeping the given open connection alive.
+
+        If report_metrics is False, the connection's pings and pongs are left
+        out of the metrics.
+        """
+        self._connections[handler] = _Connection(
+            handler=handler,
+            report_metrics=report_metrics,
+            last_received_at=self._timer(),
+        )
+
+    def unregister(self, handler: tornado.websocket.WebSocketHandler) -> None:
+        """Stop keeping the given connection alive, e.g. because it closed."""
+        self._connections.pop(handler, None)
+
+    def on_received(self, handler: tornado.websocket.WebSocketHandler) -> None:
+        """Record that a message was received on the given connection.
+
+        Must be called for each received message, as received messages make
+        pings unnecessary.
+        """
+        connection = self._connections.get(handler)
+        if connection is not None:
+            connection.last_received_at = self._timer()
+            connection.ping_sent_at = None
+
+    def on_pong(self, handler: tornado.websocket.WebSocketHandler) -> None:
+        """Record that a pong was received on the given connection."""
+        connection = self._connections.get(handler)
+        if connection is None:
+            return
+        now = self._timer()
+        if connection.report_metrics:
+            if connection.ping_sent_at is not None:
+                self.ping_rtt.observe(now - connection.ping_sent_at)
+            self.pongs_received.inc()
+        connection.last_received_at = now
+        connection.ping_sent_at = None
+
+    def check_connections(self) -> None:
+        """Ping connections that have been idle for the ping interval, and
+        close connections that didn't answer a ping within the ping timeout.
+        """
+        now = self._timer()
+        for connection in list(self._connections.values()):
+            if connection.ping_sent_at is not None:
+                if 0 < self._ping_timeout <= now - connection.ping_sent_at:
+                    _LOGGER.debug("Closing websocket connection: ping timed out")
+                    if connection.report_metrics:
+                        self.ping_timeouts.inc()
+                    self.unregister(connection.handler)
+                    connection.handler.close(reason="ping timed out")
+                continue
+
+            if now - connection.last_received_at >= self._ping_interval:
+                try:
+                    connection.handler.ping()
+                except tornado.websocket.WebSocketClosedError:
+                    self.unregister(connection.handler)
+                    continue
+                connection.ping_sent_at = now
+                if connection.report_metrics:
+                    self.pings_sent.inc()
@@ -0,0 +1,295 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Handlers that forward requests from one worker to another in worker mode.
+
+See `streamlit.web.server.workers` for details.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+import tornado.httpclient
+import tornado.web
+import tornado.websocket
+from tornado.httputil import HTTPHeaders
+
+from streamlit import config
+from streamlit.logger import get_logger
+from streamlit.runtime.runtime_util import get_max_message_size_bytes
+from streamlit.web.server.component_request_handler import ComponentRequestHandler
+from streamlit.web.server.routes import MessageCacheHandler
+from streamlit.web.server.server_util import is_url_from_allowed_origins
+from streamlit.web.server.workers import WORKER_FORWARDED_HEADER, is_forwarded_request
+
+if TYPE_CHECKING:
+    from tornado.httputil import HTTPServerRequest
+
+    from streamlit.components.types.base_component_registry import (
+        BaseComponentRegistry,
+    )
+    from streamlit.runtime.forward_msg_cache import ForwardMsgCache
+    from streamlit.web.server.websocket_keepalive import WebSocketKeepalive
+    from streamlit.web.server.workers import WorkerRouting
+
+_LOGGER: Final = get_logger(__name__)
+
+# Headers that only apply to a single connection, and websocket handshake
+# headers, which the websocket client sets itself.
+_UNFORWARDED_HEADERS: Final = frozenset(
+    h.lower()
+    for h in [
+        "Connection",
+        "Keep-Alive",
+        "Transfer-Encoding",
+        "Upgrade",
+        "Content-Length",
+        "Sec-WebSocket-Key",
+        "Sec-WebSocket-Version",
+        "Sec-WebSocket-Extensions",
+        "Sec-WebSocket-Protocol",
+    ]
+)
+
+# Response headers that Tornado sets itself.
+_UNCOPIED_RESPONSE_HEADERS: Final = frozenset(
+    h.lower()
+    for h in ["Connection", "Transfer-Encoding", "Content-Length", "Server", "Date"]
+)
+
+
+def _get_forwarded_headers(request: HTTPServerRequest) -> HTTPHeaders:
+    headers = HTTPHeaders()
+    for name, value in request.headers.get_all():
+        if name.lower() not in _UNFORWARDED_HEADERS:
+            headers.add(name, value)
+    headers[WORKER_FORWARDED_HEADER] = "1"
+    return headers
+
+
+async def forward_request(
+    routing: WorkerRouting, worker_index: int, request: HTTPServerRequest
+) -> tornado.httpclient.HTTPResponse:
+    """Send the given request to the given worker, and return its response.
+
+    If the worker can't be reached, the response has the code 599.
+    """
+    has_body = request.method in ("POST", "PUT", "PATCH")
+    forwarded_request = tornado.httpclient.HTTPRequest(
+        url=routing.get_worker_url(worker_index, request.uri or "/"),
+        method=request.method or "GET",
+        headers=_get_forwarded_headers(request),
+        body=request.body if has_body else None,
+        follow_redirects=False,
+        decompress_response=False,
+        allow_nonstandard_methods=True,
+    )
+    try:
+        return await tornado.httpclient.AsyncHTTPClient().fetch(
+            forwarded_request, raise_error=False
+        )
+    except OSError as ex:
+        # raise_error=False doesn't apply to connection errors.
+        return tornado.httpclient.HTTPResponse(forwarded_request, 599, error=ex)
+
+
+async def fetch_from_other_workers(
+    routing: WorkerRouting, request: HTTPServerRequest
+) -> tornado.httpclient.HTTPResponse | None:
+    """Send the given GET request to all other workers in turn, and return the
+    first successful response, or None if no worker could handle it.
+    """
+    for worker_index in routing.other_worker_indices:
+        response = await forward_request(routing, worker_index, request)
+        if response.code == 200:
+            return response
+    return None
+
+
+def write_forwarded_response(
+    handler: tornado.web.RequestHandler, response: tornado.httpclient.HTTPResponse
+) -> None:
+    """Write a response received from another worker to the given handler."""
+    if response.code == 599:
+        # The worker couldn't be reached.
+        _LOGGER.warning("Failed to forward request to worker: %s", response.error)
+        handler.set_status(502)
+        return
+
+    handler.set_status(response.code, response.reason)
+    handler.clear_header("Content-Type")
+    for name, value in response.headers.get_all():
+        if name.lower() not in _UNCOPIED_RESPONSE_HEADERS:
+            handler.add_header(name, value)
+    if response.body:
+        handler.write(response.body)
+
+
+class WorkerRequestForwardingHandler(tornado.web.RequestHandler):
+    """Forwards HTTP requests to the worker that owns the requested resource."""
+
+    def initialize(self, routing: WorkerRouting) -> None:
+        self._routing = routing
+
+    def check_xsrf_cookie(self) -> None:
+        # The worker that handles the request checks the XSRF cookie.
+        pass
+
+    async def _forward(self, worker_index: str) -> None:
+        response = await forward_request(self._routing, int(worker_index), self.request)
+        write_forwarded_response(self, response)
+
+    async def get(self, worker_index: str) -> None:
+        await self._forward(worker_index)
+
+    async def head(self, worker_index: str) -> None:
+        await self._forward(worker_index)
+
+    async def post(self, worker_index: str) -> None:
+        await self._forward(worker_index)
+
+    async def put(self, worker_index: str) -> None:
+        await self._forward(worker_index)
+
+    async def delete(self, worker_index: str) -> None:
+        await self._forward(worker_index)
+
+    async def options(self, worker_index: str) -> None:
+        await self._forward(worker_index)
+
+
+class WorkerWebSocketForwardingHandler(tornado.websocket.WebSocketHandler):
+    """Forwards a browser's websocket connection to the worker that owns the
+    session that the browser reconnects to.
+    """
+
+    def initialize(self, routing: WorkerRouting, keepalive: WebSocketKeepalive) -> None:
+        self._routing = routing
+        self._keepalive = keepalive
+        self._upstream: tornado.websocket.WebSocketClientConnection | None = None
+        # Set the XSRF cookie, like BrowserWebSocketHandler does.
+        if config.get_option("server.enableXsrfProtection"):
+            _ = self.xsrf_token
+
+    def check_origin(self, origin: str) -> bool:
+        """Set up CORS."""
+        return super().check_origin(origin) or is_url_from_allowed_origins(origin)
+
+    def select_subprotocol(self, subprotocols: list[str]) -> str | None:
+        # See BrowserWebSocketHandler.select_subprotocol.
+        if subprotocols:
+            return subprotocols[0]
+        return None
+
+    async def open(self, worker_index: str) -> None:  # type: ignore[override]
+        protocols = self.request.headers.get("Sec-Websocket-Protocol", "")
+        request = tornado.httpclient.HTTPRequest(
+            url=self._routing.get_worker_url(
+                int(worker_index), self.request.uri or "/", scheme="ws"
+            ),
+            headers=_get_forwarded_headers(self.request),
+        )
+        try:
+            self._upstream = await tornado.websocket.websocket_connect(
+                request,
+                on_message_callback=self._on_upstream_message,
+                max_message_size=get_max_message_size_bytes(),
+                # Keep empty entries: the session ID is identified by its
+                # position in the list.
+                subprotocols=[p.strip() for p in protocols.split(",")]
+                if protocols
+                else None,
+            )
+        except Exception:
+            _LOGGER.warning(
+                "Failed to forward websocket to worker %s", worker_index, exc_info=True
+            )
+            self.close()
+            return
+        # The worker that owns the session reports the connection's liveness.
+        self._keepalive.register(self, report_metrics=False)
+
+    def _on_upstream_message(self, message: str | bytes | None) -> None:
+        if message is None:
+            # The worker closed the connection.
+            self.close()
+            return
+        try:
+            self.write_message(message, binary=isinstance(message, bytes))
+        except tornado.websocket.WebSocketClosedError:
+            pass
+
+    def on_message(self, message: str | bytes) -> None:
+        self._keepalive.on_received(self)
+        if self._upstream is not None:
+            self._upstream.write_message(message, binary=isinstance(message, bytes))
+
+    def on_pong(self, data: bytes) -> None:
+        self._keepalive.on_pong(self)
+
+    def on_close(self) -> None:
+        self._keepalive.unregister(self)
+        if self._upstream is not None:
+            self._upstream.close()
+            self._upstream = None
+
+
+class WorkerMessageCacheHandler(MessageCacheHandler):
+    """A MessageCacheHandler that asks the other workers for messages that
+    aren't in the current worker's cache.
+    """
+
+    def initialize(  # type: ignore[override]
+        self, cache: ForwardMsgCache, routing: WorkerRouting
+    ) -> None:
+        super().initialize(cache)
+        self._routing = routing
+
+    async def get(self) -> None:  # type: ignore[override]
+        msg_hash = self.get_argument("hash", None)
+        if (
+            msg_hash is not None
+            and self._cache.get_message(msg_hash) is None
+            and not is_forwarded_request(self.request)
+            and config.get_option("global.storeCachedForwardMessagesInMemory")
+        ):
+            response = await fetch_from_other_workers(self._routing, self.request)
+            if response is not None:
+                write_forwarded_response(self, response)
+                return
+        super().get()
+
+
+class WorkerComponentRequestHandler(ComponentRequestHandler):
+    """A ComponentRequestHandler that asks the other workers for components
+    that haven't been registered in the current worker yet.
+    """
+
+    def initialize(  # type: ignore[override]
+        self, registry: BaseComponentRegistry, routing: WorkerRouting
+    ) -> None:
+        super().initialize(registry)
+        self._routing = routing
+
+    async def get(self, path: str) -> None:  # type: ignore[override]
+        component_name = path.split("/")[0]
+        if self._registry.get_component_path(
+            component_name
+        ) is None and not is_forwarded_request(self.request):
+            response = await fetch_from_other_workers(self._routing, self.request)
+            if response is not None:
+                write_forwarded_response(self, response)
+                return
+        super().get(path)
@@ -0,0 +1,340 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Multi-process worker mode, enabled with `server.workers` > 1.
+
+In worker mode, the `streamlit run` process forks several worker processes.
+Each worker runs its own Server and Runtime, and all workers accept connections
+from the same listening sockets, so script runs aren't limited to a single
+core by the GIL.
+
+Sessions live in the worker that created them. Session IDs start with the index
+of that worker, and each worker also listens on a private loopback port. If a
+request for a session reaches the wrong worker (e.g. a websocket reconnecting
+to an existing session, or a file upload), it's forwarded to the worker that
+owns the session. The same goes for media files, whose URLs contain the index
+of the worker that stores them.
+
+`st.cache_data` values are shared by all workers via a SQLite database in a
+temporary directory created by the supervising process.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Final
+
+import tornado.netutil
+from tornado import httputil
+from tornado.routing import PathMatches
+
+from streamlit.logger import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+    from tornado.httputil import HTTPServerRequest
+
+_LOGGER: Final = get_logger(__name__)
+
+# Set on requests forwarded from one worker to another, so that the receiving
+# worker handles them itself. It's removed from requests that arrive on the
+# public sockets (see PublicRequestDelegate), so clients can't set it.
+WORKER_FORWARDED_HEADER: Final = "X-Streamlit-Worker-Forwarded"
+
+# The supervisor stops restarting crashed workers after this many restarts.
+_MAX_WORKER_RESTARTS: Final = 100
+
+_SESSION_ID_RE: Final = re.compile(r"^w(\d+)-")
+
+
+@dataclass(frozen=True)
+class WorkerRouting:
+    """Knows which worker owns a session or media file, and how to reach it."""
+
+    # The index of the current worker.
+    index: int
+
+    # The private loopback port of each worker, indexed by worker index.
+    ports: tuple[int, ...]
+
+    @property
+    def num_workers(self) -> int:
+        return len(self.ports)
+
+    @property
+    def other_worker_indices(self) -> list[int]:
+        return [i for i in range(self.num_workers) if i != self.index]
+
+    @property
+    def media_path_prefix(self) -> str:
+        """The path segment that URLs of this worker's media files start with."""
+        return f"w{self.index}"
+
+    def new_session_id(self) -> str:
+        """Return a new session ID owned by the current worker."""
+        return f"w{self.index}-{uuid.uuid4()}"
+
+    def get_session_owner(self, session_id: str | None) -> int | None:
+        """Return the index of the worker that owns the given session, or None if
+        the session ID wasn't created by a worker.
+        """
+        if not session_id:
+            return None
+        match = _SESSION_ID_RE.match(session_id)
+        if match is None:
+            return None
+        return self._check_index(int(match.group(1)))
+
+    def get_media_owner(self, media_path: str) -> int | None:
+        """Return the index of the worker that stores the media file with the
+        given path (relative to the media endpoint), or None if unknown.
+        """
+        prefix, _, _ = media_path.partition("/")
+        if not prefix.startswith("w") or not prefix[1:].isdigit():
+            return None
+        return self._check_index(int(prefix[1:]))
+
+    def get_worker_url(self, index: int, uri: str, scheme: str = "http") -> str:
+        """Return the URL of the given request URI on the given worker's private
+        port.
+        """
+        return f"{scheme}://127.0.0.1:{self.ports[index]}{uri}"
+
+    def _check_index(self, index: int) -> int | None:
+        return index if 0 <= index < self.num_workers else None
+
+
+@dataclass(frozen=True)
+class Worker:
+    """The state of the current worker process."""
+
+    routing: WorkerRouting
+
+    # The public listening sockets, shared by all workers.
+    public_sockets: list[socket.socket]
+
+    # This worker's private loopback sockets, which other workers forward
+    # requests to. They're served without TLS, since forwarded requests never
+    # leave the machine.
+    private_sockets: list[socket.socket]
+
+    # A directory shared by all workers, deleted when the supervisor exits.
+    shared_dir: str
+
+    @property
+    def cache_db_path(self) -> str:
+        return os.path.join(self.shared_dir, "cache.sqlite")
+
+
+def is_forwarded_request(request: HTTPServerRequest) -> bool:
+    """True if the request was forwarded by another worker."""
+    return WORKER_FORWARDED_HEADER in request.headers
+
+
+class PublicRequestDelegate(httputil.HTTPServerConnectionDelegate):
+    """Passes requests that arrive on the public sockets on to the app, without
+    the WORKER_FORWARDED_HEADER.
+
+    Only requests on the workers' private loopback sockets can be forwarded
+    requests. Otherwise, clients could set the header to bypass the routing of
+    requests to the worker that owns their session.
+    """
+
+    def __init__(self, delegate: httputil.HTTPServerConnectionDelegate) -> None:
+        self._delegate = delegate
+
+    def start_request(
+        self, server_conn: object, request_conn: httputil.HTTPConnection
+    ) -> httputil.HTTPMessageDelegate:
+        return _StripForwardedHeader(
+            self._delegate.start_request(server_conn, request_conn)
+        )
+
+    def on_close(self, server_conn: object) -> None:
+        self._delegate.on_close(server_conn)
+
+
+class _StripForwardedHeader(httputil.HTTPMessageDelegate):
+    def __init__(self, delegate: httputil.HTTPMessageDelegate) -> None:
+        self._delegate = delegate
+
+    def headers_received(
+        self,
+        start_line: httputil.RequestStartLine | httputil.ResponseStartLine,
+        headers: httputil.HTTPHeaders,
+    ) -> Awaitable[None] | None:
+        if WORKER_FORWARDED_HEADER in headers:
+            del headers[WORKER_FORWARDED_HEADER]
+        return self._delegate.headers_received(start_line, headers)
+
+    def data_received(self, chunk: bytes) -> Awaitable[None] | None:
+        return self._delegate.data_received(chunk)
+
+    def finish(self) -> None:
+        self._delegate.finish()
+
+    def on_connection_close(self) -> None:
+        self._delegate.on_connection_close()
+
+
+class OwnedByOtherWorker(PathMatches):
+    """Matches requests for the given path pattern that must be handled by
+    another worker.
+
+    The index of that worker is passed to the handler as the `worker_index`
+    keyword argument.
+    """
+
+    def __init__(
+        self,
+        path_pattern: str,
+        routing: WorkerRouting,
+        get_owner: Callable[[HTTPServerRequest, dict[str, Any]], int | None],
+    ):
+        super().__init__(path_pattern)
+        self._routing = routing
+        self._get_owner = get_owner
+
+    def match(self, request: HTTPServerRequest) -> dict[str, Any] | None:
+        path_match = super().match(request)
+        if path_match is None or is_forwarded_request(request):
+            return None
+
+        owner = self._get_owner(request, path_match)
+        if owner is None or owner == self._routing.index:
+            return None
+
+        return {"path_args": [], "path_kwargs": {"worker_index": str(owner).encode()}}
+
+
+def start_workers(num_workers: int, sockets: list[socket.socket]) -> Worker:
+    """Fork num_workers worker processes that share the given listening sockets.
+
+    This only returns in the worker processes. The calling process becomes the
+    workers' supervisor: it restarts workers that crash, forwards termination
+    signals to them, and exits once all of them have exited.
+    """
+    private_sockets = [
+        tornado.netutil.bind_sockets(0, "127.0.0.1", family=socket.AF_INET)
+        for _ in range(num_workers)
+    ]
+    ports = tuple(socks[0].getsockname()[1] for socks in private_sockets)
+    shared_dir = tempfile.mkdtemp(prefix="streamlit-workers-")
+
+    try:
+        index = _fork_workers(num_workers)
+    except BaseException:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+        raise
+
+    if index is None:
+        # We're the supervisor, and all workers have exited.
+        shutil.rmtree(shared_dir, ignore_errors=True)
+        sys.exit(0)
+
+    for i, socks in enumerate(private_sockets):
+        if i != index:
+            for sock in socks:
+                sock.close()
+
+    _LOGGER.debug("Started worker %s (pid %s)", index, os.getpid())
+    return Worker(
+        routing=WorkerRouting(index=index, ports=ports),
+        public_sockets=sockets,
+        private_sockets=private_sockets[index],
+        shared_dir=shared_dir,
+    )
+
+
+_FORWARDED_SIGNALS: Final = [signal.SIGINT, signal.SIGTERM]
+if sys.platform != "win32":
+    _FORWARDED_SIGNALS.append(signal.SIGQUIT)
+
+
+def _fork_workers(num_workers: int) -> int | None:
+    """Fork the worker processes and supervise them.
+
+    Returns the worker's index in worker processes, and None in the supervisor
+    once all workers have exited.
+    """
+    workers_by_pid: dict[int, int] = {}
+
+    def fork(index: int) -> bool:
+        pid = os.fork()
+        if pid == 0:
+            for signal_number in _FORWARDED_SIGNALS:
+                signal.signal(signal_number, signal.SIG_DFL)
+            return True
+        workers_by_pid[pid] = index
+        return False
+
+    for index in range(num_workers):
+        if fork(index):
+            return index
+
+    stopping = False
+
+    def forward_signal(signal_number, stack_frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers_by_pid:
+            try:
+                os.kill(pid, signal_number)
+            except ProcessLookupError:
+                pass
+
+    for signal_number in _FORWARDED_SIGNALS:
+        signal.signal(signal_number, forward_signal)
+
+    num_restarts = 0
+    while workers_by_pid:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+
+        index = workers_by_pid.pop(pid, None)
+        if index is None:
+            continue
+
+        exit_code = os.waitstatus_to_exitcode(status)
+        if exit_code == 0 or stopping:
+            _LOGGER.debug("Worker %s exited with code %s", index, exit_code)
+            continue
+
+        if num_restarts >= _MAX_WORKER_RESTARTS:
+            _LOGGER.error(
+                "Worker %s exited with code %s. Too many restarts, not restarting it.",
+                index,
+                exit_code,
+            )
+            continue
+
+        _LOGGER.warning(
+            "Worker %s exited with code %s. Restarting it.", index, exit_code
+        )
+        num_restarts += 1
+        if fork(index):
+            return index
+
+    return None
@@ -402,6 +402,75 @@ class InvokeComponentTest(DeltaGeneratorTestCase):
             _serialize_bytes_arg("bytes_arg", b"bytes"), proto.special_args[1]
         )
 
+    def _get_blob_arg(self, blob_url: str) -> SpecialArg:
+        blob = self.media_file_storage.get_file(blob_url.split("/")[-1])
+        self.assertEqual("application/octet-stream", blob.mimetype)
+        return SpecialArg.FromString(blob.content)
+
+    def test_large_args_are_sent_as_blobs(self):
+        """Large args of any type are replaced by a reference to a blob."""
+        large_list = list(range(20_000))
+        large_bytes = b"x" * 100_000
+        large_df = pd.DataFrame({"a": range(20_000)})
+        self.test_component(
+            small="small", large_list=large_list, data=large_bytes, df=large_df
+        )
+        proto = self.get_delta_from_queue().new_element.component_instance
+
+        self.assertJSONEqual(
+            {"small": "small", "key": None, "default": None}, proto.json_args
+        )
+        self.assertEqual(
+            ["data", "df", "large_list"],
+            sorted(arg.key for arg in proto.special_args),
+        )
+        args_by_key = {arg.key: arg for arg in proto.special_args}
+        for arg in proto.special_args:
+            self.assertEqual("blob_url", arg.WhichOneof("value"))
+
+        self.assertEqual(
+            large_list,
+            json.loads(self._get_blob_arg(args_by_key["large_list"].blob_url).json),
+        )
+        self.assertEqual(
+            _serialize_bytes_arg("data", large_bytes),
+            self._get_blob_arg(args_by_key["data"].blob_url),
+        )
+        self.assertEqual(
+            _serialize_dataframe_arg("df", large_df),
+            self._get_blob_arg(args_by_key["df"].blob_url),
+        )
+
+    def test_blob_urls_only_change_with_arg_content(self):
+        """An unchanged large arg is sent as the same blob URL, so that the
+        frontend doesn't fetch it again.
+        """
+        large_list = list(range(20_000))
+        self.test_component(large_list=large_list, other=1)
+        proto1 = self.get_delta_from_queue().new_element.component_instance
+        self.test_component(large_list=large_list, other=2)
+        proto2 = self.get_delta_from_queue().new_element.component_instance
+        self.test_component(large_list=[*large_list, 1], other=2)
+        proto3 = self.get_delta_from_queue().new_element.component_instance
+
+        self.assertEqual(
+            proto1.special_args[0].blob_url, proto2.special_args[0].blob_url
+        )
+        self.assertNotEqual(
+            proto2.special_args[0].blob_url, proto3.special_args[0].blob_url
+        )
+        # Keyless components' IDs still depend on the large arg's content.
+        self.assertNotEqual(proto2.id, proto3.id)
+
+    def test_large_args_are_inlined_without_runtime(self):
+        Runtime._instance = None
+        large_list = list(range(20_000))
+        self.test_component(large_list=large_list)
+        proto = self.get_delta_from_queue().new_element.component_instance
+
+        self.assertEqual("json", proto.special_args[0].WhichOneof("value"))
+        self.assertEqual(large_list, json.loads(proto.special_args[0].json))
+
     def test_duplicate_key(self):
         """Two components with the same `key` should throw DuplicateWidgetID exception"""
         self.test_component(foo="bar", key="baz")
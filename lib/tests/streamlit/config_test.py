@@ -411,6 +411,7 @@ class ConfigTest(unittest.TestCase):
                 "runner.postScriptGC",
                 "runner.fastReruns",
                 "runner.enumCoercion",
+                "runner.profileCommands",
                 "magic.displayRootDocString",
                 "magic.displayLastExprIfNoSemicolon",
                 "mapbox.token",
@@ -419,7 +420,16 @@ class ConfigTest(unittest.TestCase):
                 "server.enableCORS",
                 "server.cookieSecret",
                 "server.scriptHealthCheckEnabled",
+                "server.scriptHealthCheckTtl",
+                "server.scriptHealthCheckInterval",
+                "server.warmup",
+                "server.warmupScript",
                 "server.enableWebsocketCompression",
+                "server.rerunCoalescingWindow",
+                "server.websocketPingInterval",
+                "server.websocketPingTimeout",
+                "server.enableWidgetStateDeltas",
+                "server.enableElementDiffing",
                 "server.enableXsrfProtection",
                 "server.fileWatcherType",
                 "server.folderWatchBlacklist",
@@ -435,6 +445,11 @@ class ConfigTest(unittest.TestCase):
                 "server.sslCertFile",
                 "server.sslKeyFile",
                 "server.disconnectedSessionTTL",
+                "server.sessionHibernationDir",
+                "server.maxHibernatedSessions",
+                "server.maxHibernatedSessionsSize",
+                "server.maxPersistedCacheSize",
+                "server.workers",
                 "ui.hideTopBar",
             ]
         )
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import tempfile
 import threading
 import unittest
 from copy import deepcopy
@@ -217,3 +218,107 @@ class SQLConnectionTest(unittest.TestCase):
         # connection.
         assert conn._connect.call_count == 1
         conn._connect.reset_mock()
+
+    @patch(
+        "streamlit.connections.sql_connection.SQLConnection._secrets",
+        PropertyMock(
+            return_value=AttrDict(
+                {
+                    **DB_SECRETS,
+                    "pool_size": 10,
+                    "max_overflow": 5,
+                    "pool_pre_ping": True,
+                    "create_engine_kwargs": {"max_overflow": 20},
+                }
+            )
+        ),
+    )
+    @patch("sqlalchemy.create_engine")
+    def test_pool_params_from_secrets(self, patched_create_engine):
+        SQLConnection("my_sql_connection", pool_pre_ping=False)
+
+        patched_create_engine.assert_called_once()
+        _, kwargs = patched_create_engine.call_args_list[0]
+
+        assert kwargs == {"pool_size": 10, "max_overflow": 20, "pool_pre_ping": False}
+
+    def test_query_returns_connection_to_pool(self):
+        add_script_run_ctx(threading.current_thread(), create_mock_script_run_ctx())
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = SQLConnection(
+                "my_sql_connection", url=f"sqlite:///{tmp_dir}/db.sqlite"
+            )
+
+            conn.query("SELECT 1 AS x;")
+            conn.query("SELECT 1 AS x;", return_type="arrow")
+
+            assert conn.engine.pool.checkedout() == 0
+            conn.engine.dispose()
+
+    def test_query_arrow(self):
+        import pyarrow as pa
+        from sqlalchemy import text
+
+        add_script_run_ctx(threading.current_thread(), create_mock_script_run_ctx())
+        conn = SQLConnection("my_sql_connection", url="sqlite://")
+        with conn.session as session:
+            session.execute(text("CREATE TABLE t (a INTEGER, b TEXT, c REAL);"))
+            session.execute(
+                text("INSERT INTO t VALUES (:a, :b, :c);"),
+                [{"a": 1, "b": "x", "c": 0.5}, {"a": None, "b": None, "c": None}],
+            )
+            session.commit()
+
+        with patch("streamlit.connections.sql_connection._ARROW_FETCH_BATCH_SIZE", 1):
+            table = conn.query(
+                "SELECT * FROM t WHERE a = :a OR a IS NULL;",
+                params={"a": 1},
+                return_type="arrow",
+            )
+
+        assert isinstance(table, pa.Table)
+        assert table.to_pydict() == {"a": [1, None], "b": ["x", None], "c": [0.5, None]}
+
+    def test_query_arrow_uses_driver_arrow_support(self):
+        import pyarrow as pa
+
+        from streamlit.connections.sql_connection import _fetch_arrow_table
+
+        table = pa.table({"a": [1, 2]})
+        result = MagicMock()
+        result.cursor.fetch_arrow_table.return_value = table
+        del result.cursor.to_arrow_table
+
+        assert _fetch_arrow_table(result) is table
+        result.fetchmany.assert_not_called()
+
+    @patch("streamlit.connections.sql_connection.SQLConnection._connect", MagicMock())
+    def test_query_arrow_rejects_pandas_only_args(self):
+        conn = SQLConnection("my_sql_connection")
+
+        for kwargs in [{"index_col": "a"}, {"chunksize": 10}, {"coerce_float": True}]:
+            with pytest.raises(StreamlitAPIException):
+                conn.query("SELECT 1;", return_type="arrow", **kwargs)
+
+    @patch("streamlit.connections.sql_connection.SQLConnection._connect", MagicMock())
+    def test_query_rejects_invalid_return_type(self):
+        conn = SQLConnection("my_sql_connection")
+
+        with pytest.raises(StreamlitAPIException):
+            conn.query("SELECT 1;", return_type="polars")
+
+    def test_query_arrow_unifies_batch_types(self):
+        import pyarrow as pa
+
+        from streamlit.connections.sql_connection import _fetch_arrow_table
+
+        result = MagicMock()
+        result.keys.return_value = ["a", "b"]
+        del result.cursor.to_arrow_table
+        del result.cursor.fetch_arrow_table
+        result.cursor.fetchmany.side_effect = [[(None, 1)], [(1, 2.5)], []]
+
+        table = _fetch_arrow_table(result)
+
+        assert table.schema == pa.schema([("a", pa.int64()), ("b", pa.float64())])
+        assert table.to_pydict() == {"a": [None, 1], "b": [1.0, 2.5]}
@@ -0,0 +1,196 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from __future__ import annotations
+
+import base64
+import json
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io
+
+from streamlit.elements.lib import plotly_utils
+from streamlit.elements.lib.plotly_utils import (
+    _encode_typed_arrays,
+    _SpecCache,
+    figure_to_json,
+)
+
+
+def _decode(typed_array: dict[str, str], dtype: str) -> list[float]:
+    return np.frombuffer(
+        base64.b64decode(typed_array["bdata"]), dtype=np.dtype(dtype).newbyteorder("<")
+    ).tolist()
+
+
+class EncodeTypedArraysTest(unittest.TestCase):
+    def test_numeric_arrays(self):
+        """Numeric arrays nested anywhere are encoded, other values are kept."""
+        encoded = _encode_typed_arrays(
+            {
+                "data": [
+                    {
+                        "x": np.array([1.5, 2.5]),
+                        "marker": {"size": np.array([1, 2], dtype=np.uint16)},
+                        "name": "trace",
+                        "text": np.array(["a", "b"]),
+                    }
+                ],
+                "layout": {"width": 100, "range": (0, 1)},
+            }
+        )
+
+        trace = encoded["data"][0]
+        self.assertEqual("f8", trace["x"]["dtype"])
+        self.assertEqual([1.5, 2.5], _decode(trace["x"], "f8"))
+        self.assertEqual("u2", trace["marker"]["size"]["dtype"])
+        self.assertEqual([1, 2], _decode(trace["marker"]["size"], "u2"))
+        self.assertEqual("trace", trace["name"])
+        np.testing.assert_array_equal(np.array(["a", "b"]), trace["text"])
+        self.assertEqual({"width": 100, "range": [0, 1]}, encoded["layout"])
+
+    def test_int64_arrays_are_narrowed(self):
+        encoded = _encode_typed_arrays(np.array([-1, 1000], dtype=np.int64))
+        self.assertEqual("i2", encoded["dtype"])
+        self.assertEqual([-1, 1000], _decode(encoded, "i2"))
+
+        encoded = _encode_typed_arrays(np.array([1, 2**20], dtype=np.uint64))
+        self.assertEqual("u4", encoded["dtype"])
+        self.assertEqual([1, 2**20], _decode(encoded, "u4"))
+
+    def test_int64_arrays_out_of_int32_range_are_kept(self):
+        value = np.array([0, 2**40], dtype=np.int64)
+        self.assertIs(value, _encode_typed_arrays(value))
+
+    def test_multidimensional_big_endian_array(self):
+        value = np.arange(6, dtype=">f4").reshape(2, 3)
+        encoded = _encode_typed_arrays(value)
+
+        self.assertEqual("f4", encoded["dtype"])
+        self.assertEqual("2, 3", encoded["shape"])
+        self.assertEqual([0, 1, 2, 3, 4, 5], _decode(encoded, "f4"))
+
+    def test_empty_array_is_kept(self):
+        value = np.array([], dtype=np.float64)
+        self.assertIs(value, _encode_typed_arrays(value))
+
+
+class FigureToJsonTest(unittest.TestCase):
+    def setUp(self) -> None:
+        plotly_utils._spec_cache.clear()
+
+    def tearDown(self) -> None:
+        plotly_utils._spec_cache.clear()
+
+    def _figure(self, y: list[float]) -> go.Figure:
+        return go.Figure(go.Scatter(x=np.arange(len(y)), y=np.array(y)))
+
+    def test_matches_plotly_io(self):
+        figure = self._figure([1.0, 2.0, 3.0])
+        spec, _ = figure_to_json(figure)
+        self.assertEqual(plotly.io.to_json(figure, validate=False), spec)
+
+    def test_numeric_arrays_are_typed_arrays(self):
+        spec, _ = figure_to_json(self._figure([1.0, 2.0, 3.0]))
+        trace = json.loads(spec)["data"][0]
+        self.assertEqual([1.0, 2.0, 3.0], _decode(trace["y"], trace["y"]["dtype"]))
+
+    def test_memoizes_specs_by_content(self):
+        with patch.object(
+            plotly_utils, "_to_json", wraps=plotly_utils._to_json
+        ) as patched_to_json:
+            spec1, spec_hash1 = figure_to_json(self._figure([1.0, 2.0]))
+            spec2, spec_hash2 = figure_to_json(self._figure([1.0, 2.0]))
+            self.assertEqual(1, patched_to_json.call_count)
+            self.assertEqual(spec1, spec2)
+            self.assertEqual(spec_hash1, spec_hash2)
+
+            spec3, spec_hash3 = figure_to_json(self._figure([1.0, 3.0]))
+            self.assertEqual(2, patched_to_json.call_count)
+            self.assertNotEqual(spec1, spec3)
+            self.assertNotEqual(spec_hash1, spec_hash3)
+
+    def test_changing_chart_is_not_fingerprinted_or_memoized(self):
+        """Once a chart's figure changes, it's serialized without computing a
+        fingerprint, until it stops changing."""
+        with patch.object(
+            plotly_utils,
+            "_compute_fingerprint",
+            wraps=plotly_utils._compute_fingerprint,
+        ) as patched_fingerprint, patch.object(
+            plotly_utils._spec_cache, "set", wraps=plotly_utils._spec_cache.set
+        ) as patched_set:
+            figure_to_json(self._figure([1.0]), "chart")
+            figure_to_json(self._figure([2.0]), "chart")
+            self.assertEqual(2, patched_fingerprint.call_count)
+            # Only the first figure is memoized.
+            self.assertEqual(1, patched_set.call_count)
+
+            spec, spec_hash = figure_to_json(self._figure([3.0]), "chart")
+            spec_again, spec_hash_again = figure_to_json(self._figure([3.0]), "chart")
+            self.assertEqual(2, patched_fingerprint.call_count)
+            self.assertEqual(1, patched_set.call_count)
+            self.assertEqual(spec, spec_again)
+            self.assertEqual(spec_hash, spec_hash_again)
+
+            # The figure stopped changing, so it's memoized again.
+            figure_to_json(self._figure([3.0]), "chart")
+            self.assertEqual(3, patched_fingerprint.call_count)
+            self.assertEqual(2, patched_set.call_count)
+
+            # Other charts are still fingerprinted.
+            figure_to_json(self._figure([2.0]), "other_chart")
+            self.assertEqual(4, patched_fingerprint.call_count)
+
+    def test_spec_hash_does_not_depend_on_memoization(self):
+        figure_to_json(self._figure([1.0]), "chart")
+        _, changing_spec_hash = figure_to_json(self._figure([2.0]), "chart")
+        _, memoized_spec_hash = figure_to_json(self._figure([2.0]), "other_chart")
+
+        self.assertEqual(changing_spec_hash, memoized_spec_hash)
+
+    def test_unpicklable_figure_is_not_memoized(self):
+        with patch.object(
+            plotly_utils.pickle, "dumps", side_effect=TypeError
+        ), patch.object(
+            plotly_utils, "_to_json", wraps=plotly_utils._to_json
+        ) as patched_to_json:
+            spec1, spec_hash1 = figure_to_json(self._figure([1.0, 2.0]))
+            spec2, spec_hash2 = figure_to_json(self._figure([1.0, 2.0]))
+
+        self.assertEqual(2, patched_to_json.call_count)
+        self.assertEqual(spec1, spec2)
+        self.assertEqual(spec_hash1, spec_hash2)
+
+
+class SpecCacheTest(unittest.TestCase):
+    def test_evicts_least_recently_used_specs(self):
+        cache = _SpecCache(max_bytes=10)
+        cache.set("a", "1234", "hash")
+        cache.set("b", "1234", "hash")
+        cache.get("a")
+        cache.set("c", "1234", "hash")
+
+        self.assertEqual(("1234", "hash"), cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(("1234", "hash"), cache.get("c"))
+
+    def test_ignores_specs_larger_than_the_cache(self):
+        cache = _SpecCache(max_bytes=10)
+        cache.set("a", "12345678901", "hash")
+        self.assertIsNone(cache.get("a"))
@@ -14,6 +14,8 @@
 
 """Unit tests for st.map()."""
 
+from __future__ import annotations
+
 import itertools
 import json
 from unittest import mock
@@ -23,6 +25,8 @@ import pandas as pd
 from parameterized import parameterized
 
 import streamlit as st
+from streamlit.dataframe_util import convert_arrow_bytes_to_pandas_df
+from streamlit.elements.lib.color_util import to_int_color_tuple
 from streamlit.elements.map import _DEFAULT_MAP, _DEFAULT_ZOOM_LEVEL
 from streamlit.errors import StreamlitAPIException
 from tests.delta_generator_test_case import DeltaGeneratorTestCase
@@ -31,6 +35,18 @@ from tests.testutil import patch_config_options
 mock_df = pd.DataFrame({"lat": [1, 2, 3, 4], "lon": [10, 20, 30, 40]})
 
 
+def _get_layer_data(chart_proto) -> tuple[pd.DataFrame, dict[str, list[str]]]:
+    """Return the data of the map's layer, and the columns of each of its
+    binary attributes.
+    """
+    layer_data = chart_proto.arrow_layer_data[0]
+    binary_attributes = {
+        attribute.accessor: list(attribute.columns)
+        for attribute in layer_data.binary_attributes
+    }
+    return convert_arrow_bytes_to_pandas_df(layer_data.data), binary_attributes
+
+
 class StMapTest(DeltaGeneratorTestCase):
     """Test ability to marshall deck_gl_json_chart protos via st.map."""
 
@@ -70,10 +86,11 @@ class StMapTest(DeltaGeneratorTestCase):
             )
             st.map(df)
 
-            c = json.loads(
-                self.get_delta_from_queue().new_element.deck_gl_json_chart.json
+            layer_df, _ = _get_layer_data(
+                self.get_delta_from_queue().new_element.deck_gl_json_chart
             )
-            self.assertEqual(len(c.get("layers")[0].get("data")), 4)
+            self.assertEqual(list(layer_df["lat"]), [1, 2, 3, 4])
+            self.assertEqual(list(layer_df["lon"]), [10, 20, 30, 40])
 
     def test_map_uses_convert_anything_to_df(self):
         """Test that st.map uses convert_anything_to_df to convert input data."""
@@ -99,11 +116,29 @@ class StMapTest(DeltaGeneratorTestCase):
         )
 
         st.map(df, latitude="xlat", longitude="xlon", color="color", size="size")
-        c = json.loads(self.get_delta_from_queue().new_element.deck_gl_json_chart.json)
+        chart_proto = self.get_delta_from_queue().new_element.deck_gl_json_chart
+        c = json.loads(chart_proto.json)
+        layer_df, binary_attributes = _get_layer_data(chart_proto)
 
-        self.assertEqual(c.get("layers")[0].get("getPosition"), "@@=[xlon, xlat]")
-        self.assertEqual(c.get("layers")[0].get("getFillColor"), "@@=color")
-        self.assertEqual(c.get("layers")[0].get("getRadius"), "@@=size")
+        self.assertEqual(
+            binary_attributes,
+            {
+                "getPosition": ["lon", "lat"],
+                "getRadius": ["size"],
+                "getFillColor": ["r", "g", "b", "a"],
+            },
+        )
+        self.assertEqual(list(layer_df["lon"]), list(df["xlon"]))
+        self.assertEqual(list(layer_df["lat"]), list(df["xlat"]))
+        self.assertEqual(list(layer_df["size"]), [100, 50, 30])
+        self.assertEqual(
+            layer_df[["r", "g", "b", "a"]].values.tolist(), df["color"].tolist()
+        )
+        # Accessors are replaced by binary attributes.
+        self.assertNotIn("getPosition", c.get("layers")[0])
+        self.assertNotIn("getFillColor", c.get("layers")[0])
+        self.assertNotIn("getRadius", c.get("layers")[0])
+        self.assertNotIn("data", c.get("layers")[0])
 
         # Also test that the radius property is set up correctly.
         self.assertEqual(c.get("layers")[0].get("radiusMinPixels"), 3)
@@ -127,10 +162,12 @@ class StMapTest(DeltaGeneratorTestCase):
         )
 
         st.map(df, size="size", color="color")
-        c = json.loads(self.get_delta_from_queue().new_element.deck_gl_json_chart.json)
+        chart_proto = self.get_delta_from_queue().new_element.deck_gl_json_chart
+        layer_df, binary_attributes = _get_layer_data(chart_proto)
 
-        self.assertEqual(c.get("layers")[0].get("getFillColor"), "@@=color")
-        self.assertEqual(c.get("layers")[0].get("getRadius"), "@@=size")
+        self.assertEqual(binary_attributes["getFillColor"], ["r", "g", "b", "a"])
+        self.assertEqual(binary_attributes["getRadius"], ["size"])
+        self.assertEqual(list(layer_df["size"]), [100, 50, 30])
 
     def test_named_dataframe_index(self):
         """Test that the map method does not error with a dataframe with a named index"""
@@ -145,10 +182,13 @@ class StMapTest(DeltaGeneratorTestCase):
         df.index.name = "my index"
 
         st.map(df, color="color", size="size")
-        c = json.loads(self.get_delta_from_queue().new_element.deck_gl_json_chart.json)
+        chart_proto = self.get_delta_from_queue().new_element.deck_gl_json_chart
+        c = json.loads(chart_proto.json)
+        layer_df, binary_attributes = _get_layer_data(chart_proto)
 
-        self.assertEqual(c.get("layers")[0].get("getFillColor"), "@@=color")
-        self.assertEqual(c.get("layers")[0].get("getRadius"), "@@=size")
+        self.assertEqual(binary_attributes["getFillColor"], ["r", "g", "b", "a"])
+        self.assertEqual(binary_attributes["getRadius"], ["size"])
+        self.assertEqual(list(layer_df["size"]), [100, 50, 30])
 
         # Also test that the radius property is set up correctly.
         self.assertEqual(c.get("layers")[0].get("radiusMinPixels"), 3)
@@ -217,14 +257,92 @@ class StMapTest(DeltaGeneratorTestCase):
 
             else:
                 st.map(df, color=color_column)
-                c = json.loads(
-                    self.get_delta_from_queue().new_element.deck_gl_json_chart.json
+                layer_df, binary_attributes = _get_layer_data(
+                    self.get_delta_from_queue().new_element.deck_gl_json_chart
                 )
 
-                rows = c.get("layers")[0].get("data")
+                color_components = binary_attributes["getFillColor"]
+                self.assertEqual(
+                    layer_df[color_components].values.tolist(),
+                    expected_color_values,
+                )
+
+    def test_vectorized_colors_match_to_int_color_tuple(self):
+        """Test that colors converted per column match the per-color conversion,
+        including mixed formats that fall back to it.
+        """
+        colors = {
+            "strings": ["#f00", "#00ff0080", "#f00", "#0000ff"],
+            "float_tuples": [[0.5, 1.0, 1.5], [0.0, -0.1, 0.25]] * 2,
+            "mixed_tuples": [[255, 0, 300, 0.5], [1, 2, 3, 1.0]] * 2,
+            "mixed_components": [[255, 0.5, 0], [0.5, 255, 0]] * 2,
+            "mixed_formats": ["#f00", [0, 255, 0], "#00f8", [1, 2, 3, 4]],
+        }
+        df = pd.DataFrame({"lat": [1, 2, 3, 4], "lon": [1, 2, 3, 4], **colors})
 
-                for i, row in enumerate(rows):
-                    self.assertEqual(row[color_column], expected_color_values[i])
+        for color_column, color_values in colors.items():
+            st.map(df, color=color_column)
+            layer_df, binary_attributes = _get_layer_data(
+                self.get_delta_from_queue().new_element.deck_gl_json_chart
+            )
+            color_components = binary_attributes["getFillColor"]
+
+            expected = [list(to_int_color_tuple(c)) for c in color_values]
+            if len(color_components) == 4:
+                expected = [c if len(c) == 4 else [*c, 255] for c in expected]
+            self.assertEqual(
+                expected,
+                layer_df[color_components].values.tolist(),
+                color_column,
+            )
+            self.assertEqual("uint8", layer_df[color_components[0]].dtype)
+
+    def test_string_colors_converted_once_per_distinct_color(self):
+        """Test that string colors are converted once per distinct color, also
+        with pandas versions whose factorize doesn't accept na_sentinel
+        keywords.
+        """
+        df = pd.DataFrame(
+            {"lat": [1, 2, 3, 4], "lon": [1, 2, 3, 4], "c": ["#f00", "#0f0"] * 2}
+        )
+        factorize = pd.factorize
+
+        with mock.patch.object(
+            pd, "factorize", side_effect=lambda values: factorize(values)
+        ), mock.patch(
+            "streamlit.elements.map.to_int_color_tuple", wraps=to_int_color_tuple
+        ) as to_int_color_tuple_mock:
+            st.map(df, color="c")
+
+        self.assertEqual(2, to_int_color_tuple_mock.call_count)
+        layer_df, binary_attributes = _get_layer_data(
+            self.get_delta_from_queue().new_element.deck_gl_json_chart
+        )
+        self.assertEqual(
+            [[255, 0, 0], [0, 255, 0]] * 2,
+            layer_df[binary_attributes["getFillColor"][:3]].values.tolist(),
+        )
+
+    def test_missing_string_color(self):
+        """Test that a missing color in a column of strings is reported."""
+        df = pd.DataFrame(
+            {"lat": [1, 2, 3], "lon": [1, 2, 3], "c": ["#f00", None, "#f00"]}
+        )
+
+        with self.assertRaises(StreamlitAPIException):
+            st.map(df, color="c")
+
+    def test_constant_size_and_color(self):
+        """Test that a constant size and color are part of the JSON spec."""
+        st.map(mock_df, size=20, color="#0044ff")
+
+        chart_proto = self.get_delta_from_queue().new_element.deck_gl_json_chart
+        layer = json.loads(chart_proto.json)["layers"][0]
+        _, binary_attributes = _get_layer_data(chart_proto)
+
+        self.assertEqual(layer["getRadius"], 20)
+        self.assertEqual(layer["getFillColor"], [0, 68, 255, 255])
+        self.assertEqual(binary_attributes, {"getPosition": ["lon", "lat"]})
 
     def test_unused_columns_get_dropped(self):
         """Test that unused columns don't get transmitted."""
@@ -240,24 +358,36 @@ class StMapTest(DeltaGeneratorTestCase):
         )
 
         st.map(df)
-        c = json.loads(self.get_delta_from_queue().new_element.deck_gl_json_chart.json)
-        self.assertEqual(len(c.get("layers")[0].get("data")[0]), 2)
+        layer_df, _ = _get_layer_data(
+            self.get_delta_from_queue().new_element.deck_gl_json_chart
+        )
+        self.assertEqual(list(layer_df.columns), ["lon", "lat"])
 
         st.map(df, latitude="xlat", longitude="xlon")
-        c = json.loads(self.get_delta_from_queue().new_element.deck_gl_json_chart.json)
-        self.assertEqual(len(c.get("layers")[0].get("data")[0]), 2)
+        layer_df, _ = _get_layer_data(
+            self.get_delta_from_queue().new_element.deck_gl_json_chart
+        )
+        self.assertEqual(list(layer_df.columns), ["lon", "lat"])
 
         st.map(df, latitude="xlat", longitude="xlon", color="int_color")
-        c = json.loads(self.get_delta_from_queue().new_element.deck_gl_json_chart.json)
-        self.assertEqual(len(c.get("layers")[0].get("data")[0]), 3)
+        layer_df, _ = _get_layer_data(
+            self.get_delta_from_queue().new_element.deck_gl_json_chart
+        )
+        self.assertEqual(list(layer_df.columns), ["lon", "lat", "r", "g", "b", "a"])
 
         st.map(df, latitude="xlat", longitude="xlon", size="size")
-        c = json.loads(self.get_delta_from_queue().new_element.deck_gl_json_chart.json)
-        self.assertEqual(len(c.get("layers")[0].get("data")[0]), 3)
+        layer_df, _ = _get_layer_data(
+            self.get_delta_from_queue().new_element.deck_gl_json_chart
+        )
+        self.assertEqual(list(layer_df.columns), ["lon", "lat", "size"])
 
         st.map(df, latitude="xlat", longitude="xlon", color="int_color", size="size")
-        c = json.loads(self.get_delta_from_queue().new_element.deck_gl_json_chart.json)
-        self.assertEqual(len(c.get("layers")[0].get("data")[0]), 4)
+        layer_df, _ = _get_layer_data(
+            self.get_delta_from_queue().new_element.deck_gl_json_chart
+        )
+        self.assertEqual(
+            list(layer_df.columns), ["lon", "lat", "size", "r", "g", "b", "a"]
+        )
 
     def test_original_df_is_untouched(self):
         """Test that when we modify the outgoing DF we don't mutate the input DF."""
@@ -270,8 +400,10 @@ class StMapTest(DeltaGeneratorTestCase):
         )
 
         st.map(df)
-        c = json.loads(self.get_delta_from_queue().new_element.deck_gl_json_chart.json)
-        self.assertEqual(len(c.get("layers")[0].get("data")[0]), 2)
+        layer_df, _ = _get_layer_data(
+            self.get_delta_from_queue().new_element.deck_gl_json_chart
+        )
+        self.assertEqual(len(layer_df.columns), 2)
         self.assertEqual(len(df.columns), 3)
 
     # This test was turned off while we investigate issues with the feature.
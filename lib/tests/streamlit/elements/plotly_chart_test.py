@@ -11,6 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import subprocess
+import sys
+import textwrap
 from unittest.mock import MagicMock, patch
 
 import plotly.express as px
@@ -52,6 +55,26 @@ class PyDeckTest(DeltaGeneratorTestCase):
         el = self.get_delta_from_queue().new_element
         self.assertEqual(el.plotly_chart.theme, proto_value)
 
+    def test_streamlit_plotly_theme_is_configured_on_import(self):
+        """Test that the Streamlit Plotly theme is the default for figures, even
+        though Plotly is imported after Streamlit.
+        """
+        script = textwrap.dedent(
+            """
+            import sys
+            import streamlit
+            assert "plotly" not in sys.modules
+
+            import plotly.graph_objects as go
+            print(go.Figure().layout.template.layout.colorway[0])
+            """
+        )
+        output = subprocess.check_output(
+            [sys.executable, "-c", script], text=True
+        ).strip()
+        # The first color of the Streamlit theme's temporary color palette
+        self.assertEqual(output, "#000001")
+
     def test_bad_theme(self):
         df = px.data.gapminder().query("country=='Canada'")
         fig = px.line(df, x="year", y="lifeExp", title="Life expectancy in Canada")
@@ -12,14 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import annotations
+
 import json
 from unittest import mock
 
+import numpy as np
 import pandas as pd
 import pydeck as pdk
 
 import streamlit as st
 import streamlit.elements.deck_gl_json_chart as deck_gl_json_chart
+from streamlit.dataframe_util import convert_arrow_bytes_to_pandas_df
 from streamlit.errors import StreamlitAPIException
 from streamlit.proto.DeckGlJsonChart_pb2 import DeckGlJsonChart as PydeckProto
 from tests.delta_generator_test_case import DeltaGeneratorTestCase
@@ -54,6 +58,80 @@ class PyDeckTest(DeltaGeneratorTestCase):
         )
         self.assertEqual(el.deck_gl_json_chart.tooltip, "")
 
+    def test_binary_transport(self):
+        """Test that the data of layers created with use_binary_transport=True is
+        sent as Arrow binary attributes.
+        """
+        df = pd.DataFrame(
+            {
+                "position": [[10.0, 1.0], [20.0, 2.0], [30.0, 3.0]],
+                "radius": np.array([1, 2, 3], dtype=np.int64),
+            }
+        )
+        st.pydeck_chart(
+            pdk.Deck(
+                layers=[
+                    pdk.Layer("TextLayer", data=df1),
+                    pdk.Layer(
+                        "ScatterplotLayer",
+                        data=df,
+                        get_position="position",
+                        get_radius="radius",
+                        use_binary_transport=True,
+                    ),
+                ]
+            )
+        )
+
+        chart = self.get_delta_from_queue().new_element.deck_gl_json_chart
+        spec = json.loads(chart.json)
+        self.assertIn("data", spec["layers"][0])
+        self.assertNotIn("data", spec["layers"][1])
+        self.assertNotIn("getPosition", spec["layers"][1])
+
+        self.assertEqual(1, len(chart.arrow_layer_data))
+        layer_data = chart.arrow_layer_data[0]
+        self.assertEqual(1, layer_data.layer_index)
+        self.assertEqual(
+            {
+                "getPosition": ["position[0]", "position[1]"],
+                "getRadius": ["radius"],
+            },
+            {
+                attribute.accessor: list(attribute.columns)
+                for attribute in layer_data.binary_attributes
+            },
+        )
+
+        layer_df = convert_arrow_bytes_to_pandas_df(layer_data.data)
+        self.assertEqual([10.0, 20.0, 30.0], layer_df["position[0]"].tolist())
+        self.assertEqual([1.0, 2.0, 3.0], layer_df["position[1]"].tolist())
+        # 64-bit integers are sent as floats.
+        self.assertEqual("float64", layer_df["radius"].dtype)
+
+    def test_binary_transport_changes_element_id(self):
+        """Test that the element ID of a selectable chart depends on the data of
+        its binary transport layers.
+        """
+
+        def pydeck_chart(values: list[float]) -> str:
+            st.pydeck_chart(
+                pdk.Deck(
+                    layers=[
+                        pdk.Layer(
+                            "ScatterplotLayer",
+                            data=pd.DataFrame({"radius": values}),
+                            get_radius="radius",
+                            use_binary_transport=True,
+                        )
+                    ]
+                ),
+                on_select="rerun",
+            )
+            return self.get_delta_from_queue().new_element.deck_gl_json_chart.id
+
+        self.assertNotEqual(pydeck_chart([1.0]), pydeck_chart([2.0]))
+
     def test_with_tooltip(self):
         """Test that pydeck object with tooltip works."""
 
@@ -15,11 +15,17 @@
 from __future__ import annotations
 
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from git.exc import InvalidGitRepositoryError
 
-from streamlit.git_util import GITHUB_HTTP_URL, GITHUB_SSH_URL, GitRepo
+from streamlit.git_util import (
+    GITHUB_HTTP_URL,
+    GITHUB_SSH_URL,
+    GitRepo,
+    GitRepoInfo,
+    GitRepoInfoCache,
+)
 
 
 class GitUtilTest(unittest.TestCase):
@@ -74,3 +80,93 @@ class GitUtilTest(unittest.TestCase):
         with patch.dict("sys.modules", {"git": None}):
             repo = GitRepo(".")
             self.assertFalse(repo.is_valid())
+
+
+class GitRepoInfoCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.repo_info = GitRepoInfo(
+            repository="streamlit/streamlit",
+            branch="main",
+            module="app.py",
+            untracked_files=(),
+            uncommitted_files=(),
+            is_head_detached=False,
+            is_ahead_of_remote=False,
+        )
+        self.load_repo_info = MagicMock(return_value=self.repo_info)
+        self.cache = GitRepoInfoCache(self.load_repo_info)
+
+        git_repo_patcher = patch("streamlit.git_util.GitRepo")
+        self.git_repo = git_repo_patcher.start()
+        self.addCleanup(git_repo_patcher.stop)
+        self.git_repo.return_value.repo.git_dir = "/repo/.git"
+
+        watch_file_patcher = patch(
+            "streamlit.watcher.path_watcher.watch_file", return_value=True
+        )
+        self.watch_file = watch_file_patcher.start()
+        self.addCleanup(watch_file_patcher.stop)
+
+        isfile_patcher = patch("streamlit.git_util.os.path.isfile", return_value=True)
+        isfile_patcher.start()
+        self.addCleanup(isfile_patcher.stop)
+
+    def test_loads_repo_info_once(self):
+        """Concurrent and later requests share the same load."""
+        future1 = self.cache.get("/repo/app.py")
+        future2 = self.cache.get("/repo/app.py")
+
+        self.assertIs(self.repo_info, future1.result(timeout=5))
+        self.assertIs(future1, future2)
+        self.assertIs(future1, self.cache.get("/repo/app.py"))
+        self.load_repo_info.assert_called_once_with(self.git_repo.return_value)
+
+    def test_watches_git_files_once(self):
+        self.cache.get("/repo/app.py").result(timeout=5)
+        self.cache.invalidate()
+        self.cache.get("/repo/app.py").result(timeout=5)
+
+        self.assertEqual(
+            [
+                "/repo/.git/HEAD",
+                "/repo/.git/FETCH_HEAD",
+                "/repo/.git/logs/HEAD",
+            ],
+            [call.args[0] for call in self.watch_file.call_args_list],
+        )
+
+    def test_git_file_change_invalidates(self):
+        future = self.cache.get("/repo/app.py")
+        future.result(timeout=5)
+
+        on_changed = self.watch_file.call_args.args[1]
+        on_changed("/repo/.git/HEAD")
+
+        new_future = self.cache.get("/repo/app.py")
+        self.assertIsNot(future, new_future)
+        new_future.result(timeout=5)
+        self.assertEqual(2, self.load_repo_info.call_count)
+
+    def test_does_not_keep_repo_info_if_not_watched(self):
+        """Without a file watcher, repo info is loaded for every request."""
+        self.watch_file.return_value = False
+
+        future = self.cache.get("/repo/app.py")
+        future.result(timeout=5)
+
+        self.assertIsNot(future, self.cache.get("/repo/app.py"))
+
+    def test_does_not_keep_invalid_repos(self):
+        self.git_repo.return_value.is_valid.return_value = False
+        self.load_repo_info.return_value = None
+
+        future = self.cache.get("/repo/app.py")
+        self.assertIsNone(future.result(timeout=5))
+
+        self.assertIsNot(future, self.cache.get("/repo/app.py"))
+        self.watch_file.assert_not_called()
+
+    def test_load_errors_resolve_to_none(self):
+        self.load_repo_info.side_effect = RuntimeError("git failed")
+
+        self.assertIsNone(self.cache.get("/repo/app.py").result(timeout=5))
@@ -87,6 +87,7 @@ FD = FieldDescriptor
                 ("hide_top_bar", FD.LABEL_OPTIONAL, FD.TYPE_BOOL),
                 ("hide_sidebar_nav", FD.LABEL_OPTIONAL, FD.TYPE_BOOL),
                 ("toolbar_mode", FD.LABEL_OPTIONAL, FD.TYPE_ENUM),
+                ("enable_widget_state_deltas", FD.LABEL_OPTIONAL, FD.TYPE_BOOL),
             },
         ),
         (
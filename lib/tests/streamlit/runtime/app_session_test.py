@@ -19,6 +19,7 @@ import gc
 import threading
 import unittest
 from asyncio import AbstractEventLoop
+from concurrent.futures import Future
 from typing import Any, Callable, cast
 from unittest import IsolatedAsyncioTestCase
 from unittest.mock import DEFAULT, MagicMock, patch
@@ -27,11 +28,14 @@ import pytest
 
 import streamlit.runtime.app_session as app_session
 from streamlit import config
+from streamlit.git_util import GitRepoInfo
 from streamlit.proto.AppPage_pb2 import AppPage
 from streamlit.proto.BackMsg_pb2 import BackMsg
 from streamlit.proto.ClientState_pb2 import ClientState
 from streamlit.proto.Common_pb2 import FileURLs, FileURLsRequest, FileURLsResponse
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.GitInfo_pb2 import GitInfo
+from streamlit.proto.NewSession_pb2 import Config, NewSession
 from streamlit.runtime import Runtime
 from streamlit.runtime.app_session import AppSession, AppSessionState
 from streamlit.runtime.caching.storage.dummy_cache_storage import (
@@ -42,6 +46,7 @@ from streamlit.runtime.fragment import MemoryFragmentStorage
 from streamlit.runtime.media_file_manager import MediaFileManager
 from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.pages_manager import PagesManager
+from streamlit.runtime.runtime_metrics import RuntimeMetrics
 from streamlit.runtime.script_data import ScriptData
 from streamlit.runtime.scriptrunner import (
     RerunData,
@@ -359,6 +364,51 @@ class AppSessionTest(unittest.TestCase):
             )
             mock_enqueue.assert_not_called()
 
+    @patch("streamlit.runtime.app_session.AppSession._enqueue_forward_msg")
+    @patch("streamlit.runtime.app_session.AppSession.request_rerun")
+    def test_requests_widget_states_if_delta_does_not_apply(
+        self, mock_request_rerun: MagicMock, mock_enqueue: MagicMock
+    ):
+        """A widget state delta against unknown widget states is dropped, and
+        the browser is asked to send its complete widget states."""
+        session = _create_test_session()
+
+        client_state = ClientState()
+        client_state.widget_states.version = 3
+        client_state.widget_states.base_version = 2
+        session._handle_rerun_script_request(client_state)
+
+        mock_request_rerun.assert_not_called()
+        expected_msg = ForwardMsg()
+        expected_msg.resend_widget_states = True
+        mock_enqueue.assert_called_once_with(expected_msg)
+
+        client_state.widget_states.base_version = 0
+        session._handle_rerun_script_request(client_state)
+        mock_request_rerun.assert_called_once_with(client_state)
+
+    @patch("streamlit.runtime.app_session.AppSession.request_rerun")
+    def test_clears_element_snapshot_if_client_requests_elements(
+        self, mock_request_rerun: MagicMock
+    ):
+        """A client that's missing an element that was reported as unchanged
+        gets every element in full."""
+        session = _create_test_session()
+        msg = ForwardMsg()
+        msg.metadata.delta_path[:] = [0, 0]
+        msg.delta.new_element.text.body = "text"
+        session.element_snapshot.get_msg_to_send(msg)
+
+        session._handle_rerun_script_request(ClientState())
+        self.assertEqual(1, len(session.element_snapshot))
+
+        client_state = ClientState()
+        client_state.resend_elements = True
+        session._handle_rerun_script_request(client_state)
+
+        self.assertEqual(0, len(session.element_snapshot))
+        mock_request_rerun.assert_called_with(client_state)
+
     @patch("streamlit.runtime.app_session.ScriptRunner", MagicMock(spec=ScriptRunner))
     @patch("streamlit.runtime.app_session.AppSession._enqueue_forward_msg", MagicMock())
     def test_resets_debug_last_backmsg_id_on_script_finished(self):
@@ -397,6 +447,57 @@ class AppSessionTest(unittest.TestCase):
 
             assert session._state == AppSessionState.APP_NOT_RUNNING
 
+    @patch("streamlit.runtime.app_session.ScriptRunner", MagicMock(spec=ScriptRunner))
+    @patch("streamlit.runtime.app_session.AppSession._enqueue_forward_msg", MagicMock())
+    @patch(
+        "streamlit.runtime.app_session.AppSession._create_new_session_message",
+        MagicMock(return_value=ForwardMsg()),
+    )
+    @patch("streamlit.runtime.app_session.AppSession._handle_rerun_script_request")
+    @patch_config_options({"server.fileWatcherType": "none"})
+    def test_records_rerun_metrics(self, _):
+        session = _create_test_session()
+        session._create_scriptrunner(initial_rerun_data=RerunData())
+        session._metrics = RuntimeMetrics()
+
+        rerun_msg = BackMsg()
+        rerun_msg.rerun_script.query_string = ""
+        delta_msg = ForwardMsg()
+        delta_msg.delta.new_element.markdown.body = "hi"
+
+        with patch(
+            "streamlit.runtime.app_session.asyncio.get_running_loop",
+            return_value=session._event_loop,
+        ), patch(
+            "streamlit.runtime.app_session.time.monotonic",
+            side_effect=[10.0, 10.5, 10.75, 12.5],
+        ):
+            session.handle_backmsg(rerun_msg)
+            session._handle_scriptrunner_event_on_event_loop(
+                sender=session._scriptrunner,
+                event=ScriptRunnerEvent.SCRIPT_STARTED,
+                page_script_hash="hash",
+            )
+            # Only the first delta of the run is recorded.
+            for _ in range(2):
+                session._handle_scriptrunner_event_on_event_loop(
+                    sender=session._scriptrunner,
+                    event=ScriptRunnerEvent.ENQUEUE_FORWARD_MSG,
+                    forward_msg=delta_msg,
+                )
+            session._handle_scriptrunner_event_on_event_loop(
+                sender=session._scriptrunner,
+                event=ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+            )
+
+        metrics = session._metrics
+        assert (metrics.script_queue_wait.count, metrics.script_queue_wait.sum) == (
+            1,
+            0.5,
+        )
+        assert (metrics.first_delta.count, metrics.first_delta.sum) == (1, 0.75)
+        assert (metrics.script_exec.count, metrics.script_exec.sum) == (1, 2.0)
+
     def test_passes_client_state_on_run_on_save(self):
         session = _create_test_session()
         session._run_on_save = True
@@ -406,6 +507,13 @@ class AppSessionTest(unittest.TestCase):
         session._script_cache.clear.assert_called_once()
         session.request_rerun.assert_called_once_with(session._client_state)
 
+    @patch("streamlit.runtime.app_session.get_git_repo_info_cache")
+    def test_source_file_change_invalidates_git_info(self, get_git_repo_info_cache):
+        session = _create_test_session()
+        session._on_source_file_changed()
+
+        get_git_repo_info_cache.return_value.invalidate.assert_called_once()
+
     @patch(
         "streamlit.runtime.app_session.AppSession._should_rerun_on_file_change",
         MagicMock(return_value=False),
@@ -663,6 +771,12 @@ def _mock_get_options_for_section(overrides=None) -> Callable[..., Any]:
 class AppSessionScriptEventTest(IsolatedAsyncioTestCase):
     """Tests for AppSession's ScriptRunner event handling."""
 
+    def setUp(self) -> None:
+        super().setUp()
+        # Some tests patch config.get_options_for_section, which the config
+        # version doesn't reflect.
+        config.bump_config_version()
+
     @patch(
         "streamlit.runtime.app_session.config.get_options_for_section",
         MagicMock(side_effect=_mock_get_options_for_section()),
@@ -806,6 +920,46 @@ class AppSessionScriptEventTest(IsolatedAsyncioTestCase):
 
         add_script_run_ctx(ctx=orig_ctx)
 
+    @patch(
+        "streamlit.runtime.app_session._generate_scriptrun_id",
+        MagicMock(return_value="mock_scriptrun_id"),
+    )
+    async def test_handle_shared_fragment_run(self):
+        session = _create_test_session(asyncio.get_running_loop())
+        session._client_state.page_script_hash = "page_hash"
+
+        delta_msg = ForwardMsg()
+        delta_msg.delta.new_element.text.body = "shared"
+        session.handle_shared_fragment_run(
+            "my_fragment_id", [delta_msg.SerializeToString()]
+        )
+
+        new_session_msg, sent_delta_msg, script_finished_msg = (
+            session._browser_queue._queue
+        )
+        assert new_session_msg.new_session.fragment_ids_this_run == ["my_fragment_id"]
+        assert new_session_msg.new_session.page_script_hash == "page_hash"
+        assert sent_delta_msg.delta.new_element.text.body == "shared"
+        assert (
+            script_finished_msg.script_finished
+            == ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY
+        )
+
+    async def test_handle_shared_fragment_run_skips_running_app(self):
+        session = _create_test_session(asyncio.get_running_loop())
+        session._state = AppSessionState.APP_IS_RUNNING
+
+        session.handle_shared_fragment_run("my_fragment_id", [])
+
+        assert session._browser_queue.is_empty()
+
+    async def test_renders_fragment(self):
+        session = _create_test_session(asyncio.get_running_loop())
+        session._fragment_storage.set("my_fragment_id", lambda: None)
+
+        assert session.renders_fragment("my_fragment_id")
+        assert not session.renders_fragment("other_fragment_id")
+
     async def test_updates_page_script_hash_in_client_state_on_script_start(self):
         session = _create_test_session(asyncio.get_running_loop())
         session._client_state.page_script_hash = "some_page_script_hash"
@@ -977,6 +1131,58 @@ class AppSessionScriptEventTest(IsolatedAsyncioTestCase):
         session.handle_backmsg(msg)
         assert session._debug_last_backmsg_id == "some backmsg"
 
+    async def test_handles_git_information_request(self):
+        session = _create_test_session(asyncio.get_running_loop())
+        repo_info: Future[GitRepoInfo | None] = Future()
+        with patch(
+            "streamlit.runtime.app_session.get_git_repo_info_cache"
+        ) as get_git_repo_info_cache:
+            get_git_repo_info_cache.return_value.get.return_value = repo_info
+            session.handle_backmsg(BackMsg(load_git_info=True))
+
+        get_git_repo_info_cache.return_value.get.assert_called_once_with(
+            "/fake/script_path.py"
+        )
+        # The repo info is loaded in the background, so nothing is sent yet.
+        await asyncio.sleep(0)
+        assert len(session._browser_queue._queue) == 0
+
+        repo_info.set_result(
+            GitRepoInfo(
+                repository="streamlit/streamlit",
+                branch="main",
+                module="app.py",
+                untracked_files=("new.py",),
+                uncommitted_files=(),
+                is_head_detached=False,
+                is_ahead_of_remote=True,
+            )
+        )
+        await asyncio.sleep(0)
+
+        sent_messages = session._browser_queue._queue
+        assert len(sent_messages) == 1
+        git_info = sent_messages[0].git_info_changed
+        assert git_info.repository == "streamlit/streamlit"
+        assert git_info.branch == "main"
+        assert git_info.module == "app.py"
+        assert list(git_info.untracked_files) == ["new.py"]
+        assert list(git_info.uncommitted_files) == []
+        assert git_info.state == GitInfo.GitStates.AHEAD_OF_REMOTE
+
+    async def test_ignores_missing_git_information(self):
+        session = _create_test_session(asyncio.get_running_loop())
+        repo_info: Future[GitRepoInfo | None] = Future()
+        repo_info.set_result(None)
+        with patch(
+            "streamlit.runtime.app_session.get_git_repo_info_cache"
+        ) as get_git_repo_info_cache:
+            get_git_repo_info_cache.return_value.get.return_value = repo_info
+            session.handle_backmsg(BackMsg(load_git_info=True))
+
+        await asyncio.sleep(0)
+        assert len(session._browser_queue._queue) == 0
+
     @patch("streamlit.runtime.app_session._LOGGER")
     async def test_handles_app_heartbeat_backmsg(self, patched_logger):
         session = _create_test_session(asyncio.get_running_loop())
@@ -994,6 +1200,78 @@ class AppSessionScriptEventTest(IsolatedAsyncioTestCase):
             patched_logger.warning.assert_not_called()
 
 
+class NewSessionTemplateTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        config.bump_config_version()
+        self.pages = {
+            "hash1": {"page_name": "page_1", "icon": "", "script_path": "script1"},
+            "hash2": {"page_name": "page_2", "icon": "🎉", "script_path": "script2"},
+        }
+
+    def test_template_holds_session_invariant_fields(self):
+        new_session = NewSession.FromString(
+            app_session._get_new_session_template(self.pages)
+        )
+
+        assert [page.page_name for page in new_session.app_pages] == [
+            "page 1",
+            "page 2",
+        ]
+        assert new_session.HasField("config")
+        assert new_session.initialize.environment_info.streamlit_version != ""
+        assert new_session.initialize.user_info.installation_id != ""
+        # Per-session fields are set by the session.
+        assert new_session.script_run_id == ""
+        assert new_session.initialize.session_id == ""
+
+    def test_template_is_reused(self):
+        with patch.object(
+            app_session, "_populate_config_msg", wraps=app_session._populate_config_msg
+        ) as populate_config_msg:
+            template1 = app_session._get_new_session_template(self.pages)
+            template2 = app_session._get_new_session_template(dict(self.pages))
+
+        assert template1 is template2
+        populate_config_msg.assert_called_once()
+
+    def test_template_changes_with_pages(self):
+        template1 = app_session._get_new_session_template(self.pages)
+        self.pages["hash2"] = {**self.pages["hash2"], "icon": "🎈"}
+        template2 = app_session._get_new_session_template(self.pages)
+
+        assert template1 != template2
+        assert NewSession.FromString(template2).app_pages[1].icon == "🎈"
+
+    def test_template_changes_with_config(self):
+        orig_value = config.get_option("client.toolbarMode")
+        template1 = app_session._get_new_session_template(self.pages)
+        try:
+            config.set_option("client.toolbarMode", "minimal")
+            template2 = app_session._get_new_session_template(self.pages)
+        finally:
+            config.set_option("client.toolbarMode", orig_value)
+
+        assert (
+            NewSession.FromString(template2).config.toolbar_mode
+            == Config.ToolbarMode.MINIMAL
+        )
+        assert template1 != template2
+
+    def test_template_changes_with_patched_config(self):
+        template1 = app_session._get_new_session_template(self.pages)
+        with patch_config_options({"client.toolbarMode": "minimal"}):
+            template2 = app_session._get_new_session_template(self.pages)
+        template3 = app_session._get_new_session_template(self.pages)
+
+        assert (
+            NewSession.FromString(template2).config.toolbar_mode
+            == Config.ToolbarMode.MINIMAL
+        )
+        assert template1 != template2
+        assert template1 == template3
+
+
 class PopulateCustomThemeMsgTest(unittest.TestCase):
     @patch("streamlit.runtime.app_session.config")
     def test_no_custom_theme_prop_if_no_theme(self, patched_config):
@@ -19,20 +19,21 @@ from __future__ import annotations
 import logging
 import os
 import pickle
-import re
+import sqlite3
 import threading
 import unittest
+from contextlib import closing
 from typing import Any
-from unittest.mock import MagicMock, Mock, mock_open, patch
+from unittest.mock import MagicMock, Mock, patch
 
 from parameterized import parameterized
+from testfixtures import TempDirectory
 
 import streamlit as st
-from streamlit import file_util
 from streamlit.errors import StreamlitAPIException
 from streamlit.proto.Text_pb2 import Text as TextProto
 from streamlit.runtime import Runtime
-from streamlit.runtime.caching import cached_message_replay
+from streamlit.runtime.caching import cache_data_api, cache_utils, cached_message_replay
 from streamlit.runtime.caching.cache_data_api import get_data_cache_stats_provider
 from streamlit.runtime.caching.cache_errors import CacheError
 from streamlit.runtime.caching.cached_message_replay import (
@@ -54,7 +55,6 @@ from streamlit.runtime.caching.storage.dummy_cache_storage import (
 )
 from streamlit.runtime.caching.storage.local_disk_cache_storage import (
     LocalDiskCacheStorageManager,
-    get_cache_folder_path,
 )
 from streamlit.runtime.scriptrunner import add_script_run_ctx
 from streamlit.runtime.stats import CacheStat
@@ -283,94 +283,84 @@ class CacheDataPersistTest(DeltaGeneratorTestCase):
 
     def setUp(self) -> None:
         super().setUp()
+        self.tempdir = TempDirectory(create=True)
+        self.db_path = os.path.join(self.tempdir.path, "cache_data.sqlite")
+        self.patch_get_cache_folder_path = patch(
+            "streamlit.runtime.caching.storage.local_disk_cache_storage.get_cache_folder_path",
+            return_value=self.tempdir.path,
+        )
+        self.patch_get_cache_folder_path.start()
         mock_runtime = MagicMock(spec=Runtime)
         mock_runtime.cache_storage_manager = LocalDiskCacheStorageManager()
         Runtime._instance = mock_runtime
 
     def tearDown(self) -> None:
         st.cache_data.clear()
+        self.patch_get_cache_folder_path.stop()
+        self.tempdir.cleanup()
         super().tearDown()
 
-    @patch("streamlit.runtime.caching.storage.local_disk_cache_storage.streamlit_write")
-    def test_dont_persist_by_default(self, mock_write):
+    def restart_server(self) -> None:
+        """Drop the in-memory caches, so that values are read from disk."""
+        cache_data_api._data_caches._function_caches = {}
+
+    def persisted_values(self) -> list[Any]:
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            return [
+                pickle.loads(row[0]).value
+                for row in conn.execute("SELECT value FROM cache_entries")
+            ]
+
+    def overwrite_persisted_values(self, value: bytes) -> None:
+        with closing(sqlite3.connect(self.db_path)) as conn, conn:
+            conn.execute("UPDATE cache_entries SET value = ?", (value,))
+
+    def test_dont_persist_by_default(self):
         @st.cache_data
         def foo():
             return "data"
 
         foo()
-        mock_write.assert_not_called()
+        self.assertFalse(os.path.exists(self.db_path))
 
-    @patch("streamlit.runtime.caching.storage.local_disk_cache_storage.streamlit_write")
-    def test_persist_path(self, mock_write):
-        """Ensure we're writing to ~/.streamlit/cache/*.memo"""
+    def test_persist_path(self):
+        """Ensure we're writing to ~/.streamlit/cache/cache_data.sqlite"""
 
         @st.cache_data(persist="disk")
         def foo():
             return "data"
 
         foo()
-        mock_write.assert_called_once()
 
-        write_path = mock_write.call_args[0][0]
-        match = re.fullmatch(
-            r"/mock/home/folder/.streamlit/cache/.*?\.memo", write_path
-        )
-        self.assertIsNotNone(match)
+        self.assertEqual(["data"], self.persisted_values())
 
-    @patch("streamlit.file_util.os.stat", MagicMock())
-    @patch(
-        "streamlit.file_util.open",
-        mock_open(read_data=pickle.dumps(as_cached_result("mock_pickled_value"))),
-    )
-    @patch(
-        "streamlit.runtime.caching.storage.local_disk_cache_storage.streamlit_read",
-        wraps=file_util.streamlit_read,
-    )
-    def test_read_persisted_data(self, mock_read):
+    def test_read_persisted_data(self):
         """We should read persisted data from disk on cache miss."""
+        return_value = "persisted_value"
 
         @st.cache_data(persist="disk")
         def foo():
-            return "actual_value"
+            return return_value
 
-        data = foo()
-        mock_read.assert_called_once()
-        self.assertEqual("mock_pickled_value", data)
+        foo()
+        self.restart_server()
+        return_value = "actual_value"
 
-    @patch("streamlit.file_util.os.stat", MagicMock())
-    @patch("streamlit.file_util.open", mock_open(read_data="bad_pickled_value"))
-    @patch(
-        "streamlit.runtime.caching.storage.local_disk_cache_storage.streamlit_read",
-        wraps=file_util.streamlit_read,
-    )
-    def test_read_bad_persisted_data(self, mock_read):
-        """If our persisted data is bad, we raise an exception."""
+        self.assertEqual("persisted_value", foo())
 
-        @st.cache_data(persist="disk")
-        def foo():
-            return "actual_value"
-
-        with self.assertRaises(CacheError) as error:
-            foo()
-        mock_read.assert_called_once()
-        self.assertEqual("Unable to read from cache", str(error.exception))
-
-    @patch("streamlit.file_util.os.stat", MagicMock())
-    @patch("streamlit.file_util.open", mock_open(read_data=b"bad_binary_pickled_value"))
-    @patch(
-        "streamlit.runtime.caching.storage.local_disk_cache_storage.streamlit_read",
-        wraps=file_util.streamlit_read,
-    )
-    def test_read_bad_persisted_binary_data(self, mock_read):
+    def test_read_bad_persisted_data(self):
         """If our persisted data is bad, we raise an exception."""
 
         @st.cache_data(persist="disk")
         def foo():
             return "actual_value"
 
+        foo()
+        self.restart_server()
+        self.overwrite_persisted_values(b"bad_binary_pickled_value")
+
         with self.assertRaises(CacheError) as error:
             foo()
-        mock_read.assert_called_once()
         self.assertIn("Failed to unpickle", str(error.exception))
 
     def test_bad_persist_value(self):
@@ -386,83 +376,56 @@ class CacheDataPersistTest(DeltaGeneratorTestCase):
             str(e.exception),
         )
 
-    @patch("shutil.rmtree")
-    def test_clear_all_disk_caches(self, mock_rmtree):
-        """`clear_all` should remove the disk cache directory if it exists."""
+    def test_clear_all_disk_caches(self):
+        """`clear_all` should remove all persisted values, and the files of
+        older versions.
+        """
+        legacy_file_path = os.path.join(self.tempdir.path, "func-key-key.memo")
+        with open(legacy_file_path, "wb") as f:
+            f.write(b"legacy-value")
 
-        # If the cache dir exists, we should delete it.
-        with patch("os.path.isdir", MagicMock(return_value=True)):
-            st.cache_data.clear()
-            mock_rmtree.assert_called_once_with(get_cache_folder_path())
+        @st.cache_data(persist="disk")
+        def foo():
+            return "data"
 
-        mock_rmtree.reset_mock()
+        foo()
+        st.cache_data.clear()
 
-        # If the cache dir does not exist, we shouldn't try to delete it.
-        with patch("os.path.isdir", MagicMock(return_value=False)):
-            st.cache_data.clear()
-            mock_rmtree.assert_not_called()
+        self.assertEqual([], self.persisted_values())
+        self.assertFalse(os.path.exists(legacy_file_path))
 
-    @patch("streamlit.file_util.os.stat", MagicMock())
-    @patch(
-        "streamlit.file_util.open",
-        wraps=mock_open(read_data=pickle.dumps(as_cached_result("mock_pickled_value"))),
-    )
-    @patch("streamlit.runtime.caching.storage.local_disk_cache_storage.os.remove")
-    def test_clear_one_disk_cache(self, mock_os_remove: Mock, mock_open: Mock):
+    def test_clear_one_disk_cache(self):
         """A memoized function's clear_cache() property should just clear
         that function's cache."""
 
         @st.cache_data(persist="disk")
         def foo(val):
-            return "actual_value"
+            return "foo_value"
+
+        @st.cache_data(persist="disk")
+        def bar(val):
+            return "bar_value"
 
         foo(0)
         foo(1)
+        bar(0)
+        self.assertEqual(3, len(self.persisted_values()))
 
-        # We should've opened two files, one for each distinct "foo" call.
-        self.assertEqual(2, mock_open.call_count)
-
-        # Get the names of the two files that were created. These will look
-        # something like '/mock/home/folder/.streamlit/cache/[long_hash].memo'
-        created_filenames = {
-            mock_open.call_args_list[0][0][0],
-            mock_open.call_args_list[1][0][0],
-        }
+        foo.clear()
 
-        created_files_base_names = [
-            os.path.basename(filename) for filename in created_filenames
-        ]
+        self.assertEqual(["bar_value"], self.persisted_values())
 
-        mock_os_remove.assert_not_called()
-
-        with patch(
-            "os.listdir", MagicMock(return_value=created_files_base_names)
-        ), patch("os.path.isdir", MagicMock(return_value=True)):
-            # Clear foo's cache
-            foo.clear()
-
-        # os.remove should have been called once for each of our created cache files
-        self.assertEqual(2, mock_os_remove.call_count)
-
-        removed_filenames = {
-            mock_os_remove.call_args_list[0][0][0],
-            mock_os_remove.call_args_list[1][0][0],
-        }
-
-        # The two files we removed should be the same two files we created.
-        self.assertEqual(created_filenames, removed_filenames)
-
-    @patch("streamlit.file_util.os.stat", MagicMock())
-    @patch(
-        "streamlit.file_util.open",
-        wraps=mock_open(read_data=pickle.dumps(as_replay_test_data())),
-    )
-    def test_cached_st_function_replay(self, _):
+    def test_cached_st_function_replay(self):
         @st.cache_data(persist="disk")
         def foo(i):
             st.text(i)
             return i
 
+        foo(1)
+        self.restart_server()
+        self.overwrite_persisted_values(pickle.dumps(as_replay_test_data()))
+        self.clear_queue()
+
         foo(1)
 
         deltas = self.get_all_deltas_from_queue()
@@ -473,16 +436,7 @@ class CacheDataPersistTest(DeltaGeneratorTestCase):
         ]
         assert text == ["1"]
 
-    @patch("streamlit.file_util.os.stat", MagicMock())
-    @patch(
-        "streamlit.runtime.caching.storage.local_disk_cache_storage.streamlit_write",
-        MagicMock(),
-    )
-    @patch(
-        "streamlit.file_util.open",
-        wraps=mock_open(read_data=pickle.dumps(1)),
-    )
-    def test_cached_st_function_clear_args_persist(self, _):
+    def test_cached_st_function_clear_args_persist(self):
         self.x = 0
 
         @st.cache_data(persist="disk")
@@ -496,43 +450,78 @@ class CacheDataPersistTest(DeltaGeneratorTestCase):
         foo.clear(1)
         assert foo(1) == 2
 
-    @patch("streamlit.file_util.os.stat", MagicMock())
-    @patch(
-        "streamlit.runtime.caching.storage.local_disk_cache_storage.streamlit_write",
-        MagicMock(),
-    )
-    @patch(
-        "streamlit.file_util.open",
-        wraps=mock_open(read_data=pickle.dumps(1)),
-    )
-    def test_cached_format_migration(self, _):
+    def test_cached_format_migration(self):
         @st.cache_data(persist="disk")
         def foo(i):
             st.text(i)
             return i
 
+        foo(1)
+        self.restart_server()
+        self.overwrite_persisted_values(pickle.dumps(1))
+
         # Executes normally, without raising any errors
         foo(1)
 
-    @patch("streamlit.runtime.caching.storage.local_disk_cache_storage.streamlit_write")
-    def test_warning_memo_ttl_persist(self, _):
-        """Using @st.cache_data with ttl and persist produces a warning."""
-        with self.assertLogs(
-            "streamlit.runtime.caching.storage.local_disk_cache_storage",
-            level=logging.WARNING,
-        ) as logs:
+    @patch("streamlit.runtime.caching.storage.sqlite_cache_storage.time.time")
+    def test_ttl_persist(self, mock_time):
+        """Persisted values expire after their TTL."""
+        mock_time.return_value = 1000
+        return_value = "old_value"
 
-            @st.cache_data(ttl=60, persist="disk")
-            def user_function():
-                return 42
+        @st.cache_data(ttl=60, persist="disk")
+        def foo():
+            return return_value
 
-            st.write(user_function())
+        foo()
+        return_value = "new_value"
+
+        mock_time.return_value = 1059
+        self.restart_server()
+        self.assertEqual("old_value", foo())
+
+        mock_time.return_value = 1060
+        self.restart_server()
+        self.assertEqual("new_value", foo())
+
+    @patch("streamlit.runtime.caching.cache_utils.RESULT_WRITTEN_AT_TIMER")
+    @patch("streamlit.runtime.caching.cache_utils.TTLCACHE_TIMER")
+    def test_refreshes_persisted_entry_after_reboot(self, mock_monotonic, mock_time):
+        """Persisted entries become stale in wall-clock time, even when the
+        monotonic clock was reset by a reboot."""
+        mock_monotonic.return_value = 1_000_000
+        mock_time.return_value = 1000
+        return_value = "old_value"
+
+        @st.cache_data(ttl=60, refresh="background", persist="disk")
+        def foo():
+            return return_value
 
-            output = "".join(logs.output)
-            self.assertIn(
-                "The cached function 'user_function' has a TTL that will be ignored.",
-                output,
-            )
+        foo()
+        return_value = "new_value"
+
+        # After a reboot, the monotonic clock starts again from zero.
+        mock_monotonic.return_value = 10
+        mock_time.return_value = 1060
+        self.restart_server()
+        self.assertEqual("old_value", foo())
+        executor = cache_utils._background_refresher._executor
+        executor.submit(lambda: None).result()
+
+        self.assertEqual("new_value", foo())
+        self.assertEqual(["new_value"], self.persisted_values())
+
+    def test_max_entries_persist(self):
+        """Persisted functions don't keep more than max_entries values on disk."""
+
+        @st.cache_data(max_entries=2, persist="disk")
+        def foo(i):
+            return i
+
+        for i in range(5):
+            foo(i)
+
+        self.assertEqual(2, len(self.persisted_values()))
 
     @parameterized.expand(
         [
@@ -542,13 +531,11 @@ class CacheDataPersistTest(DeltaGeneratorTestCase):
             ("False", False, False),
         ]
     )
-    @patch("streamlit.runtime.caching.storage.local_disk_cache_storage.streamlit_write")
     def test_persist_param_value(
         self,
         _,
         persist_value: str | bool | None,
         should_persist: bool,
-        mock_write: Mock,
     ):
         """Passing "disk" or `True` enables persistence; `None` or `False` disables it."""
 
@@ -558,10 +545,7 @@ class CacheDataPersistTest(DeltaGeneratorTestCase):
 
         foo()
 
-        if should_persist:
-            mock_write.assert_called_once()
-        else:
-            mock_write.assert_not_called()
+        self.assertEqual(should_persist, os.path.exists(self.db_path))
 
 
 class CacheDataStatsProviderTest(unittest.TestCase):
@@ -718,6 +702,188 @@ class CacheDataMessageReplayTest(DeltaGeneratorTestCase):
             replay_cached_messages_mock.assert_called()
 
 
+class CacheDataBackgroundRefreshTest(DeltaGeneratorTestCase):
+    """st.cache_data(refresh="background") tests"""
+
+    def setUp(self):
+        super().setUp()
+        st.cache_data.clear()
+        self.timer_patch = patch(
+            "streamlit.runtime.caching.cache_utils.TTLCACHE_TIMER", return_value=0
+        )
+        self.timer = self.timer_patch.start()
+        # Staleness is measured in wall-clock time; move both timers together.
+        self.written_at_timer_patch = patch(
+            "streamlit.runtime.caching.cache_utils.RESULT_WRITTEN_AT_TIMER",
+            new=self.timer,
+        )
+        self.written_at_timer_patch.start()
+
+    def tearDown(self):
+        self.written_at_timer_patch.stop()
+        self.timer_patch.stop()
+        st.cache_data.clear()
+        super().tearDown()
+
+    @staticmethod
+    def wait_for_refreshes() -> None:
+        """Wait until all queued background refreshes have finished."""
+        executor = cache_utils._background_refresher._executor
+        if executor is not None:
+            # Refreshes run on a single worker, in order.
+            executor.submit(lambda: None).result()
+
+    def test_serves_stale_value_while_refreshing(self):
+        """A stale entry is returned, and replaced by a refreshed value."""
+        calls = []
+
+        @st.cache_data(ttl=10, refresh="background")
+        def foo():
+            calls.append(None)
+            return len(calls)
+
+        self.assertEqual(1, foo())
+        self.timer.return_value = 9
+        self.assertEqual(1, foo())
+        self.wait_for_refreshes()
+        self.assertEqual(1, len(calls))
+
+        # The entry is stale: it's still served, and refreshed in the background.
+        self.timer.return_value = 10
+        self.assertEqual(1, foo())
+        self.wait_for_refreshes()
+        self.assertEqual(2, len(calls))
+        self.assertEqual(2, foo())
+
+    def test_refreshes_async_function_in_background(self):
+        """Stale entries of async functions are recomputed on the shared loop."""
+        calls = []
+
+        @st.cache_data(ttl=10, refresh="background")
+        async def foo():
+            calls.append(None)
+            return len(calls)
+
+        self.assertEqual(1, foo())
+        self.timer.return_value = 10
+        self.assertEqual(1, foo())
+        self.wait_for_refreshes()
+        self.assertEqual(2, foo())
+        self.assertEqual(2, len(calls))
+
+    def test_refreshes_entry_once_at_a_time(self):
+        """Stale hits for an entry that's being refreshed don't refresh it again."""
+        calls = []
+        refresh_started = threading.Event()
+        can_finish = threading.Event()
+
+        @st.cache_data(ttl=10, refresh="background")
+        def foo():
+            calls.append(None)
+            if len(calls) > 1:
+                refresh_started.set()
+                can_finish.wait()
+            return len(calls)
+
+        foo()
+        self.timer.return_value = 10
+        self.assertEqual(1, foo())
+        refresh_started.wait()
+        self.assertEqual(1, foo())
+        self.assertEqual(1, foo())
+        can_finish.set()
+        self.wait_for_refreshes()
+
+        self.assertEqual(2, len(calls))
+        self.assertEqual(2, foo())
+
+    def test_recomputes_entry_after_max_age(self):
+        """Entries older than max_age are removed, like with refresh="expire"."""
+        calls = []
+
+        @st.cache_data(ttl=10, refresh="background", max_age=60)
+        def foo():
+            calls.append(None)
+            return len(calls)
+
+        foo()
+        self.timer.return_value = 60
+        self.assertEqual(2, foo())
+
+    def test_keeps_stale_entry_if_refresh_fails(self):
+        """If the refresh raises, the stale entry is still served."""
+        calls = []
+
+        @st.cache_data(ttl=10, refresh="background")
+        def foo():
+            calls.append(None)
+            if len(calls) > 1:
+                raise RuntimeError("boom")
+            return len(calls)
+
+        foo()
+        self.timer.return_value = 10
+        with self.assertLogs(
+            "streamlit.runtime.caching.cache_utils", level=logging.WARNING
+        ):
+            self.assertEqual(1, foo())
+            self.wait_for_refreshes()
+        self.assertEqual(1, foo())
+
+    def test_replays_messages_of_served_value(self):
+        """The messages replayed with a value are the ones that its computation
+        produced, and refreshes don't send messages to the session."""
+        calls = []
+
+        @st.cache_data(ttl=10, refresh="background")
+        def foo():
+            calls.append(None)
+            st.text(f"call {len(calls)}")
+            with st.container():
+                st.text("in container")
+            return len(calls)
+
+        foo()
+        self.timer.return_value = 10
+        self.clear_queue()
+        self.assertEqual(1, foo())
+        self.wait_for_refreshes()
+
+        # Only the stale value's messages were sent.
+        deltas = self.get_all_deltas_from_queue()
+        self.assertEqual(3, len(deltas))
+        self.assertEqual("call 1", deltas[0].new_element.text.body)
+        self.assertEqual("in container", deltas[2].new_element.text.body)
+
+        self.clear_queue()
+        self.assertEqual(2, foo())
+        deltas = self.get_all_deltas_from_queue()
+        self.assertEqual(3, len(deltas))
+        self.assertEqual("call 2", deltas[0].new_element.text.body)
+        self.assertTrue(deltas[1].HasField("add_block"))
+        self.assertEqual("in container", deltas[2].new_element.text.body)
+        # The text is replayed into the replayed container.
+        container_path = self.get_message_from_queue(-2).metadata.delta_path
+        text_path = self.get_message_from_queue(-1).metadata.delta_path
+        self.assertEqual([*container_path, 0], list(text_path))
+
+    @parameterized.expand(
+        [
+            ({"refresh": "sometimes"}, "Unsupported refresh option"),
+            ({"refresh": "background"}, "requires a `ttl`"),
+            ({"ttl": 10, "max_age": 60}, "only supported with"),
+            (
+                {"ttl": 10, "refresh": "background", "max_age": 5},
+                "greater than or equal to `ttl`",
+            ),
+        ]
+    )
+    def test_rejects_invalid_params(self, params: dict[str, Any], message: str):
+        with self.assertRaises(StreamlitAPIException) as e:
+            st.cache_data(**params)
+        self.assertIn(message, str(e.exception))
+
+
 def get_byte_length(value):
     """Return the byte length of the pickled value."""
     return len(pickle.dumps(value))
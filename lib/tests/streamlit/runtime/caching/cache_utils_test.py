@@ -0,0 +1,218 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""cache_utils unit tests."""
+
+from __future__ import annotations
+
+import functools
+import gc
+import inspect
+import unittest
+from unittest.mock import MagicMock, patch
+
+from streamlit.runtime.caching.cache_type import CacheType
+from streamlit.runtime.caching.cache_utils import (
+    MemCache,
+    _get_positional_arg_names,
+    _hashing_plans,
+    _HashingPlan,
+    _make_function_key,
+    _make_value_key,
+)
+
+
+def _make_func():
+    """Return a new function object that shares its code object with all
+    other functions returned by this helper, like a re-decorated function in a
+    rerun script."""
+
+    def foo(a, _b, *args, c=1, **kwargs):
+        return a
+
+    return foo
+
+
+class HashingPlanTest(unittest.TestCase):
+    def setUp(self) -> None:
+        _hashing_plans.clear()
+
+    def tearDown(self) -> None:
+        _hashing_plans.clear()
+
+    def test_positional_arg_names(self):
+        """Only named positional params have a name."""
+        self.assertEqual(
+            ("a", "_b", None, None, None), _get_positional_arg_names(_make_func())
+        )
+
+    def test_plan_is_reused_for_same_code(self):
+        """Functions sharing a code object share a plan, so the source and
+        signature are only inspected once."""
+        func1 = _make_func()
+        func2 = _make_func()
+        self.assertIsNot(func1, func2)
+
+        with patch(
+            "streamlit.runtime.caching.cache_utils.inspect.signature",
+            wraps=inspect.signature,
+        ) as signature_mock:
+            plan1 = _hashing_plans.get_plan(CacheType.DATA, func1)
+            plan2 = _hashing_plans.get_plan(CacheType.DATA, func2)
+
+        self.assertIs(plan1, plan2)
+        self.assertEqual(1, signature_mock.call_count)
+        self.assertEqual(_make_function_key(CacheType.DATA, func1), plan1.function_key)
+
+    def test_plan_depends_on_cache_type(self):
+        func = _make_func()
+        self.assertIsNot(
+            _hashing_plans.get_plan(CacheType.DATA, func),
+            _hashing_plans.get_plan(CacheType.RESOURCE, func),
+        )
+
+    def test_wrapped_functions_are_not_shared(self):
+        """Wrappers share their code object, but not their signature."""
+
+        def decorator(f):
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                return f(*args, **kwargs)
+
+            return wrapper
+
+        @decorator
+        def foo(x):
+            return x
+
+        @decorator
+        def bar(_y):
+            return _y
+
+        self.assertIs(foo.__code__, bar.__code__)
+        self.assertEqual(
+            ("x",), _hashing_plans.get_plan(CacheType.DATA, foo).positional_arg_names
+        )
+        self.assertEqual(
+            ("_y",), _hashing_plans.get_plan(CacheType.DATA, bar).positional_arg_names
+        )
+
+    def test_plan_is_dropped_with_code(self):
+        """Plans don't keep code objects alive."""
+        code = compile("def foo(a):\n    return a\n", "<test>", "exec")
+        namespace: dict = {}
+        exec(code, namespace)
+        _hashing_plans.get_plan(CacheType.DATA, namespace["foo"])
+        self.assertEqual(1, len(_hashing_plans._plans))
+
+        del code, namespace
+        # Hashing another function releases the last hash source.
+        _hashing_plans.get_plan(CacheType.DATA, _make_func())
+        gc.collect()
+        # Collected entries are purged the next time a plan is created.
+        _hashing_plans.get_plan(CacheType.RESOURCE, _make_func())
+        self.assertEqual(1, len(_hashing_plans._plans))
+
+    def test_value_key_unchanged_by_plan(self):
+        """Value keys computed with a plan match those computed without."""
+        func = _make_func()
+        plan = _HashingPlan(CacheType.DATA, func)
+        args = (1, "ignored", 3, 4)
+        kwargs = {"c": 5, "d": [6]}
+
+        self.assertEqual(
+            _make_value_key(CacheType.DATA, func, args, kwargs, None),
+            _make_value_key(CacheType.DATA, func, args, kwargs, None, plan),
+        )
+        # The underscore-prefixed arg is not hashed.
+        self.assertEqual(
+            _make_value_key(CacheType.DATA, func, args, kwargs, None, plan),
+            _make_value_key(
+                CacheType.DATA, func, (1, "other", 3, 4), kwargs, None, plan
+            ),
+        )
+        self.assertNotEqual(
+            _make_value_key(CacheType.DATA, func, args, kwargs, None, plan),
+            _make_value_key(
+                CacheType.DATA, func, (1, "ignored", 4, 3), kwargs, None, plan
+            ),
+        )
+
+
+class MemCacheTest(unittest.TestCase):
+    def test_get_set(self):
+        cache: MemCache[str] = MemCache(maxsize=10, ttl=100)
+        with self.assertRaises(KeyError):
+            cache.get("a")
+
+        cache.set("a", "A")
+        self.assertEqual("A", cache.get("a"))
+
+    def test_get_does_not_lock(self):
+        """Reads don't need the write lock."""
+        cache: MemCache[str] = MemCache(maxsize=10, ttl=100)
+        cache.set("a", "A")
+
+        with cache._lock:
+            self.assertEqual("A", cache.get("a"))
+
+    def test_lru_order_includes_lock_free_hits(self):
+        """Hits are applied to the LRU order before the next write evicts."""
+        cache: MemCache[str] = MemCache(maxsize=2, ttl=100)
+        cache.set("a", "A")
+        cache.set("b", "B")
+
+        # "a" becomes the most recently used entry, so "b" is evicted.
+        cache.get("a")
+        cache.set("c", "C")
+
+        self.assertEqual("A", cache.get("a"))
+        self.assertEqual("C", cache.get("c"))
+        with self.assertRaises(KeyError):
+            cache.get("b")
+
+    @patch("streamlit.runtime.caching.cache_utils.TTLCACHE_TIMER")
+    def test_ttl(self, timer_patch: MagicMock):
+        timer_patch.return_value = 0
+        cache: MemCache[str] = MemCache(maxsize=10, ttl=1)
+        cache.set("a", "A")
+        self.assertEqual("A", cache.get("a"))
+
+        timer_patch.return_value = 2
+        with self.assertRaises(KeyError):
+            cache.get("a")
+
+    def test_pop_expected(self):
+        """pop with an expected value doesn't remove a replaced entry."""
+        cache: MemCache[list[int]] = MemCache(maxsize=10, ttl=100)
+        old_value = [1]
+        new_value = [2]
+        cache.set("a", new_value)
+
+        cache.pop("a", expected=old_value)
+        self.assertIs(new_value, cache.get("a"))
+
+        cache.pop("a", expected=new_value)
+        with self.assertRaises(KeyError):
+            cache.get("a")
+
+    def test_clear(self):
+        cache: MemCache[str] = MemCache(maxsize=10, ttl=100)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        self.assertEqual(["A", "B"], cache.values())
+
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual([], cache.values())
@@ -16,6 +16,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import threading
 import time
 import unittest
@@ -29,7 +30,7 @@ import streamlit as st
 from streamlit.runtime import Runtime
 from streamlit.runtime.caching import cache_data, cache_resource
 from streamlit.runtime.caching.cache_errors import CacheReplayClosureError
-from streamlit.runtime.caching.cache_utils import CachedResult
+from streamlit.runtime.caching.cache_utils import Cache, CachedResult
 from streamlit.runtime.caching.storage.dummy_cache_storage import (
     MemoryCacheStorageManager,
 )
@@ -944,6 +945,314 @@ class CommonCacheThreadingTest(unittest.TestCase):
         # Sanity check: ensure we can still call our cached function.
         self.assertEqual(42, foo())
 
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_compute_async_value_only_once(self, _, cache_decorator):
+        """Sessions that miss the cache of an async function while its value is
+        being computed share that computation.
+        """
+        cached_func_call_count = [0]
+
+        @cache_decorator
+        async def foo():
+            cached_func_call_count[0] += 1
+            await asyncio.sleep(0.25)
+            return 42
+
+        def call_foo(_: int) -> None:
+            self.assertEqual(42, foo())
+
+        call_on_threads(call_foo, num_threads=self.NUM_THREADS, timeout=0.5)
+        self.assertEqual(1, cached_func_call_count[0])
+
+
+class CommonCacheAsyncTest(unittest.TestCase):
+    def setUp(self):
+        mock_runtime = MagicMock(spec=Runtime)
+        mock_runtime.cache_storage_manager = MemoryCacheStorageManager()
+        Runtime._instance = mock_runtime
+
+    def tearDown(self):
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        super().tearDown()
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_returns_value_of_async_function(self, _, cache_decorator):
+        """Async functions are awaited on the shared event loop, and their value
+        is returned to the (sync) caller.
+        """
+        calls = []
+
+        @cache_decorator
+        async def foo(x):
+            calls.append(threading.current_thread().name)
+            await asyncio.sleep(0)
+            return x * 2
+
+        self.assertEqual(2, foo(1))
+        self.assertEqual(2, foo(1))
+        self.assertEqual(4, foo(2))
+        self.assertEqual(["CacheAsyncLoop", "CacheAsyncLoop"], calls)
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_awaits_value_in_event_loop(self, _, cache_decorator):
+        """Callers in a running event loop await the value instead of blocking
+        their loop.
+        """
+
+        @cache_decorator
+        async def foo(x):
+            await asyncio.sleep(0)
+            return x * 2
+
+        @cache_decorator
+        async def bar(x):
+            return await foo(x) + 1
+
+        async def call_foo():
+            return await foo(1), await foo(1)
+
+        self.assertEqual((2, 2), asyncio.run(call_foo()))
+        self.assertEqual(3, bar(1))
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_shares_exception_of_computation(self, _, cache_decorator):
+        """An exception raised by the computation is raised in all waiting
+        callers, and the value is computed again on the next call.
+        """
+        calls = []
+        can_finish = threading.Event()
+
+        @cache_decorator
+        async def foo():
+            calls.append(None)
+            await asyncio.to_thread(can_finish.wait)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return len(calls)
+
+        errors = []
+
+        def call_foo(_: int) -> None:
+            try:
+                foo()
+            except RuntimeError as ex:
+                errors.append(ex)
+
+        # Let the computation finish once all callers share it.
+        joined = threading.Semaphore(0)
+        get_or_start_computation = Cache.get_or_start_computation
+
+        def join_computation(cache, *args):
+            result = get_or_start_computation(cache, *args)
+            joined.release()
+            return result
+
+        threads = [threading.Thread(target=call_foo, args=[i]) for i in range(5)]
+        with patch.object(Cache, "get_or_start_computation", join_computation):
+            for thread in threads:
+                thread.start()
+            for _ in threads:
+                joined.acquire()
+        can_finish.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(5, len(errors))
+        self.assertEqual(2, foo())
+        self.assertEqual(2, len(calls))
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_clear_forgets_computation(self, _, cache_decorator):
+        """Callers after a clear don't join a computation started before it."""
+        calls = []
+        can_finish = threading.Event()
+
+        @cache_decorator
+        async def foo():
+            calls.append(None)
+            if len(calls) == 1:
+                await asyncio.to_thread(can_finish.wait)
+            return len(calls)
+
+        thread = threading.Thread(target=foo)
+        thread.start()
+        while not calls:
+            time.sleep(0.01)
+
+        foo.clear()
+        self.assertEqual(2, foo())
+        can_finish.set()
+        thread.join()
+
+
+class CommonCacheSubmitTest(DeltaGeneratorTestCase):
+    """CachedFunc.submit tests"""
+
+    def tearDown(self):
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        super().tearDown()
+
+    def get_text_delta_contents(self) -> list[str]:
+        return [
+            delta.new_element.text.body
+            for delta in self.get_all_deltas_from_queue()
+            if delta.new_element.WhichOneof("type") == "text"
+        ]
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_computes_values_concurrently(self, _, cache_decorator):
+        """Submitted values are computed at the same time, on worker threads
+        with the script run's session.
+        """
+        both_running = threading.Barrier(2, timeout=5)
+        session_ids = []
+
+        @cache_decorator
+        def foo(x):
+            session_ids.append(get_script_run_ctx().session_id)
+            both_running.wait()
+            return x
+
+        futures = [foo.submit(1), foo.submit(2)]
+
+        self.assertEqual([1, 2], [future.result() for future in futures])
+        self.assertEqual([self.script_run_ctx.session_id] * 2, session_ids)
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_replays_messages_in_order_of_results(self, _, cache_decorator):
+        """Elements are displayed where the results are read, not where (or
+        when) the values are computed.
+        """
+        computed = threading.Event()
+
+        @cache_decorator
+        def foo():
+            computed.wait(timeout=5)
+            st.text("foo")
+            return "foo"
+
+        @cache_decorator
+        def bar():
+            st.text("bar")
+            with st.container():
+                st.text("in container")
+            computed.set()
+            return "bar"
+
+        foo_future = foo.submit()
+        bar_future = bar.submit()
+        st.text("---")
+
+        self.assertEqual("foo", foo_future.result())
+        self.assertEqual("bar", bar_future.result())
+        self.assertEqual(
+            ["---", "foo", "bar", "in container"], self.get_text_delta_contents()
+        )
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_submit_returns_cached_value(self, _, cache_decorator):
+        calls = []
+
+        @cache_decorator
+        def foo():
+            calls.append(None)
+            st.text("foo")
+            return 42
+
+        foo()
+        future = foo.submit()
+
+        self.assertTrue(future.done())
+        self.assertEqual(42, future.result())
+        self.assertEqual(1, len(calls))
+        self.assertEqual(["foo", "foo"], self.get_text_delta_contents())
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_result_raises_exception(self, _, cache_decorator):
+        @cache_decorator
+        def foo():
+            raise RuntimeError("boom")
+
+        future = foo.submit()
+
+        with self.assertRaises(RuntimeError):
+            future.result()
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_nested_submit_computes_value_on_calling_thread(self, _, cache_decorator):
+        """Nested functions don't wait on the worker pool, which may be running
+        their caller.
+        """
+        threads = []
+
+        @cache_decorator
+        def inner():
+            threads.append(threading.current_thread())
+            st.text("inner")
+            return 1
+
+        @cache_decorator
+        def outer():
+            future = inner.submit()
+            self.assertFalse(future.done())
+            return future.result() + 1
+
+        self.assertEqual(2, outer())
+        self.assertEqual([threading.current_thread()], threads)
+        self.assertEqual(["inner"], self.get_text_delta_contents())
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_submit_async_function(self, _, cache_decorator):
+        @cache_decorator
+        async def foo(x):
+            await asyncio.sleep(0)
+            return x * 2
+
+        futures = [foo.submit(1), foo.submit(2)]
+
+        self.assertEqual([2, 4], [future.result() for future in futures])
+
+    @parameterized.expand(
+        [("cache_data", cache_data), ("cache_resource", cache_resource)]
+    )
+    def test_recomputes_cleared_value(self, _, cache_decorator):
+        calls = []
+
+        @cache_decorator
+        def foo():
+            calls.append(None)
+            return len(calls)
+
+        future = foo.submit()
+        future._future.result()
+        foo.clear()
+
+        self.assertEqual(2, future.result())
+
 
 def test_arrow_replay():
     """Regression test for https://github.com/streamlit/streamlit/issues/6103"""
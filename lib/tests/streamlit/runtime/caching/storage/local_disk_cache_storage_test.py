@@ -16,7 +16,6 @@
 
 from __future__ import annotations
 
-import logging
 import math
 import os.path
 import shutil
@@ -25,8 +24,6 @@ from unittest.mock import MagicMock, patch
 
 from testfixtures import TempDirectory
 
-from streamlit import errors
-from streamlit.logger import get_logger
 from streamlit.runtime.caching.storage import (
     CacheStorageContext,
     CacheStorageError,
@@ -41,6 +38,29 @@ from streamlit.runtime.caching.storage.local_disk_cache_storage import (
 )
 
 
+def _persist_context(
+    function_key: str = "func-key",
+    ttl_seconds: float | None = None,
+    max_entries: int | None = None,
+) -> CacheStorageContext:
+    return CacheStorageContext(
+        function_key=function_key,
+        function_display_name="func-display-name",
+        persist="disk",
+        ttl_seconds=ttl_seconds,
+        max_entries=max_entries,
+    )
+
+
+def _list_cache_files(cache_dir: str) -> list[str]:
+    """List the cache directory, ignoring SQLite's temporary files."""
+    return sorted(
+        file_name
+        for file_name in os.listdir(cache_dir)
+        if not file_name.endswith(("-wal", "-shm"))
+    )
+
+
 class LocalDiskCacheStorageManagerTest(unittest.TestCase):
     def setUp(self) -> None:
         super().setUp()
@@ -93,8 +113,8 @@ class LocalDiskCacheStorageManagerTest(unittest.TestCase):
         self.assertEqual(storage.max_entries, math.inf)
 
     def test_check_context_with_persist_and_ttl(self):
-        """Tests that LocalDiskCacheStorageManager.check_context() writes a warning
-        in logs when persist="disk" and ttl_seconds is not None
+        """Tests that LocalDiskCacheStorageManager.check_context() accepts
+        persist="disk" with a TTL, which is enforced on disk.
         """
         context = CacheStorageContext(
             function_key="func-key",
@@ -104,60 +124,35 @@ class LocalDiskCacheStorageManagerTest(unittest.TestCase):
             max_entries=100,
         )
 
-        with self.assertLogs(
-            "streamlit.runtime.caching.storage.local_disk_cache_storage",
-            level=logging.WARNING,
-        ) as logs:
-            manager = LocalDiskCacheStorageManager()
-            manager.check_context(context)
-
-            output = "".join(logs.output)
-            self.assertIn(
-                "The cached function 'func-display-name' has a TTL that will be "
-                "ignored. Persistent cached functions currently don't support TTL.",
-                output,
-            )
-
-    def test_check_context_without_persist(self):
-        """Tests that LocalDiskCacheStorageManager.check_context() does not
-        write a warning in logs when persist is None and ttl_seconds is NOT None.
-        """
-        context = CacheStorageContext(
-            function_key="func-key",
-            function_display_name="func-display-name",
-            persist=None,
-            ttl_seconds=60,
-            max_entries=100,
-        )
+        manager = LocalDiskCacheStorageManager()
+        manager.check_context(context)
 
-        with self.assertLogs(
-            "streamlit.runtime.caching.storage.local_disk_cache_storage",
-            level=logging.WARNING,
-        ) as logs:
-            manager = LocalDiskCacheStorageManager()
-            manager.check_context(context)
-
-            # assertLogs is being used as a context manager, but it also checks
-            # that some log output was captured, so we have to let it capture something
-            get_logger(
-                "streamlit.runtime.caching.storage.local_disk_cache_storage"
-            ).warning("irrelevant warning so assertLogs passes")
-
-            output = "".join(logs.output)
-            self.assertNotIn(
-                "The cached function 'func-display-name' has a TTL that will be "
-                "ignored. Persistent cached functions currently don't support TTL.",
-                output,
-            )
-
-    @patch("shutil.rmtree", wraps=shutil.rmtree)
-    def test_clear_all(self, mock_rmtree):
-        """Tests that LocalDiskCacheStorageManager.clear_all() calls shutil.rmtree
-        to remove the cache folder
+    def test_clear_all(self):
+        """Tests that LocalDiskCacheStorageManager.clear_all() removes the
+        persisted values of all functions, and the files of older versions.
         """
+        legacy_file_path = os.path.join(self.tempdir.path, "func-key-key.memo")
+        with open(legacy_file_path, "wb") as f:
+            f.write(b"legacy-value")
         manager = LocalDiskCacheStorageManager()
+        storage1 = manager.create(_persist_context("func-key-1"))
+        storage2 = manager.create(_persist_context("func-key-2"))
+        storage1.set("some-key", b"some-value")
+        storage2.set("some-key", b"some-value")
+
         manager.clear_all()
-        mock_rmtree.assert_called_once()
+
+        for function_key in ["func-key-1", "func-key-2"]:
+            with self.assertRaises(CacheStorageKeyNotFoundError):
+                LocalDiskCacheStorage(_persist_context(function_key)).get("some-key")
+        self.assertFalse(os.path.exists(legacy_file_path))
+
+    def test_clear_all_without_cache_directory(self):
+        """Tests that clear_all() doesn't create the cache directory."""
+        cache_dir = self.tempdir.path
+        self.tempdir.cleanup()
+        LocalDiskCacheStorageManager().clear_all()
+        self.assertFalse(os.path.exists(cache_dir))
 
 
 class LocalDiskPersistCacheStorageTest(unittest.TestCase):
@@ -194,22 +189,22 @@ class LocalDiskPersistCacheStorageTest(unittest.TestCase):
         self.assertEqual(self.storage.get("some-key"), b"some-value")
 
     def test_storage_set(self):
-        """Test that storage.set() writes the correct value to disk."""
+        """Test that storage.set() writes the value to the cache database."""
         self.storage.set("new-key", b"new-value")
-        self.assertTrue(os.path.exists(self.tempdir.path + "/func-key-new-key.memo"))
-
-        with open(self.tempdir.path + "/func-key-new-key.memo", "rb") as f:
-            self.assertEqual(f.read(), b"new-value")
+        self.assertEqual(["cache_data.sqlite"], _list_cache_files(self.tempdir.path))
+        self.assertEqual(
+            b"new-value", LocalDiskCacheStorage(self.context).get("new-key")
+        )
 
     @patch(
-        "streamlit.runtime.caching.storage.local_disk_cache_storage.streamlit_write",
-        MagicMock(side_effect=errors.Error("mock exception")),
+        "streamlit.runtime.caching.storage.sqlite_cache_storage.SQLiteCacheDatabase.transaction",
+        MagicMock(side_effect=CacheStorageError("Unable to access the cache database")),
     )
     def test_storage_set_error(self):
         """Test that storage.set() raises an exception when it fails to write to disk."""
         with self.assertRaises(CacheStorageError) as e:
             self.storage.set("uniqueKey", b"new-value")
-        self.assertEqual(str(e.exception), "Unable to write to cache")
+        self.assertEqual(str(e.exception), "Unable to access the cache database")
 
     def test_storage_set_override(self):
         """Test that storage.set() overrides the value of an existing key."""
@@ -218,59 +213,110 @@ class LocalDiskPersistCacheStorageTest(unittest.TestCase):
         self.assertEqual(self.storage.get("another_key"), b"new_value")
 
     def test_storage_delete(self):
-        """Test that storage.delete() removes the correct file from disk."""
+        """Test that storage.delete() removes the value from disk."""
         self.storage.set("new-key", b"new-value")
-        self.assertTrue(os.path.exists(self.tempdir.path + "/func-key-new-key.memo"))
         self.storage.delete("new-key")
-        self.assertFalse(os.path.exists(self.tempdir.path + "/func-key-new-key.memo"))
 
         with self.assertRaises(CacheStorageKeyNotFoundError):
             self.storage.get("new-key")
 
+    def test_storage_delete_not_existing_key(self):
+        """Test that storage.delete() doesn't raise if the key doesn't exist."""
+        self.storage.delete("new-key")
+
     def test_storage_clear(self):
-        """Test that storage.clear() removes all storage files from disk."""
+        """Test that storage.clear() removes all of its function's values."""
+        other_storage = LocalDiskCacheStorage(_persist_context("other-func-key"))
         self.storage.set("some-key", b"some-value")
         self.storage.set("another-key", b"another-value")
-        self.assertTrue(os.path.exists(self.tempdir.path + "/func-key-some-key.memo"))
-        self.assertTrue(
-            os.path.exists(self.tempdir.path + "/func-key-another-key.memo")
-        )
+        other_storage.set("some-key", b"other-value")
 
         self.storage.clear()
 
-        self.assertFalse(os.path.exists(self.tempdir.path + "/func-key-some-key.memo"))
-        self.assertFalse(
-            os.path.exists(self.tempdir.path + "/func-key-another-key.memo")
-        )
-
         with self.assertRaises(CacheStorageKeyNotFoundError):
             self.storage.get("some-key")
 
         with self.assertRaises(CacheStorageKeyNotFoundError):
             self.storage.get("another-key")
 
-        # test that cache folder is empty
-        self.assertEqual(os.listdir(self.tempdir.path), [])
+        self.assertEqual(b"other-value", other_storage.get("some-key"))
 
     def test_storage_clear_not_existing_cache_directory(self):
         """Test that clear() is not crashing if the cache directory does not exist."""
+        cache_dir = self.tempdir.path
         self.tempdir.cleanup()
         self.storage.clear()
+        self.assertFalse(os.path.exists(cache_dir))
 
-    def test_storage_clear_call_listdir_existing_cache_directory(self):
-        """Test that clear() call os.listdir if cache folder does not exist."""
-        with patch("os.listdir") as mock_listdir:
-            self.storage.clear()
-        mock_listdir.assert_called_once()
-
-    def test_storage_clear_not_call_listdir_not_existing_cache_directory(self):
-        """Test that clear() doesn't call os.listdir if cache folder does not exist."""
+    def test_storage_get_not_existing_cache_directory(self):
+        """Test that get() doesn't create the cache directory."""
+        cache_dir = self.tempdir.path
         self.tempdir.cleanup()
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            self.storage.get("some-key")
+        self.assertFalse(os.path.exists(cache_dir))
+
+    def test_storage_recreates_removed_cache_directory(self):
+        """Test that set() recreates the database if the cache directory was
+        removed.
+        """
+        self.storage.set("some-key", b"some-value")
+        shutil.rmtree(self.tempdir.path)
 
-        with patch("os.listdir") as mock_listdir:
-            self.storage.clear()
+        self.storage.set("some-key", b"new-value")
 
-        mock_listdir.assert_not_called()
+        self.assertEqual(b"new-value", self.storage.get("some-key"))
+
+    @patch("streamlit.runtime.caching.storage.sqlite_cache_storage.time.time")
+    def test_storage_ttl(self, mock_time):
+        """Test that values expire on disk after their TTL."""
+        mock_time.return_value = 1000
+        storage = LocalDiskCacheStorage(_persist_context(ttl_seconds=10))
+        storage.set("some-key", b"some-value")
+
+        mock_time.return_value = 1009
+        self.assertEqual(b"some-value", storage.get("some-key"))
+
+        mock_time.return_value = 1010
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("some-key")
+
+    @patch("streamlit.runtime.caching.storage.sqlite_cache_storage.time.time")
+    def test_storage_max_entries(self, mock_time):
+        """Test that only the max_entries most recently set values are kept."""
+        storage = LocalDiskCacheStorage(_persist_context(max_entries=2))
+        for i, key in enumerate(["a", "b", "c"]):
+            mock_time.return_value = 1000 + i
+            storage.set(key, key.encode())
+
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("a")
+        self.assertEqual(b"b", storage.get("b"))
+        self.assertEqual(b"c", storage.get("c"))
+
+    @patch("streamlit.runtime.caching.storage.sqlite_cache_storage.time.time")
+    def test_storage_max_size_bytes(self, mock_time):
+        """Test that the least recently set values of all functions are removed
+        once all values don't fit into max_size_bytes.
+        """
+        storage1 = LocalDiskCacheStorage(_persist_context("func-key-1"), 10)
+        storage2 = LocalDiskCacheStorage(_persist_context("func-key-2"), 10)
+        mock_time.return_value = 1000
+        storage1.set("a", b"1234")
+        mock_time.return_value = 1001
+        storage2.set("b", b"1234")
+        mock_time.return_value = 1002
+        storage1.set("c", b"1234")
+
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage1.get("a")
+        self.assertEqual(b"1234", storage2.get("b"))
+        self.assertEqual(b"1234", storage1.get("c"))
+
+        # Overwriting a value replaces its size.
+        mock_time.return_value = 1003
+        storage2.set("b", b"12")
+        self.assertEqual(b"1234", storage1.get("c"))
 
     def test_storage_close(self):
         """Test that storage.close() does not raise any exception."""
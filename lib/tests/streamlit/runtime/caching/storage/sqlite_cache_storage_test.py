@@ -0,0 +1,235 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for SQLiteCacheStorage and SQLiteCacheStorageManager"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import unittest
+from unittest.mock import patch
+
+from testfixtures import TempDirectory
+
+from streamlit.runtime.caching.storage import (
+    CacheStorageContext,
+    CacheStorageError,
+    CacheStorageKeyNotFoundError,
+)
+from streamlit.runtime.caching.storage.in_memory_cache_storage_wrapper import (
+    InMemoryCacheStorageWrapper,
+)
+from streamlit.runtime.caching.storage.sqlite_cache_storage import (
+    _MAX_IDLE_CONNECTIONS,
+    SQLiteCacheStorage,
+    SQLiteCacheStorageManager,
+)
+from streamlit.runtime.stats import CacheStat
+
+
+def _context(
+    function_key: str = "func-key",
+    persist: str | None = None,
+    ttl_seconds: float | None = None,
+    max_entries: int | None = None,
+) -> CacheStorageContext:
+    return CacheStorageContext(
+        function_key=function_key,
+        function_display_name="func-display-name",
+        persist=persist,  # type: ignore[arg-type]
+        ttl_seconds=ttl_seconds,
+        max_entries=max_entries,
+    )
+
+
+class SQLiteCacheStorageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.tempdir = TempDirectory(create=True)
+        self.db_path = os.path.join(self.tempdir.path, "cache.sqlite")
+        self.patch_get_cache_folder_path = patch(
+            "streamlit.runtime.caching.storage.local_disk_cache_storage.get_cache_folder_path",
+            return_value=self.tempdir.path,
+        )
+        self.patch_get_cache_folder_path.start()
+        self.manager = SQLiteCacheStorageManager(self.db_path)
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.patch_get_cache_folder_path.stop()
+        self.tempdir.cleanup()
+
+    def test_create(self):
+        """create() returns a SQLiteCacheStorage, unless persist="disk"."""
+        storage = self.manager.create(_context(ttl_seconds=60, max_entries=100))
+        self.assertIsInstance(storage, SQLiteCacheStorage)
+        self.assertEqual(60, storage.ttl_seconds)
+        self.assertEqual(100, storage.max_entries)
+
+        storage = self.manager.create(_context())
+        self.assertEqual(math.inf, storage.ttl_seconds)
+        self.assertEqual(math.inf, storage.max_entries)
+
+        storage = self.manager.create(_context(persist="disk"))
+        self.assertIsInstance(storage, InMemoryCacheStorageWrapper)
+
+    def test_get_set_delete(self):
+        storage = self.manager.create(_context())
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("foo")
+
+        storage.set("foo", b"bar")
+        self.assertEqual(b"bar", storage.get("foo"))
+
+        storage.set("foo", b"baz")
+        self.assertEqual(b"baz", storage.get("foo"))
+
+        storage.delete("foo")
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("foo")
+
+    def test_storages_are_isolated_by_function(self):
+        storage1 = self.manager.create(_context(function_key="func1"))
+        storage2 = self.manager.create(_context(function_key="func2"))
+
+        storage1.set("foo", b"1")
+        storage2.set("foo", b"2")
+        self.assertEqual(b"1", storage1.get("foo"))
+        self.assertEqual(b"2", storage2.get("foo"))
+
+        storage1.clear()
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage1.get("foo")
+        self.assertEqual(b"2", storage2.get("foo"))
+
+    @patch("streamlit.runtime.caching.storage.sqlite_cache_storage.time.time")
+    def test_ttl(self, mock_time):
+        mock_time.return_value = 1000
+        storage = self.manager.create(_context(ttl_seconds=10))
+        storage.set("foo", b"bar")
+
+        mock_time.return_value = 1009
+        self.assertEqual(b"bar", storage.get("foo"))
+
+        mock_time.return_value = 1010
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("foo")
+
+    @patch("streamlit.runtime.caching.storage.sqlite_cache_storage.time.time")
+    def test_max_entries(self, mock_time):
+        storage = self.manager.create(_context(max_entries=2))
+        for i, key in enumerate(["a", "b", "c"]):
+            mock_time.return_value = 1000 + i
+            storage.set(key, key.encode())
+
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("a")
+        self.assertEqual(b"b", storage.get("b"))
+        self.assertEqual(b"c", storage.get("c"))
+
+    def test_clear_all(self):
+        storage = self.manager.create(_context())
+        storage.set("foo", b"bar")
+
+        self.manager.clear_all()
+
+        with self.assertRaises(CacheStorageKeyNotFoundError):
+            storage.get("foo")
+
+    def test_get_stats(self):
+        storage = self.manager.create(_context())
+        storage.set("foo", b"bar")
+        storage.set("baz", b"quux")
+
+        self.assertEqual(
+            sorted(
+                [
+                    CacheStat("st_cache_data", "func-display-name", 3),
+                    CacheStat("st_cache_data", "func-display-name", 4),
+                ],
+                key=lambda stat: stat.byte_length,
+            ),
+            sorted(storage.get_stats(), key=lambda stat: stat.byte_length),
+        )
+
+    def test_values_are_shared_by_managers(self):
+        """Managers using the same database, e.g. in different worker processes,
+        share their values.
+        """
+        other_manager = SQLiteCacheStorageManager(self.db_path)
+        self.manager.create(_context()).set("foo", b"bar")
+
+        self.assertEqual(b"bar", other_manager.create(_context()).get("foo"))
+
+    def test_threads_share_pooled_connections(self):
+        """Each script run has its own thread, which mustn't leave an open
+        connection behind.
+        """
+        storage = self.manager.create(_context())
+        storage.set("foo", b"bar")
+        database = self.manager._database
+
+        results = []
+        with patch(
+            "streamlit.runtime.caching.storage.sqlite_cache_storage.sqlite3.connect",
+            wraps=sqlite3.connect,
+        ) as connect:
+            for _ in range(10):
+                thread = threading.Thread(
+                    target=lambda: results.append(storage.get("foo"))
+                )
+                thread.start()
+                thread.join()
+
+        self.assertEqual([b"bar"] * 10, results)
+        connect.assert_not_called()
+        self.assertEqual(1, len(database._idle_connections))
+
+    def test_idle_connections_are_limited(self):
+        storage = self.manager.create(_context())
+        storage.set("foo", b"bar")
+        database = self.manager._database
+        num_threads = _MAX_IDLE_CONNECTIONS + 4
+        barrier = threading.Barrier(num_threads)
+
+        def read_concurrently() -> None:
+            with database._connection() as conn:
+                barrier.wait()
+                conn.execute("SELECT 1")
+
+        threads = [
+            threading.Thread(target=read_concurrently) for _ in range(num_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(_MAX_IDLE_CONNECTIONS, len(database._idle_connections))
+        self.assertEqual(b"bar", storage.get("foo"))
+
+    def test_failed_connections_are_not_reused(self):
+        database = self.manager._database
+        with database._connection() as conn:
+            pass
+        self.assertEqual([conn], database._idle_connections)
+
+        with self.assertRaises(CacheStorageError):
+            with database.transaction() as conn:
+                conn.execute("SELECT * FROM nonexistent_table")
+
+        self.assertEqual([], database._idle_connections)
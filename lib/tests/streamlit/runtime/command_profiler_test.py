@@ -0,0 +1,180 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from streamlit.runtime import command_profiler
+from streamlit.runtime.command_profiler import (
+    CommandProfiler,
+    get_command_profiler,
+    profile_section,
+    set_command_profiling_enabled,
+)
+from streamlit.runtime.metrics_util import gather_metrics
+
+
+class CommandProfilerTest(unittest.TestCase):
+    def _timer(self, *times: float):
+        return patch.object(command_profiler, "timer", side_effect=times)
+
+    def test_nested_frames(self):
+        """Nested frames are aggregated per call stack, and their time is
+        excluded from the self time of their parent.
+        """
+        profiler = CommandProfiler()
+        with self._timer(0, 1, 4, 10):
+            profiler.push("write")
+            profiler.push("hashing")
+            profiler.pop()
+            profiler.pop()
+
+        stats = {stat.stack[1:]: stat for stat in profiler.get_stats()}
+        self.assertEqual({("write",), ("write", "hashing")}, set(stats))
+        self.assertEqual(1, stats[("write",)].count)
+        self.assertEqual(10, stats[("write",)].total_seconds)
+        self.assertEqual(7, stats[("write",)].self_seconds)
+        self.assertEqual(3, stats[("write", "hashing")].total_seconds)
+        self.assertEqual(3, stats[("write", "hashing")].self_seconds)
+
+    def test_aggregates_calls(self):
+        profiler = CommandProfiler()
+        with self._timer(0, 1, 0, 3):
+            for _ in range(2):
+                profiler.push("markdown")
+                profiler.pop()
+
+        [stat] = profiler.get_stats()
+        self.assertEqual(2, stat.count)
+        self.assertEqual(4, stat.total_seconds)
+        self.assertEqual(3, stat.max_seconds)
+
+    def test_call_site(self):
+        """The first element of each stack is the calling line outside of
+        Streamlit.
+        """
+        profiler = CommandProfiler()
+        profiler.push("markdown")
+        profiler.pop()
+
+        [stat] = profiler.get_stats()
+        self.assertTrue(stat.stack[0].startswith("command_profiler_test.py:"))
+
+    def test_collapses_recursive_frames(self):
+        profiler = CommandProfiler()
+        profiler.push("arrow_conversion")
+        self.assertFalse(profiler.push("arrow_conversion"))
+        profiler.pop()
+
+        self.assertEqual(
+            [("arrow_conversion",)], [stat.stack[1:] for stat in profiler.get_stats()]
+        )
+
+    def test_max_stacks(self):
+        """Stacks beyond the limit are aggregated together."""
+        profiler = CommandProfiler(max_stacks=2)
+        for name in ["a", "b", "c", "d"]:
+            profiler.push(name)
+            profiler.pop()
+
+        stats = profiler.get_stats()
+        self.assertEqual(3, len(stats))
+        [overflow] = [stat for stat in stats if stat.stack == ("[other]",)]
+        self.assertEqual(2, overflow.count)
+
+    def test_stats_by_name(self):
+        profiler = CommandProfiler()
+        with self._timer(0, 1, 2, 4):
+            profiler.push("button")
+            profiler.pop()
+            profiler.push("button")
+            profiler.pop()
+
+        [stat] = profiler.get_stats_by_name()
+        self.assertEqual(("button",), stat.stack)
+        self.assertEqual(2, stat.count)
+        self.assertEqual(3, stat.total_seconds)
+
+    def test_folded_stacks(self):
+        profiler = CommandProfiler()
+        with self._timer(0, 0.25, 0.75, 1):
+            profiler.push("dataframe")
+            profiler.push("arrow_conversion")
+            profiler.pop()
+            profiler.pop()
+
+        lines = profiler.to_folded_stacks().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].endswith(";dataframe 500000"))
+        self.assertTrue(lines[1].endswith(";dataframe;arrow_conversion 500000"))
+
+        profiler.clear()
+        self.assertEqual("", profiler.to_folded_stacks())
+
+
+class ProfilingEnabledTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_command_profiling_enabled(False)
+
+    def test_profile_section(self):
+        @profile_section("hashing")
+        def hash_value(value):
+            return value
+
+        set_command_profiling_enabled(False)
+        self.assertEqual(1, hash_value(1))
+        self.assertIsNone(get_command_profiler())
+
+        set_command_profiling_enabled(True)
+        self.assertEqual(1, hash_value(1))
+        profiler = get_command_profiler()
+        assert profiler is not None
+        self.assertEqual(
+            [("hashing",)], [stat.stack[1:] for stat in profiler.get_stats()]
+        )
+
+    def test_gather_metrics(self):
+        @profile_section("hashing")
+        def hash_value(value):
+            return value
+
+        @gather_metrics("my_command")
+        def my_command():
+            return hash_value(1)
+
+        set_command_profiling_enabled(True)
+        my_command()
+
+        profiler = get_command_profiler()
+        assert profiler is not None
+        self.assertEqual(
+            {("my_command",), ("my_command", "hashing")},
+            {stat.stack[1:] for stat in profiler.get_stats()},
+        )
+
+    def test_frames_are_popped_on_exception(self):
+        @gather_metrics("failing_command")
+        def failing_command():
+            raise RuntimeError("boom")
+
+        set_command_profiling_enabled(True)
+        with self.assertRaises(RuntimeError):
+            failing_command()
+
+        profiler = get_command_profiler()
+        assert profiler is not None
+        self.assertEqual([], profiler._get_frames())
+        self.assertEqual(1, profiler.get_stats()[0].count)
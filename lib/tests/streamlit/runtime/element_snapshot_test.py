@@ -0,0 +1,227 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.runtime.element_snapshot import ElementSnapshot
+from streamlit.runtime.forward_msg_cache import populate_hash_if_needed
+
+
+def _text_msg(
+    path: tuple[int, ...],
+    body: str,
+    fragment_id: str = "",
+    active_script_hash: str = "page_hash",
+) -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.metadata.delta_path[:] = path
+    msg.metadata.active_script_hash = active_script_hash
+    msg.delta.new_element.text.body = body
+    msg.delta.fragment_id = fragment_id
+    return msg
+
+
+def _block_msg(path: tuple[int, ...], horizontal: bool = False) -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.metadata.delta_path[:] = path
+    msg.metadata.active_script_hash = "page_hash"
+    if horizontal:
+        msg.delta.add_block.horizontal.gap = "small"
+    else:
+        msg.delta.add_block.vertical.border = False
+    return msg
+
+
+def _new_session_msg(page_script_hash: str = "page_hash") -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.new_session.main_script_path = "/app.py"
+    msg.new_session.page_script_hash = page_script_hash
+    return msg
+
+
+def _script_finished_msg(
+    status: ForwardMsg.ScriptFinishedStatus.ValueType = ForwardMsg.FINISHED_SUCCESSFULLY,
+) -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.script_finished = status
+    return msg
+
+
+class ElementSnapshotTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.snapshot = ElementSnapshot()
+
+    def send(self, msg: ForwardMsg) -> bool:
+        """Send the message, and return True if it was replaced by an
+        "unchanged" marker.
+        """
+        sent_msg = self.snapshot.get_msg_to_send(msg)
+        if sent_msg is msg:
+            return False
+        self.assertEqual("unchanged_element", sent_msg.delta.WhichOneof("type"))
+        self.assertEqual(msg.metadata, sent_msg.metadata)
+        return True
+
+    def run_script(self, *msgs: ForwardMsg, page_script_hash: str = "page_hash"):
+        """Send the messages of a successful script run, and return which of
+        them were replaced by "unchanged" markers.
+        """
+        self.send(_new_session_msg(page_script_hash))
+        unchanged = [self.send(msg) for msg in msgs]
+        self.send(_script_finished_msg())
+        return unchanged
+
+    def test_replaces_unchanged_elements(self):
+        self.run_script(_text_msg((0, 0), "a"), _text_msg((0, 1), "b"))
+
+        self.assertEqual(
+            [True, False],
+            self.run_script(_text_msg((0, 0), "a"), _text_msg((0, 1), "changed")),
+        )
+
+    def test_reuses_populated_message_hashes(self):
+        """Messages that already have a hash aren't hashed again."""
+        msg = _text_msg((0, 0), "a")
+        msg.metadata.cacheable = True
+        populate_hash_if_needed(msg)
+        self.run_script(msg)
+
+        with patch("streamlit.runtime.element_snapshot.hashlib") as mock_hashlib:
+            unchanged_msg = self.snapshot.get_msg_to_send(msg)
+
+        mock_hashlib.md5.assert_not_called()
+        self.assertEqual("unchanged_element", unchanged_msg.delta.WhichOneof("type"))
+        # The marker must not be cached by the client.
+        self.assertFalse(unchanged_msg.metadata.cacheable)
+
+    def test_sends_elements_of_other_scripts(self):
+        self.run_script(_text_msg((0, 0), "a", active_script_hash="main_hash"))
+
+        self.assertEqual(
+            [False],
+            self.run_script(_text_msg((0, 0), "a", active_script_hash="page_hash")),
+        )
+
+    def test_sends_elements_that_set_widget_values(self):
+        msg = ForwardMsg()
+        msg.metadata.delta_path[:] = (0, 0)
+        msg.delta.new_element.text_input.value = "value"
+        msg.delta.new_element.text_input.set_value = True
+        self.run_script(msg)
+
+        self.assertEqual([False], self.run_script(msg))
+
+    def test_sends_all_elements_on_page_change(self):
+        self.run_script(_text_msg((0, 0), "a"))
+
+        self.assertEqual(
+            [False],
+            self.run_script(_text_msg((0, 0), "a"), page_script_hash="other_page"),
+        )
+
+    def test_forgets_stale_elements(self):
+        """Elements that a run didn't send are cleared by the client."""
+        self.run_script(_text_msg((0, 0), "a"), _text_msg((0, 1), "b"))
+        self.run_script(_text_msg((0, 0), "a"))
+
+        self.assertEqual(
+            [True, False],
+            self.run_script(_text_msg((0, 0), "a"), _text_msg((0, 1), "b")),
+        )
+
+    def test_keeps_elements_of_runs_finished_early(self):
+        """The client doesn't clear stale elements of interrupted runs."""
+        self.run_script(_text_msg((0, 0), "a"), _text_msg((0, 1), "b"))
+        self.send(_new_session_msg())
+        self.send(_text_msg((0, 0), "a"))
+        self.send(_script_finished_msg(ForwardMsg.FINISHED_EARLY_FOR_RERUN))
+
+        self.assertEqual(
+            [True, True],
+            self.run_script(_text_msg((0, 0), "a"), _text_msg((0, 1), "b")),
+        )
+
+    def test_fragment_runs_forget_stale_fragment_elements(self):
+        self.run_script(
+            _text_msg((0, 0), "a"),
+            _text_msg((0, 1), "b", fragment_id="fragment"),
+            _text_msg((0, 2), "c", fragment_id="fragment"),
+        )
+
+        self.send(_new_session_msg())
+        self.assertTrue(self.send(_text_msg((0, 1), "b", fragment_id="fragment")))
+        self.send(_script_finished_msg(ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY))
+
+        self.assertEqual(
+            [True, True, False],
+            self.run_script(
+                _text_msg((0, 0), "a"),
+                _text_msg((0, 1), "b", fragment_id="fragment"),
+                _text_msg((0, 2), "c", fragment_id="fragment"),
+            ),
+        )
+
+    def test_add_rows_changes_element(self):
+        self.run_script(_text_msg((0, 0), "a"))
+        add_rows_msg = ForwardMsg()
+        add_rows_msg.metadata.delta_path[:] = (0, 0)
+        add_rows_msg.delta.arrow_add_rows.name = "data"
+        self.send(add_rows_msg)
+
+        self.assertEqual([False], self.run_script(_text_msg((0, 0), "a")))
+
+    def test_keeps_children_of_blocks_of_same_type(self):
+        self.run_script(_block_msg((0, 0)), _text_msg((0, 0, 0), "a"))
+
+        self.assertEqual(
+            [False, True],
+            self.run_script(_block_msg((0, 0)), _text_msg((0, 0, 0), "a")),
+        )
+
+    def test_forgets_children_of_replaced_blocks(self):
+        self.run_script(_block_msg((0, 0)), _text_msg((0, 0, 0), "a"))
+
+        self.assertEqual(
+            [False, False],
+            self.run_script(
+                _block_msg((0, 0), horizontal=True), _text_msg((0, 0, 0), "a")
+            ),
+        )
+
+    def test_forgets_children_of_blocks_replaced_by_elements(self):
+        self.run_script(_block_msg((0, 0)), _text_msg((0, 0, 0), "a"))
+        self.send(_new_session_msg())
+        self.send(_text_msg((0, 0), "b"))
+
+        self.assertFalse(self.send(_block_msg((0, 0))))
+        self.assertFalse(self.send(_text_msg((0, 0, 0), "a")))
+
+    def test_forgets_children_of_stale_blocks(self):
+        self.run_script(_block_msg((0, 0)), _text_msg((0, 0, 0), "a"))
+        # The block is cleared, but its child is (unexpectedly) sent.
+        self.run_script(_text_msg((0, 0, 0), "a"))
+
+        self.assertEqual([False], self.run_script(_text_msg((0, 0, 0), "a")))
+
+    def test_clear(self):
+        self.run_script(_text_msg((0, 0), "a"))
+        self.snapshot.clear()
+
+        self.assertEqual(0, len(self.snapshot))
+        self.assertEqual([False], self.run_script(_text_msg((0, 0), "a")))
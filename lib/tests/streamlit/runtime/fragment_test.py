@@ -27,6 +27,7 @@ from streamlit.delta_generator_singletons import context_dg_stack
 from streamlit.errors import (
     FragmentHandledException,
     FragmentStorageKeyError,
+    StreamlitAPIException,
     StreamlitFragmentWidgetsNotAllowedOutsideError,
 )
 from streamlit.runtime.fragment import (
@@ -318,6 +319,50 @@ class FragmentTest(unittest.TestCase):
         else:
             ctx.enqueue.assert_not_called()
 
+    @patch("streamlit.runtime.fragment.runtime")
+    @patch("streamlit.runtime.fragment.get_script_run_ctx")
+    def test_shared_fragment_subscribes_session(
+        self, patched_get_script_run_ctx, patched_runtime
+    ):
+        """A shared fragment is rerun by the runtime instead of the browser."""
+        called = False
+
+        ctx = MagicMock()
+        ctx.fragment_storage = MemoryFragmentStorage()
+        patched_get_script_run_ctx.return_value = ctx
+        subscribe = patched_runtime.get_instance.return_value.shared_fragments.subscribe
+
+        @fragment(run_every="5s", shared=True)
+        def my_fragment():
+            nonlocal called
+
+            called = True
+
+        my_fragment()
+
+        assert called
+        ctx.enqueue.assert_not_called()
+        [fragment_id] = ctx.fragment_storage._fragments
+        subscribe.assert_called_once_with(
+            fragment_id, ctx.fragment_storage.get(fragment_id), 5.0, ctx
+        )
+
+    def test_shared_fragment_requires_run_every(self):
+        with pytest.raises(StreamlitAPIException, match="requires `run_every`"):
+
+            @fragment(shared=True)
+            def my_fragment():
+                pass
+
+    @patch("streamlit.runtime.fragment.get_script_run_ctx", MagicMock())
+    def test_shared_fragment_rejects_arguments(self):
+        @fragment(run_every=5, shared=True)
+        def my_fragment(value):
+            pass
+
+        with pytest.raises(StreamlitAPIException, match="can't take arguments"):
+            my_fragment(1)
+
     @patch("streamlit.runtime.fragment.get_script_run_ctx")
     def test_sets_active_script_hash_if_needed(self, patched_get_script_run_ctx):
         ctx = MagicMock()
@@ -19,7 +19,10 @@ from unittest.mock import MagicMock
 
 from cachetools import TTLCache
 
-from streamlit.runtime.memory_session_storage import MemorySessionStorage
+from streamlit.runtime.memory_session_storage import (
+    MemorySessionStorage,
+    _SessionCache,
+)
 
 
 class MemorySessionStorageTest(unittest.TestCase):
@@ -69,3 +72,90 @@ class MemorySessionStorageTest(unittest.TestCase):
         store._cache["baz"] = "qux"
 
         self.assertEqual(store.list(), ["bar", "qux"])
+
+
+def _session_info(session_id: str) -> MagicMock:
+    session_info = MagicMock()
+    session_info.session.id = session_id
+    return session_info
+
+
+class MemorySessionStorageEvictionTest(unittest.TestCase):
+    def test_evicted_sessions_are_shut_down(self):
+        store = MemorySessionStorage(maxsize=1)
+        foo = _session_info("foo")
+        bar = _session_info("bar")
+
+        store.save(foo)
+        store.save(bar)
+
+        foo.session.shutdown.assert_called_once()
+        bar.session.shutdown.assert_not_called()
+        self.assertEqual(store.list(), [bar])
+
+    def test_expired_sessions_are_shut_down(self):
+        timer_patch = MagicMock(return_value=0)
+        store = MemorySessionStorage()
+        store._cache = _SessionCache(
+            maxsize=128, ttl=10, on_evict=store._on_evict, timer=timer_patch
+        )
+        foo = _session_info("foo")
+        store.save(foo)
+
+        timer_patch.return_value = 5
+        self.assertEqual(store.get("foo"), foo)
+        foo.session.shutdown.assert_not_called()
+
+        timer_patch.return_value = 11
+        self.assertEqual(store.list(), [])
+        foo.session.shutdown.assert_called_once()
+
+    def test_deleted_sessions_are_not_shut_down(self):
+        """Deleting a session hands it over to the caller, e.g. on reconnect."""
+        store = MemorySessionStorage()
+        foo = _session_info("foo")
+        store.save(foo)
+
+        store.delete("foo")
+        store.delete("foo")
+
+        foo.session.shutdown.assert_not_called()
+
+    def test_evicted_sessions_are_hibernated(self):
+        hibernator = MagicMock()
+        store = MemorySessionStorage(maxsize=1, hibernator=hibernator)
+        foo = _session_info("foo")
+
+        store.save(foo)
+        store.save(_session_info("bar"))
+
+        hibernator.hibernate.assert_called_once_with(foo.session)
+        foo.session.shutdown.assert_called_once()
+
+    def test_get_restores_hibernated_sessions(self):
+        hibernator = MagicMock()
+        restored_session = MagicMock()
+        hibernator.restore.return_value = restored_session
+        store = MemorySessionStorage(hibernator=hibernator)
+
+        session_info = store.get("foo")
+
+        hibernator.restore.assert_called_once_with("foo")
+        self.assertIs(session_info.session, restored_session)
+        self.assertIsNone(session_info.client)
+        self.assertEqual(store.list(), [session_info])
+
+    def test_get_without_hibernated_session(self):
+        hibernator = MagicMock()
+        hibernator.restore.return_value = None
+        store = MemorySessionStorage(hibernator=hibernator)
+
+        self.assertIsNone(store.get("foo"))
+
+    def test_delete_discards_hibernated_session(self):
+        hibernator = MagicMock()
+        store = MemorySessionStorage(hibernator=hibernator)
+
+        store.delete("foo")
+
+        hibernator.discard.assert_called_once_with("foo")
@@ -0,0 +1,119 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.runtime.runtime_metrics import (
+    Counter,
+    EventLoopLagProbe,
+    Histogram,
+    RuntimeMetrics,
+    get_runtime_metrics,
+)
+from streamlit.runtime.runtime_util import serialize_forward_msg
+
+
+class HistogramTest(unittest.TestCase):
+    def test_observe(self):
+        histogram = Histogram("test_seconds", "seconds", "help", (0.1, 1.0))
+        for value in [0.05, 0.1, 0.5, 2.0, 3.0]:
+            histogram.observe(value)
+
+        self.assertEqual(5, histogram.count)
+        self.assertAlmostEqual(5.65, histogram.sum)
+        self.assertEqual(
+            [(0.1, 2), (1.0, 3), (math.inf, 5)], histogram.get_cumulative_buckets()
+        )
+
+    def test_to_metric_str(self):
+        histogram = Histogram("test_seconds", "seconds", "help", (0.1, 1.0))
+        histogram.observe(0.5)
+        histogram.observe(1.0)
+
+        self.assertEqual(
+            [
+                'test_seconds_bucket{le="0.1"} 0',
+                'test_seconds_bucket{le="1"} 2',
+                'test_seconds_bucket{le="+Inf"} 2',
+                "test_seconds_sum 1.5",
+                "test_seconds_count 2",
+            ],
+            histogram.to_metric_str(),
+        )
+
+
+class CounterTest(unittest.TestCase):
+    def test_inc(self):
+        counter = Counter("test_things", "help")
+        counter.inc()
+        counter.inc(2)
+
+        self.assertEqual(3, counter.value)
+        self.assertEqual(["test_things_total 3"], counter.to_metric_str())
+
+
+class RuntimeMetricsTest(unittest.TestCase):
+    def test_count_sent_bytes(self):
+        """Only bytes serialized while counting are counted."""
+        metrics = RuntimeMetrics()
+        metrics.record_sent_bytes(100)
+
+        metrics.start_counting_sent_bytes()
+        metrics.record_sent_bytes(10)
+        metrics.record_sent_bytes(20)
+        self.assertEqual(30, metrics.stop_counting_sent_bytes())
+
+        metrics.record_sent_bytes(100)
+        self.assertEqual(0, metrics.stop_counting_sent_bytes())
+
+    def test_serialize_forward_msg_records_sent_bytes(self):
+        msg = ForwardMsg()
+        msg.delta.new_element.markdown.body = "hello"
+
+        metrics = get_runtime_metrics()
+        metrics.start_counting_sent_bytes()
+        msg_bytes = serialize_forward_msg(msg)
+        self.assertEqual(len(msg_bytes), metrics.stop_counting_sent_bytes())
+
+
+class EventLoopLagProbeTest(IsolatedAsyncioTestCase):
+    async def test_measures_lag(self):
+        histogram = Histogram("lag_seconds", "seconds", "help", (0.05, 10.0))
+        probe = EventLoopLagProbe(histogram, interval_seconds=0.01)
+        probe.start()
+
+        await asyncio.sleep(0.05)
+        self.assertGreater(histogram.count, 0)
+
+        # Block the event loop, so the next sample is late.
+        count = histogram.count
+        time.sleep(0.1)
+        await asyncio.sleep(0.02)
+        probe.stop()
+
+        self.assertGreater(histogram.count, count)
+        # The late sample is in the overflow bucket.
+        self.assertGreater(histogram.count, histogram.get_cumulative_buckets()[0][1])
+
+        # No more samples after stopping.
+        count = histogram.count
+        await asyncio.sleep(0.03)
+        self.assertEqual(count, histogram.count)
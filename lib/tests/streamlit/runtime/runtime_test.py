@@ -19,10 +19,12 @@ import os
 import shutil
 import tempfile
 import unittest
+from unittest import IsolatedAsyncioTestCase
 from unittest.mock import ANY, MagicMock, call, patch
 
 import pytest
 
+from streamlit import config, source_util
 from streamlit.components.lib.local_component_registry import LocalComponentRegistry
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import (
@@ -40,7 +42,9 @@ from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.memory_session_storage import MemorySessionStorage
 from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
 from streamlit.runtime.runtime import AsyncObjects, RuntimeStoppedError
+from streamlit.runtime.scriptrunner.script_cache import get_default_bytecode_dir
 from streamlit.runtime.websocket_session_manager import WebsocketSessionManager
+from streamlit.testing.v1.util import build_mock_config_get_option
 from streamlit.watcher import event_based_path_watcher
 from tests.streamlit.message_mocks import (
     create_dataframe_msg,
@@ -544,12 +548,87 @@ class RuntimeTest(RuntimeTestCase):
             # And the same *metadata* as msg2:
             self.assertEqual(msg2.metadata, cached.metadata)
 
+    async def test_sends_unchanged_element_marker(self):
+        """Test that an element that the client already displays at the same
+        path is replaced by an "unchanged" marker.
+        """
+        await self.runtime.start()
+
+        client = MockSessionClient()
+        session_id = self.runtime.connect_session(client=client, user_info=MagicMock())
+
+        with patch_config_options({"server.enableElementDiffing": True}):
+            self.enqueue_forward_msg(session_id, create_dataframe_msg([1, 2, 3]))
+            await self.tick_runtime_loop()
+            self.assertEqual(
+                "new_element", client.forward_msgs.pop().delta.WhichOneof("type")
+            )
+
+            msg = create_dataframe_msg([1, 2, 3])
+            self.enqueue_forward_msg(session_id, msg)
+            await self.tick_runtime_loop()
+
+        unchanged = client.forward_msgs.pop()
+        self.assertEqual("unchanged_element", unchanged.delta.WhichOneof("type"))
+        self.assertEqual(msg.metadata, unchanged.metadata)
+
+        # Element diffing is disabled by default.
+        self.enqueue_forward_msg(session_id, create_dataframe_msg([1, 2, 3]))
+        await self.tick_runtime_loop()
+        self.assertEqual(
+            "new_element", client.forward_msgs.pop().delta.WhichOneof("type")
+        )
+
+    async def test_element_diffing_reuses_forward_msg_cache_hash(self):
+        """Test that messages that are hashed for the ForwardMsgCache aren't
+        hashed again for element diffing.
+        """
+        await self.runtime.start()
+
+        client = MockSessionClient()
+        session_id = self.runtime.connect_session(client=client, user_info=MagicMock())
+
+        with patch_config_options(
+            {"server.enableElementDiffing": True, "global.minCachedMessageSize": 0}
+        ), patch("streamlit.runtime.element_snapshot.hashlib") as mock_hashlib:
+            msg = create_dataframe_msg([1, 2, 3])
+            self.enqueue_forward_msg(session_id, msg)
+            await self.tick_runtime_loop()
+
+        mock_hashlib.md5.assert_not_called()
+        self.assertNotEqual("", msg.hash)
+
+    async def test_reconnect_clears_element_snapshot(self):
+        """Test that a client that reconnects gets all elements in full."""
+        await self.runtime.start()
+
+        client = MockSessionClient()
+        session_id = self.runtime.connect_session(client=client, user_info=MagicMock())
+        with patch_config_options({"server.enableElementDiffing": True}):
+            self.enqueue_forward_msg(session_id, create_dataframe_msg([1, 2, 3]))
+            await self.tick_runtime_loop()
+
+        session = self.runtime._session_mgr.get_session_info(session_id).session
+        self.assertEqual(1, len(session.element_snapshot))
+
+        with patch.object(
+            self.runtime._session_mgr, "connect_session", return_value=session_id
+        ):
+            self.runtime.connect_session(
+                client=client, user_info=MagicMock(), existing_session_id=session_id
+            )
+
+        self.assertEqual(0, len(session.element_snapshot))
+
     async def test_forwardmsg_cache_clearing(self):
         """Test that the ForwardMsgCache gets properly cleared when scripts
         finish running.
         """
         with patch_config_options(
-            {"global.minCachedMessageSize": 0, "global.maxCachedMessageAge": 1}
+            {
+                "global.minCachedMessageSize": 0,
+                "global.maxCachedMessageAge": 1,
+            }
         ):
             await self.runtime.start()
 
@@ -690,6 +769,24 @@ time.sleep(5)
         with patch("streamlit.runtime.runtime.SCRIPT_RUN_CHECK_TIMEOUT", new=0.1):
             await self._check_script_loading(script, False, "timeout")
 
+    @pytest.mark.slow
+    async def test_caches_result_until_source_changes(self):
+        await self._check_script_loading("import streamlit", True, "ok")
+
+        # The script isn't run again while the result is cached...
+        with open(self._path, "w") as f:
+            f.write("raise RuntimeError('boom')")
+        self.assertEqual(
+            (True, "ok"), await self.runtime.does_script_run_without_error()
+        )
+
+        # ...but is once a source file changed, and the script cache is cleared.
+        self.runtime._script_cache.clear()
+        ok, msg = await self.runtime.does_script_run_without_error()
+        event_based_path_watcher._MultiPathWatcher.get_singleton().close()
+        event_based_path_watcher._MultiPathWatcher._singleton = None
+        self.assertEqual((False, "error"), (ok, msg))
+
     async def _check_script_loading(
         self, script: str, expected_loads: bool, expected_msg: str
     ) -> None:
@@ -701,3 +798,163 @@ time.sleep(5)
         event_based_path_watcher._MultiPathWatcher._singleton = None
         self.assertEqual(expected_loads, ok)
         self.assertEqual(expected_msg, msg)
+
+
+class WarmupTest(IsolatedAsyncioTestCase):
+    """Tests for Runtime.warm_up"""
+
+    def setUp(self) -> None:
+        self._home = tempfile.mkdtemp()
+        self._old_home = os.environ["HOME"]
+        os.environ["HOME"] = self._home
+
+        self._app_dir = tempfile.mkdtemp()
+        self._main_script_path = self._write_script("app.py", "import streamlit")
+        os.mkdir(os.path.join(self._app_dir, "pages"))
+        self._page_script_path = self._write_script(
+            os.path.join("pages", "page.py"), "import streamlit"
+        )
+
+        config_patch = patch.object(
+            config,
+            "get_option",
+            new=build_mock_config_get_option(
+                {"server.warmup": True, "server.fileWatcherType": "none"}
+            ),
+        )
+        config_patch.start()
+        self.addCleanup(config_patch.stop)
+        # Pages are cached for the first main script they're requested for.
+        pages_patch = patch.object(source_util, "_cached_pages", None)
+        pages_patch.start()
+        self.addCleanup(pages_patch.stop)
+
+        super().setUp()
+
+    async def asyncSetUp(self):
+        self.runtime = Runtime(
+            RuntimeConfig(
+                script_path=self._main_script_path,
+                command_line=None,
+                component_registry=LocalComponentRegistry(),
+                media_file_storage=MemoryMediaFileStorage("/mock/media"),
+                uploaded_file_manager=MemoryUploadedFileManager("/mock/upload"),
+                session_manager_class=MagicMock,
+                session_storage=MagicMock(),
+                cache_storage_manager=MagicMock(),
+                is_hello=False,
+            )
+        )
+        await self.runtime.start()
+
+    async def asyncTearDown(self):
+        self.runtime.stop()
+        await self.runtime.stopped
+        Runtime._instance = None
+
+    def tearDown(self) -> None:
+        os.environ["HOME"] = self._old_home
+        shutil.rmtree(self._home)
+        shutil.rmtree(self._app_dir)
+
+        super().tearDown()
+
+    def _write_script(self, name: str, script: str) -> str:
+        path = os.path.join(self._app_dir, name)
+        with open(path, "w") as f:
+            f.write(script)
+        return path
+
+    async def test_not_ready_until_warmed_up(self):
+        self.assertEqual(
+            (False, "warming up"), await self.runtime.is_ready_for_browser_connection
+        )
+
+        await self.runtime.warm_up()
+
+        self.assertEqual(
+            (True, "ok"), await self.runtime.is_ready_for_browser_connection
+        )
+
+    async def test_compiles_pages(self):
+        await self.runtime.warm_up()
+
+        self.assertEqual(
+            {self._main_script_path, self._page_script_path},
+            set(self.runtime._script_cache._cache),
+        )
+        # The bytecode is persisted, too.
+        self.assertEqual(2, len(os.listdir(get_default_bytecode_dir())))
+
+    async def test_becomes_ready_if_page_fails_to_compile(self):
+        self._write_script(os.path.join("pages", "page.py"), "def (")
+
+        await self.runtime.warm_up()
+
+        self.assertEqual(
+            (True, "ok"), await self.runtime.is_ready_for_browser_connection
+        )
+        self.assertEqual(
+            {self._main_script_path}, set(self.runtime._script_cache._cache)
+        )
+
+    async def test_runs_warmup_script(self):
+        output_path = os.path.join(self._app_dir, "output.txt")
+        warmup_script_path = self._write_script(
+            "warmup.py",
+            f"""
+import streamlit as st
+
+st.write("Streamlit commands work, but their output isn't sent anywhere.")
+with open({output_path!r}, "w") as f:
+    f.write("warmed up")
+""",
+        )
+
+        with self.assertNoLogs("streamlit.runtime.runtime", level="WARNING"):
+            await self.runtime.warm_up(warmup_script_path)
+
+        with open(output_path) as f:
+            self.assertEqual("warmed up", f.read())
+        self.assertIn(warmup_script_path, self.runtime._script_cache._cache)
+
+    async def test_becomes_ready_if_warmup_script_fails(self):
+        warmup_script_path = self._write_script(
+            "warmup.py", "raise RuntimeError('boom')"
+        )
+
+        with self.assertLogs("streamlit.runtime.runtime", level="WARNING") as logs:
+            await self.runtime.warm_up(warmup_script_path)
+
+        self.assertIn("Failed to warm up", logs.output[0])
+        self.assertIn("RuntimeError: boom", logs.output[0])
+        self.assertEqual(
+            (True, "ok"), await self.runtime.is_ready_for_browser_connection
+        )
+
+    @patch("streamlit.runtime.runtime.WARMUP_SCRIPT_TIMEOUT", 0.1)
+    async def test_becomes_ready_if_warmup_script_times_out(self):
+        output_path = os.path.join(self._app_dir, "output.txt")
+        warmup_script_path = self._write_script(
+            "warmup.py",
+            f"""
+import time
+
+time.sleep(0.5)
+with open({output_path!r}, "w") as f:
+    f.write("finished")
+""",
+        )
+
+        with self.assertLogs("streamlit.runtime.runtime", level="WARNING") as logs:
+            await self.runtime.warm_up(warmup_script_path)
+
+        self.assertIn("didn't finish within 0.1 seconds", logs.output[0])
+        self.assertEqual(
+            (True, "ok"), await self.runtime.is_ready_for_browser_connection
+        )
+        # The script isn't stopped, it keeps running in the background.
+        self.assertFalse(os.path.exists(output_path))
+        await asyncio.sleep(1)
+        with open(output_path) as f:
+            self.assertEqual("finished", f.read())
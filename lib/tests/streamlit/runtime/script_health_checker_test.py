@@ -0,0 +1,165 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from streamlit.runtime.script_health_checker import (
+    ScriptHealthChecker,
+    ScriptHealthCheckResult,
+)
+
+
+class ScriptHealthCheckerTest(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.num_checks = 0
+        self.results: list[ScriptHealthCheckResult] = []
+        self.check_started = asyncio.Event()
+        self.can_finish = asyncio.Event()
+        self.can_finish.set()
+
+    async def run_check(self) -> ScriptHealthCheckResult:
+        self.num_checks += 1
+        self.check_started.set()
+        await self.can_finish.wait()
+        return self.results.pop(0) if self.results else (True, "ok")
+
+    async def test_caches_result(self):
+        checker = ScriptHealthChecker(
+            self.run_check, ttl_seconds=60, interval_seconds=0
+        )
+
+        self.assertEqual((True, "ok"), await checker.get_result())
+        self.assertEqual((True, "ok"), await checker.get_result())
+        self.assertEqual(1, self.num_checks)
+
+    async def test_reruns_check_after_ttl(self):
+        checker = ScriptHealthChecker(
+            self.run_check, ttl_seconds=60, interval_seconds=0
+        )
+        self.results = [(True, "ok"), (False, "error")]
+
+        with patch("streamlit.runtime.script_health_checker.time.monotonic") as now:
+            now.return_value = 100
+            self.assertEqual((True, "ok"), await checker.get_result())
+            now.return_value = 159
+            self.assertEqual((True, "ok"), await checker.get_result())
+            now.return_value = 160
+            self.assertEqual((False, "error"), await checker.get_result())
+
+        self.assertEqual(2, self.num_checks)
+
+    async def test_concurrent_requests_share_check(self):
+        checker = ScriptHealthChecker(
+            self.run_check, ttl_seconds=60, interval_seconds=0
+        )
+        self.can_finish.clear()
+
+        requests = [asyncio.create_task(checker.get_result()) for _ in range(5)]
+        await self.check_started.wait()
+        self.can_finish.set()
+
+        self.assertEqual([(True, "ok")] * 5, await asyncio.gather(*requests))
+        self.assertEqual(1, self.num_checks)
+
+    async def test_cancelled_request_does_not_cancel_check(self):
+        checker = ScriptHealthChecker(
+            self.run_check, ttl_seconds=60, interval_seconds=0
+        )
+        self.can_finish.clear()
+
+        cancelled_request = asyncio.create_task(checker.get_result())
+        await self.check_started.wait()
+        other_request = asyncio.create_task(checker.get_result())
+        cancelled_request.cancel()
+        self.can_finish.set()
+
+        self.assertEqual((True, "ok"), await other_request)
+        self.assertEqual(1, self.num_checks)
+
+    async def test_invalidate_discards_result(self):
+        checker = ScriptHealthChecker(
+            self.run_check, ttl_seconds=60, interval_seconds=0
+        )
+        self.results = [(True, "ok"), (False, "error")]
+
+        await checker.get_result()
+        checker.invalidate()
+
+        self.assertEqual((False, "error"), await checker.get_result())
+        self.assertEqual(2, self.num_checks)
+
+    async def test_does_not_cache_result_of_check_invalidated_while_running(self):
+        checker = ScriptHealthChecker(
+            self.run_check, ttl_seconds=60, interval_seconds=0
+        )
+        self.results = [(True, "ok"), (False, "error")]
+        self.can_finish.clear()
+
+        request = asyncio.create_task(checker.get_result())
+        await self.check_started.wait()
+        checker.invalidate()
+        self.can_finish.set()
+
+        # The request that was waiting still gets the check's result...
+        self.assertEqual((True, "ok"), await request)
+        # ...but it isn't served to later requests.
+        self.assertEqual((False, "error"), await checker.get_result())
+
+    async def test_does_not_cache_errors(self):
+        results = [RuntimeError("boom"), (True, "ok")]
+
+        async def run_check() -> ScriptHealthCheckResult:
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        checker = ScriptHealthChecker(run_check, ttl_seconds=60, interval_seconds=0)
+
+        with self.assertRaises(RuntimeError):
+            await checker.get_result()
+        self.assertEqual((True, "ok"), await checker.get_result())
+
+    async def test_runs_check_in_background(self):
+        checker = ScriptHealthChecker(
+            self.run_check, ttl_seconds=60, interval_seconds=0.01
+        )
+        checker.start()
+        try:
+            await self.check_started.wait()
+            # Requests are served from the background check's result.
+            self.assertEqual((True, "ok"), await checker.get_result())
+
+            # And the check is re-run on schedule.
+            while self.num_checks < 3:
+                await asyncio.sleep(0.01)
+        finally:
+            checker.stop()
+
+        num_checks = self.num_checks
+        await asyncio.sleep(0.05)
+        self.assertEqual(num_checks, self.num_checks)
+
+    async def test_does_not_run_check_in_background_without_interval(self):
+        checker = ScriptHealthChecker(
+            self.run_check, ttl_seconds=60, interval_seconds=0
+        )
+        checker.start()
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(0, self.num_checks)
@@ -12,13 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import annotations
+
 import os.path
 import unittest
 from unittest import mock
 from unittest.mock import Mock
 
-from streamlit import source_util
+from testfixtures import TempDirectory
+
+from streamlit import config, source_util
 from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1.util import build_mock_config_get_option
+from tests.testutil import patch_config_options
 
 
 def _get_script_path(name: str) -> str:
@@ -59,6 +65,15 @@ class ScriptCacheTest(unittest.TestCase):
         cache.clear()
         self.assertEqual(0, len(cache._cache))
 
+    def test_clear_emits_on_cleared(self):
+        """`clear` notifies `on_cleared` listeners."""
+        cache = ScriptCache()
+        listener = Mock()
+        cache.on_cleared.connect(listener)
+
+        cache.clear()
+        listener.assert_called_once_with(cache)
+
     def test_file_not_found_error(self):
         """An exception is thrown when a script file doesn't exist."""
         cache = ScriptCache()
@@ -70,3 +85,75 @@ class ScriptCacheTest(unittest.TestCase):
         cache = ScriptCache()
         with self.assertRaises(SyntaxError):
             cache.get_bytecode(_get_script_path("compile_error.py.txt"))
+
+
+class PersistedScriptCacheTest(unittest.TestCase):
+    """Tests for the bytecode that's persisted if `server.warmup` is enabled."""
+
+    def setUp(self) -> None:
+        config_patch = mock.patch.object(
+            config,
+            "get_option",
+            new=build_mock_config_get_option({"server.warmup": True}),
+        )
+        config_patch.start()
+        self.addCleanup(config_patch.stop)
+
+        self.tmp_dir = TempDirectory()
+        self.bytecode_dir = os.path.join(self.tmp_dir.path, "bytecode")
+        self.script_path = self.tmp_dir.write("script.py", b"x = 1")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _exec_script(self, cache: ScriptCache) -> dict[str, object]:
+        namespace: dict[str, object] = {}
+        exec(cache.get_bytecode(self.script_path), namespace)
+        return namespace
+
+    @mock.patch("streamlit.runtime.scriptrunner.script_cache.open_python_file")
+    def test_loads_persisted_bytecode(self, mock_open_python_file: Mock):
+        """Other caches load the bytecode from disk instead of compiling it."""
+        mock_open_python_file.side_effect = source_util.open_python_file
+        self.assertEqual(1, self._exec_script(ScriptCache(self.bytecode_dir))["x"])
+        self.assertEqual(1, len(os.listdir(self.bytecode_dir)))
+        mock_open_python_file.assert_called_once()
+
+        mock_open_python_file.reset_mock()
+        self.assertEqual(1, self._exec_script(ScriptCache(self.bytecode_dir))["x"])
+        mock_open_python_file.assert_not_called()
+
+    def test_recompiles_changed_script(self):
+        """Bytecode is persisted per modification time of the script."""
+        self._exec_script(ScriptCache(self.bytecode_dir))
+
+        self.tmp_dir.write("script.py", b"x = 2")
+        stat = os.stat(self.script_path)
+        os.utime(self.script_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertEqual(2, self._exec_script(ScriptCache(self.bytecode_dir))["x"])
+        # The bytecode of the old version is removed.
+        self.assertEqual(1, len(os.listdir(self.bytecode_dir)))
+
+    def test_recompiles_corrupted_bytecode(self):
+        self._exec_script(ScriptCache(self.bytecode_dir))
+        [bytecode_file] = os.listdir(self.bytecode_dir)
+        with open(os.path.join(self.bytecode_dir, bytecode_file), "wb") as f:
+            f.write(b"not bytecode")
+
+        self.assertEqual(1, self._exec_script(ScriptCache(self.bytecode_dir))["x"])
+
+    def test_persists_bytecode_per_magic_setting(self):
+        """Magic changes the compiled script."""
+        self._exec_script(ScriptCache(self.bytecode_dir))
+        with patch_config_options({"runner.magicEnabled": False}):
+            self._exec_script(ScriptCache(self.bytecode_dir))
+
+        # Each setting replaced the other's bytecode.
+        self.assertEqual(1, len(os.listdir(self.bytecode_dir)))
+
+    def test_does_not_persist_without_warmup(self):
+        with patch_config_options({"server.warmup": False}):
+            self._exec_script(ScriptCache(self.bytecode_dir))
+
+        self.assertFalse(os.path.exists(self.bytecode_dir))
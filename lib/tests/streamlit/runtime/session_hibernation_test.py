@@ -0,0 +1,201 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""SessionHibernator unit tests."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import unittest
+from typing import Any
+from unittest.mock import MagicMock
+
+from streamlit.runtime.session_hibernation import SessionHibernator
+from streamlit.runtime.state import SessionState
+from streamlit.runtime.state.common import GENERATED_ELEMENT_ID_PREFIX
+
+
+def _mock_session(session_id: str, values: dict[str, Any]) -> MagicMock:
+    session = MagicMock()
+    session.id = session_id
+    session.session_state = SessionState()
+    for key, value in values.items():
+        session.session_state[key] = value
+
+    def restore_session() -> MagicMock:
+        restored_session = MagicMock()
+        restored_session.id = session_id
+        restored_session.session_state = SessionState()
+        return restored_session
+
+    session.make_restorer.return_value = restore_session
+    return session
+
+
+class SessionHibernatorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._hibernators: list[SessionHibernator] = []
+
+    def tearDown(self) -> None:
+        for hibernator in self._hibernators:
+            hibernator.close()
+        self._tmp_dir.cleanup()
+
+    def _hibernator(
+        self, max_sessions: int = 10, max_bytes: int = 1024 * 1024
+    ) -> SessionHibernator:
+        hibernator = SessionHibernator(self._tmp_dir.name, max_sessions, max_bytes)
+        self._hibernators.append(hibernator)
+        return hibernator
+
+    def _files(self, hibernator: SessionHibernator) -> list[str]:
+        return os.listdir(hibernator._dir)
+
+    def test_hibernate_and_restore(self):
+        hibernator = self._hibernator()
+        session = _mock_session("foo", {"a": 1, "b": [2, 3]})
+
+        self.assertTrue(hibernator.hibernate(session))
+        self.assertIn("foo", hibernator)
+        self.assertEqual(["foo.pickle"], self._files(hibernator))
+
+        restored_session = hibernator.restore("foo")
+
+        self.assertEqual(
+            {"a": 1, "b": [2, 3]}, restored_session.session_state.get_user_values()
+        )
+        restored_session.disconnect_file_watchers.assert_called_once()
+        self.assertNotIn("foo", hibernator)
+        self.assertEqual(0, hibernator.total_bytes)
+        self.assertEqual([], self._files(hibernator))
+        self.assertIsNone(hibernator.restore("foo"))
+
+    def test_unpicklable_values_are_dropped(self):
+        hibernator = self._hibernator()
+        session = _mock_session("foo", {"a": 1, "lock": threading.Lock()})
+
+        self.assertTrue(hibernator.hibernate(session))
+
+        restored_session = hibernator.restore("foo")
+        self.assertEqual({"a": 1}, restored_session.session_state.get_user_values())
+
+    def test_empty_state_is_not_hibernated(self):
+        hibernator = self._hibernator()
+
+        self.assertFalse(hibernator.hibernate(_mock_session("foo", {})))
+        self.assertNotIn("foo", hibernator)
+        self.assertEqual([], self._files(hibernator))
+
+    def test_max_sessions(self):
+        hibernator = self._hibernator(max_sessions=2)
+        for session_id in ["foo", "bar", "baz"]:
+            hibernator.hibernate(_mock_session(session_id, {"a": 1}))
+
+        self.assertEqual(2, len(hibernator))
+        self.assertNotIn("foo", hibernator)
+        self.assertEqual(["bar.pickle", "baz.pickle"], sorted(self._files(hibernator)))
+
+    def test_max_bytes(self):
+        hibernator = self._hibernator(max_bytes=2500)
+        for session_id in ["foo", "bar", "baz"]:
+            hibernator.hibernate(_mock_session(session_id, {"a": "x" * 1000}))
+
+        self.assertEqual(2, len(hibernator))
+        self.assertNotIn("foo", hibernator)
+        self.assertLessEqual(hibernator.total_bytes, 2500)
+
+    def test_oversized_session_is_not_hibernated(self):
+        hibernator = self._hibernator(max_bytes=100)
+
+        self.assertFalse(hibernator.hibernate(_mock_session("foo", {"a": "x" * 200})))
+        self.assertEqual(0, len(hibernator))
+        self.assertEqual([], self._files(hibernator))
+
+    def test_discard_and_clear(self):
+        hibernator = self._hibernator()
+        for session_id in ["foo", "bar"]:
+            hibernator.hibernate(_mock_session(session_id, {"a": 1}))
+
+        hibernator.discard("foo")
+        hibernator.discard("nonexistent")
+        self.assertEqual(["bar.pickle"], self._files(hibernator))
+
+        hibernator.clear()
+        self.assertEqual(0, len(hibernator))
+        self.assertEqual(0, hibernator.total_bytes)
+        self.assertEqual([], self._files(hibernator))
+
+    def test_close_removes_directory(self):
+        hibernator = self._hibernator()
+        hibernator.hibernate(_mock_session("foo", {"a": 1}))
+
+        hibernator.close()
+
+        self.assertEqual(0, len(hibernator))
+        self.assertEqual([], os.listdir(self._tmp_dir.name))
+
+    def test_removes_stale_directories(self):
+        """Directories of hibernators that weren't closed, e.g. because their
+        server was killed, are removed when a new hibernator is created."""
+        stale_dir = os.path.join(self._tmp_dir.name, "sessions-stale")
+        os.mkdir(stale_dir)
+        with open(os.path.join(stale_dir, "foo.pickle"), "wb") as f:
+            f.write(b"data")
+        unrelated_dir = os.path.join(self._tmp_dir.name, "other")
+        os.mkdir(unrelated_dir)
+
+        hibernator = self._hibernator()
+
+        self.assertEqual(
+            sorted(
+                [
+                    "other",
+                    os.path.basename(hibernator._dir),
+                    f"{os.path.basename(hibernator._dir)}.lock",
+                ]
+            ),
+            sorted(os.listdir(self._tmp_dir.name)),
+        )
+
+    def test_keeps_directories_in_use(self):
+        """Several servers can share the same directory."""
+        hibernator = self._hibernator()
+        hibernator.hibernate(_mock_session("foo", {"a": 1}))
+
+        other_hibernator = self._hibernator()
+
+        self.assertTrue(os.path.isdir(other_hibernator._dir))
+        self.assertEqual(["foo.pickle"], self._files(hibernator))
+        restored_session = hibernator.restore("foo")
+        self.assertEqual({"a": 1}, restored_session.session_state.get_user_values())
+
+        other_hibernator.close()
+        hibernator.close()
+        self.assertEqual([], os.listdir(self._tmp_dir.name))
+
+    def test_widget_values_are_not_hibernated(self):
+        """Browsers send widget values when they reconnect."""
+        session = _mock_session("foo", {"a": 1})
+        widget_id = f"{GENERATED_ELEMENT_ID_PREFIX}-abc-key"
+        session.session_state._old_state[widget_id] = 2
+        session.session_state._key_id_mapper["key"] = widget_id
+        hibernator = self._hibernator()
+
+        hibernator.hibernate(session)
+
+        restored_session = hibernator.restore("foo")
+        self.assertEqual({"a": 1}, restored_session.session_state.get_user_values())
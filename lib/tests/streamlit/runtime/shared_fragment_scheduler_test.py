@@ -0,0 +1,183 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import threading
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, patch
+
+import streamlit as st
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.runtime import Runtime
+from streamlit.runtime.app_session import AppSession
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME,
+)
+from streamlit.runtime.shared_fragment_scheduler import SharedFragmentScheduler
+from tests.testutil import create_mock_script_run_ctx
+
+
+def _create_session_ctx(session_id: str):
+    return dataclasses.replace(create_mock_script_run_ctx(), session_id=session_id)
+
+
+class SharedFragmentSchedulerTest(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.sessions: dict[str, MagicMock] = {}
+        self.fanned_out = asyncio.Event()
+        self.scheduler = SharedFragmentScheduler(
+            self.sessions.get, MagicMock(spec=MediaFileManager)
+        )
+        self.scheduler.start()
+        self.num_runs = 0
+
+    async def asyncTearDown(self) -> None:
+        self.scheduler.stop()
+
+    def add_session(self, session_id: str) -> MagicMock:
+        session = MagicMock(spec=AppSession)
+        session.renders_fragment.return_value = True
+        session.handle_shared_fragment_run.side_effect = (
+            lambda *args: self.fanned_out.set()
+        )
+        self.sessions[session_id] = session
+        return session
+
+    def run_fragment(self) -> None:
+        self.num_runs += 1
+        st.text(f"run {self.num_runs}")
+
+    async def wait_for_fan_out(self) -> None:
+        self.fanned_out.clear()
+        await asyncio.wait_for(self.fanned_out.wait(), timeout=5)
+
+    async def test_runs_fragment_once_for_all_sessions(self):
+        session1 = self.add_session("session1")
+        session2 = self.add_session("session2")
+
+        self.scheduler.subscribe(
+            "fragment", self.run_fragment, 0.01, _create_session_ctx("session1")
+        )
+        self.scheduler.subscribe(
+            "fragment", self.run_fragment, 0.01, _create_session_ctx("session2")
+        )
+        await self.wait_for_fan_out()
+
+        self.assertEqual(1, self.num_runs)
+        session1.handle_shared_fragment_run.assert_called_once()
+        [(fragment_id, msgs), _] = session1.handle_shared_fragment_run.call_args
+        self.assertEqual("fragment", fragment_id)
+        session2.handle_shared_fragment_run.assert_called_once_with("fragment", msgs)
+
+        # The messages are hashed once, before they're sent to the sessions.
+        [msg] = [ForwardMsg.FromString(msg) for msg in msgs]
+        self.assertEqual("run 1", msg.delta.new_element.text.body)
+        self.assertNotEqual("", msg.hash)
+
+    async def test_reruns_fragment_every_interval(self):
+        session = self.add_session("session")
+        self.scheduler.subscribe(
+            "fragment", self.run_fragment, 0.01, _create_session_ctx("session")
+        )
+
+        await self.wait_for_fan_out()
+        await self.wait_for_fan_out()
+
+        self.assertEqual(2, self.num_runs)
+        self.assertEqual(2, session.handle_shared_fragment_run.call_count)
+
+    async def test_runs_fragment_without_session_data(self):
+        """Shared runs don't have access to the subscribed sessions' data."""
+        self.add_session("session")
+        session_ctx = _create_session_ctx("session")
+        session_ctx.session_state["key"] = "value"
+        run_ctxs = []
+
+        def run_fragment():
+            run_ctxs.append(get_script_run_ctx())
+
+        self.scheduler.subscribe("fragment", run_fragment, 0.01, session_ctx)
+        await self.wait_for_fan_out()
+
+        [run_ctx] = run_ctxs
+        self.assertNotEqual("session", run_ctx.session_id)
+        self.assertNotIn("key", run_ctx.session_state)
+        self.assertEqual({}, run_ctx.user_info)
+        self.assertEqual("", run_ctx.query_string)
+        self.assertEqual(["fragment"], run_ctx.fragment_ids_this_run)
+
+    async def test_unsubscribes_sessions_that_dont_render_fragment(self):
+        session1 = self.add_session("session1")
+        session2 = self.add_session("session2")
+        session3 = self.add_session("session3")
+        session2.renders_fragment.return_value = False
+        del self.sessions["session3"]
+
+        for session_id in ["session1", "session2", "session3"]:
+            self.scheduler.subscribe(
+                "fragment", self.run_fragment, 0.01, _create_session_ctx(session_id)
+            )
+        await self.wait_for_fan_out()
+
+        session1.handle_shared_fragment_run.assert_called_once()
+        session2.handle_shared_fragment_run.assert_not_called()
+        session3.handle_shared_fragment_run.assert_not_called()
+
+    async def test_stops_running_fragment_without_sessions(self):
+        session = self.add_session("session")
+        self.scheduler.subscribe(
+            "fragment", self.run_fragment, 0.01, _create_session_ctx("session")
+        )
+        await self.wait_for_fan_out()
+
+        session.renders_fragment.return_value = False
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(1, self.num_runs)
+        self.assertEqual({}, self.scheduler._fragments)
+
+    async def test_sends_exception_of_failed_run(self):
+        session = self.add_session("session")
+        runtime = MagicMock(spec=Runtime)
+        runtime.shared_fragments = self.scheduler
+
+        @st.fragment(run_every=0.01, shared=True)
+        def failing_fragment():
+            ctx = get_script_run_ctx()
+            if ctx.session_id != "session":
+                raise RuntimeError("boom")
+
+        thread = threading.current_thread()
+        add_script_run_ctx(thread, _create_session_ctx("session"))
+        try:
+            with patch.object(Runtime, "_instance", runtime):
+                failing_fragment()
+                await self.wait_for_fan_out()
+        finally:
+            delattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME)
+
+        # The shared run renders the fragment's container and the exception
+        # at the fragment's position in the sessions' apps.
+        [(_, msgs), _] = session.handle_shared_fragment_run.call_args
+        block_msg, exception_msg = (ForwardMsg.FromString(msg) for msg in msgs)
+        self.assertTrue(block_msg.delta.HasField("add_block"))
+        self.assertEqual([0, 0], block_msg.metadata.delta_path)
+        self.assertEqual("boom", exception_msg.delta.new_element.exception.message)
+        self.assertEqual([0, 0, 0], exception_msg.metadata.delta_path)
+        self.assertNotEqual("", exception_msg.delta.fragment_id)
@@ -0,0 +1,111 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""ClientWidgetStates unit tests."""
+
+from __future__ import annotations
+
+import unittest
+
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.runtime.state import ClientWidgetStates
+
+
+def _client_state(
+    widgets: dict[str, int],
+    version: int = 0,
+    base_version: int = 0,
+    removed_widget_ids: list[str] | None = None,
+) -> ClientState:
+    client_state = ClientState(query_string="foo=bar", page_script_hash="hash")
+    widget_states = client_state.widget_states
+    for widget_id, value in widgets.items():
+        widget_states.widgets.add(id=widget_id, int_value=value)
+    widget_states.version = version
+    widget_states.base_version = base_version
+    widget_states.removed_widget_ids.extend(removed_widget_ids or [])
+    return client_state
+
+
+def _widget_values(client_state: ClientState) -> dict[str, int]:
+    return {w.id: w.int_value for w in client_state.widget_states.widgets}
+
+
+class ClientWidgetStatesTest(unittest.TestCase):
+    def test_full_states_are_returned_as_is(self):
+        client_widget_states = ClientWidgetStates()
+        client_state = _client_state({"a": 1, "b": 2}, version=1)
+
+        self.assertIs(client_state, client_widget_states.resolve(client_state))
+        self.assertEqual(1, client_widget_states.version)
+
+    def test_delta_is_applied(self):
+        client_widget_states = ClientWidgetStates()
+        client_widget_states.resolve(_client_state({"a": 1, "b": 2}, version=1))
+
+        resolved = client_widget_states.resolve(
+            _client_state({"b": 3, "c": 4}, version=2, base_version=1)
+        )
+
+        self.assertEqual({"a": 1, "b": 3, "c": 4}, _widget_values(resolved))
+        self.assertEqual(2, resolved.widget_states.version)
+        self.assertEqual(0, resolved.widget_states.base_version)
+        self.assertEqual("foo=bar", resolved.query_string)
+        self.assertEqual("hash", resolved.page_script_hash)
+        self.assertEqual(2, client_widget_states.version)
+
+    def test_removed_widgets(self):
+        client_widget_states = ClientWidgetStates()
+        client_widget_states.resolve(_client_state({"a": 1, "b": 2}, version=1))
+
+        resolved = client_widget_states.resolve(
+            _client_state({}, version=2, base_version=1, removed_widget_ids=["a"])
+        )
+
+        self.assertEqual({"b": 2}, _widget_values(resolved))
+        self.assertEqual([], list(resolved.widget_states.removed_widget_ids))
+
+    def test_full_states_replace_deltas(self):
+        """Full widget states, e.g. after a reconnect, replace all known states."""
+        client_widget_states = ClientWidgetStates()
+        client_widget_states.resolve(_client_state({"a": 1}, version=1))
+        client_widget_states.resolve(_client_state({"b": 2}, version=2, base_version=1))
+
+        client_widget_states.resolve(_client_state({"c": 3}, version=1))
+        resolved = client_widget_states.resolve(
+            _client_state({"d": 4}, version=2, base_version=1)
+        )
+
+        self.assertEqual({"c": 3, "d": 4}, _widget_values(resolved))
+
+    def test_version_mismatch_is_rejected(self):
+        """Deltas against other states than the latest known ones are dropped."""
+        client_widget_states = ClientWidgetStates()
+        client_widget_states.resolve(_client_state({"a": 1}, version=1))
+
+        with self.assertLogs(
+            "streamlit.runtime.state.client_widget_states", level="WARNING"
+        ):
+            resolved = client_widget_states.resolve(
+                _client_state({"b": 2}, version=5, base_version=4)
+            )
+
+        self.assertIsNone(resolved)
+        self.assertEqual(1, client_widget_states.version)
+
+        # The browser then sends its complete widget states.
+        resolved = client_widget_states.resolve(
+            _client_state({"a": 1, "b": 2}, version=1)
+        )
+        self.assertEqual({"a": 1, "b": 2}, _widget_values(resolved))
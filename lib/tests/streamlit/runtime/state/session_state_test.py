@@ -34,6 +34,7 @@ from streamlit.errors import (
 )
 from streamlit.proto.Common_pb2 import FileURLs as FileURLsProto
 from streamlit.proto.WidgetStates_pb2 import WidgetState as WidgetStateProto
+from streamlit.proto.WidgetStates_pb2 import WidgetStates as WidgetStatesProto
 from streamlit.runtime.scriptrunner import get_script_run_ctx
 from streamlit.runtime.state import SessionState, get_session_state
 from streamlit.runtime.state.common import GENERATED_ELEMENT_ID_PREFIX
@@ -692,6 +693,120 @@ class SessionStateMethodTests(unittest.TestCase):
         self.session_state._new_widget_state.set_from_value("foo", "bar")
         assert not self.session_state._widget_changed("foo")
 
+    def test_unchanged_serialized_widget_is_not_deserialized(self):
+        """A widget whose serialized value didn't change between runs reuses
+        its old value instead of being deserialized again."""
+        deserializer = MagicMock(side_effect=lambda x, s: ("value", x["a"]))
+        callback = MagicMock()
+        widget_id = f"{GENERATED_ELEMENT_ID_PREFIX}-json"
+        session_state = SessionState()
+        session_state._set_widget_metadata(
+            WidgetMetadata(
+                id=widget_id,
+                deserializer=deserializer,
+                serializer=identity,
+                value_type="json_value",
+                callback=callback,
+            )
+        )
+
+        def widget_states(json_value: str) -> WidgetStatesProto:
+            states = WidgetStatesProto()
+            states.widgets.add(id=widget_id, json_value=json_value)
+            return states
+
+        session_state.on_script_will_rerun(widget_states('{"a": 1}'))
+        old_value = session_state[widget_id]
+        assert deserializer.call_count == 1
+        assert callback.call_count == 1
+
+        session_state.on_script_will_rerun(widget_states('{"a": 1}'))
+        assert session_state[widget_id] is old_value
+        assert deserializer.call_count == 1
+        assert callback.call_count == 1
+
+        session_state.on_script_will_rerun(widget_states('{"a": 2}'))
+        assert session_state[widget_id] == ("value", 2)
+        assert deserializer.call_count == 2
+        assert callback.call_count == 2
+
+    def test_mutable_widget_value_is_not_reused(self):
+        """Mutable values may have been changed in place by the previous
+        script run, so they're deserialized again."""
+        widget_id = f"{GENERATED_ELEMENT_ID_PREFIX}-multiselect"
+        callback = MagicMock()
+        session_state = SessionState()
+        session_state._set_widget_metadata(
+            WidgetMetadata(
+                id=widget_id,
+                deserializer=lambda x, s: list(x) if x is not None else [],
+                serializer=identity,
+                value_type="int_array_value",
+                callback=callback,
+            )
+        )
+        states = WidgetStatesProto()
+        states.widgets.add(id=widget_id).int_array_value.data.extend([1, 2])
+
+        session_state.on_script_will_rerun(states)
+        old_value = session_state[widget_id]
+        old_value.append(3)
+        assert callback.call_count == 1
+
+        session_state.on_script_will_rerun(states)
+        assert session_state[widget_id] == [1, 2]
+        assert session_state[widget_id] is not old_value
+
+    def test_unchanged_widget_is_not_deserialized_to_detect_changes(self):
+        """Widgets whose serialized value is unchanged aren't deserialized
+        (or compared) to decide whether to call their callbacks."""
+        widget_id = f"{GENERATED_ELEMENT_ID_PREFIX}-data_editor"
+        callback = MagicMock()
+        deserializer = MagicMock(side_effect=lambda x, s: dict(x))
+        session_state = SessionState()
+        session_state._set_widget_metadata(
+            WidgetMetadata(
+                id=widget_id,
+                deserializer=deserializer,
+                serializer=identity,
+                value_type="json_value",
+                callback=callback,
+            )
+        )
+        states = WidgetStatesProto()
+        states.widgets.add(id=widget_id, json_value='{"edited_rows": {}}')
+
+        session_state.on_script_will_rerun(states)
+        assert callback.call_count == 1
+        session_state[widget_id]
+        deserializer.reset_mock()
+
+        session_state.on_script_will_rerun(states)
+        assert callback.call_count == 1
+        deserializer.assert_not_called()
+
+    def test_value_set_from_python_is_not_reused(self):
+        """Only values deserialized from a widget's proto are reused."""
+        widget_id = f"{GENERATED_ELEMENT_ID_PREFIX}-int"
+        session_state = SessionState()
+        session_state._set_widget_metadata(
+            WidgetMetadata(
+                id=widget_id,
+                deserializer=lambda x, s: x,
+                serializer=identity,
+                value_type="int_value",
+            )
+        )
+        states = WidgetStatesProto()
+        states.widgets.add(id=widget_id, int_value=1)
+
+        session_state.on_script_will_rerun(states)
+        assert session_state[widget_id] == 1
+        session_state._new_widget_state.set_from_value(widget_id, 2)
+
+        session_state.on_script_will_rerun(states)
+        assert session_state[widget_id] == 1
+
     def test_remove_stale_widgets(self):
         existing_widget_key = f"{GENERATED_ELEMENT_ID_PREFIX}-existing_widget"
         generated_widget_key = f"{GENERATED_ELEMENT_ID_PREFIX}-removed_widget"
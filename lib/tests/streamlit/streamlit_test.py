@@ -26,7 +26,10 @@ import unittest
 import matplotlib
 
 import streamlit as st
+import streamlit.components.v1
+import streamlit.connections
 from streamlit import __version__
+from streamlit.runtime.connection_factory import connection_factory
 from tests.streamlit.element_mocks import (
     CONTAINER_ELEMENTS,
     NON_WIDGET_ELEMENTS,
@@ -79,6 +82,51 @@ ELEMENT_COMMANDS: set[str] = {
 }
 
 
+# The maximum number of modules that `import streamlit` may import, including
+# the standard library. Import time is too noisy to test on CI machines, but
+# it's dominated by the number of imported modules, which is deterministic.
+# There's some headroom, as the standard library differs between Python versions.
+IMPORTED_MODULES_BUDGET = 600
+
+# Optional or heavy dependencies that `import streamlit` must not import. These
+# are imported by the commands that need them, when they're first called.
+LAZILY_IMPORTED_MODULES = [
+    "altair",
+    "graphviz",
+    "matplotlib",
+    "numpy",
+    "pandas",
+    "PIL",
+    "plotly",
+    "pyarrow",
+    "pydeck",
+    "sqlalchemy",
+    "streamlit.components.v1",
+    "streamlit.connections",
+    "tornado",
+]
+
+
+def get_import_times() -> dict[str, float]:
+    """Import Streamlit in a new process, and return the cumulative import time
+    of each imported module, in seconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import streamlit"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        # Lines look like: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        import_times[module.strip()] = int(cumulative) / 1e6
+    return import_times
+
+
 class StreamlitTest(unittest.TestCase):
     """Test Streamlit.__init__.py."""
 
@@ -121,8 +169,8 @@ class StreamlitTest(unittest.TestCase):
         """
         api = {
             k
-            for k, v in st.__dict__.items()
-            if not k.startswith("_") and not isinstance(v, type(st))
+            for k in dir(st)
+            if not k.startswith("_") and not isinstance(getattr(st, k), type(st))
         }
 
         mocked_elements = {
@@ -142,11 +190,34 @@ class StreamlitTest(unittest.TestCase):
         """
         api = {
             k
-            for k, v in st.__dict__.items()
-            if not k.startswith("_") and not isinstance(v, type(st))
+            for k in dir(st)
+            if not k.startswith("_") and not isinstance(getattr(st, k), type(st))
         }
         self.assertEqual(api, ELEMENT_COMMANDS.union(NON_ELEMENT_COMMANDS))
 
+    def test_lazy_attributes(self):
+        """Test that lazily loaded attributes can be used like any other."""
+        self.assertIn("connection", dir(st))
+        self.assertIs(st.connection, connection_factory)
+        self.assertIs(st.connections, streamlit.connections)
+        self.assertIs(st.components.v1.html, streamlit.components.v1.html)
+
+        with self.assertRaises(AttributeError):
+            st.not_a_command  # noqa: B018
+
+    def test_import_does_not_load_heavy_modules(self):
+        """Test that `import streamlit` doesn't import modules that are only
+        needed by some commands.
+        """
+        import_times = get_import_times()
+        for module in LAZILY_IMPORTED_MODULES:
+            self.assertNotIn(module, import_times)
+
+    def test_import_budget(self):
+        """Test that `import streamlit` stays within its import budget."""
+        import_times = get_import_times()
+        self.assertLessEqual(len(import_times), IMPORTED_MODULES_BUDGET)
+
     def test_pydoc(self):
         """Test that we can run pydoc on the streamlit package"""
         cwd = os.getcwd()
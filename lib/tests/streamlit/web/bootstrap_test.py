@@ -18,7 +18,7 @@ import os.path
 import sys
 from io import StringIO
 from unittest import IsolatedAsyncioTestCase
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from streamlit import config
 from streamlit.web import bootstrap
@@ -406,3 +406,31 @@ class BootstrapPrintTest(IsolatedAsyncioTestCase):
                 "server.port": 8502,
             },
         )
+
+    async def test_maybe_warm_up_disabled(self):
+        mock_server = AsyncMock()
+
+        with patch_config_options({"server.warmup": False}):
+            await bootstrap._maybe_warm_up(mock_server)
+
+        mock_server.warm_up.assert_not_called()
+
+    async def test_maybe_warm_up_without_script(self):
+        mock_server = AsyncMock()
+
+        with patch_config_options({"server.warmup": True, "server.warmupScript": None}):
+            await bootstrap._maybe_warm_up(mock_server)
+
+        mock_server.warm_up.assert_awaited_once_with(None)
+
+    async def test_maybe_warm_up_with_script(self):
+        mock_server = AsyncMock()
+
+        with patch_config_options(
+            {"server.warmup": True, "server.warmupScript": "warmup/script.py"}
+        ):
+            await bootstrap._maybe_warm_up(mock_server)
+
+        mock_server.warm_up.assert_awaited_once_with(
+            os.path.abspath("warmup/script.py")
+        )
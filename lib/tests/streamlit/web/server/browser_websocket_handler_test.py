@@ -24,6 +24,7 @@ import tornado.websocket
 from streamlit.proto.BackMsg_pb2 import BackMsg
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import Runtime, SessionClientDisconnectedError
+from streamlit.web.server.browser_websocket_handler import _parse_backmsg
 from streamlit.web.server.server import BrowserWebSocketHandler
 from tests.streamlit.web.server.server_test_case import ServerTestCase
 from tests.testutil import patch_config_options
@@ -189,3 +190,92 @@ class BrowserWebSocketHandlerTest(ServerTestCase):
                 )
 
                 patched_stop_runtime.assert_called_once()
+
+    @tornado.testing.gen_test
+    async def test_app_heartbeat_is_handled_as_keepalive(self):
+        """App heartbeats keep the connection alive, and aren't passed to the
+        runtime.
+        """
+        with self._patch_app_session():
+            await self.server.start()
+            await self.ws_connect()
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+            self.assertEqual(1, self.server._keepalive.num_connections)
+
+            mock_runtime = MagicMock(spec=Runtime)
+            websocket_handler._runtime = mock_runtime
+            with patch.object(
+                self.server._keepalive, "on_received"
+            ) as patched_on_received:
+                websocket_handler.on_message(
+                    BackMsg(app_heartbeat=True).SerializeToString()
+                )
+
+                patched_on_received.assert_called_once_with(websocket_handler)
+            mock_runtime.handle_backmsg.assert_not_called()
+
+    @tornado.testing.gen_test
+    async def test_coalesces_rerun_requests(self):
+        """Rerun requests received in quick succession reach the runtime as a
+        single request, which is passed on before any other message.
+        """
+        with self._patch_app_session():
+            await self.server.start()
+            await self.ws_connect()
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+
+            mock_runtime = MagicMock(spec=Runtime)
+            websocket_handler._runtime = mock_runtime
+
+            for query_string in ["a", "b", "c"]:
+                msg = BackMsg()
+                msg.rerun_script.query_string = query_string
+                websocket_handler.on_message(msg.SerializeToString())
+            websocket_handler.on_message(BackMsg(stop_script=True).SerializeToString())
+
+            self.assertEqual(
+                ["rerun_script", "rerun_script", "stop_script"],
+                [
+                    call.args[1].WhichOneof("type")
+                    for call in mock_runtime.handle_backmsg.call_args_list
+                ],
+            )
+            self.assertEqual(
+                ["a", "c"],
+                [
+                    call.args[1].rerun_script.query_string
+                    for call in mock_runtime.handle_backmsg.call_args_list[:2]
+                ],
+            )
+
+    @tornado.testing.gen_test
+    async def test_parses_large_messages_off_the_event_loop(self):
+        with self._patch_app_session():
+            await self.server.start()
+            await self.ws_connect()
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+
+            mock_runtime = MagicMock(spec=Runtime)
+            websocket_handler._runtime = mock_runtime
+
+            msg = BackMsg()
+            msg.rerun_script.query_string = "x" * 2_000_000
+            with patch(
+                "streamlit.web.server.browser_websocket_handler._parse_backmsg",
+                wraps=_parse_backmsg,
+            ) as patched_parse:
+                result = websocket_handler.on_message(msg.SerializeToString())
+                self.assertIsNotNone(result)
+                mock_runtime.handle_backmsg.assert_not_called()
+
+                await result
+                patched_parse.assert_called_once()
+
+            mock_runtime.handle_backmsg.assert_called_once()
+            self.assertEqual(msg, mock_runtime.handle_backmsg.call_args.args[1])
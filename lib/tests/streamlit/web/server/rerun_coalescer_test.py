@@ -0,0 +1,182 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.web.server.rerun_coalescer import RerunCoalescer, coalesce_client_states
+
+
+def _client_state(
+    values: dict[str, int] | None = None,
+    triggers: list[str] | None = None,
+    version: int = 0,
+    base_version: int = 0,
+    removed: list[str] | None = None,
+) -> ClientState:
+    client_state = ClientState()
+    widget_states = client_state.widget_states
+    for widget_id, value in (values or {}).items():
+        widget_states.widgets.add(id=widget_id, int_value=value)
+    for widget_id in triggers or []:
+        widget_states.widgets.add(id=widget_id, trigger_value=True)
+    widget_states.version = version
+    widget_states.base_version = base_version
+    widget_states.removed_widget_ids.extend(removed or [])
+    return client_state
+
+
+def _values(client_state: ClientState) -> dict[str, object]:
+    return {
+        state.id: getattr(state, state.WhichOneof("value"))
+        for state in client_state.widget_states.widgets
+    }
+
+
+def _rerun_msg(value: int, fragment_id: str = "") -> BackMsg:
+    msg = BackMsg()
+    msg.rerun_script.CopyFrom(_client_state({"slider": value}))
+    msg.rerun_script.fragment_id = fragment_id
+    return msg
+
+
+class CoalesceClientStatesTest(unittest.TestCase):
+    def test_full_states(self):
+        """The newer full states win, but older button triggers are kept."""
+        old = _client_state({"slider": 1, "text": 2}, triggers=["button"])
+        new = _client_state({"slider": 3})
+        new.page_script_hash = "page"
+
+        result = coalesce_client_states(old, new)
+
+        self.assertEqual({"slider": 3, "button": True}, _values(result))
+        self.assertEqual("page", result.page_script_hash)
+        self.assertEqual(0, result.widget_states.base_version)
+
+    def test_full_states_then_delta(self):
+        old = _client_state({"slider": 1, "text": 2}, version=1)
+        new = _client_state({"slider": 3}, version=2, base_version=1, removed=["text"])
+
+        result = coalesce_client_states(old, new)
+
+        self.assertEqual({"slider": 3}, _values(result))
+        self.assertEqual(2, result.widget_states.version)
+        self.assertEqual(0, result.widget_states.base_version)
+        self.assertEqual([], list(result.widget_states.removed_widget_ids))
+
+    def test_deltas(self):
+        """Two deltas merge into a delta against the older one's base."""
+        old = _client_state(
+            {"slider": 1}, triggers=["button"], version=2, base_version=1
+        )
+        new = _client_state(
+            {"text": 3},
+            version=3,
+            base_version=2,
+            removed=["slider", "button", "checkbox"],
+        )
+
+        result = coalesce_client_states(old, new)
+
+        self.assertEqual({"text": 3, "button": True}, _values(result))
+        self.assertEqual(3, result.widget_states.version)
+        self.assertEqual(1, result.widget_states.base_version)
+        self.assertEqual(
+            ["slider", "checkbox"], list(result.widget_states.removed_widget_ids)
+        )
+
+    def test_keeps_request_to_resend_elements(self):
+        old = _client_state({"slider": 1})
+        old.resend_elements = True
+
+        result = coalesce_client_states(old, _client_state({"slider": 2}))
+
+        self.assertTrue(result.resend_elements)
+
+
+class RerunCoalescerTest(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.forwarded: list[BackMsg] = []
+        self.coalescer = RerunCoalescer(
+            0.05, self.forwarded.append, timer=lambda: self.now
+        )
+
+    def _forwarded_values(self) -> list[dict[str, object]]:
+        return [_values(msg.rerun_script) for msg in self.forwarded]
+
+    async def test_forwards_first_rerun_immediately(self):
+        self.coalescer.on_rerun(_rerun_msg(1))
+        self.assertEqual([{"slider": 1}], self._forwarded_values())
+
+        self.now = 1
+        self.coalescer.on_rerun(_rerun_msg(2))
+        self.assertEqual([{"slider": 1}, {"slider": 2}], self._forwarded_values())
+
+    async def test_coalesces_reruns_within_window(self):
+        self.coalescer.on_rerun(_rerun_msg(1))
+        self.now = 0.01
+        self.coalescer.on_rerun(_rerun_msg(2))
+        self.coalescer.on_rerun(_rerun_msg(3))
+        self.assertTrue(self.coalescer.has_pending_rerun)
+        self.assertEqual([{"slider": 1}], self._forwarded_values())
+
+        await asyncio.sleep(0.1)
+
+        self.assertFalse(self.coalescer.has_pending_rerun)
+        self.assertEqual([{"slider": 1}, {"slider": 3}], self._forwarded_values())
+
+    async def test_flush(self):
+        self.coalescer.on_rerun(_rerun_msg(1))
+        self.coalescer.on_rerun(_rerun_msg(2))
+
+        self.coalescer.flush()
+
+        self.assertEqual([{"slider": 1}, {"slider": 2}], self._forwarded_values())
+        # The flushed rerun started a new window.
+        self.coalescer.on_rerun(_rerun_msg(3))
+        self.assertEqual(2, len(self.forwarded))
+        self.coalescer.close()
+
+    async def test_does_not_merge_different_fragments(self):
+        self.coalescer.on_rerun(_rerun_msg(1))
+        self.coalescer.on_rerun(_rerun_msg(2))
+        self.coalescer.on_rerun(_rerun_msg(3, fragment_id="fragment"))
+
+        self.assertEqual(
+            ["", ""], [msg.rerun_script.fragment_id for msg in self.forwarded]
+        )
+        self.assertTrue(self.coalescer.has_pending_rerun)
+        self.coalescer.close()
+
+    async def test_close_drops_pending_rerun(self):
+        self.coalescer.on_rerun(_rerun_msg(1))
+        self.coalescer.on_rerun(_rerun_msg(2))
+
+        self.coalescer.close()
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(1, len(self.forwarded))
+
+    async def test_zero_window(self):
+        coalescer = RerunCoalescer(0, self.forwarded.append, timer=lambda: self.now)
+        for value in range(3):
+            coalescer.on_rerun(_rerun_msg(value))
+
+        self.assertEqual(3, len(self.forwarded))
@@ -18,23 +18,26 @@ import json
 import mimetypes
 import os
 import tempfile
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import tornado.httpserver
 import tornado.testing
 import tornado.web
 import tornado.websocket
 
+from streamlit.runtime.command_profiler import CommandProfiler
 from streamlit.runtime.forward_msg_cache import ForwardMsgCache, populate_hash_if_needed
 from streamlit.runtime.runtime_util import serialize_forward_msg
 from streamlit.web.server import Server
 from streamlit.web.server.routes import _DEFAULT_ALLOWED_MESSAGE_ORIGINS
 from streamlit.web.server.server import (
+    COMMAND_PROFILE_ENDPOINT,
     HEALTH_ENDPOINT,
     HOST_CONFIG_ENDPOINT,
     MESSAGE_ENDPOINT,
     NEW_HEALTH_ENDPOINT,
     AddSlashHandler,
+    CommandProfileHandler,
     HealthHandler,
     HostConfigHandler,
     MessageCacheHandler,
@@ -128,6 +131,63 @@ class MessageCacheHandlerTest(tornado.testing.AsyncHTTPTestCase):
         self.assertEqual(404, self.fetch("/_stcore/message?id=non_existent").code)
 
 
+class CommandProfileHandlerTest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        self._profiler: CommandProfiler | None = CommandProfiler()
+        return tornado.web.Application(
+            [
+                (
+                    rf"/{COMMAND_PROFILE_ENDPOINT}",
+                    CommandProfileHandler,
+                    dict(get_profiler=lambda: self._profiler),
+                )
+            ]
+        )
+
+    def _profile_command(self):
+        assert self._profiler is not None
+        with patch(
+            "streamlit.runtime.command_profiler.timer", side_effect=[0, 1, 3, 4]
+        ):
+            self._profiler.push("dataframe")
+            self._profiler.push("arrow_conversion")
+            self._profiler.pop()
+            self._profiler.pop()
+
+    def test_json(self):
+        self._profile_command()
+
+        response = self.fetch("/_stcore/command-profile")
+        self.assertEqual(200, response.code)
+
+        profile = json.loads(response.body)
+        self.assertEqual(
+            ["dataframe", "arrow_conversion"],
+            [command["stack"][0] for command in profile["commands"]],
+        )
+        self.assertEqual(
+            [["dataframe"], ["dataframe", "arrow_conversion"]],
+            [stack["stack"][1:] for stack in profile["stacks"]],
+        )
+
+    def test_folded(self):
+        self._profile_command()
+
+        response = self.fetch("/_stcore/command-profile?format=folded")
+        self.assertEqual(200, response.code)
+        self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+
+        stacks = [
+            line.rsplit(" ", 1)[0].split(";")[1:]
+            for line in response.body.decode().splitlines()
+        ]
+        self.assertEqual([["dataframe"], ["dataframe", "arrow_conversion"]], stacks)
+
+    def test_disabled(self):
+        self._profiler = None
+        self.assertEqual(404, self.fetch("/_stcore/command-profile").code)
+
+
 class StaticFileHandlerTest(tornado.testing.AsyncHTTPTestCase):
     def setUp(self) -> None:
         self._tmpdir = tempfile.TemporaryDirectory()
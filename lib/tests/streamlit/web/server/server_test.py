@@ -30,6 +30,7 @@ from unittest.mock import patch
 
 import pytest
 import tornado.httpserver
+import tornado.netutil
 import tornado.testing
 import tornado.web
 import tornado.websocket
@@ -40,12 +41,16 @@ from streamlit import config
 from streamlit.logger import get_logger
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import Runtime, RuntimeState
+from streamlit.runtime.caching.storage.sqlite_cache_storage import (
+    SQLiteCacheStorageManager,
+)
 from streamlit.web.server.server import (
     MAX_PORT_SEARCH_RETRIES,
     RetriesExceeded,
     Server,
     start_listening,
 )
+from streamlit.web.server.workers import Worker, WorkerRouting
 from tests.streamlit.message_mocks import create_dataframe_msg
 from tests.streamlit.web.server.server_test_case import ServerTestCase
 from tests.testutil import patch_config_options
@@ -93,6 +98,20 @@ class ServerTest(ServerTestCase):
             await asyncio.sleep(0.1)
             self.assertEqual(RuntimeState.STOPPED, self.server._runtime._state)
 
+    @tornado.testing.gen_test
+    async def test_stop_closes_session_hibernator(self):
+        """Hibernated sessions are removed from disk once the server stopped."""
+        hibernator = mock.MagicMock()
+        self.server._session_hibernator = hibernator
+        with self._patch_app_session():
+            await self.server.start()
+
+            self.server.stop()
+            await self.server.stopped
+            await asyncio.sleep(0)
+
+            hibernator.close.assert_called_once()
+
     @tornado.testing.gen_test
     async def test_websocket_connect(self):
         """Test that we can connect to the server via websocket."""
@@ -495,6 +514,134 @@ class UnixSocketTest(unittest.TestCase):
             mock_server.add_socket.assert_called_with(some_socket)
 
 
+class WorkerModeTest(tornado.testing.AsyncHTTPTestCase):
+    """Tests a Server running as worker 0 of 2."""
+
+    def setUp(self):
+        self._shared_dir = tempfile.TemporaryDirectory()
+        super().setUp()
+
+    def tearDown(self):
+        Runtime._instance = None
+        super().tearDown()
+        self._shared_dir.cleanup()
+
+    def get_app(self):
+        # Nothing listens on port 1, so requests forwarded to worker 1 fail.
+        self.server = Server(
+            "mock/script/path",
+            is_hello=False,
+            worker=Worker(
+                routing=WorkerRouting(index=0, ports=(self.get_http_port(), 1)),
+                public_sockets=[],
+                private_sockets=[],
+                shared_dir=self._shared_dir.name,
+            ),
+        )
+        return self.server._create_app()
+
+    def test_cache_data_is_shared(self):
+        self.assertIsInstance(
+            self.server._runtime.cache_storage_manager, SQLiteCacheStorageManager
+        )
+
+    def test_media_urls_contain_worker_index(self):
+        url = self.server._runtime.media_file_mgr.add(b"abc", "text/plain", "coord")
+
+        self.assertTrue(url.startswith("/media/w0/"))
+        self.assertEqual(200, self.fetch(url).code)
+
+    def test_media_requests_are_forwarded_to_owner(self):
+        self.assertEqual(502, self.fetch("/media/w1/abc.txt").code)
+
+    def test_is_primary_worker(self):
+        self.assertTrue(self.server.is_primary_worker)
+
+
+@unittest.skipIf("win32" in sys.platform, "Windows does not natively have openssl")
+class WorkerModeSSLTest(tornado.testing.AsyncHTTPTestCase):
+    """Tests forwarding requests to another worker with SSL enabled."""
+
+    class MediaHandler(tornado.web.RequestHandler):
+        def get(self, path: str) -> None:
+            self.write(f"worker 1: {path}")
+
+    def setUp(self):
+        self._exit_stack = contextlib.ExitStack()
+        tmp_dir = self._exit_stack.enter_context(tempfile.TemporaryDirectory())
+        cert_file = Path(tmp_dir) / "cert.cert"
+        key_file = Path(tmp_dir) / "key.key"
+        subprocess.check_call(
+            [
+                "openssl",
+                "req",
+                "-x509",
+                "-newkey",
+                "rsa:2048",
+                "-keyout",
+                str(key_file),
+                "-out",
+                str(cert_file),
+                "-days",
+                "1",
+                "-nodes",
+                "-subj",
+                "/CN=localhost",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self._exit_stack.enter_context(
+            patch_config_options(
+                {"server.sslCertFile": cert_file, "server.sslKeyFile": key_file}
+            )
+        )
+        self._shared_dir = self._exit_stack.enter_context(tempfile.TemporaryDirectory())
+        super().setUp()
+
+    def tearDown(self):
+        Runtime._instance = None
+        super().tearDown()
+        self._exit_stack.close()
+
+    def get_app(self):
+        # Worker 1 is served like a worker's Server: on its public (SSL) socket
+        # and its private loopback socket.
+        [self.public_socket] = tornado.netutil.bind_sockets(0, "127.0.0.1")
+        [private_socket] = tornado.netutil.bind_sockets(0, "127.0.0.1")
+        worker_1_app = tornado.web.Application([(r"/media/w1/(.*)", self.MediaHandler)])
+        start_listening(worker_1_app, [self.public_socket], [private_socket])
+
+        self.server = Server(
+            "mock/script/path",
+            is_hello=False,
+            worker=Worker(
+                routing=WorkerRouting(
+                    index=0,
+                    ports=(self.get_http_port(), private_socket.getsockname()[1]),
+                ),
+                public_sockets=[],
+                private_sockets=[],
+                shared_dir=self._shared_dir,
+            ),
+        )
+        return self.server._create_app()
+
+    def test_requests_are_forwarded_without_ssl(self):
+        response = self.fetch("/media/w1/abc.txt")
+
+        self.assertEqual(200, response.code)
+        self.assertEqual(b"worker 1: abc.txt", response.body)
+
+    def test_public_sockets_use_ssl(self):
+        port = self.public_socket.getsockname()[1]
+        response = self.fetch(
+            f"https://127.0.0.1:{port}/media/w1/abc.txt", validate_cert=False
+        )
+
+        self.assertEqual(200, response.code)
+
+
 class ScriptCheckEndpointExistsTest(tornado.testing.AsyncHTTPTestCase):
     async def does_script_run_without_error(self):
         return True, "test_message"
@@ -22,9 +22,168 @@ from google.protobuf.json_format import MessageToDict
 from tornado.httputil import HTTPHeaders
 
 from streamlit.proto.openmetrics_data_model_pb2 import MetricSet as MetricSetProto
+from streamlit.runtime.runtime_metrics import RuntimeMetrics
 from streamlit.runtime.stats import CacheStat
 from streamlit.web.server.server import METRIC_ENDPOINT
 from streamlit.web.server.stats_request_handler import StatsRequestHandler
+from streamlit.web.server.websocket_keepalive import WebSocketKeepalive
+
+
+class LivenessStatsHandlerTest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        mock_stats_manager = MagicMock()
+        mock_stats_manager.get_stats = MagicMock(return_value=[])
+        self.now = 1000.0
+        self.keepalive = WebSocketKeepalive(
+            ping_interval_seconds=10,
+            ping_timeout_seconds=30,
+            timer=lambda: self.now,
+        )
+        return tornado.web.Application(
+            [
+                (
+                    rf"/{METRIC_ENDPOINT}",
+                    StatsRequestHandler,
+                    dict(stats_manager=mock_stats_manager, keepalive=self.keepalive),
+                )
+            ]
+        )
+
+    def ping_connections(self, *handlers: MagicMock) -> None:
+        for handler in handlers:
+            self.keepalive.register(handler)
+        self.now += 10
+        self.keepalive.check_connections()
+        self.now += 0.02
+        self.keepalive.on_pong(handlers[0])
+
+    def test_liveness_stats(self):
+        self.ping_connections(MagicMock(), MagicMock())
+
+        response = self.fetch("/_stcore/metrics")
+        self.assertEqual(200, response.code)
+
+        lines = response.body.decode().split("\n")
+        self.assertEqual("# EOF", lines[-2])
+        self.assertIn("# TYPE websocket_ping_rtt_seconds histogram", lines)
+        self.assertIn('websocket_ping_rtt_seconds_bucket{le="0.01"} 0', lines)
+        self.assertIn('websocket_ping_rtt_seconds_bucket{le="0.025"} 1', lines)
+        self.assertIn("websocket_ping_rtt_seconds_count 1", lines)
+        self.assertIn("# TYPE websocket_pings_sent counter", lines)
+        self.assertIn("websocket_pings_sent_total 2", lines)
+        self.assertIn("websocket_pongs_received_total 1", lines)
+        self.assertIn("websocket_ping_timeouts_total 0", lines)
+        # Connections (and the sessions they belong to) aren't labeled.
+        self.assertNotIn("connection=", response.body.decode())
+
+    def test_protobuf_liveness_stats(self):
+        self.ping_connections(MagicMock())
+
+        response = self.fetch(
+            "/_stcore/metrics", headers={"Accept": "application/x-protobuf"}
+        )
+        self.assertEqual(200, response.code)
+
+        metric_set = MetricSetProto()
+        metric_set.ParseFromString(response.body)
+
+        families = {family.name: family for family in metric_set.metric_families}
+        self.assertEqual(
+            [
+                "cache_memory_bytes",
+                "websocket_ping_rtt_seconds",
+                "websocket_pings_sent",
+                "websocket_pongs_received",
+                "websocket_ping_timeouts",
+            ],
+            list(families),
+        )
+        self.assertEqual(
+            {"metricPoints": [{"counterValue": {"intValue": "1"}}]},
+            MessageToDict(families["websocket_pings_sent"].metrics[0]),
+        )
+
+
+class RuntimeMetricsHandlerTest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        mock_stats_manager = MagicMock()
+        mock_stats_manager.get_stats = MagicMock(return_value=[])
+        self.runtime_metrics = RuntimeMetrics()
+        return tornado.web.Application(
+            [
+                (
+                    rf"/{METRIC_ENDPOINT}",
+                    StatsRequestHandler,
+                    dict(
+                        stats_manager=mock_stats_manager,
+                        runtime_metrics=self.runtime_metrics,
+                    ),
+                )
+            ]
+        )
+
+    def test_runtime_metrics(self):
+        self.runtime_metrics.script_exec.observe(0.2)
+        self.runtime_metrics.script_exec.observe(100)
+        self.runtime_metrics.forward_msg_cache_hits.inc(3)
+
+        response = self.fetch("/_stcore/metrics")
+        self.assertEqual(200, response.code)
+
+        lines = response.body.decode().split("\n")
+        self.assertEqual("# EOF", lines[-2])
+        self.assertEqual("", lines[-1])
+        self.assertIn("# TYPE script_exec_seconds histogram", lines)
+        self.assertIn("# UNIT script_exec_seconds seconds", lines)
+        self.assertIn('script_exec_seconds_bucket{le="0.1"} 0', lines)
+        self.assertIn('script_exec_seconds_bucket{le="0.25"} 1', lines)
+        self.assertIn('script_exec_seconds_bucket{le="60"} 1', lines)
+        self.assertIn('script_exec_seconds_bucket{le="+Inf"} 2', lines)
+        self.assertIn("script_exec_seconds_sum 100.2", lines)
+        self.assertIn("script_exec_seconds_count 2", lines)
+        self.assertIn("# TYPE forward_msg_cache_hits counter", lines)
+        self.assertIn("forward_msg_cache_hits_total 3", lines)
+        self.assertIn("forward_msg_cache_misses_total 0", lines)
+
+    def test_protobuf_runtime_metrics(self):
+        self.runtime_metrics.session_flush_bytes.observe(1000)
+
+        response = self.fetch(
+            "/_stcore/metrics", headers={"Accept": "application/x-protobuf"}
+        )
+        self.assertEqual(200, response.code)
+
+        metric_set = MetricSetProto()
+        metric_set.ParseFromString(response.body)
+
+        families = {family.name: family for family in metric_set.metric_families}
+        self.assertEqual(
+            [
+                "cache_memory_bytes",
+                "event_loop_lag_seconds",
+                "script_queue_wait_seconds",
+                "script_exec_seconds",
+                "rerun_first_delta_seconds",
+                "session_flush_bytes",
+                "backmsg_handling_seconds",
+                "forward_msg_cache_hits",
+                "forward_msg_cache_misses",
+                "coalesced_reruns",
+            ],
+            list(families),
+        )
+
+        histogram = families["session_flush_bytes"].metrics[0].metric_points[0]
+        self.assertEqual(1000, histogram.histogram_value.double_value)
+        self.assertEqual(1, histogram.histogram_value.count)
+        self.assertEqual(
+            [0, 1, 1],
+            [b.count for b in histogram.histogram_value.buckets[:3]],
+        )
+        self.assertEqual(
+            {"metricPoints": [{"counterValue": {"intValue": "0"}}]},
+            MessageToDict(families["forward_msg_cache_hits"].metrics[0]),
+        )
 
 
 class StatsHandlerTest(tornado.testing.AsyncHTTPTestCase):
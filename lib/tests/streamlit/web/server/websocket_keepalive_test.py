@@ -0,0 +1,125 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""WebSocketKeepalive unit tests."""
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock
+
+import tornado.websocket
+
+from streamlit.web.server.websocket_keepalive import WebSocketKeepalive
+
+
+class WebSocketKeepaliveTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 1000.0
+        self.keepalive = WebSocketKeepalive(
+            ping_interval_seconds=10,
+            ping_timeout_seconds=30,
+            timer=lambda: self.now,
+        )
+        self.handler = MagicMock()
+        self.keepalive.register(self.handler)
+
+    def test_idle_connections_are_pinged(self):
+        self.now += 9
+        self.keepalive.check_connections()
+        self.handler.ping.assert_not_called()
+
+        self.now += 1
+        self.keepalive.check_connections()
+        self.handler.ping.assert_called_once()
+
+        # Only one ping is pending at a time.
+        self.now += 10
+        self.keepalive.check_connections()
+        self.handler.ping.assert_called_once()
+
+    def test_busy_connections_are_not_pinged(self):
+        for _ in range(10):
+            self.now += 5
+            self.keepalive.on_received(self.handler)
+            self.keepalive.check_connections()
+
+        self.handler.ping.assert_not_called()
+
+    def test_unresponsive_connections_are_closed(self):
+        self.now += 10
+        self.keepalive.check_connections()
+
+        self.now += 29
+        self.keepalive.check_connections()
+        self.handler.close.assert_not_called()
+
+        self.now += 1
+        self.keepalive.check_connections()
+        self.handler.close.assert_called_once()
+        self.assertEqual(0, self.keepalive.num_connections)
+
+    def test_any_message_answers_a_ping(self):
+        self.now += 10
+        self.keepalive.check_connections()
+
+        self.now += 20
+        self.keepalive.on_received(self.handler)
+
+        self.now += 20
+        self.keepalive.check_connections()
+        self.handler.close.assert_not_called()
+
+    def test_closed_connections_are_unregistered(self):
+        self.handler.ping.side_effect = tornado.websocket.WebSocketClosedError
+        self.now += 10
+        self.keepalive.check_connections()
+
+        self.assertEqual(0, self.keepalive.num_connections)
+        self.handler.close.assert_not_called()
+
+    def test_metrics(self):
+        self.now += 10
+        self.keepalive.check_connections()
+        self.now += 0.25
+        self.keepalive.on_pong(self.handler)
+
+        # Connections registered without metrics aren't counted.
+        other_handler = MagicMock()
+        self.keepalive.register(other_handler, report_metrics=False)
+        self.now += 10
+        self.keepalive.check_connections()
+        self.now += 30
+        self.keepalive.check_connections()
+
+        self.assertEqual(1, self.keepalive.ping_rtt.count)
+        self.assertEqual(0.25, self.keepalive.ping_rtt.sum)
+        self.assertEqual(2, self.keepalive.pings_sent.value)
+        self.assertEqual(1, self.keepalive.pongs_received.value)
+        self.assertEqual(1, self.keepalive.ping_timeouts.value)
+        other_handler.close.assert_called_once()
+
+    def test_unregister(self):
+        self.keepalive.unregister(self.handler)
+        self.keepalive.unregister(self.handler)
+
+        self.now += 10
+        self.keepalive.check_connections()
+        self.handler.ping.assert_not_called()
+        self.assertEqual(0, self.keepalive.pings_sent.value)
+
+    def test_start_does_nothing_without_ping_interval(self):
+        keepalive = WebSocketKeepalive(ping_interval_seconds=0, ping_timeout_seconds=30)
+        keepalive.start()
+        self.assertIsNone(keepalive._periodic_check)
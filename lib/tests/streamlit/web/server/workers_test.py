@@ -0,0 +1,129 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import unittest
+
+import tornado.testing
+import tornado.web
+from tornado.httputil import HTTPHeaders, HTTPServerRequest
+
+from streamlit.web.server.workers import (
+    WORKER_FORWARDED_HEADER,
+    OwnedByOtherWorker,
+    PublicRequestDelegate,
+    WorkerRouting,
+    is_forwarded_request,
+)
+
+
+def _request(path: str, headers: dict[str, str] | None = None) -> HTTPServerRequest:
+    return HTTPServerRequest(uri=path, headers=HTTPHeaders(headers or {}))
+
+
+class WorkerRoutingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.routing = WorkerRouting(index=1, ports=(8001, 8002, 8003))
+
+    def test_other_worker_indices(self):
+        self.assertEqual(3, self.routing.num_workers)
+        self.assertEqual([0, 2], self.routing.other_worker_indices)
+
+    def test_new_session_id(self):
+        session_id = self.routing.new_session_id()
+
+        self.assertTrue(session_id.startswith("w1-"))
+        self.assertEqual(1, self.routing.get_session_owner(session_id))
+        self.assertNotEqual(session_id, self.routing.new_session_id())
+
+    def test_get_session_owner(self):
+        self.assertEqual(2, self.routing.get_session_owner("w2-abc"))
+        # Not created by a worker
+        self.assertIsNone(self.routing.get_session_owner("abc"))
+        self.assertIsNone(self.routing.get_session_owner(""))
+        self.assertIsNone(self.routing.get_session_owner(None))
+        # Unknown worker
+        self.assertIsNone(self.routing.get_session_owner("w3-abc"))
+
+    def test_get_media_owner(self):
+        self.assertEqual("w1", self.routing.media_path_prefix)
+        self.assertEqual(0, self.routing.get_media_owner("w0/abc.png"))
+        self.assertIsNone(self.routing.get_media_owner("abc.png"))
+        self.assertIsNone(self.routing.get_media_owner("wx/abc.png"))
+        self.assertIsNone(self.routing.get_media_owner("w5/abc.png"))
+
+    def test_get_worker_url(self):
+        self.assertEqual(
+            "http://127.0.0.1:8003/foo?bar=1",
+            self.routing.get_worker_url(2, "/foo?bar=1"),
+        )
+        self.assertEqual(
+            "ws://127.0.0.1:8001/_stcore/stream",
+            self.routing.get_worker_url(0, "/_stcore/stream", scheme="ws"),
+        )
+
+
+class OwnedByOtherWorkerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.routing = WorkerRouting(index=0, ports=(8001, 8002))
+        self.matcher = OwnedByOtherWorker(
+            r"/media/(.*)",
+            self.routing,
+            lambda _, path_match: self.routing.get_media_owner(
+                path_match["path_args"][0].decode()
+            ),
+        )
+
+    def test_matches_resources_of_other_workers(self):
+        self.assertEqual(
+            {"path_args": [], "path_kwargs": {"worker_index": b"1"}},
+            self.matcher.match(_request("/media/w1/abc.png")),
+        )
+
+    def test_ignores_resources_of_current_worker(self):
+        self.assertIsNone(self.matcher.match(_request("/media/w0/abc.png")))
+
+    def test_ignores_unknown_resources(self):
+        self.assertIsNone(self.matcher.match(_request("/media/abc.png")))
+
+    def test_ignores_other_paths(self):
+        self.assertIsNone(self.matcher.match(_request("/other/w1/abc.png")))
+
+    def test_ignores_forwarded_requests(self):
+        """Requests must never be forwarded twice."""
+        self.assertIsNone(
+            self.matcher.match(
+                _request("/media/w1/abc.png", {WORKER_FORWARDED_HEADER: "1"})
+            )
+        )
+
+
+class _IsForwardedHandler(tornado.web.RequestHandler):
+    def get(self) -> None:
+        self.write(str(is_forwarded_request(self.request)))
+
+
+class PublicRequestDelegateTest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        return PublicRequestDelegate(
+            tornado.web.Application([(r"/", _IsForwardedHandler)])
+        )
+
+    def test_strips_forwarded_header(self):
+        """Clients can't make their requests look like forwarded requests."""
+        response = self.fetch("/", headers={WORKER_FORWARDED_HEADER: "1"})
+
+        self.assertEqual(200, response.code)
+        self.assertEqual(b"False", response.body)
@@ -0,0 +1,128 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark many sessions requesting I/O-bound values of cached functions.
+
+Each session is a thread that calls a cached function with a cold cache, like
+the script runs of an app that was just (re)started. The sessions request the
+given number of distinct keys. For each decorator, this compares a sync
+function that sleeps with an async function that awaits `asyncio.sleep`, and
+reports the wall time, the per-call latency, and how many times the function
+was executed.
+
+Example:
+    python scripts/async_cache_benchmark.py --sessions 200 --keys 1
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import threading
+import time
+from typing import Any, Callable
+
+import click
+
+import streamlit as st
+from streamlit import config, logger
+
+
+def _make_funcs(
+    decorator: Callable[..., Any], latency: float, executions: list[int]
+) -> dict[str, Callable[[int], Any]]:
+    @decorator(show_spinner=False)
+    def sync_fetch(key: int) -> int:
+        executions.append(key)
+        time.sleep(latency)
+        return key
+
+    @decorator(show_spinner=False)
+    async def async_fetch(key: int) -> int:
+        executions.append(key)
+        await asyncio.sleep(latency)
+        return key
+
+    return {"sync": sync_fetch, "async": async_fetch}
+
+
+def _run_sessions(
+    func: Callable[[int], Any], num_sessions: int, num_keys: int
+) -> tuple[float, list[float]]:
+    """Call func on num_sessions threads at once, and return the wall time and
+    the latencies of the calls.
+    """
+    barrier = threading.Barrier(num_sessions + 1)
+    latencies: list[float] = []
+
+    def run_session(session: int) -> None:
+        barrier.wait()
+        start = time.perf_counter()
+        func(session % num_keys)
+        latencies.append(time.perf_counter() - start)
+
+    threads = [
+        threading.Thread(target=run_session, args=[session])
+        for session in range(num_sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+@click.command()
+@click.option("--sessions", type=int, default=200, help="Number of sessions.")
+@click.option("--keys", type=int, default=1, help="Number of distinct keys.")
+@click.option("--latency", type=float, default=0.2, help="Seconds per computation.")
+@click.option("--rounds", type=int, default=5, help="Cold-cache rounds per case.")
+def main(sessions: int, keys: int, latency: float, rounds: int) -> None:
+    """Benchmark concurrent sessions requesting I/O-bound cached values."""
+    # Silence the warnings about running without a Streamlit runtime.
+    config.get_config_options()
+    logger.set_log_level("error")
+
+    click.echo(
+        f"{'decorator':>14} {'func':>5} {'wall s':>7} {'p50 ms':>7}"
+        f" {'p99 ms':>7} {'executions':>10}"
+    )
+    for name, decorator in [
+        ("cache_data", st.cache_data),
+        ("cache_resource", st.cache_resource),
+    ]:
+        executions: list[int] = []
+        for func_name, func in _make_funcs(decorator, latency, executions).items():
+            executions.clear()
+            wall_times: list[float] = []
+            latencies: list[float] = []
+            for _ in range(rounds):
+                func.clear()
+                wall_time, round_latencies = _run_sessions(func, sessions, keys)
+                wall_times.append(wall_time)
+                latencies.extend(round_latencies)
+
+            latencies.sort()
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            click.echo(
+                f"{name:>14} {func_name:>5} {statistics.median(wall_times):>7.3f}"
+                f" {statistics.median(latencies) * 1000:>7.1f} {p99 * 1000:>7.1f}"
+                f" {len(executions) / rounds:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
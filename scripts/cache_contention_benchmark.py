@@ -0,0 +1,88 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark cache hits of a single hot cached function on many threads.
+
+Each thread stands in for a session's script run. All threads call the same
+cached function with the same argument, so every call after the first is a
+cache hit, and the threads contend for the cache's locks. This reports the
+total throughput for @st.cache_data and @st.cache_resource.
+
+Example:
+    python scripts/cache_contention_benchmark.py --threads 64 --hits 128000
+"""
+
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from typing import Any, Callable
+
+import click
+
+import streamlit as st
+from streamlit import config, logger
+
+
+def _run_threads(func: Callable[[int], Any], num_threads: int, hits: int) -> float:
+    """Call func hits times in total on num_threads threads at once, and
+    return the wall time.
+    """
+    barrier = threading.Barrier(num_threads + 1)
+    hits_per_thread = hits // num_threads
+
+    def run() -> None:
+        barrier.wait()
+        for _ in range(hits_per_thread):
+            func(1)
+
+    threads = [threading.Thread(target=run) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--threads", type=int, default=64, help="Number of threads.")
+@click.option("--hits", type=int, default=128_000, help="Total cache hits per round.")
+@click.option("--rounds", type=int, default=3, help="Number of rounds.")
+def main(threads: int, hits: int, rounds: int) -> None:
+    """Benchmark concurrent cache hits of a single cached function."""
+    # Silence the warnings about running without a Streamlit runtime.
+    config.get_config_options()
+    logger.set_log_level("error")
+
+    click.echo(f"{'decorator':>14} {'hits/s':>9}")
+    for name, decorator in [
+        ("cache_data", st.cache_data),
+        ("cache_resource", st.cache_resource),
+    ]:
+
+        @decorator(show_spinner=False)
+        def hot(value: int) -> list[int]:
+            return list(range(value, value + 100))
+
+        hot(1)
+        wall_times = [_run_threads(hot, threads, hits) for _ in range(rounds)]
+        hits_per_second = (hits // threads) * threads / statistics.median(wall_times)
+        click.echo(f"{name:>14} {hits_per_second:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
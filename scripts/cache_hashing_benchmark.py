@@ -0,0 +1,79 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the per-call overhead of cached functions.
+
+This measures two things, without a Streamlit session:
+- calling a @st.cache_data function with three arguments that's always a
+  cache hit, which is dominated by computing the function and value keys.
+- decorating the same function again, which happens on every script run for
+  cached functions that are defined in the script.
+
+Example:
+    python scripts/cache_hashing_benchmark.py --calls 20000
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from typing import Any, Callable
+
+import click
+
+import streamlit as st
+from streamlit import config, logger
+
+
+def _query(table: str, limit: int, columns: tuple[str, ...]) -> list[Any]:
+    return [table, limit, columns]
+
+
+def _time_per_call(run: Callable[[], Any], calls: int, rounds: int) -> float:
+    """Return the median time per call of run, in microseconds."""
+    round_times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        round_times.append((time.perf_counter() - start) / calls)
+    return statistics.median(round_times) * 1_000_000
+
+
+@click.command()
+@click.option("--calls", type=int, default=20_000, help="Calls per round.")
+@click.option("--rounds", type=int, default=5, help="Number of rounds.")
+def main(calls: int, rounds: int) -> None:
+    """Benchmark cache hits and re-decoration of a cached function."""
+    # Silence the warnings about running without a Streamlit runtime.
+    config.get_config_options()
+    logger.set_log_level("error")
+
+    cached_query = st.cache_data(_query)
+    args = ("users", 100, ("id", "name", "email"))
+    cached_query(*args)
+
+    click.echo(f"{'operation':>12} {'us/call':>8}")
+    click.echo(
+        f"{'cache hit':>12} "
+        f"{_time_per_call(lambda: cached_query(*args), calls, rounds):>8.1f}"
+    )
+    click.echo(
+        f"{'decorate':>12} "
+        f"{_time_per_call(lambda: st.cache_data(_query), calls, rounds):>8.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark custom components that receive large args.
+
+This runs an app with a custom component that gets a large JSON arg, a large
+dataframe arg, and a counter that changes on every rerun, as happens when a
+component's args are updated rapidly. For each rerun, it measures the script
+run time and the size of the component instance sent to the frontend, with
+large args sent inline and as blobs.
+
+Example:
+    python scripts/component_args_benchmark.py --megabytes 10 --reruns 20
+"""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import click
+
+from streamlit.components.v1 import custom_component
+from streamlit.testing.v1 import AppTest
+
+_SCRIPT = """
+import numpy as np
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as components
+
+@st.cache_data
+def load_data(num_rows):
+    rng = np.random.default_rng(0)
+    return (
+        rng.random(num_rows).round(6).tolist(),
+        pd.DataFrame({"x": rng.random(num_rows), "y": rng.random(num_rows)}),
+    )
+
+component = components.declare_component("bench", url="http://localhost:3001")
+points, df = load_data({num_rows})
+st.session_state.setdefault("counter", 0)
+st.session_state.counter += 1
+component(points=points, df=df, counter=st.session_state.counter)
+"""
+
+
+def _run(num_rows: int, reruns: int) -> tuple[float, float]:
+    """Run the app, and return the mean script run time and component instance
+    size of its reruns, in seconds and bytes.
+    """
+    app = AppTest.from_string(_SCRIPT.replace("{num_rows}", str(num_rows)))
+    app.run(timeout=60)
+
+    total_seconds = 0.0
+    total_bytes = 0
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run(timeout=60)
+        total_seconds += time.perf_counter() - start
+        total_bytes += app.get("component_instance")[0].proto.ByteSize()
+    return total_seconds / reruns, total_bytes / reruns
+
+
+@click.command()
+@click.option(
+    "--megabytes",
+    type=float,
+    default=10,
+    help="Approximate total size of the component's large args.",
+)
+@click.option("--reruns", type=int, default=20, help="Number of reruns to measure.")
+def main(megabytes: float, reruns: int) -> None:
+    """Benchmark custom components that receive large args."""
+    # Each row adds about 9 bytes to the JSON arg and 16 to the dataframe arg.
+    num_rows = int(megabytes * 1e6 / 25)
+
+    click.echo(f"{'args':>8} {'ms/rerun':>9} {'KB/rerun':>10}")
+    with patch.object(custom_component, "_MIN_BLOB_ARG_SIZE", float("inf")):
+        seconds, num_bytes = _run(num_rows, reruns)
+    click.echo(f"{'inline':>8} {seconds * 1000:>9.1f} {num_bytes / 1e3:>10.1f}")
+
+    seconds, num_bytes = _run(num_rows, reruns)
+    click.echo(f"{'blobs':>8} {seconds * 1000:>9.1f} {num_bytes / 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
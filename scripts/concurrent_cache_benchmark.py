@@ -0,0 +1,84 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark a script run that reads several independent cached values.
+
+The "script" calls the given number of I/O-bound cached functions with a cold
+cache, with latencies spread evenly up to --latency. This compares calling
+them one after another with submitting all of them first and then reading
+their results, which computes the cache misses concurrently.
+
+Example:
+    python scripts/concurrent_cache_benchmark.py --calls 4 --latency 0.5
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from typing import Any, Callable
+
+import click
+
+import streamlit as st
+from streamlit import config, logger
+
+
+@st.cache_data(show_spinner=False)
+def _query(index: int, latency: float) -> list[int]:
+    time.sleep(latency)
+    return list(range(index, index + 1000))
+
+
+def _run_sequentially(calls: list[tuple[int, float]]) -> list[Any]:
+    return [_query(index, latency) for index, latency in calls]
+
+
+def _run_concurrently(calls: list[tuple[int, float]]) -> list[Any]:
+    futures = [_query.submit(index, latency) for index, latency in calls]
+    return [future.result() for future in futures]
+
+
+@click.command()
+@click.option("--calls", type=int, default=4, help="Number of cached functions.")
+@click.option("--latency", type=float, default=0.5, help="Slowest call in seconds.")
+@click.option("--rounds", type=int, default=5, help="Cold-cache script runs.")
+def main(calls: int, latency: float, rounds: int) -> None:
+    """Benchmark sequential and concurrent cache misses in a script run."""
+    # Silence the warnings about running without a Streamlit runtime.
+    config.get_config_options()
+    logger.set_log_level("error")
+
+    call_args = [(index, latency * (index + 1) / calls) for index in range(calls)]
+    click.echo(
+        f"{calls} calls, {sum(arg[1] for arg in call_args):.2f}s total,"
+        f" {latency:.2f}s slowest"
+    )
+    click.echo(f"{'mode':>12} {'run s':>6}")
+    runners: dict[str, Callable[[list[tuple[int, float]]], list[Any]]] = {
+        "sequential": _run_sequentially,
+        "submit": _run_concurrently,
+    }
+    for name, run in runners.items():
+        run_times = []
+        for _ in range(rounds):
+            _query.clear()
+            start = time.perf_counter()
+            run(call_args)
+            run_times.append(time.perf_counter() - start)
+        click.echo(f"{name:>12} {statistics.median(run_times):>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
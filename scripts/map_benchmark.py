@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the server-side cost of st.map with many points.
+
+For each number of points, this measures the time to build st.map's proto and
+the size of the serialized proto, for a DataFrame with latitude, longitude,
+size and color columns. As a baseline, it also measures the same for
+st.pydeck_chart with an equivalent ScatterplotLayer, whose data is sent as JSON
+records.
+
+Example:
+    python scripts/map_benchmark.py --points 100000 --points 1000000
+"""
+
+from __future__ import annotations
+
+import time
+
+import click
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+
+from streamlit.elements import deck_gl_json_chart
+from streamlit.elements import map as st_map
+from streamlit.proto.DeckGlJsonChart_pb2 import DeckGlJsonChart as DeckGlJsonChartProto
+
+_PALETTE = ["#ff4b4b", "#1c83e1", "#21c354", "#ffbd45"]
+
+
+def _make_points(num_points: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "lat": rng.normal(37.76, 0.1, num_points),
+            "lon": rng.normal(-122.4, 0.1, num_points),
+            "size": rng.uniform(10, 100, num_points),
+            "color": rng.choice(_PALETTE, num_points),
+        }
+    )
+
+
+def _st_map_proto(df: pd.DataFrame) -> DeckGlJsonChartProto:
+    proto = DeckGlJsonChartProto()
+    deck_gl_json, layer_columns, binary_attributes = st_map.to_deckgl_json(
+        df, "lat", "lon", "size", "color", None, None
+    )
+    st_map.marshall(proto, deck_gl_json, True)
+    deck_gl_json_chart.marshall_arrow_layer_data(
+        proto, 0, layer_columns, binary_attributes
+    )
+    return proto
+
+
+def _json_pydeck_proto(df: pd.DataFrame) -> DeckGlJsonChartProto:
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=df,
+        get_position=["lon", "lat"],
+        get_radius="size",
+        get_fill_color="color",
+    )
+    proto = DeckGlJsonChartProto()
+    proto.json = pdk.Deck(layers=[layer]).to_json()
+    return proto
+
+
+def _measure(build, df: pd.DataFrame) -> tuple[float, int]:
+    start = time.perf_counter()
+    proto = build(df)
+    num_bytes = len(proto.SerializeToString())
+    return time.perf_counter() - start, num_bytes
+
+
+@click.command()
+@click.option(
+    "--points",
+    type=int,
+    multiple=True,
+    default=[100_000, 1_000_000, 5_000_000],
+    help="Number of points to benchmark with. Can be passed multiple times.",
+)
+@click.option(
+    "--skip-json",
+    is_flag=True,
+    help="Don't measure the JSON baseline, which is slow for many points.",
+)
+def main(points: tuple[int, ...], skip_json: bool) -> None:
+    """Benchmark the server-side cost of st.map with many points."""
+    click.echo(f"{'points':>10} {'encoding':>8} {'seconds':>9} {'MB':>9}")
+    for num_points in points:
+        df = _make_points(num_points)
+        builds = [("arrow", _st_map_proto)]
+        if not skip_json:
+            builds.append(("json", _json_pydeck_proto))
+        for name, build in builds:
+            seconds, num_bytes = _measure(build, df)
+            click.echo(
+                f"{num_points:>10} {name:>8} {seconds:>9.2f} {num_bytes / 1e6:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
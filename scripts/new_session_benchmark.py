@@ -0,0 +1,94 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark building the new_session message that starts every script run.
+
+For an app with the given number of pages, this measures the time to build a
+session's new_session message when the shared template has to be built (as
+on the first run after a config or page change), and when it's reused (as on
+every other run).
+
+Example:
+    python scripts/new_session_benchmark.py --pages 10 --pages 200
+"""
+
+from __future__ import annotations
+
+import os
+import timeit
+from unittest.mock import MagicMock, patch
+
+import click
+
+from streamlit.runtime import app_session
+from streamlit.runtime.app_session import AppSession
+from streamlit.runtime.script_data import ScriptData
+from streamlit.runtime.uploaded_file_manager import UploadedFileManager
+
+
+def _create_session() -> AppSession:
+    with patch(
+        "streamlit.runtime.app_session.asyncio.get_running_loop",
+        return_value=MagicMock(),
+    ), patch("streamlit.runtime.app_session.LocalSourcesWatcher"):
+        return AppSession(
+            script_data=ScriptData(os.path.abspath(__file__), is_hello=False),
+            uploaded_file_manager=MagicMock(spec=UploadedFileManager),
+            script_cache=MagicMock(),
+            message_enqueued_callback=None,
+            user_info={},
+        )
+
+
+@click.command()
+@click.option(
+    "--pages",
+    type=int,
+    multiple=True,
+    default=[10, 200],
+    help="Number of pages to benchmark with. Can be passed multiple times.",
+)
+@click.option("--number", type=int, default=2000, help="Runs per measurement.")
+def main(pages: tuple[int, ...], number: int) -> None:
+    """Benchmark building the new_session message of a script run."""
+    session = _create_session()
+
+    click.echo(f"{'pages':>6} {'template':>9} {'us/run':>8}")
+    for num_pages in pages:
+        app_pages = {
+            f"hash_{i}": {
+                "page_name": f"page_{i}",
+                "icon": "🎈",
+                "script_path": f"/benchmark/page_{i}.py",
+            }
+            for i in range(num_pages)
+        }
+
+        def create_message(app_pages=app_pages) -> None:
+            session._create_new_session_message("hash_0", None, app_pages)
+
+        def create_message_without_template(app_pages=app_pages) -> None:
+            app_session._new_session_templates.clear()
+            session._create_new_session_message("hash_0", None, app_pages)
+
+        for name, func in [
+            ("built", create_message_without_template),
+            ("reused", create_message),
+        ]:
+            seconds = timeit.timeit(func, number=number) / number
+            click.echo(f"{num_pages:>6} {name:>9} {seconds * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the server-side cost of st.plotly_chart with large figures.
+
+For a scatter figure with the given number of points, this measures the time
+to serialize the figure like before memoization (plotly.io.to_json, plus
+hashing the spec for the element ID), and with Streamlit's memoized
+serialization: the first time (a cache miss), for an unchanged figure on a
+later rerun (a cache hit), and for a chart whose figure changes on every
+rerun.
+
+Example:
+    python scripts/plotly_benchmark.py --points 1000000
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Callable
+
+import click
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io
+
+from streamlit.elements.lib import plotly_utils
+
+
+def _to_json(fig_dict: dict[str, Any]) -> str:
+    spec = plotly.io.to_json(fig_dict, validate=False)
+    # The element ID used to be computed from the spec.
+    hashlib.md5(spec.encode("utf-8"), usedforsecurity=False)
+    return spec
+
+
+def _figure_to_json(fig_dict: dict[str, Any]) -> str:
+    return plotly_utils.figure_to_json(fig_dict, "chart")[0]
+
+
+def _make_fig_dict(num_points: int, seed: int) -> dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    figure = go.Figure(
+        go.Scattergl(x=rng.random(num_points), y=rng.random(num_points), mode="markers")
+    )
+    return figure.to_plotly_json()
+
+
+def _time(func: Callable[[dict[str, Any]], str], fig_dict: dict[str, Any]):
+    start = time.perf_counter()
+    spec = func(fig_dict)
+    return time.perf_counter() - start, spec
+
+
+@click.command()
+@click.option(
+    "--points",
+    type=int,
+    multiple=True,
+    default=[1_000_000],
+    help="Number of points to benchmark with. Can be passed multiple times.",
+)
+def main(points: tuple[int, ...]) -> None:
+    """Benchmark the server-side cost of st.plotly_chart with large figures."""
+    click.echo(f"{'points':>10} {'method':>12} {'seconds':>9} {'MB':>9}")
+    for num_points in points:
+        fig_dicts = [_make_fig_dict(num_points, seed) for seed in range(3)]
+
+        plotly_utils._spec_cache.clear()
+        measurements = [
+            ("old path", _to_json, fig_dicts[0]),
+            ("cache miss", _figure_to_json, fig_dicts[0]),
+            ("cache hit", _figure_to_json, fig_dicts[0]),
+            ("changed", _figure_to_json, fig_dicts[1]),
+            # The chart's figure changed on the previous rerun, too.
+            ("changing", _figure_to_json, fig_dicts[2]),
+        ]
+        for name, func, fig_dict in measurements:
+            seconds, spec = _time(func, fig_dict)
+            click.echo(
+                f"{num_points:>10} {name:>12} {seconds:>9.3f} {len(spec) / 1e6:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
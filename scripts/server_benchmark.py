@@ -0,0 +1,512 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the Python server under concurrent sessions.
+
+The `run` command drives a Streamlit Runtime in-process with many fake session
+clients. Each of them sends real rerun BackMsgs to an app (by default, the apps
+in frontend/app/performance/apps, which are also used by the Lighthouse
+benchmarks), waits for the rerun to finish, and reruns again. The results are
+written as JSON:
+
+- reruns_per_second: completed reruns per second, over all sessions.
+- rerun_latency_ms: from sending the rerun request to receiving script_finished.
+- time_to_first_delta_ms: from sending the rerun request to receiving the first
+  delta.
+- bytes_sent_per_rerun: serialized ForwardMsg bytes sent to a session per rerun.
+- event_loop_lag_ms: how late a task sleeping on the event loop wakes up.
+- memory_per_session_bytes: memory allocated by a new session and its first
+  rerun (measured separately with tracemalloc).
+- forward_msg_cache_hit_ratio: share of cacheable ForwardMsgs sent as
+  references to messages the client already has.
+- cache_hit_ratio: share of st.cache_data/st.cache_resource calls that were
+  cache hits.
+- exceptions_per_rerun: exception elements per rerun, e.g. because an app
+  needs network access.
+
+The `compare` command compares two result files, e.g. of two releases, and
+exits with an error if any metric regressed by more than a threshold.
+
+To see what server-side element diffing saves, compare bytes_sent_per_rerun
+of runs with and without --element-diffing.
+
+Examples:
+    python scripts/server_benchmark.py run --sessions 50 --output new.json
+    python scripts/server_benchmark.py compare baseline.json new.json
+    python scripts/server_benchmark.py run --element-diffing \
+        frontend/app/performance/apps/dashboard_app.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, Iterator
+
+import click
+
+import streamlit
+from streamlit import config, source_util
+from streamlit.logger import set_log_level
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.runtime import Runtime, RuntimeConfig
+from streamlit.runtime.caching import cache_utils
+from streamlit.runtime.caching.storage.dummy_cache_storage import (
+    MemoryCacheStorageManager,
+)
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
+from streamlit.runtime.runtime_util import serialize_forward_msg
+
+if TYPE_CHECKING:
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+_REPO_ROOT: Final = Path(__file__).resolve().parent.parent
+_DEFAULT_APPS: Final = [
+    _REPO_ROOT / "frontend/app/performance/apps/blank_app.py",
+    _REPO_ROOT / "frontend/app/performance/apps/crud_app.py",
+    _REPO_ROOT / "frontend/app/performance/apps/dashboard_app.py",
+    _REPO_ROOT / "frontend/app/performance/apps/multipage/multipage_app.py",
+]
+
+# How often the event loop lag is sampled.
+_LAG_SAMPLE_INTERVAL_SECONDS: Final = 0.01
+
+# For each metric, whether higher values are better.
+_HIGHER_IS_BETTER: Final = {
+    "reruns_per_second": True,
+    "rerun_latency_ms": False,
+    "time_to_first_delta_ms": False,
+    "bytes_sent_per_rerun": False,
+    "event_loop_lag_ms": False,
+    "memory_per_session_bytes": False,
+    "forward_msg_cache_hit_ratio": True,
+    "cache_hit_ratio": True,
+    "exceptions_per_rerun": False,
+}
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    values = sorted(values)
+
+    def percentile(p: float) -> float:
+        return values[min(len(values) - 1, math.ceil(p * len(values)) - 1)]
+
+    return {
+        "p50": round(percentile(0.5), 3),
+        "p90": round(percentile(0.9), 3),
+        "p99": round(percentile(0.99), 3),
+        "max": round(values[-1], 3),
+    }
+
+
+class _FakeSessionClient:
+    """A SessionClient that records what a browser would receive."""
+
+    def __init__(self) -> None:
+        self.bytes_sent = 0
+        self.forward_msg_cache_hits = 0
+        self.forward_msg_cache_misses = 0
+        self.exceptions = 0
+        self._rerun_started_at = 0.0
+        self.first_delta_at: float | None = None
+        self.finished = asyncio.Event()
+
+    def start_rerun(self) -> None:
+        self._rerun_started_at = time.perf_counter()
+        self.first_delta_at = None
+        self.finished.clear()
+
+    @property
+    def rerun_started_at(self) -> float:
+        return self._rerun_started_at
+
+    def write_forward_msg(self, msg: ForwardMsg) -> None:
+        # Serializing messages is part of the work done for real clients.
+        self.bytes_sent += len(serialize_forward_msg(msg))
+
+        msg_type = msg.WhichOneof("type")
+        if msg_type == "ref_hash":
+            self.forward_msg_cache_hits += 1
+        elif msg.metadata.cacheable:
+            self.forward_msg_cache_misses += 1
+
+        if msg_type == "delta" or msg_type == "ref_hash":
+            if self.first_delta_at is None:
+                self.first_delta_at = time.perf_counter()
+            if (
+                msg_type == "delta"
+                and msg.delta.WhichOneof("type") == "new_element"
+                and msg.delta.new_element.WhichOneof("type") == "exception"
+            ):
+                self.exceptions += 1
+        elif msg_type == "script_finished":
+            self.finished.set()
+
+
+class _CacheCounts:
+    """Counts of st.cache_data and st.cache_resource lookups and hits."""
+
+    def __init__(self) -> None:
+        self.lookups = 0
+        self.hits = 0
+        self.lock = threading.Lock()
+
+
+@contextmanager
+def _count_cache_hits() -> Iterator[_CacheCounts]:
+    """Count cached function lookups and hits while the context is active."""
+    counts = _CacheCounts()
+    cached_func = cache_utils.CachedFunc
+    get_or_create = cached_func._get_or_create_cached_value
+    handle_hit = cached_func._handle_cache_hit
+
+    def counting_get_or_create(func_self, *args, **kwargs):
+        with counts.lock:
+            counts.lookups += 1
+        return get_or_create(func_self, *args, **kwargs)
+
+    def counting_handle_hit(func_self, *args, **kwargs):
+        with counts.lock:
+            counts.hits += 1
+        return handle_hit(func_self, *args, **kwargs)
+
+    cached_func._get_or_create_cached_value = counting_get_or_create  # type: ignore[method-assign]
+    cached_func._handle_cache_hit = counting_handle_hit  # type: ignore[method-assign]
+    try:
+        yield counts
+    finally:
+        cached_func._get_or_create_cached_value = get_or_create  # type: ignore[method-assign]
+        cached_func._handle_cache_hit = handle_hit  # type: ignore[method-assign]
+
+
+@dataclass
+class _AppResults:
+    num_reruns: int = 0
+    duration_seconds: float = 0.0
+    rerun_latencies_ms: list[float] = field(default_factory=list)
+    time_to_first_delta_ms: list[float] = field(default_factory=list)
+    event_loop_lags_ms: list[float] = field(default_factory=list)
+
+
+def _rerun_msg(page_script_hash: str) -> BackMsg:
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    msg.rerun_script.page_script_hash = page_script_hash
+    return msg
+
+
+def _get_page_script_hashes(app_path: Path) -> list[str]:
+    """Return the script hashes of the app's pages, so that sessions of a
+    multipage app visit all of them.
+    """
+    # Pages are cached for the first main script they're requested for.
+    source_util.invalidate_pages_cache()
+    pages = source_util.get_pages(str(app_path))
+    return [page["page_script_hash"] for page in pages.values()] or [""]
+
+
+class _Benchmark:
+    def __init__(self, app_path: Path, num_sessions: int, duration: float) -> None:
+        self._app_path = app_path
+        self._num_sessions = num_sessions
+        self._duration = duration
+        self._page_hashes = _get_page_script_hashes(app_path)
+        self._runtime: Runtime | None = None
+
+    async def _rerun(
+        self,
+        session_id: str,
+        client: _FakeSessionClient,
+        page_hash: str,
+        results: _AppResults | None,
+    ) -> None:
+        assert self._runtime is not None
+        client.start_rerun()
+        self._runtime.handle_backmsg(session_id, _rerun_msg(page_hash))
+        await client.finished.wait()
+        if results is None:
+            return
+
+        finished_at = time.perf_counter()
+        results.num_reruns += 1
+        results.rerun_latencies_ms.append(
+            (finished_at - client.rerun_started_at) * 1000
+        )
+        if client.first_delta_at is not None:
+            results.time_to_first_delta_ms.append(
+                (client.first_delta_at - client.rerun_started_at) * 1000
+            )
+
+    def _connect(self, index: int) -> tuple[str, _FakeSessionClient, str]:
+        assert self._runtime is not None
+        client = _FakeSessionClient()
+        session_id = self._runtime.connect_session(
+            client=client, user_info={"email": f"user{index}@example.com"}
+        )
+        page_hash = self._page_hashes[index % len(self._page_hashes)]
+        return session_id, client, page_hash
+
+    async def _run_session(
+        self,
+        session: tuple[str, _FakeSessionClient, str],
+        stop_at: float,
+        results: _AppResults,
+    ) -> None:
+        session_id, client, page_hash = session
+        while time.perf_counter() < stop_at:
+            await self._rerun(session_id, client, page_hash, results)
+
+    async def _sample_event_loop_lag(self, results: _AppResults) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled_at = loop.time()
+            await asyncio.sleep(_LAG_SAMPLE_INTERVAL_SECONDS)
+            lag = loop.time() - scheduled_at - _LAG_SAMPLE_INTERVAL_SECONDS
+            results.event_loop_lags_ms.append(max(0.0, lag) * 1000)
+
+    async def _measure_memory_per_session(self, num_sessions: int) -> float:
+        """Measure the memory allocated by new sessions and their first rerun."""
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            sessions = [self._connect(i) for i in range(num_sessions)]
+            await asyncio.gather(
+                *(
+                    self._rerun(session_id, client, page_hash, None)
+                    for session_id, client, page_hash in sessions
+                )
+            )
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        return (after - before) / num_sessions
+
+    async def run(self) -> dict[str, Any]:
+        self._runtime = Runtime(
+            RuntimeConfig(
+                script_path=str(self._app_path),
+                command_line=None,
+                media_file_storage=MemoryMediaFileStorage("/media"),
+                uploaded_file_manager=MemoryUploadedFileManager("/_stcore/upload_file"),
+                cache_storage_manager=MemoryCacheStorageManager(),
+            )
+        )
+        await self._runtime.start()
+        try:
+            return await self._run_sessions()
+        finally:
+            self._runtime.stop()
+            await self._runtime.stopped
+            Runtime._instance = None
+
+    async def _run_sessions(self) -> dict[str, Any]:
+        sessions = [self._connect(i) for i in range(self._num_sessions)]
+
+        # Warm up: the first run of an app imports modules and fills caches.
+        await asyncio.gather(
+            *(
+                self._rerun(session_id, client, page_hash, None)
+                for session_id, client, page_hash in sessions
+            )
+        )
+        for _, client, _ in sessions:
+            client.bytes_sent = 0
+            client.forward_msg_cache_hits = 0
+            client.forward_msg_cache_misses = 0
+            client.exceptions = 0
+
+        results = _AppResults()
+        lag_sampler = asyncio.create_task(self._sample_event_loop_lag(results))
+        with _count_cache_hits() as cache_counts:
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    self._run_session(session, start + self._duration, results)
+                    for session in sessions
+                )
+            )
+            results.duration_seconds = time.perf_counter() - start
+        lag_sampler.cancel()
+
+        memory_per_session = await self._measure_memory_per_session(
+            min(10, self._num_sessions)
+        )
+
+        num_reruns = max(1, results.num_reruns)
+        cache_hits = sum(client.forward_msg_cache_hits for _, client, _ in sessions)
+        cache_misses = sum(client.forward_msg_cache_misses for _, client, _ in sessions)
+        return {
+            "reruns_per_second": round(
+                results.num_reruns / results.duration_seconds, 3
+            ),
+            "rerun_latency_ms": _percentiles(results.rerun_latencies_ms),
+            "time_to_first_delta_ms": _percentiles(results.time_to_first_delta_ms),
+            "bytes_sent_per_rerun": round(
+                sum(client.bytes_sent for _, client, _ in sessions) / num_reruns
+            ),
+            "event_loop_lag_ms": _percentiles(results.event_loop_lags_ms),
+            "memory_per_session_bytes": round(memory_per_session),
+            "forward_msg_cache_hit_ratio": round(
+                cache_hits / max(1, cache_hits + cache_misses), 4
+            ),
+            "cache_hit_ratio": round(
+                cache_counts.hits / max(1, cache_counts.lookups), 4
+            ),
+            "exceptions_per_rerun": round(
+                sum(client.exceptions for _, client, _ in sessions) / num_reruns, 4
+            ),
+            "num_reruns": results.num_reruns,
+        }
+
+
+def _run_app_benchmark(app_path: Path, sessions: int, duration: float) -> dict:
+    # Apps import modules from their own directory, as with `streamlit run`.
+    sys.path.insert(0, str(app_path.parent))
+    try:
+        return asyncio.run(_Benchmark(app_path, sessions, duration).run())
+    finally:
+        sys.path.remove(str(app_path.parent))
+
+
+def _flatten(metrics: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    flat: dict[str, float] = {}
+    for name, value in metrics.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{name}."))
+        else:
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+
+def _is_higher_better(metric_name: str) -> bool | None:
+    return _HIGHER_IS_BETTER.get(metric_name.split(".")[0])
+
+
+@click.group()
+def main() -> None:
+    """Benchmark the Streamlit server."""
+
+
+@main.command()
+@click.argument("apps", nargs=-1, type=click.Path(exists=True, path_type=Path))
+@click.option("--sessions", type=int, default=20, help="Concurrent sessions.")
+@click.option("--duration", type=float, default=10, help="Seconds per app.")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the results to this file instead of stdout.",
+)
+@click.option(
+    "--element-diffing/--no-element-diffing",
+    default=False,
+    help="Whether to send unchanged elements as compact markers.",
+)
+def run(
+    apps: tuple[Path, ...],
+    sessions: int,
+    duration: float,
+    output: Path | None,
+    element_diffing: bool,
+) -> None:
+    """Benchmark the given apps (by default, the Lighthouse performance apps)."""
+    # Benchmarks must not depend on the file system being watched.
+    config.set_option("server.fileWatcherType", "none")
+    set_log_level("warning")
+    config.set_option("browser.gatherUsageStats", False)
+    config.set_option("server.enableElementDiffing", element_diffing)
+
+    results: dict[str, Any] = {
+        "streamlit_version": streamlit.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "sessions": sessions,
+        "duration_seconds": duration,
+        "element_diffing": element_diffing,
+        "apps": {},
+    }
+    for app_path in apps or _DEFAULT_APPS:
+        click.echo(f"Benchmarking {app_path.name}...", err=True)
+        results["apps"][app_path.stem] = _run_app_benchmark(
+            app_path.resolve(), sessions, duration
+        )
+
+    result_json = json.dumps(results, indent=2)
+    if output is None:
+        click.echo(result_json)
+    else:
+        output.write_text(result_json + "\n")
+
+
+@main.command()
+@click.argument("baseline", type=click.Path(exists=True, path_type=Path))
+@click.argument("current", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.1,
+    help="Relative change beyond which a metric counts as regressed.",
+)
+def compare(baseline: Path, current: Path, threshold: float) -> None:
+    """Compare two result files, and fail if any metric regressed."""
+    baseline_apps = json.loads(baseline.read_text())["apps"]
+    current_apps = json.loads(current.read_text())["apps"]
+
+    regressions = []
+    for app_name in sorted(baseline_apps.keys() & current_apps.keys()):
+        click.echo(app_name)
+        baseline_metrics = _flatten(baseline_apps[app_name])
+        current_metrics = _flatten(current_apps[app_name])
+        for metric_name in sorted(baseline_metrics.keys() & current_metrics.keys()):
+            higher_is_better = _is_higher_better(metric_name)
+            if higher_is_better is None:
+                continue
+            old = baseline_metrics[metric_name]
+            new = current_metrics[metric_name]
+            change = (new - old) / old if old else (0.0 if new == old else math.inf)
+            regressed = (-change if higher_is_better else change) > threshold
+            marker = "REGRESSED" if regressed else ""
+            click.echo(
+                f"  {metric_name:36} {old:>12} -> {new:>12} ({change:+.1%}) {marker}"
+            )
+            if regressed:
+                regressions.append(f"{app_name}: {metric_name}")
+
+    if regressions:
+        click.secho(
+            f"{len(regressions)} metric(s) regressed by more than {threshold:.0%}:",
+            fg="red",
+        )
+        for regression in regressions:
+            click.secho(f"  {regression}", fg="red")
+        sys.exit(1)
+    click.secho("No regressions.", fg="green")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark SQLConnection.query results as pandas DataFrames and Arrow tables.
+
+This creates a local SQLite database (and a DuckDB database, if duckdb and
+duckdb_engine are installed) with a table of the given number of rows. For each
+return type, it measures the time to run an uncached query, and the time to
+serialize the result for st.dataframe.
+
+Requires sqlalchemy.
+
+Example:
+    python scripts/sql_query_benchmark.py --rows 1000000
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import time
+
+import click
+
+import streamlit as st
+from streamlit import config, dataframe_util, logger
+from streamlit.connections import SQLConnection
+
+
+def _create_sqlite_db(path: str, num_rows: int) -> str:
+    with sqlite3.connect(path) as db:
+        db.execute("CREATE TABLE t (id INTEGER, name TEXT, value REAL)")
+        db.executemany(
+            "INSERT INTO t VALUES (?, ?, ?)",
+            ((i, f"name_{i % 1000}", i * 0.5) for i in range(num_rows)),
+        )
+    return f"sqlite:///{path}"
+
+
+def _create_duckdb_db(path: str, num_rows: int) -> str | None:
+    try:
+        import duckdb
+        import duckdb_engine  # noqa: F401
+    except ImportError:
+        return None
+
+    with duckdb.connect(path) as db:
+        db.execute(
+            "CREATE TABLE t AS SELECT i::INTEGER AS id, 'name_' || (i % 1000) AS name,"
+            f" i * 0.5 AS value FROM range({num_rows}) AS r(i)"
+        )
+    return f"duckdb:///{path}"
+
+
+@click.command()
+@click.option("--rows", type=int, default=1_000_000, help="Number of table rows.")
+def main(rows: int) -> None:
+    """Benchmark SQLConnection.query results as pandas DataFrames and Arrow."""
+    # Silence the warnings about running without a Streamlit runtime.
+    config.get_config_options()
+    logger.set_log_level("error")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        urls = {
+            "sqlite": _create_sqlite_db(os.path.join(tmp_dir, "db.sqlite"), rows),
+            "duckdb": _create_duckdb_db(os.path.join(tmp_dir, "db.duckdb"), rows),
+        }
+
+        click.echo(f"{'database':>9} {'result':>7} {'query s':>8} {'serialize s':>12}")
+        for name, url in urls.items():
+            if url is None:
+                click.echo(f"{name:>9} skipped, not installed")
+                continue
+
+            conn = SQLConnection(name, url=url)
+            for return_type in ["pandas", "arrow"]:
+                st.cache_data.clear()
+                start = time.perf_counter()
+                result = conn.query("SELECT * FROM t", return_type=return_type)
+                query_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                dataframe_util.convert_anything_to_arrow_bytes(result)
+                serialize_seconds = time.perf_counter() - start
+
+                click.echo(
+                    f"{name:>9} {return_type:>7} {query_seconds:>8.2f}"
+                    f" {serialize_seconds:>12.2f}"
+                )
+            conn.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure how rerun throughput scales with the `server.workers` option.
+
+For each number of workers, this starts `streamlit run` on a CPU-bound app,
+connects several concurrent websocket clients that rerun the app over and over,
+and prints the number of completed reruns per second, and the speedup over the
+first measurement. Scaling can only show up to the number of CPU cores that
+this process may use, so run it on a host with at least as many cores as the
+largest number of workers.
+
+Example:
+    python scripts/worker_load_test.py --workers 1 --workers 4 --clients 8
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+import tornado.httpclient
+import tornado.websocket
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+_APP = """
+import streamlit as st
+
+# Busy work that holds the GIL, so a single process can't run several
+# sessions' scripts in parallel.
+total = sum(i * i for i in range(200_000))
+st.write(total)
+"""
+
+
+def _usable_cpu_count() -> int:
+    """Return the number of CPU cores that this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_for_server(port: int, timeout: float = 30) -> None:
+    client = tornado.httpclient.AsyncHTTPClient()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await client.fetch(f"http://127.0.0.1:{port}/_stcore/health")
+            return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def _run_client(port: int, stop_at: float) -> int:
+    """Rerun the app until stop_at, and return the number of completed reruns."""
+    ws = await tornado.websocket.websocket_connect(
+        f"ws://127.0.0.1:{port}/_stcore/stream"
+    )
+    rerun = BackMsg()
+    rerun.rerun_script.query_string = ""
+    rerun_bytes = rerun.SerializeToString()
+
+    num_reruns = 0
+    try:
+        while time.monotonic() < stop_at:
+            await ws.write_message(rerun_bytes, binary=True)
+            while True:
+                data = await ws.read_message()
+                if data is None:
+                    return num_reruns
+                msg = ForwardMsg()
+                msg.ParseFromString(data)
+                if msg.WhichOneof("type") == "script_finished":
+                    num_reruns += 1
+                    break
+    finally:
+        ws.close()
+    return num_reruns
+
+
+async def _measure(port: int, num_clients: int, duration: float) -> float:
+    await _wait_for_server(port)
+    # Warm up, e.g. so that all workers have imported the app's modules.
+    await asyncio.gather(
+        *(_run_client(port, time.monotonic() + 1) for _ in range(num_clients))
+    )
+
+    start = time.monotonic()
+    counts = await asyncio.gather(
+        *(_run_client(port, start + duration) for _ in range(num_clients))
+    )
+    return sum(counts) / (time.monotonic() - start)
+
+
+def _run_benchmark(
+    app_path: str, num_workers: int, num_clients: int, duration: float
+) -> float:
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "streamlit",
+            "run",
+            app_path,
+            "--global.developmentMode=false",
+            "--server.headless=true",
+            f"--server.port={port}",
+            f"--server.workers={num_workers}",
+            "--server.fileWatcherType=none",
+            "--browser.gatherUsageStats=false",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        return asyncio.run(_measure(port, num_clients, duration))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+@click.command()
+@click.option(
+    "--workers",
+    "workers_list",
+    type=int,
+    multiple=True,
+    default=(1, 2, 4),
+    help="Numbers of workers to measure. Can be passed several times.",
+)
+@click.option("--clients", type=int, default=8, help="Concurrent websocket clients.")
+@click.option("--duration", type=float, default=10, help="Seconds per measurement.")
+def main(workers_list: tuple[int, ...], clients: int, duration: float) -> None:
+    num_cores = _usable_cpu_count()
+    click.echo(f"CPU cores: {num_cores}, clients: {clients}")
+    if max(workers_list) > num_cores:
+        click.echo(
+            f"Warning: measuring up to {max(workers_list)} workers on"
+            f" {num_cores} cores, so throughput can't scale beyond"
+            f" {num_cores} workers.",
+            err=True,
+        )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app_path = os.path.join(tmp_dir, "app.py")
+        with open(app_path, "w") as f:
+            f.write(_APP)
+
+        baseline = None
+        for num_workers in workers_list:
+            reruns_per_second = _run_benchmark(app_path, num_workers, clients, duration)
+            baseline = baseline or reruns_per_second
+            speedup = reruns_per_second / baseline
+            linear_speedup = num_workers / workers_list[0]
+            click.echo(
+                f"workers={num_workers}: {reruns_per_second:.1f} reruns/s "
+                f"({speedup:.2f}x, {speedup / linear_speedup:.0%} of linear)"
+            )
+
+
+if __name__ == "__main__":
+    main()